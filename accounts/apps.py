@@ -14,6 +14,16 @@ class AccountsConfig(AppConfig):
         Load all tenant databases into settings on first request.
         This avoids hitting the database during app initialization.
         """
+        from accounts import signals  # noqa: F401
+        from django.db.backends.signals import connection_created
+        from accounts.database_utils import track_tenant_connection
+
+        # Track tenant connections so idle ones can be evicted past the cap
+        connection_created.connect(
+            track_tenant_connection,
+            dispatch_uid="accounts.track_tenant_connection",
+        )
+
         # Only wire this in web server processes, not during management commands like migrate
         import sys
         if 'runserver' in sys.argv or 'gunicorn' in sys.argv[0]:
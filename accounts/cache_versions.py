@@ -0,0 +1,27 @@
+"""
+Version keys for cache invalidation.
+
+Cached values embed the current version of a key in their own cache key, so
+bumping the version orphans every entry built on the previous one; orphans
+expire through their TTL.
+"""
+import uuid
+
+from django.core.cache import cache as default_cache
+
+
+def get_cache_version(key, cache_backend=None) -> str:
+    """Return the current version of ``key``, creating it on first use."""
+    backend = cache_backend or default_cache
+    version = backend.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not backend.add(key, version, None):
+            version = backend.get(key) or version
+    return version
+
+
+def bump_cache_version(*keys, cache_backend=None) -> None:
+    """Give every key in ``keys`` a new version."""
+    if keys:
+        (cache_backend or default_cache).set_many({key: uuid.uuid4().hex for key in keys}, None)
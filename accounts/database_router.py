@@ -2,7 +2,7 @@
 Database router for multi-tenant architecture
 Routes database queries to appropriate tenant databases
 """
-from django.conf import settings
+from accounts.tenant_context import get_tenant_db_context
 
 
 class TenantDatabaseRouter:
@@ -33,6 +33,10 @@ class TenantDatabaseRouter:
         'logentry',
         'outstandingtoken',
         'blacklistedtoken',
+        'attendancekiosktokenindex',  # Central kiosk token -> tenant lookup
+        'publicjoblisting',  # Cross-tenant public job board index
+        'employeematchkey',  # Hashed cross-tenant duplicate-detection index
+        'frontdeskstationslugindex',  # Central kiosk slug -> tenant lookup
     ]
     
     def db_for_read(self, model, **hints):
@@ -54,8 +58,8 @@ class TenantDatabaseRouter:
             if instance_db:
                 return instance_db
         
-        # Check for tenant context in thread-local storage
-        tenant_db = getattr(settings, 'CURRENT_TENANT_DB', None)
+        # Check for the request-scoped tenant context
+        tenant_db = get_tenant_db_context()
         if tenant_db:
             return tenant_db
         
@@ -81,8 +85,8 @@ class TenantDatabaseRouter:
             if instance_db:
                 return instance_db
         
-        # Check for tenant context in thread-local storage
-        tenant_db = getattr(settings, 'CURRENT_TENANT_DB', None)
+        # Check for the request-scoped tenant context
+        tenant_db = get_tenant_db_context()
         if tenant_db:
             return tenant_db
         
@@ -151,6 +155,9 @@ class TenantDatabaseRouter:
             if app_label in ['auth', 'admin', 'sessions', 'contenttypes', 'notifications', 'token_blacklist']:
                 # These tables should not be created in tenant databases
                 return False
+            # Central registries living inside tenant apps stay in the default database only
+            if (model_name or '').lower() in self.DEFAULT_DB_MODELS:
+                return False
             
             # Allow all other app migrations
             return True
@@ -2,7 +2,11 @@
 Utility functions for multi-tenant database management
 """
 import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.pool
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from django.conf import settings
 from django.core.management import call_command
@@ -12,6 +16,187 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+TENANT_ALIAS_PREFIX = 'tenant_'
+
+
+class TenantConnectionManager:
+    """
+    Registers tenant aliases lazily with persistent connections and keeps the
+    number of open tenant connections under TENANT_DB_MAX_OPEN_CONNECTIONS.
+
+    - Aliases are added to settings.DATABASES on first use; the socket itself is
+      opened by Django only when a query runs.
+    - Django connections are per thread, so the LRU of open aliases is kept per
+      thread; idle (non-atomic) least-recently-used aliases are closed when the
+      cap is exceeded.
+    - CREATE/DROP DATABASE statements borrow from a small pool of admin
+      connections to the `postgres` maintenance database; callers wait for a
+      free one and open a one-off connection if none frees up in time.
+    """
+
+    ADMIN_POOL_WAIT_SECONDS = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._admin_pool = None
+        self._admin_slots = None
+        self.metrics = {
+            'hits': 0,
+            'registrations': 0,
+            'opens': 0,
+            'evictions': 0,
+            'admin_checkouts': 0,
+            'admin_overflows': 0,
+        }
+
+    @property
+    def max_open_connections(self):
+        return int(getattr(settings, 'TENANT_DB_MAX_OPEN_CONNECTIONS', 50) or 0)
+
+    def _incr(self, key, amount=1):
+        with self._lock:
+            self.metrics[key] += amount
+
+    def _open_aliases(self):
+        lru = getattr(self._local, 'lru', None)
+        if lru is None:
+            lru = self._local.lru = OrderedDict()
+        return lru
+
+    def build_config(self, db_name):
+        """Copy the default database settings for a tenant database."""
+        tenant_db_config = settings.DATABASES['default'].copy()
+        tenant_db_config['NAME'] = db_name
+        tenant_db_config['CONN_MAX_AGE'] = getattr(settings, 'TENANT_DB_CONN_MAX_AGE', 60)
+        tenant_db_config['CONN_HEALTH_CHECKS'] = getattr(settings, 'TENANT_DB_CONN_HEALTH_CHECKS', True)
+        return tenant_db_config
+
+    def register(self, alias, db_name):
+        """
+        Make sure the alias is known to Django.
+        Returns True when the alias was newly registered.
+        """
+        if alias in settings.DATABASES:
+            self._incr('hits')
+            lru = self._open_aliases()
+            if alias in lru:
+                lru.move_to_end(alias)
+            return False
+
+        tenant_db_config = self.build_config(db_name)
+        settings.DATABASES[alias] = tenant_db_config
+        connections.databases[alias] = settings.DATABASES[alias]
+        self._incr('registrations')
+        return True
+
+    def on_connection_created(self, alias):
+        """Track a freshly opened tenant connection and evict idle ones past the cap."""
+        if not alias.startswith(TENANT_ALIAS_PREFIX):
+            return
+        self._incr('opens')
+        lru = self._open_aliases()
+        lru[alias] = True
+        lru.move_to_end(alias)
+        self.evict_idle(keep=alias)
+
+    def evict_idle(self, keep=None):
+        cap = self.max_open_connections
+        if cap <= 0:
+            return
+        lru = self._open_aliases()
+        # Forget aliases already closed elsewhere (CONN_MAX_AGE expiry, errors).
+        for alias in list(lru):
+            if alias != keep and (alias not in settings.DATABASES or connections[alias].connection is None):
+                lru.pop(alias, None)
+        for alias in list(lru):
+            if len(lru) <= cap:
+                break
+            if alias == keep:
+                continue
+            wrapper = connections[alias]
+            if wrapper.in_atomic_block:
+                continue
+            wrapper.close()
+            lru.pop(alias, None)
+            self._incr('evictions')
+
+    def _admin_connect_kwargs(self):
+        default_db = settings.DATABASES['default']
+        return {
+            'dbname': 'postgres',  # Connect to default postgres database
+            'user': default_db['USER'],
+            'password': default_db['PASSWORD'],
+            'host': default_db['HOST'],
+            'port': default_db['PORT'],
+        }
+
+    def _get_admin_pool(self):
+        if self._admin_pool is None:
+            with self._lock:
+                if self._admin_pool is None:
+                    size = max(int(getattr(settings, 'TENANT_ADMIN_DB_POOL_SIZE', 2) or 1), 1)
+                    # getconn() raises PoolError once every connection is out; the
+                    # semaphore makes callers queue for a slot instead.
+                    self._admin_slots = threading.BoundedSemaphore(size)
+                    self._admin_pool = psycopg2.pool.ThreadedConnectionPool(0, size, **self._admin_connect_kwargs())
+        return self._admin_pool
+
+    @contextmanager
+    def admin_connection(self):
+        """Borrow an autocommit connection to the `postgres` database."""
+        pool = self._get_admin_pool()
+        if not self._admin_slots.acquire(timeout=self.ADMIN_POOL_WAIT_SECONDS):
+            self._incr('admin_overflows')
+            conn = psycopg2.connect(**self._admin_connect_kwargs())
+            try:
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            self._incr('admin_checkouts')
+            broken = False
+            try:
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            finally:
+                pool.putconn(conn, close=broken or bool(conn.closed))
+        finally:
+            self._admin_slots.release()
+
+    def snapshot(self):
+        with self._lock:
+            data = dict(self.metrics)
+        data['open_connections'] = len(self._open_aliases())
+        data['registered_aliases'] = sum(
+            1 for alias in settings.DATABASES if alias.startswith(TENANT_ALIAS_PREFIX)
+        )
+        data['max_open_connections'] = self.max_open_connections
+        return data
+
+
+tenant_connections = TenantConnectionManager()
+
+
+def track_tenant_connection(sender, connection, **kwargs):
+    """connection_created receiver feeding the tenant connection LRU."""
+    tenant_connections.on_connection_created(connection.alias)
+
+
+def get_tenant_connection_metrics():
+    """Hit/open/eviction counters for tenant connections (current process)."""
+    return tenant_connections.snapshot()
+
 
 def sanitize_database_name(company_name):
     """
@@ -53,24 +238,10 @@ def create_tenant_database(employer_profile):
             db_name = f"{original_db_name}_{counter}"
             counter += 1
         
-        # Get default database configuration
-        default_db = settings.DATABASES['default']
-        
-        # Connect to PostgreSQL to create new database
-        conn = psycopg2.connect(
-            dbname='postgres',  # Connect to default postgres database
-            user=default_db['USER'],
-            password=default_db['PASSWORD'],
-            host=default_db['HOST'],
-            port=default_db['PORT']
-        )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cursor = conn.cursor()
-        
-        # Create the database
-        cursor.execute(f'CREATE DATABASE {db_name}')
-        cursor.close()
-        conn.close()
+        # Create the database through a pooled admin connection
+        with tenant_connections.admin_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f'CREATE DATABASE {db_name}')
         
         logger.info(f"Successfully created database: {db_name}")
         
@@ -104,27 +275,13 @@ def database_exists(db_name):
     Check if a database exists in PostgreSQL
     """
     try:
-        default_db = settings.DATABASES['default']
-        conn = psycopg2.connect(
-            dbname='postgres',
-            user=default_db['USER'],
-            password=default_db['PASSWORD'],
-            host=default_db['HOST'],
-            port=default_db['PORT']
-        )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT 1 FROM pg_database WHERE datname = %s",
-            (db_name,)
-        )
-        exists = cursor.fetchone() is not None
-        
-        cursor.close()
-        conn.close()
-        
-        return exists
+        with tenant_connections.admin_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM pg_database WHERE datname = %s",
+                    (db_name,)
+                )
+                return cursor.fetchone() is not None
         
     except Exception as e:
         logger.error(f"Error checking database existence: {str(e)}")
@@ -135,19 +292,12 @@ def add_tenant_database_to_settings(db_name, employer_id):
     """
     Dynamically add tenant database configuration to Django settings
     """
-    alias = f"tenant_{employer_id}"
-    default_db = settings.DATABASES['default']
-    
-    # Create a copy of the default database configuration
-    tenant_db_config = default_db.copy()
-    
-    # Override the NAME with the tenant database name
-    tenant_db_config['NAME'] = db_name
-    
-    settings.DATABASES[alias] = tenant_db_config
-    
-    # Ensure the connection is available
-    connections.databases[alias] = settings.DATABASES[alias]
+    alias = f"{TENANT_ALIAS_PREFIX}{employer_id}"
+    if alias in settings.DATABASES:
+        # Re-point an existing alias (e.g. recreated database) at the new name
+        connections[alias].close()
+        del settings.DATABASES[alias]
+    tenant_connections.register(alias, db_name)
     
     logger.info(f"Added database configuration for alias: {alias}")
 
@@ -186,10 +336,7 @@ def get_tenant_database_alias(employer_profile):
     Returns 'default' if no tenant database exists
     """
     if employer_profile and employer_profile.database_name:
-        alias = f"tenant_{employer_profile.id}"
-        if alias not in settings.DATABASES:
-            ensure_tenant_database_loaded(employer_profile)
-        return alias
+        return ensure_tenant_database_loaded(employer_profile)
     return 'default'
 
 
@@ -203,31 +350,23 @@ def delete_tenant_database(employer_profile):
             return False, "No database to delete"
         
         db_name = employer_profile.database_name
-        default_db = settings.DATABASES['default']
-        
-        # Connect to PostgreSQL
-        conn = psycopg2.connect(
-            dbname='postgres',
-            user=default_db['USER'],
-            password=default_db['PASSWORD'],
-            host=default_db['HOST'],
-            port=default_db['PORT']
-        )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-        cursor = conn.cursor()
-        
-        # Terminate all connections to the database
-        cursor.execute(f"""
-            SELECT pg_terminate_backend(pg_stat_activity.pid)
-            FROM pg_stat_activity
-            WHERE pg_stat_activity.datname = '{db_name}'
-            AND pid <> pg_backend_pid()
-        """)
+        alias = f"{TENANT_ALIAS_PREFIX}{employer_profile.id}"
+        if alias in settings.DATABASES:
+            # Release our own persistent connection before dropping
+            connections[alias].close()
         
-        # Drop the database
-        cursor.execute(f'DROP DATABASE IF EXISTS {db_name}')
-        cursor.close()
-        conn.close()
+        with tenant_connections.admin_connection() as conn:
+            with conn.cursor() as cursor:
+                # Terminate all connections to the database
+                cursor.execute(f"""
+                    SELECT pg_terminate_backend(pg_stat_activity.pid)
+                    FROM pg_stat_activity
+                    WHERE pg_stat_activity.datname = '{db_name}'
+                    AND pid <> pg_backend_pid()
+                """)
+                
+                # Drop the database
+                cursor.execute(f'DROP DATABASE IF EXISTS {db_name}')
         
         # Update employer profile
         employer_profile.database_name = None
@@ -261,21 +400,13 @@ def load_all_tenant_databases():
         )
         
         loaded_count = 0
-        for employer in employer_profiles:
-            alias = f"tenant_{employer.id}"
+        for employer in employer_profiles.only('id', 'database_name'):
+            alias = f"{TENANT_ALIAS_PREFIX}{employer.id}"
             
-            # Skip if already loaded
-            if alias in settings.DATABASES:
+            # Registration is lazy: connections are opened on first query
+            if not tenant_connections.register(alias, employer.database_name):
                 continue
             
-            # Add to settings
-            default_db = settings.DATABASES['default']
-            tenant_db_config = default_db.copy()
-            tenant_db_config['NAME'] = employer.database_name
-            
-            settings.DATABASES[alias] = tenant_db_config
-            connections.databases[alias] = settings.DATABASES[alias]
-            
             loaded_count += 1
             logger.info(f"Loaded tenant database: {alias} ({employer.database_name})")
         
@@ -295,23 +426,57 @@ def ensure_tenant_database_loaded(employer_profile):
     if not employer_profile or not employer_profile.database_name:
         return 'default'
     
-    alias = f"tenant_{employer_profile.id}"
+    alias = f"{TENANT_ALIAS_PREFIX}{employer_profile.id}"
     
-    # Check if already loaded
-    if alias not in settings.DATABASES:
-        # Load it now
-        default_db = settings.DATABASES['default']
-        tenant_db_config = default_db.copy()
-        tenant_db_config['NAME'] = employer_profile.database_name
-        
-        settings.DATABASES[alias] = tenant_db_config
-        connections.databases[alias] = settings.DATABASES[alias]
-        
+    # Register lazily (counts as a hit when already loaded)
+    if tenant_connections.register(alias, employer_profile.database_name):
         logger.info(f"Dynamically loaded tenant database: {alias} ({employer_profile.database_name})")
     
     return alias
 
 
+def resolve_indexed_tenant_alias(tenant_db, employer_id):
+    """
+    Return a usable alias for a central-index row (``tenant_db``, ``employer_id``),
+    loading the employer's tenant database when it is not registered yet.
+    """
+    if not tenant_db:
+        return None
+    if tenant_db in settings.DATABASES:
+        return tenant_db
+    from accounts.models import EmployerProfile  # Imported locally to avoid circular imports
+
+    employer = EmployerProfile.objects.filter(id=employer_id).first()
+    if not employer:
+        return None
+    return ensure_tenant_database_loaded(employer)
+
+
+def scan_tenant_databases(tables, probe):
+    """
+    Legacy fallback for central indexes: call ``probe(alias, table_names)`` on
+    every loaded tenant database (then ``default``) holding any of ``tables``
+    and return the first non-None result. Indexes are backfilled by their
+    migrations, so the scan only runs when TENANT_INDEX_SCAN_FALLBACK is on.
+    """
+    if not getattr(settings, 'TENANT_INDEX_SCAN_FALLBACK', False):
+        return None
+    aliases = [alias for alias in settings.DATABASES.keys() if alias.startswith(TENANT_ALIAS_PREFIX)]
+    if "default" in settings.DATABASES:
+        aliases.append("default")
+    for alias in aliases:
+        try:
+            table_names = set(connections[alias].introspection.table_names())
+            if not table_names.intersection(tables):
+                continue
+            result = probe(alias, table_names)
+        except Exception:
+            continue
+        if result is not None:
+            return result
+    return None
+
+
 def get_employee_tenant_db_from_membership(request, require_context=None):
     """
     Resolve tenant database alias for an authenticated employee based on membership.
@@ -321,7 +486,8 @@ def get_employee_tenant_db_from_membership(request, require_context=None):
     2) last_active_employer_id stored on the user (if present)
     3) Legacy fallback to request.user.employee_profile when feature flag is disabled
     """
-    from accounts.models import EmployeeMembership, EmployerProfile  # Imported locally to avoid circular imports
+    from accounts.membership_cache import get_active_membership_snapshot, get_cached_employer, get_membership_snapshot
+    from accounts.models import EmployeeMembership  # Imported locally to avoid circular imports
     from rest_framework.exceptions import PermissionDenied, ParseError
 
     user = getattr(request, 'user', None)
@@ -350,21 +516,18 @@ def get_employee_tenant_db_from_membership(request, require_context=None):
     employer_profile = None
 
     if employer_id is not None:
-        membership = EmployeeMembership.objects.filter(
-            user_id=user.id,
-            employer_profile_id=employer_id,
-        ).select_related('employer_profile').first()
+        membership = get_membership_snapshot(user.id, employer_id, request=request)
         if not membership:
             # Legacy/single-employer fallback when membership rows are absent.
             employee = getattr(user, 'employee_profile', None)
             if employee and getattr(employee, 'employer_id', None) == employer_id:
-                employer_profile = EmployerProfile.objects.filter(id=employer_id).first()
+                employer_profile = get_cached_employer(employer_id, request=request)
             else:
                 raise PermissionDenied("You do not have access to the requested employer.")
         else:
-            if membership.status != EmployeeMembership.STATUS_ACTIVE:
+            if membership['status'] != EmployeeMembership.STATUS_ACTIVE:
                 raise PermissionDenied("Your membership with this employer is not active.")
-            employer_profile = membership.employer_profile
+            employer_profile = get_cached_employer(employer_id, request=request)
     else:
         # Allow implicit resolution only when the feature flag is disabled
         if require_context:
@@ -372,23 +535,19 @@ def get_employee_tenant_db_from_membership(request, require_context=None):
 
         # Prefer the last_active_employer_id marker if we have it
         if getattr(user, 'last_active_employer_id', None):
-            membership = EmployeeMembership.objects.filter(
-                user_id=user.id,
-                employer_profile_id=user.last_active_employer_id,
-                status=EmployeeMembership.STATUS_ACTIVE,
-            ).select_related('employer_profile').first()
+            membership = get_active_membership_snapshot(
+                user.id, user.last_active_employer_id, request=request
+            )
             if membership:
-                employer_profile = membership.employer_profile
+                employer_profile = get_cached_employer(user.last_active_employer_id, request=request)
 
         # Legacy fallback to old single-employer resolution
         if not employer_profile:
             employee = getattr(user, 'employee_profile', None)
             if employee and getattr(employee, 'employer_id', None):
-                employer_profile = EmployerProfile.objects.filter(id=employee.employer_id).first()
+                employer_profile = get_cached_employer(employee.employer_id, request=request)
 
     if not employer_profile:
         return None
 
-    alias = get_tenant_database_alias(employer_profile)
-    ensure_tenant_database_loaded(employer_profile)
-    return alias
+    return ensure_tenant_database_loaded(employer_profile)
@@ -0,0 +1,106 @@
+"""
+Cached membership / employer resolution shared by the tenant middleware and RBAC.
+
+Lookups are cached per (user_id, employer_id) in the Django cache and memoized
+on the request, so a request resolves each membership at most once. Entries are
+dropped by the EmployeeMembership / EmployerProfile signals in accounts.signals.
+"""
+from django.core.cache import cache
+
+MEMBERSHIP_CACHE_TTL_SECONDS = 300
+EMPLOYER_CACHE_TTL_SECONDS = 300
+
+
+def _membership_cache_key(user_id, employer_id):
+    return f"accounts:membership:{user_id}:{employer_id}"
+
+
+def _employer_cache_key(employer_id):
+    return f"accounts:employer:{employer_id}"
+
+
+def _request_memo(request):
+    """Per-request dict stored on the underlying HttpRequest (shared with DRF)."""
+    if request is None:
+        return None
+    base = getattr(request, "_request", request)
+    memo = getattr(base, "_membership_memo", None)
+    if memo is None:
+        memo = {}
+        try:
+            base._membership_memo = memo
+        except AttributeError:
+            return None
+    return memo
+
+
+def get_membership_snapshot(user_id, employer_id, request=None):
+    """
+    Return {'status': ..., 'tenant_employee_id': ...} for the user's membership
+    with the employer, or None when no membership row exists.
+    """
+    from accounts.models import EmployeeMembership
+
+    if not user_id or not employer_id:
+        return None
+    memo = _request_memo(request)
+    memo_key = ("membership", user_id, employer_id)
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    cache_key = _membership_cache_key(user_id, employer_id)
+    data = cache.get(cache_key)
+    if data is None:
+        data = (
+            EmployeeMembership.objects.using("default")
+            .filter(user_id=user_id, employer_profile_id=employer_id)
+            .values("status", "tenant_employee_id")
+            .first()
+        ) or {}
+        cache.set(cache_key, data, MEMBERSHIP_CACHE_TTL_SECONDS)
+
+    snapshot = data or None
+    if memo is not None:
+        memo[memo_key] = snapshot
+    return snapshot
+
+
+def get_active_membership_snapshot(user_id, employer_id, request=None):
+    """Same as get_membership_snapshot, but only for ACTIVE memberships."""
+    from accounts.models import EmployeeMembership
+
+    snapshot = get_membership_snapshot(user_id, employer_id, request=request)
+    if snapshot and snapshot.get("status") == EmployeeMembership.STATUS_ACTIVE:
+        return snapshot
+    return None
+
+
+def get_cached_employer(employer_id, request=None):
+    """Return the EmployerProfile for employer_id (or None), cached."""
+    from accounts.models import EmployerProfile
+
+    if not employer_id:
+        return None
+    memo = _request_memo(request)
+    memo_key = ("employer", employer_id)
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    cache_key = _employer_cache_key(employer_id)
+    employer = cache.get(cache_key)
+    if employer is None:
+        employer = EmployerProfile.objects.using("default").filter(id=employer_id).first() or False
+        cache.set(cache_key, employer, EMPLOYER_CACHE_TTL_SECONDS)
+
+    employer = employer or None
+    if memo is not None:
+        memo[memo_key] = employer
+    return employer
+
+
+def invalidate_membership_cache(user_id, employer_id):
+    cache.delete(_membership_cache_key(user_id, employer_id))
+
+
+def invalidate_employer_cache(employer_id):
+    cache.delete(_employer_cache_key(employer_id))
@@ -1,34 +1,21 @@
 """
 Middleware for multi-tenant database routing
 """
-from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from rest_framework.exceptions import ParseError, PermissionDenied
 from accounts.database_utils import (
     ensure_tenant_database_loaded,
     get_employee_tenant_db_from_membership,
 )
-import threading
-
-# Thread-local storage for tenant context
-_thread_locals = threading.local()
-
-
-def get_current_tenant_db():
-    """Get the current tenant database from thread-local storage"""
-    return getattr(_thread_locals, 'tenant_db', 'default')
-
-
-def set_current_tenant_db(db_alias):
-    """Set the current tenant database in thread-local storage"""
-    _thread_locals.tenant_db = db_alias
-    settings.CURRENT_TENANT_DB = db_alias
-
-
-def clear_current_tenant_db():
-    """Clear the tenant database context"""
-    _thread_locals.tenant_db = 'default'
-    settings.CURRENT_TENANT_DB = None
+# Tenant context lives in a ContextVar (safe for threaded and ASGI workers);
+# re-exported here for existing imports.
+from accounts.tenant_context import (  # noqa: F401
+    clear_current_tenant_db,
+    get_current_tenant_db,
+    get_tenant_db_context,
+    set_current_tenant_db,
+    tenant_db_context,
+)
 
 
 class TenantDatabaseMiddleware(MiddlewareMixin):
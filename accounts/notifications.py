@@ -3,6 +3,9 @@ from django.utils import timezone
 from notifications.models import Notification  # noqa: F401
 from accounts.models import EmployerProfile, User  # noqa: F401
 
+NOTIFICATION_BULK_BATCH_SIZE = 500
+
+
 def create_notification(user, title, body='', *, type='INFO', data=None, employer_profile=None):
     """
     Helper to emit a notification to a user.
@@ -20,3 +23,60 @@ def create_notification(user, title, body='', *, type='INFO', data=None, employe
         data=data or {},
         created_at=timezone.now(),
     )
+
+
+def create_notifications_bulk(
+    entries,
+    *,
+    employer_profile=None,
+    batch_size=NOTIFICATION_BULK_BATCH_SIZE,
+    ignore_conflicts=False,
+):
+    """
+    Emit many notifications with one user lookup and chunked bulk inserts.
+
+    `entries` is an iterable of (user_id, payload) pairs where payload accepts
+    title, body, type, data and optionally employer_profile / dedup_key.
+    Unknown or inactive users are skipped. Returns the Notification objects
+    that were inserted (all of them, even when ignore_conflicts drops dupes).
+    """
+    from notifications.services import touch_notification_feeds
+
+    entries = [(user_id, payload) for user_id, payload in entries if user_id]
+    if not entries:
+        return []
+
+    active_user_ids = set(
+        User.objects.filter(
+            id__in={user_id for user_id, _ in entries},
+            is_active=True,
+        ).values_list('id', flat=True)
+    )
+
+    now = timezone.now()
+    notifications = [
+        Notification(
+            user_id=user_id,
+            employer_profile=payload.get('employer_profile', employer_profile),
+            title=payload['title'],
+            body=payload.get('body') or '',
+            type=payload.get('type') or Notification.TYPE_INFO,
+            status=Notification.STATUS_UNREAD,
+            data=payload.get('data') or {},
+            dedup_key=payload.get('dedup_key'),
+            created_at=now,
+        )
+        for user_id, payload in entries
+        if user_id in active_user_ids
+    ]
+    if not notifications:
+        return []
+
+    Notification.objects.bulk_create(
+        notifications,
+        batch_size=batch_size,
+        ignore_conflicts=ignore_conflicts,
+    )
+    # bulk_create skips post_save, so refresh feed versions explicitly.
+    touch_notification_feeds({notification.user_id for notification in notifications})
+    return notifications
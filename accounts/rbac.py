@@ -1,16 +1,23 @@
 """RBAC helpers for employer delegate access and scoped permissions."""
+from django.core.cache import cache
 from django.db.models import Q
 from rest_framework.exceptions import PermissionDenied
 
+from accounts.cache_versions import bump_cache_version, get_cache_version
+from accounts.membership_cache import (
+    get_active_membership_snapshot,
+    get_cached_employer,
+    get_membership_snapshot,
+)
 from accounts.models import (
-    EmployerProfile,
-    EmployeeMembership,
     EmployeeRole,
     Permission,
     RolePermission,
     UserPermissionOverride,
 )
 
+RBAC_CACHE_TTL_SECONDS = 600
+
 
 def _get_employer_id_from_request(request):
     header_value = None
@@ -43,7 +50,7 @@ def get_active_employer(request, require_context=False):
     # Admins may access any employer by header
     employer_id = _get_employer_id_from_request(request)
     if (user.is_admin or user.is_staff or user.is_superuser) and employer_id:
-        employer = EmployerProfile.objects.filter(id=employer_id).first()
+        employer = get_cached_employer(employer_id, request=request)
         if employer:
             return employer
 
@@ -54,42 +61,27 @@ def get_active_employer(request, require_context=False):
             raise PermissionDenied("Employer context required.")
         return None
 
-    membership = (
-        EmployeeMembership.objects.filter(
-            user_id=user.id,
-            employer_profile_id=employer_id,
-            status=EmployeeMembership.STATUS_ACTIVE,
-        )
-        .select_related("employer_profile")
-        .first()
-    )
-    if not membership:
+    membership = get_active_membership_snapshot(user.id, employer_id, request=request)
+    employer = get_cached_employer(employer_id, request=request) if membership else None
+    if not employer:
         # Legacy/single-employer fallback: allow employee profile employer context
         # when membership rows are not yet present.
         employee = getattr(user, "employee_profile", None)
         if employee and getattr(employee, "employer_id", None) == employer_id:
-            employer = EmployerProfile.objects.filter(id=employer_id).first()
+            employer = get_cached_employer(employer_id, request=request)
             if employer:
                 return employer
         raise PermissionDenied("You do not have access to the requested employer.")
-    return membership.employer_profile
+    return employer
 
 
 def _get_membership_employee_id(user, employer_id):
     if not user or not user.is_authenticated:
         return None
-    membership = (
-        EmployeeMembership.objects.filter(
-            user_id=user.id,
-            employer_profile_id=employer_id,
-            status=EmployeeMembership.STATUS_ACTIVE,
-        )
-        .only("tenant_employee_id")
-        .first()
-    )
-    if not membership or not membership.tenant_employee_id:
+    membership = get_active_membership_snapshot(user.id, employer_id)
+    if not membership or not membership.get("tenant_employee_id"):
         return None
-    return str(membership.tenant_employee_id)
+    return str(membership["tenant_employee_id"])
 
 
 def _get_employee_role_queryset(user, employer_id):
@@ -107,58 +99,93 @@ def get_employee_roles_for_user(user, employer_id):
     return _get_employee_role_queryset(user, employer_id)
 
 
-def is_delegate_user(user, employer_id):
-    if not user or not user.is_authenticated:
-        return False
-    if getattr(user, "employer_profile", None):
-        return False
-    if not getattr(user, "is_employee", False):
-        return False
-    return _get_employee_role_queryset(user, employer_id).exists()
+def _empty_scope():
+    return {
+        "company": False,
+        "branch_ids": set(),
+        "department_ids": set(),
+        "self_employee_ids": set(),
+    }
 
 
-def get_effective_permissions(user, employer_id):
-    """Return queryset of effective permissions for user within employer."""
-    if not user or not user.is_authenticated:
-        return Permission.objects.none()
+def _rbac_version_key(employer_id):
+    return f"rbac:version:{employer_id or 'global'}"
+
+
+def _get_rbac_version(employer_id):
+    return get_cache_version(_rbac_version_key(employer_id))
 
-    if user.is_superuser or user.is_admin:
-        return Permission.objects.filter(is_active=True)
 
-    if getattr(user, "employer_profile", None) and user.employer_profile.id == employer_id:
-        return Permission.objects.filter(is_active=True)
+def bump_rbac_version(employer_id=None):
+    """
+    Invalidate compiled permission sets for an employer (or for every employer
+    when employer_id is None, e.g. a Permission row changed).
+    """
+    bump_cache_version(_rbac_version_key(employer_id))
 
-    roles = (
-        _get_employee_role_queryset(user, employer_id)
-        .filter(role__is_active=True)
-        .values_list("role_id", flat=True)
+
+def _compiled_permissions_key(user_id, employer_id):
+    return (
+        f"rbac:perms:{user_id}:{employer_id}:"
+        f"{_get_rbac_version(None)}:{_get_rbac_version(employer_id)}"
     )
 
-    base_perms = Permission.objects.none()
-    if roles:
-        base_perms = Permission.objects.filter(
-            is_active=True,
-            role_permissions__role_id__in=roles,
-        ).distinct()
+
+def invalidate_compiled_permissions(user_id, employer_id):
+    """Drop one user's compiled permission set (membership status changed)."""
+    cache.delete(_compiled_permissions_key(user_id, employer_id))
+
+
+def _compile_permissions(user, employer_id):
+    """Resolve effective codes, delegate flag and role scope in one pass."""
+    scope = _empty_scope()
+    is_owner = bool(getattr(user, "employer_profile", None)) and user.employer_profile.id == employer_id
+    if user.is_superuser or user.is_admin or is_owner:
+        codes = Permission.objects.filter(is_active=True).values_list("code", flat=True)
+        return {"codes": frozenset(codes), "is_delegate": False, "scope": scope}
+
+    employee_roles = list(
+        _get_employee_role_queryset(user, employer_id).select_related("role")
+    )
+    for employee_role in employee_roles:
+        if employee_role.scope_type == EmployeeRole.SCOPE_COMPANY:
+            scope["company"] = True
+        elif employee_role.scope_type == EmployeeRole.SCOPE_BRANCH:
+            if employee_role.scope_id:
+                scope["branch_ids"].add(str(employee_role.scope_id))
+        elif employee_role.scope_type == EmployeeRole.SCOPE_DEPARTMENT:
+            if employee_role.scope_id:
+                scope["department_ids"].add(str(employee_role.scope_id))
+        elif employee_role.scope_type == EmployeeRole.SCOPE_SELF:
+            membership = get_membership_snapshot(user.id, employer_id)
+            if membership and membership.get("tenant_employee_id"):
+                scope["self_employee_ids"].add(str(membership["tenant_employee_id"]))
+
+    role_ids = {
+        employee_role.role_id
+        for employee_role in employee_roles
+        if employee_role.role.is_active
+    }
+    base_codes = set()
+    if role_ids:
+        base_codes = set(
+            Permission.objects.filter(
+                is_active=True,
+                role_permissions__role_id__in=role_ids,
+            ).values_list("code", flat=True)
+        )
 
     overrides = UserPermissionOverride.objects.filter(
         employer_id=employer_id,
         user_id=user.id,
-    ).select_related("permission")
-
-    base_codes = {perm.code for perm in base_perms}
-    allow_codes = {o.permission.code for o in overrides if o.effect == UserPermissionOverride.EFFECT_ALLOW}
-    deny_codes = {o.permission.code for o in overrides if o.effect == UserPermissionOverride.EFFECT_DENY}
+    ).values_list("effect", "permission__code")
+    allow_codes = {code for effect, code in overrides if effect == UserPermissionOverride.EFFECT_ALLOW}
+    deny_codes = {code for effect, code in overrides if effect == UserPermissionOverride.EFFECT_DENY}
 
     effective_codes = (base_codes | allow_codes) - deny_codes
 
     if employer_id and not getattr(user, "employer_profile", None):
-        has_membership = EmployeeMembership.objects.filter(
-            user_id=user.id,
-            employer_profile_id=employer_id,
-            status=EmployeeMembership.STATUS_ACTIVE,
-        ).exists()
-        if has_membership:
+        if get_active_membership_snapshot(user.id, employer_id):
             effective_codes |= {
                 "employees.employee.view",
                 "employees.branch.view",
@@ -166,14 +193,57 @@ def get_effective_permissions(user, employer_id):
                 "contracts.salary_scale.view",
             }
 
-    if not effective_codes:
-        return Permission.objects.none()
+    if effective_codes:
+        effective_codes = set(
+            Permission.objects.filter(code__in=effective_codes, is_active=True).values_list("code", flat=True)
+        )
+
+    is_delegate = (
+        bool(employee_roles)
+        and not getattr(user, "employer_profile", None)
+        and bool(getattr(user, "is_employee", False))
+    )
+    return {"codes": frozenset(effective_codes), "is_delegate": is_delegate, "scope": scope}
+
+
+def get_compiled_permissions(user, employer_id):
+    """
+    Cached {'codes': frozenset, 'is_delegate': bool, 'scope': dict} for the user
+    within the employer. Entries are keyed on the employer's RBAC version, which
+    accounts.signals bumps whenever roles, role permissions, role assignments or
+    overrides change.
+    """
+    if not user or not user.is_authenticated:
+        return {"codes": frozenset(), "is_delegate": False, "scope": _empty_scope()}
 
-    return Permission.objects.filter(code__in=effective_codes, is_active=True)
+    key = _compiled_permissions_key(user.id, employer_id)
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = _compile_permissions(user, employer_id)
+        cache.set(key, compiled, RBAC_CACHE_TTL_SECONDS)
+    return compiled
+
+
+def is_delegate_user(user, employer_id):
+    if not user or not user.is_authenticated:
+        return False
+    if getattr(user, "employer_profile", None):
+        return False
+    if not getattr(user, "is_employee", False):
+        return False
+    return get_compiled_permissions(user, employer_id)["is_delegate"]
+
+
+def get_effective_permissions(user, employer_id):
+    """Return queryset of effective permissions for user within employer."""
+    codes = get_compiled_permissions(user, employer_id)["codes"]
+    if not codes:
+        return Permission.objects.none()
+    return Permission.objects.filter(code__in=codes, is_active=True)
 
 
 def get_effective_permission_codes(user, employer_id):
-    return list(get_effective_permissions(user, employer_id).values_list("code", flat=True))
+    return list(get_compiled_permissions(user, employer_id)["codes"])
 
 
 def user_has_permission(user, employer_id, required):
@@ -184,43 +254,19 @@ def user_has_permission(user, employer_id, required):
     else:
         required_codes = set(required)
 
-    effective_codes = set(get_effective_permission_codes(user, employer_id))
-    return bool(required_codes & effective_codes)
+    effective_codes = get_compiled_permissions(user, employer_id)["codes"]
+    return not effective_codes.isdisjoint(required_codes)
 
 
 def get_delegate_scope(user, employer_id):
     """Aggregate scope from assigned roles for branch/department filtering."""
-    scope = {
-        "company": False,
-        "branch_ids": set(),
-        "department_ids": set(),
-        "self_employee_ids": set(),
+    scope = get_compiled_permissions(user, employer_id)["scope"]
+    return {
+        "company": scope["company"],
+        "branch_ids": set(scope["branch_ids"]),
+        "department_ids": set(scope["department_ids"]),
+        "self_employee_ids": set(scope["self_employee_ids"]),
     }
-    if not user or not user.is_authenticated:
-        return scope
-
-    roles = _get_employee_role_queryset(user, employer_id)
-    if not roles.exists():
-        return scope
-
-    for role in roles:
-        if role.scope_type == EmployeeRole.SCOPE_COMPANY:
-            scope["company"] = True
-        elif role.scope_type == EmployeeRole.SCOPE_BRANCH:
-            if role.scope_id:
-                scope["branch_ids"].add(str(role.scope_id))
-        elif role.scope_type == EmployeeRole.SCOPE_DEPARTMENT:
-            if role.scope_id:
-                scope["department_ids"].add(str(role.scope_id))
-        elif role.scope_type == EmployeeRole.SCOPE_SELF:
-            membership = EmployeeMembership.objects.filter(
-                user_id=user.id,
-                employer_profile_id=employer_id,
-            ).first()
-            if membership and membership.tenant_employee_id:
-                scope["self_employee_ids"].add(str(membership.tenant_employee_id))
-
-    return scope
 
 
 def apply_scope_filter(
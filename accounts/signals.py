@@ -0,0 +1,52 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.membership_cache import invalidate_employer_cache, invalidate_membership_cache
+from accounts.models import (
+    EmployeeMembership,
+    EmployeeRole,
+    EmployerProfile,
+    Permission,
+    Role,
+    RolePermission,
+    UserPermissionOverride,
+)
+from accounts.rbac import bump_rbac_version, invalidate_compiled_permissions
+
+
+@receiver(post_save, sender=EmployeeMembership)
+@receiver(post_delete, sender=EmployeeMembership)
+def invalidate_membership(sender, instance: EmployeeMembership, **kwargs):
+    """Drop the cached membership so status changes apply on the next request."""
+    invalidate_membership_cache(instance.user_id, instance.employer_profile_id)
+    invalidate_compiled_permissions(instance.user_id, instance.employer_profile_id)
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=EmployeeRole)
+@receiver(post_delete, sender=EmployeeRole)
+@receiver(post_save, sender=UserPermissionOverride)
+@receiver(post_delete, sender=UserPermissionOverride)
+def bump_employer_rbac_version(sender, instance, **kwargs):
+    bump_rbac_version(instance.employer_id)
+
+
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def bump_role_permission_rbac_version(sender, instance: RolePermission, **kwargs):
+    # The role may already be gone when the delete cascades from Role.
+    employer_id = Role.objects.filter(id=instance.role_id).values_list("employer_id", flat=True).first()
+    bump_rbac_version(employer_id)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def bump_global_rbac_version(sender, instance: Permission, **kwargs):
+    bump_rbac_version(None)
+
+
+@receiver(post_save, sender=EmployerProfile)
+@receiver(post_delete, sender=EmployerProfile)
+def invalidate_employer(sender, instance: EmployerProfile, **kwargs):
+    invalidate_employer_cache(instance.id)
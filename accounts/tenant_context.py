@@ -0,0 +1,45 @@
+"""
+Request-scoped tenant database context.
+
+The active tenant alias lives in a ``ContextVar`` so each WSGI thread and each
+ASGI task sees its own value; nothing here touches ``django.conf.settings``.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_tenant_db = ContextVar('current_tenant_db', default=None)
+
+
+def get_tenant_db_context():
+    """Return the tenant alias bound to the current context, or None."""
+    return _current_tenant_db.get()
+
+
+def get_current_tenant_db():
+    """Get the current tenant database alias ('default' when unset)."""
+    return _current_tenant_db.get() or 'default'
+
+
+def set_current_tenant_db(db_alias):
+    """Bind a tenant database alias to the current context. Returns a reset token."""
+    return _current_tenant_db.set(db_alias)
+
+
+def reset_current_tenant_db(token):
+    """Restore the value that was active before ``set_current_tenant_db``."""
+    _current_tenant_db.reset(token)
+
+
+def clear_current_tenant_db():
+    """Clear the tenant database context"""
+    _current_tenant_db.set(None)
+
+
+@contextmanager
+def tenant_db_context(db_alias):
+    """Temporarily route unhinted queries to ``db_alias``."""
+    token = _current_tenant_db.set(db_alias)
+    try:
+        yield db_alias
+    finally:
+        _current_tenant_db.reset(token)
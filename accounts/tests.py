@@ -1,12 +1,26 @@
+import threading
 from datetime import date
 
+from django.core.cache import cache
 from django.db import IntegrityError
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from accounts.models import EmployerProfile, EmployeeMembership, User
+from accounts.database_router import TenantDatabaseRouter
+from accounts.membership_cache import get_active_membership_snapshot
+from accounts.models import (
+    EmployeeMembership,
+    EmployeeRole,
+    EmployerProfile,
+    Permission,
+    Role,
+    RolePermission,
+    User,
+)
+from accounts.rbac import _rbac_version_key, get_delegate_scope, is_delegate_user, user_has_permission
+from accounts.tenant_context import get_current_tenant_db, tenant_db_context
 from employees.models import Employee
 
 
@@ -55,6 +69,75 @@ class EmployeeMembershipModelTests(TestCase):
             )
 
 
+class MembershipCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='cache@example.com', password='pass', is_employee=True)
+        employer_user = User.objects.create_user(email='cache-employer@example.com', password='pass', is_employer=True)
+        self.employer_profile = create_employer_profile(employer_user, name_suffix="CACHE")
+        self.membership = EmployeeMembership.objects.create(
+            user=self.user,
+            employer_profile=self.employer_profile,
+            status=EmployeeMembership.STATUS_ACTIVE,
+        )
+
+    def test_status_change_invalidates_cached_membership(self):
+        self.assertIsNotNone(get_active_membership_snapshot(self.user.id, self.employer_profile.id))
+        with self.assertNumQueries(0):
+            get_active_membership_snapshot(self.user.id, self.employer_profile.id)
+
+        self.membership.status = EmployeeMembership.STATUS_TERMINATED
+        self.membership.save()
+
+        self.assertIsNone(get_active_membership_snapshot(self.user.id, self.employer_profile.id))
+
+
+class CompiledPermissionCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='rbac@example.com', password='pass', is_employee=True)
+        employer_user = User.objects.create_user(email='rbac-employer@example.com', password='pass', is_employer=True)
+        self.employer_profile = create_employer_profile(employer_user, name_suffix="RBAC")
+        self.permission = Permission.objects.create(
+            code='payroll.salary.view',
+            module='payroll',
+            resource='salary',
+            action='view',
+            scope='company',
+        )
+        self.role = Role.objects.create(employer=self.employer_profile, name='Payroll viewer')
+        self.role_permission = RolePermission.objects.create(role=self.role, permission=self.permission)
+        EmployeeRole.objects.create(
+            employer=self.employer_profile,
+            role=self.role,
+            user=self.user,
+            employee_id='emp-1',
+            scope_type=EmployeeRole.SCOPE_BRANCH,
+            scope_id='branch-1',
+        )
+
+    def test_role_permission_change_bumps_version(self):
+        employer_id = self.employer_profile.id
+        self.assertTrue(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+            self.assertTrue(is_delegate_user(self.user, employer_id))
+            self.assertEqual(get_delegate_scope(self.user, employer_id)['branch_ids'], {'branch-1'})
+
+        self.role_permission.delete()
+
+        self.assertFalse(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+
+    def test_revoke_survives_version_key_eviction(self):
+        employer_id = self.employer_profile.id
+        self.assertTrue(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+        self.role_permission.delete()
+        self.assertFalse(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+
+        # Cache culling drops the version key while compiled sets stay cached.
+        cache.delete(_rbac_version_key(employer_id))
+
+        self.assertFalse(user_has_permission(self.user, employer_id, 'payroll.salary.view'))
+
+
 class MembershipEndpointsTests(APITestCase):
     def setUp(self):
         self.employee_user = User.objects.create_user(email='emp@example.com', password='pass', is_employee=True)
@@ -112,3 +195,24 @@ class EmployeeMembershipSignalTests(TestCase):
         self.assertEqual(membership.tenant_employee_id, emp.id)
         self.assertEqual(membership.status, EmployeeMembership.STATUS_ACTIVE)
 
+
+
+class TenantContextTests(SimpleTestCase):
+    def test_router_reads_context_and_threads_are_isolated(self):
+        router = TenantDatabaseRouter()
+        seen = {}
+
+        def worker():
+            seen["thread"] = router.db_for_read(Employee)
+
+        with tenant_db_context("tenant_42"):
+            self.assertEqual(router.db_for_read(Employee), "tenant_42")
+            self.assertEqual(router.db_for_write(Employee), "tenant_42")
+            self.assertEqual(router.db_for_read(User), "default")
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(seen["thread"], "default")
+        self.assertEqual(get_current_tenant_db(), "default")
+        self.assertEqual(router.db_for_read(Employee), "default")
@@ -5,3 +5,7 @@ class AttendanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "attendance"
     verbose_name = "Attendance"
+
+    def ready(self):
+        # Import signals to ensure kiosk token index hooks are registered
+        from . import signals  # noqa: F401
@@ -0,0 +1,64 @@
+import sys
+from datetime import date
+
+from django.core.management import BaseCommand, CommandError
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from attendance.services import rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily attendance rollups read by attendance reports from the raw "
+        "attendance records of every tenant database (optionally for a date window)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the rebuild to a single employer.",
+        )
+        parser.add_argument("--date-from", dest="date_from", help="First check-in date to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--date-to", dest="date_to", help="Last check-in date to rebuild (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+        date_from = self._parse_date(options.get("date_from"), "--date-from")
+        date_to = self._parse_date(options.get("date_to"), "--date-to")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        written = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Rebuilding attendance rollups for {alias}...")
+            try:
+                written += rebuild_daily_rollups(alias, employer.id, date_from=date_from, date_to=date_to)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup row(s) across {total} tenant(s)."))
+
+    def _parse_date(self, value, option: str):
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError as exc:
+            raise CommandError(f"Invalid {option} date. Use YYYY-MM-DD.") from exc
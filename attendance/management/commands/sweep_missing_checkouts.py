@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from attendance.services import sweep_missing_checkouts
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag open attendance records past their missing-checkout deadline in every "
+        "tenant database. Attendance list endpoints no longer flag on read; schedule "
+        "this every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the sweep to a single employer.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        flagged = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Sweeping missing checkouts for {alias}...")
+            try:
+                flagged += sweep_missing_checkouts(alias, employer_id=employer.id)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Flagged {flagged} record(s) across {total} tenant(s)."))
@@ -0,0 +1,77 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from attendance.models import AttendanceConfiguration, AttendanceKioskStation, AttendanceKioskTokenIndex
+from attendance.services import register_kiosk_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the central kiosk token index from every tenant database so kiosk "
+        "scans resolve their tenant with a single indexed lookup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the sync to a single employer.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        registered = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Indexing kiosk tokens for {alias}...")
+            try:
+                registered += self._sync_alias(employer.id, alias)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {registered} kiosk token(s) across {total} tenant(s)."))
+
+    def _sync_alias(self, employer_id: int, alias: str) -> int:
+        count = 0
+        configs = AttendanceConfiguration.objects.using(alias).filter(employer_id=employer_id, is_enabled=True).exclude(
+            kiosk_access_token=""
+        )
+        for config in configs:
+            register_kiosk_token(
+                config.kiosk_access_token,
+                employer_id,
+                alias,
+                AttendanceKioskTokenIndex.KIND_CONFIGURATION,
+            )
+            count += 1
+        stations = AttendanceKioskStation.objects.using(alias).filter(employer_id=employer_id)
+        for station in stations:
+            register_kiosk_token(
+                station.kiosk_token,
+                employer_id,
+                alias,
+                AttendanceKioskTokenIndex.KIND_STATION,
+                station_id=station.id,
+            )
+            count += 1
+        return count
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0009_attendance_record_break_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceKioskTokenIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(choices=[('configuration', 'Configuration token'), ('station', 'Kiosk station token')], max_length=20)),
+                ('employer_id', models.IntegerField(db_index=True, help_text='Employer/company id from main database')),
+                ('tenant_db', models.CharField(help_text='Database alias holding the token owner', max_length=64)),
+                ('station_id', models.UUIDField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Attendance Kiosk Token Index',
+                'verbose_name_plural': 'Attendance Kiosk Token Index',
+                'db_table': 'attendance_kiosk_token_index',
+                'indexes': [models.Index(fields=['employer_id', 'kind'], name='attendance__employe_9fd60e_idx')],
+            },
+        ),
+    ]
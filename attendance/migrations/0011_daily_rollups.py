@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:40
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    """Summarize existing attendance records into one rollup row per employee and day."""
+    alias = schema_editor.connection.alias
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    AttendanceDailyRollup = apps.get_model('attendance', 'AttendanceDailyRollup')
+    rows = (
+        AttendanceRecord.objects.using(alias)
+        .order_by()
+        .annotate(day=TruncDate('check_in_at'))
+        .values('employer_id', 'employee_id', 'day')
+        .annotate(
+            records=Count('id'),
+            worked=Coalesce(Sum('worked_minutes'), Value(0)),
+            expected=Coalesce(Sum(Coalesce('expected_minutes', Value(0))), Value(0)),
+            balance=Coalesce(Sum(F('overtime_worked_minutes') - F('overtime_approved_minutes')), Value(0)),
+        )
+    )
+    AttendanceDailyRollup.objects.using(alias).bulk_create(
+        (
+            AttendanceDailyRollup(
+                id=uuid.uuid4(),
+                employer_id=row['employer_id'],
+                employee_id=row['employee_id'],
+                work_date=row['day'],
+                record_count=row['records'],
+                worked_minutes=row['worked'],
+                expected_minutes=row['expected'],
+                overtime_balance_minutes=row['balance'],
+            )
+            for row in rows.iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0010_kiosk_token_index'),
+        ('employees', '0008_employee_match_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('employer_id', models.IntegerField(db_index=True)),
+                ('work_date', models.DateField()),
+                ('record_count', models.IntegerField(default=0)),
+                ('worked_minutes', models.BigIntegerField(default=0)),
+                ('expected_minutes', models.BigIntegerField(default=0)),
+                ('overtime_balance_minutes', models.BigIntegerField(default=0, help_text='Sum of overtime worked minus overtime approved minutes.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_daily_rollups', to='employees.employee')),
+            ],
+            options={
+                'db_table': 'attendance_daily_rollups',
+                'indexes': [models.Index(fields=['employer_id', 'work_date'], name='attendance_rollup_emp_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'work_date'), name='uniq_attendance_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
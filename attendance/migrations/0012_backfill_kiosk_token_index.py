@@ -0,0 +1,25 @@
+import io
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def backfill_kiosk_token_index(apps, schema_editor):
+    """Index the kiosk tokens of every tenant (the index lives in the default database)."""
+    if schema_editor.connection.alias != 'default':
+        return
+    try:
+        call_command('sync_kiosk_token_index', stdout=io.StringIO(), stderr=io.StringIO())
+    except SystemExit:
+        print("\n  Some tenants could not be indexed; re-run `manage.py sync_kiosk_token_index`.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0011_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_kiosk_token_index, migrations.RunPython.noop),
+    ]
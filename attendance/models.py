@@ -226,6 +226,40 @@ class AttendanceKioskStation(models.Model):
         return f"{self.name} ({self.branch_id or 'no branch'})"
 
 
+class AttendanceKioskTokenIndex(models.Model):
+    """
+    Central kiosk token registry (default database).
+    Maps an opaque kiosk token to the tenant that owns it so kiosk scans
+    do not have to probe every tenant database.
+    """
+
+    KIND_CONFIGURATION = "configuration"
+    KIND_STATION = "station"
+    KIND_CHOICES = [
+        (KIND_CONFIGURATION, "Configuration token"),
+        (KIND_STATION, "Kiosk station token"),
+    ]
+
+    token = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    employer_id = models.IntegerField(db_index=True, help_text="Employer/company id from main database")
+    tenant_db = models.CharField(max_length=64, help_text="Database alias holding the token owner")
+    station_id = models.UUIDField(blank=True, null=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "attendance_kiosk_token_index"
+        verbose_name = "Attendance Kiosk Token Index"
+        verbose_name_plural = "Attendance Kiosk Token Index"
+        indexes = [
+            models.Index(fields=["employer_id", "kind"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} token for employer {self.employer_id} ({self.tenant_db})"
+
+
 class WorkingSchedule(models.Model):
     """
     Simplified working schedule (per employer).
@@ -435,3 +469,36 @@ class AttendanceRecord(models.Model):
 
     def __str__(self):
         return f"{self.employee_id} @ {self.check_in_at}"
+
+
+class AttendanceDailyRollup(models.Model):
+    """
+    Per-employee daily totals of attendance records (keyed by check-in date),
+    kept in sync by the AttendanceRecord save/delete signals so multi-month
+    reports aggregate one row per employee-day instead of raw punches.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employer_id = models.IntegerField(db_index=True)
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name="attendance_daily_rollups")
+    work_date = models.DateField()
+    record_count = models.IntegerField(default=0)
+    worked_minutes = models.BigIntegerField(default=0)
+    expected_minutes = models.BigIntegerField(default=0)
+    overtime_balance_minutes = models.BigIntegerField(
+        default=0,
+        help_text="Sum of overtime worked minus overtime approved minutes.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "attendance_daily_rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "work_date"], name="uniq_attendance_daily_rollup"),
+        ]
+        indexes = [
+            models.Index(fields=["employer_id", "work_date"], name="attendance_rollup_emp_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.employee_id} rollup for {self.work_date}"
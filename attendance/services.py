@@ -8,17 +8,23 @@ except ImportError:  # pragma: no cover
     ZoneInfo = None
 
 from django.conf import settings
-from django.db import connections, models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Concat, TruncDate, TruncMonth
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from accounts.cache_versions import bump_cache_version, get_cache_version
+from accounts.database_utils import resolve_indexed_tenant_alias, scan_tenant_databases
 from employees.models import Employee
 from timeoff.models import TimeOffRequest
 
 from .models import (
     AttendanceAllowedWifi,
     AttendanceConfiguration,
+    AttendanceDailyRollup,
     AttendanceKioskStation,
+    AttendanceKioskTokenIndex,
     AttendanceLocationSite,
     AttendanceRecord,
     WorkingSchedule,
@@ -56,6 +62,98 @@ def haversine_distance_meters(lat1: float, lon1: float, lat2: float, lon2: float
     return radius * c
 
 
+GEOFENCE_INDEX_CACHE_TTL_SECONDS = 300
+GEOFENCE_GRID_DEGREES = 0.05
+GEOFENCE_GRID_MAX_CELLS = 64
+EARTH_RADIUS_METERS = 6371000
+
+
+def _geofence_version_key(employer_id: int) -> str:
+    return f"attendance_geofence_version:{employer_id}"
+
+
+def get_geofence_version(employer_id: int) -> str:
+    return get_cache_version(_geofence_version_key(employer_id))
+
+
+def bump_geofence_version(employer_id: int) -> None:
+    """Invalidate the cached geofence index of an employer (sites or Wi-Fi changed)."""
+    if employer_id:
+        bump_cache_version(_geofence_version_key(employer_id))
+
+
+def _site_bounds(latitude: float, longitude: float, radius_meters: int) -> Tuple[float, float, float, float]:
+    """Smallest lat/lon box containing every point within ``radius_meters`` (haversine)."""
+    angular = radius_meters / EARTH_RADIUS_METERS
+    d_lat = math.degrees(angular)
+    cos_lat = math.cos(math.radians(latitude))
+    if math.sin(angular) >= cos_lat:
+        d_lon = 180.0
+    else:
+        d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat))
+    # Widen marginally so float rounding never rejects a point on the circle.
+    d_lat += 1e-9
+    d_lon += 1e-9
+    return latitude - d_lat, latitude + d_lat, longitude - d_lon, longitude + d_lon
+
+
+def _grid_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    return math.floor(latitude / GEOFENCE_GRID_DEGREES), math.floor(longitude / GEOFENCE_GRID_DEGREES)
+
+
+def build_geofence_index(employer_id: int, db_alias: str) -> dict:
+    """
+    Snapshot the active sites and Wi-Fi networks of an employer. Sites are
+    bucketed into a lat/lon grid by bounding box; sites too large for the grid
+    (or crossing the antimeridian) are kept in a list checked for every point.
+    """
+    sites = []
+    grid = {}
+    wide = []
+    site_qs = AttendanceLocationSite.objects.using(db_alias).filter(employer_id=employer_id, is_active=True).order_by("id")
+    for position, site in enumerate(site_qs):
+        latitude, longitude = float(site.latitude), float(site.longitude)
+        bounds = _site_bounds(latitude, longitude, site.radius_meters)
+        sites.append((site, latitude, longitude, site.radius_meters, bounds, str(site.branch_id) if site.branch_id else None))
+        min_row, min_col = _grid_cell(bounds[0], bounds[2])
+        max_row, max_col = _grid_cell(bounds[1], bounds[3])
+        cells = (max_row - min_row + 1) * (max_col - min_col + 1)
+        if cells > GEOFENCE_GRID_MAX_CELLS or bounds[2] < -180 or bounds[3] > 180:
+            wide.append(position)
+            continue
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                grid.setdefault((row, col), []).append(position)
+
+    wifi = [
+        (
+            network,
+            (network.ssid or "").upper(),
+            (network.bssid or "").upper(),
+            network.site_id,
+            str(network.branch_id) if network.branch_id else None,
+        )
+        for network in AttendanceAllowedWifi.objects.using(db_alias)
+        .filter(employer_id=employer_id, is_active=True)
+        .order_by("id")
+    ]
+    return {"sites": sites, "grid": grid, "wide": wide, "wifi": wifi}
+
+
+def get_geofence_index(employer_id: int, db_alias: str) -> dict:
+    """Return the cached geofence index, rebuilt when the employer's version changes."""
+    key = f"attendance_geofence_index:{db_alias}:{employer_id}:{get_geofence_version(employer_id)}"
+    index = cache.get(key)
+    if index is None:
+        index = build_geofence_index(employer_id, db_alias)
+        cache.set(key, index, timeout=GEOFENCE_INDEX_CACHE_TTL_SECONDS)
+    return index
+
+
+def _branch_allowed(branch_id: Optional[str], branch_ids: Optional[set]) -> bool:
+    return not branch_ids or branch_id is None or branch_id in branch_ids
+
+
 def find_matching_site(
     employer_id: int,
     latitude: float,
@@ -64,12 +162,18 @@ def find_matching_site(
     branch_ids: Optional[list] = None,
 ) -> Optional[AttendanceLocationSite]:
     """Return the first active site that matches provided coordinates within radius (optionally branch-scoped)."""
-    sites = AttendanceLocationSite.objects.using(db_alias).filter(employer_id=employer_id, is_active=True)
-    if branch_ids:
-        sites = sites.filter(models.Q(branch_id__in=branch_ids) | models.Q(branch__isnull=True))
-    for site in sites:
-        distance = haversine_distance_meters(float(latitude), float(longitude), float(site.latitude), float(site.longitude))
-        if distance <= site.radius_meters:
+    index = get_geofence_index(employer_id, db_alias)
+    latitude, longitude = float(latitude), float(longitude)
+    allowed_branches = {str(branch_id) for branch_id in branch_ids} if branch_ids else None
+    candidates = sorted(set(index["grid"].get(_grid_cell(latitude, longitude), ())).union(index["wide"]))
+    for position in candidates:
+        site, site_latitude, site_longitude, radius_meters, bounds, branch_id = index["sites"][position]
+        if not _branch_allowed(branch_id, allowed_branches):
+            continue
+        min_lat, max_lat, min_lon, max_lon = bounds
+        if not (min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon):
+            continue
+        if haversine_distance_meters(latitude, longitude, site_latitude, site_longitude) <= radius_meters:
             return site
     return None
 
@@ -85,20 +189,23 @@ def find_matching_wifi(
     """Return matching Wi-Fi entry based on SSID/BSSID and optional site."""
     if not ssid:
         return None
-    qs = AttendanceAllowedWifi.objects.using(db_alias).filter(
-        employer_id=employer_id,
-        is_active=True,
-    )
-    if branch_ids:
-        qs = qs.filter(models.Q(branch_id__in=branch_ids) | models.Q(branch__isnull=True))
-    if site:
-        qs = qs.filter(models.Q(site=site) | models.Q(site__isnull=True))
+    allowed_branches = {str(branch_id) for branch_id in branch_ids} if branch_ids else None
+    candidates = [
+        entry
+        for entry in get_geofence_index(employer_id, db_alias)["wifi"]
+        if _branch_allowed(entry[4], allowed_branches) and (site is None or entry[3] in (None, site.id))
+    ]
     if bssid:
-        match = qs.filter(bssid__iexact=bssid).first()
-        if match:
-            return match
+        wanted_bssid = bssid.upper()
+        for network, _ssid, network_bssid, _site_id, _branch_id in candidates:
+            if network_bssid and network_bssid == wanted_bssid:
+                return network
     # Fallback to SSID match to allow multi-AP networks when BSSID differs.
-    return qs.filter(ssid__iexact=ssid).first()
+    wanted_ssid = ssid.upper()
+    for network, network_ssid, _bssid, _site_id, _branch_id in candidates:
+        if network_ssid == wanted_ssid:
+            return network
+    return None
 
 
 def ensure_attendance_configuration(employer_id: int, db_alias: str) -> AttendanceConfiguration:
@@ -136,22 +243,168 @@ def _normalize_timezone_name(tz: Optional[tzinfo]) -> Optional[str]:
     return key or str(tz)
 
 
+ATTENDANCE_CONFIG_CACHE_TTL_SECONDS = 300
+ATTENDANCE_SCHEDULE_CACHE_TTL_SECONDS = 60 * 60
+ATTENDANCE_DAY_CONTEXT_CACHE_TTL_SECONDS = 60 * 60 * 24
+LEAVE_BLOCKING_STATUSES = ("SUBMITTED", "PENDING", "APPROVED")
+
+
+def _config_version_key(employer_id: int) -> str:
+    return f"attendance_config_version:{employer_id}"
+
+
+def _schedule_version_key(employer_id: int) -> str:
+    return f"attendance_schedule_version:{employer_id}"
+
+
+def _leave_version_key(employee_id) -> str:
+    return f"attendance_leave_version:{employee_id}"
+
+
+def bump_attendance_configuration_version(employer_id: int) -> None:
+    if employer_id:
+        bump_cache_version(_config_version_key(employer_id))
+
+
+def bump_schedule_version(employer_id: int) -> None:
+    """Invalidate cached schedules and day contexts of an employer (schedule or day rule changed)."""
+    if employer_id:
+        bump_cache_version(_schedule_version_key(employer_id))
+
+
+def bump_leave_version(employee_id) -> None:
+    """Invalidate cached day contexts of an employee (time-off request created or transitioned)."""
+    if employee_id:
+        bump_cache_version(_leave_version_key(employee_id))
+
+
+def get_cached_attendance_configuration(employer_id: int, db_alias: str) -> AttendanceConfiguration:
+    """``ensure_attendance_configuration`` for read-only hot paths (check-in/out), served from cache."""
+    key = f"attendance_config:{db_alias}:{employer_id}:{get_cache_version(_config_version_key(employer_id))}"
+    config = cache.get(key)
+    if config is None:
+        config = ensure_attendance_configuration(employer_id, db_alias)
+        cache.set(key, config, timeout=ATTENDANCE_CONFIG_CACHE_TTL_SECONDS)
+    return config
+
+
+def _get_schedule_map(employer_id: int, db_alias: str) -> dict:
+    """Working schedules and day rules of an employer, loaded once per schedule version."""
+    key = f"attendance_schedules:{db_alias}:{employer_id}:{get_cache_version(_schedule_version_key(employer_id))}"
+    schedule_map = cache.get(key)
+    if schedule_map is None:
+        schedules = {
+            schedule.id: schedule
+            for schedule in WorkingSchedule.objects.using(db_alias).filter(employer_id=employer_id)
+        }
+        schedule_map = {
+            "schedules": schedules,
+            "default_id": next((schedule.id for schedule in schedules.values() if schedule.is_default), None),
+            "days": {
+                (day.schedule_id, day.weekday): day
+                for day in WorkingScheduleDay.objects.using(db_alias).filter(schedule_id__in=list(schedules))
+            },
+        }
+        cache.set(key, schedule_map, timeout=ATTENDANCE_SCHEDULE_CACHE_TTL_SECONDS)
+    return schedule_map
+
+
 def _resolve_schedule_day_context(
     employee: Employee,
     when: datetime,
     db_alias: str,
     tz_override: Optional[tzinfo] = None,
 ):
+    schedule_map = _get_schedule_map(employee.employer_id, db_alias)
+    schedules = schedule_map["schedules"]
     schedule_id = getattr(employee, "working_schedule_id", None)
-    schedule = None
-    if schedule_id:
-        schedule = WorkingSchedule.objects.using(db_alias).filter(id=schedule_id).first()
+    schedule = schedules.get(schedule_id) if schedule_id else None
     if not schedule:
-        schedule = (
-            WorkingSchedule.objects.using(db_alias)
-            .filter(employer_id=employee.employer_id, is_default=True)
-            .first()
+        schedule = schedules.get(schedule_map["default_id"])
+    return _schedule_day_context(
+        schedule,
+        lambda weekday: schedule_map["days"].get((schedule.id, weekday)),
+        when,
+        tz_override=tz_override,
+    )
+
+
+def get_attendance_day_context(
+    employee: Employee,
+    when: datetime,
+    db_alias: str,
+    tz_override: Optional[tzinfo] = None,
+) -> dict:
+    """
+    Attendance facts for the employee's local day containing ``when``: schedule
+    and break windows, expected minutes, timezone and the blocking leave
+    requests overlapping the day. Cached per employee and day until the
+    employer's schedules or the employee's leave requests change.
+    """
+    schedule, day_rule, tz, local_when, scheduled_start, scheduled_end = _resolve_schedule_day_context(
+        employee,
+        when,
+        db_alias,
+        tz_override=tz_override,
+    )
+    local_date = local_when.date()
+    key = ":".join(
+        [
+            "attendance_day_context",
+            db_alias,
+            str(employee.pk),
+            local_date.isoformat(),
+            _normalize_timezone_name(tz) or "",
+            str(schedule.id) if schedule else "",
+            get_cache_version(_schedule_version_key(employee.employer_id)),
+            get_cache_version(_leave_version_key(employee.pk)),
+        ]
+    )
+    context = cache.get(key)
+    if context is None:
+        break_start = break_end = None
+        if day_rule and day_rule.break_start_time and day_rule.break_end_time:
+            break_start = datetime.combine(local_date, day_rule.break_start_time)
+            break_end = datetime.combine(local_date, day_rule.break_end_time)
+            if timezone.is_naive(break_start):
+                break_start = timezone.make_aware(break_start, tz)
+            if timezone.is_naive(break_end):
+                break_end = timezone.make_aware(break_end, tz)
+        if day_rule:
+            expected_minutes = day_rule.expected_minutes
+        elif schedule:
+            expected_minutes = schedule.default_daily_minutes
+        else:
+            expected_minutes = None
+        day_start = timezone.make_aware(datetime.combine(local_date, time.min), tz)
+        day_end = day_start + timedelta(days=1)
+        leave_intervals = list(
+            TimeOffRequest.objects.using(db_alias)
+            .filter(
+                employee_id=employee.pk,
+                status__in=LEAVE_BLOCKING_STATUSES,
+                start_at__lt=day_end,
+                end_at__gte=day_start,
+            )
+            .values_list("start_at", "end_at")
         )
+        context = {
+            "schedule": schedule,
+            "day_rule": day_rule,
+            "tz": tz,
+            "scheduled_start": scheduled_start,
+            "scheduled_end": scheduled_end,
+            "break_start": break_start,
+            "break_end": break_end,
+            "expected_minutes": expected_minutes,
+            "leave_intervals": leave_intervals,
+        }
+        cache.set(key, context, timeout=ATTENDANCE_DAY_CONTEXT_CACHE_TTL_SECONDS)
+    return {**context, "local_when": local_when}
+
+
+def _schedule_day_context(schedule, day_for_weekday, when: datetime, tz_override: Optional[tzinfo] = None):
+    """Schedule day bounds around ``when``; ``day_for_weekday`` maps a weekday to its rule."""
     if not schedule:
         tz = tz_override or timezone.get_current_timezone()
         local_when = timezone.localtime(normalize_datetime(when), tz)
@@ -160,7 +413,7 @@ def _resolve_schedule_day_context(
     tz = tz_override or _resolve_schedule_timezone(schedule)
     aware_when = normalize_datetime(when)
     local_when = timezone.localtime(aware_when, tz)
-    day = WorkingScheduleDay.objects.using(db_alias).filter(schedule=schedule, weekday=local_when.weekday()).first()
+    day = day_for_weekday(local_when.weekday())
     if not day:
         return schedule, None, tz, local_when, None, None
 
@@ -179,21 +432,8 @@ def resolve_break_window(
     db_alias: str,
     tz_override: Optional[tzinfo] = None,
 ) -> Tuple[Optional[datetime], Optional[datetime], tzinfo, datetime, Optional[WorkingScheduleDay]]:
-    schedule, day_rule, tz, local_when, _start_dt, _end_dt = _resolve_schedule_day_context(
-        employee,
-        when,
-        db_alias,
-        tz_override=tz_override,
-    )
-    if not day_rule or not day_rule.break_start_time or not day_rule.break_end_time:
-        return None, None, tz, local_when, day_rule
-    break_start = datetime.combine(local_when.date(), day_rule.break_start_time)
-    break_end = datetime.combine(local_when.date(), day_rule.break_end_time)
-    if timezone.is_naive(break_start):
-        break_start = timezone.make_aware(break_start, tz)
-    if timezone.is_naive(break_end):
-        break_end = timezone.make_aware(break_end, tz)
-    return break_start, break_end, tz, local_when, day_rule
+    context = get_attendance_day_context(employee, when, db_alias, tz_override=tz_override)
+    return context["break_start"], context["break_end"], context["tz"], context["local_when"], context["day_rule"]
 
 
 def flag_missing_checkout_if_needed(
@@ -236,6 +476,10 @@ def resolve_missing_checkout_deadline(
         db_alias,
         tz_override=tz_override,
     )
+    return _missing_checkout_deadline(config, tz, local_check_in, scheduled_end), tz
+
+
+def _missing_checkout_deadline(config: AttendanceConfiguration, tz: tzinfo, local_check_in: datetime, scheduled_end):
     cutoff_minutes = max(int(getattr(config, "missing_checkout_cutoff_minutes", 0) or 0), 0)
     if scheduled_end:
         deadline = scheduled_end + timedelta(minutes=cutoff_minutes)
@@ -245,7 +489,7 @@ def resolve_missing_checkout_deadline(
         if timezone.is_naive(deadline):
             deadline = timezone.make_aware(deadline, tz)
         deadline = deadline + timedelta(minutes=cutoff_minutes)
-    return deadline, tz
+    return deadline
 
 
 def is_missing_checkout_after_cutoff(
@@ -263,6 +507,98 @@ def is_missing_checkout_after_cutoff(
     return local_now > deadline
 
 
+MISSING_CHECKOUT_REASON = "Missing checkout"
+
+
+def _missing_checkout_updates(penalty_mode: str, now: datetime) -> dict:
+    """SQL equivalent of the status/anomaly changes made by ``flag_missing_checkout_if_needed``."""
+    reason = models.Value(MISSING_CHECKOUT_REASON)
+    if penalty_mode == "auto_refuse":
+        new_status = models.Value(AttendanceRecord.STATUS_REFUSED)
+    else:
+        new_status = models.Case(
+            models.When(status=AttendanceRecord.STATUS_REFUSED, then=models.Value(AttendanceRecord.STATUS_REFUSED)),
+            default=models.Value(AttendanceRecord.STATUS_TO_APPROVE),
+        )
+    return {
+        "status": new_status,
+        "anomaly_reason": models.Case(
+            models.When(models.Q(anomaly_reason__isnull=True) | models.Q(anomaly_reason=""), then=reason),
+            models.When(anomaly_reason__icontains=MISSING_CHECKOUT_REASON, then=models.F("anomaly_reason")),
+            default=Concat(models.F("anomaly_reason"), models.Value("; "), reason),
+            output_field=models.CharField(),
+        ),
+        "updated_at": now,
+    }
+
+
+def sweep_missing_checkouts(
+    db_alias: str,
+    employer_id: Optional[int] = None,
+    now: Optional[datetime] = None,
+    batch_size: int = 500,
+) -> int:
+    """
+    Flag every open record past its missing-checkout deadline, for all employers
+    of a tenant database that enable the check. Schedules are loaded once per
+    employer, deadlines are computed in memory from the record values and the
+    flagged records are updated with one ``UPDATE`` per batch. Records already
+    flagged are skipped, so the sweep is safe to schedule frequently.
+    Returns the number of records flagged.
+    """
+    current_time = normalize_datetime(now) if now else timezone.now()
+    configs = AttendanceConfiguration.objects.using(db_alias).filter(
+        auto_flag_anomalies=True,
+        flag_missing_checkout=True,
+    )
+    if employer_id:
+        configs = configs.filter(employer_id=employer_id)
+
+    flagged = 0
+    for config in configs:
+        penalty_mode = getattr(config, "missing_checkout_penalty_mode", "none")
+        already_flagged_statuses = (
+            [AttendanceRecord.STATUS_REFUSED]
+            if penalty_mode == "auto_refuse"
+            else [AttendanceRecord.STATUS_TO_APPROVE, AttendanceRecord.STATUS_REFUSED]
+        )
+        open_records = (
+            AttendanceRecord.objects.using(db_alias)
+            .filter(employer_id=config.employer_id, check_out_at__isnull=True, check_in_at__lte=current_time)
+            .exclude(anomaly_reason__icontains=MISSING_CHECKOUT_REASON, status__in=already_flagged_statuses)
+        )
+        schedules = {
+            schedule.id: schedule
+            for schedule in WorkingSchedule.objects.using(db_alias).filter(employer_id=config.employer_id)
+        }
+        default_schedule = next((schedule for schedule in schedules.values() if schedule.is_default), None)
+        days = {
+            (day.schedule_id, day.weekday): day
+            for day in WorkingScheduleDay.objects.using(db_alias).filter(schedule_id__in=list(schedules))
+        }
+        update_values = _missing_checkout_updates(penalty_mode, current_time)
+
+        due = []
+        rows = open_records.values_list("id", "check_in_at", "check_in_timezone", "employee__working_schedule_id")
+        for record_id, check_in_at, check_in_timezone, schedule_id in rows.iterator(chunk_size=batch_size):
+            schedule = schedules.get(schedule_id) or default_schedule
+            _schedule, _day, tz, local_check_in, _start, scheduled_end = _schedule_day_context(
+                schedule,
+                lambda weekday: days.get((schedule.id, weekday)),
+                check_in_at,
+                tz_override=_resolve_payload_timezone(check_in_timezone),
+            )
+            deadline = _missing_checkout_deadline(config, tz, local_check_in, scheduled_end)
+            if timezone.localtime(current_time, tz) > deadline:
+                due.append(record_id)
+            if len(due) >= batch_size:
+                flagged += AttendanceRecord.objects.using(db_alias).filter(id__in=due).update(**update_values)
+                due = []
+        if due:
+            flagged += AttendanceRecord.objects.using(db_alias).filter(id__in=due).update(**update_values)
+    return flagged
+
+
 def _apply_early_check_in_rule(local_check_in: datetime, scheduled_start: Optional[datetime], early_grace_minutes: int):
     if not scheduled_start or not local_check_in:
         return local_check_in
@@ -340,17 +676,7 @@ def resolve_expected_minutes(
     tz_override: Optional[tzinfo] = None,
 ) -> Optional[int]:
     """Compute expected minutes for the given employee/date using working schedule."""
-    schedule, day_rule, _tz, _local_when, _start, _end = _resolve_schedule_day_context(
-        employee,
-        check_in_at,
-        db_alias,
-        tz_override=tz_override,
-    )
-    if day_rule:
-        return day_rule.expected_minutes
-    if schedule:
-        return schedule.default_daily_minutes
-    return None
+    return get_attendance_day_context(employee, check_in_at, db_alias, tz_override=tz_override)["expected_minutes"]
 
 
 def resolve_check_in_timing(
@@ -398,18 +724,9 @@ def resolve_check_in_timing(
 
 def is_employee_on_leave(employee: Employee, when: datetime, db_alias: str) -> bool:
     """Return True if the employee has a SUBMITTED/PENDING/APPROVED leave covering the given datetime."""
-    if when is None:
-        when = timezone.now()
-    return (
-        TimeOffRequest.objects.using(db_alias)
-        .filter(
-            employee=employee,
-            status__in=["SUBMITTED", "PENDING", "APPROVED"],
-            start_at__lte=when,
-            end_at__gte=when,
-        )
-        .exists()
-    )
+    when = normalize_datetime(when)
+    context = get_attendance_day_context(employee, when, db_alias)
+    return any(start_at <= when <= end_at for start_at, end_at in context["leave_intervals"])
 
 
 def _should_enforce_geofence(config: AttendanceConfiguration, mode: str) -> bool:
@@ -456,7 +773,8 @@ def perform_check_in(
     longitude = payload.get("longitude")
     wifi_ssid = payload.get("wifi_ssid")
     wifi_bssid = payload.get("wifi_bssid")
-    branch_ids = [str(branch_id) for branch_id in employee.assigned_branch_ids]
+    needs_location_match = enforce_geo or enforce_wifi or (latitude is not None and longitude is not None)
+    branch_ids = [str(branch_id) for branch_id in employee.assigned_branch_ids] if needs_location_match else None
     site_match = None
 
     if enforce_geo:
@@ -537,17 +855,13 @@ def perform_check_in(
         check_in_latitude=latitude,
         check_in_longitude=longitude,
         check_in_site=site_match,
-        check_in_wifi_ssid=wifi_ssid,
-        check_in_wifi_bssid=wifi_bssid,
+        check_in_wifi_ssid=wifi_match.ssid if enforce_wifi and wifi_match else wifi_ssid,
+        check_in_wifi_bssid=wifi_match.bssid if enforce_wifi and wifi_match else wifi_bssid,
         check_in_ip=payload.get("ip_address"),
         created_by_id=created_by,
         status=status,
         anomaly_reason=anomaly_reason,
     )
-    if enforce_wifi and wifi_match:
-        record.check_in_wifi_ssid = wifi_match.ssid
-        record.check_in_wifi_bssid = wifi_match.bssid
-        record.save(using=db_alias, update_fields=["check_in_wifi_ssid", "check_in_wifi_bssid"])
     return record
 
 
@@ -577,7 +891,8 @@ def perform_check_out(
     longitude = payload.get("longitude")
     wifi_ssid = payload.get("wifi_ssid")
     wifi_bssid = payload.get("wifi_bssid")
-    branch_ids = [str(branch_id) for branch_id in employee.assigned_branch_ids]
+    needs_location_match = enforce_geo or enforce_wifi or (latitude is not None and longitude is not None)
+    branch_ids = [str(branch_id) for branch_id in employee.assigned_branch_ids] if needs_location_match else None
 
     site_match = None
     if enforce_geo:
@@ -669,36 +984,308 @@ def perform_check_out(
     return record
 
 
-def resolve_configuration_by_kiosk_token(token: str) -> Tuple[Optional[AttendanceConfiguration], Optional[str]]:
-    """Find configuration by kiosk token across tenant databases."""
-    aliases = [alias for alias in settings.DATABASES.keys() if alias.startswith("tenant_")]
-    if "default" in settings.DATABASES:
-        aliases.append("default")
-    for alias in aliases:
-        try:
-            if "attendance_configurations" not in connections[alias].introspection.table_names():
-                continue
+KIOSK_TOKEN_CACHE_TTL_SECONDS = 300
+KIOSK_TOKEN_MISS_CACHE_TTL_SECONDS = 60
+KIOSK_TOKEN_MISS = object()
+
+
+def _kiosk_token_cache_key(token: str) -> str:
+    return f"attendance_kiosk_token:{token}"
+
+
+def _invalidate_kiosk_tokens(tokens) -> None:
+    keys = [_kiosk_token_cache_key(token) for token in tokens if token]
+    if keys:
+        cache.delete_many(keys)
+
+
+def register_kiosk_token(
+    token: str,
+    employer_id: int,
+    db_alias: str,
+    kind: str,
+    station_id=None,
+) -> None:
+    """
+    Record token ownership in the central index, replacing any previous token
+    for the same configuration/station (token rotation).
+    """
+    if not token:
+        return
+    index = AttendanceKioskTokenIndex.objects.using("default")
+    stale = index.filter(kind=kind, employer_id=employer_id, tenant_db=db_alias).exclude(token=token)
+    if kind == AttendanceKioskTokenIndex.KIND_STATION:
+        stale = index.filter(kind=kind, station_id=station_id).exclude(token=token)
+    stale_tokens = list(stale.values_list("token", flat=True))
+    if stale_tokens:
+        index.filter(token__in=stale_tokens).delete()
+    index.update_or_create(
+        token=token,
+        defaults={
+            "kind": kind,
+            "employer_id": employer_id,
+            "tenant_db": db_alias,
+            "station_id": station_id,
+        },
+    )
+    _invalidate_kiosk_tokens(stale_tokens + [token])
+
+
+def unregister_kiosk_station(station_id) -> None:
+    """Drop index rows pointing at a deleted kiosk station."""
+    index = AttendanceKioskTokenIndex.objects.using("default").filter(
+        kind=AttendanceKioskTokenIndex.KIND_STATION,
+        station_id=station_id,
+    )
+    tokens = list(index.values_list("token", flat=True))
+    index.delete()
+    _invalidate_kiosk_tokens(tokens)
+
+
+def _cached_kiosk_token_entry(token: str):
+    """
+    Index entry of a token, ``KIOSK_TOKEN_MISS`` for a cached miss, or None
+    when the token was just looked up and is not indexed.
+    """
+    key = _kiosk_token_cache_key(token)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached or KIOSK_TOKEN_MISS
+    entry = (
+        AttendanceKioskTokenIndex.objects.using("default")
+        .filter(token=token)
+        .values("kind", "employer_id", "tenant_db", "station_id")
+        .first()
+    )
+    if entry:
+        cache.set(key, entry, timeout=KIOSK_TOKEN_CACHE_TTL_SECONDS)
+    else:
+        # Negative entries are short-lived so freshly registered tokens show up quickly.
+        cache.set(key, {}, timeout=KIOSK_TOKEN_MISS_CACHE_TTL_SECONDS)
+    return entry
+
+
+def lookup_kiosk_token(token: str) -> Optional[dict]:
+    """Return the cached index entry (kind, employer_id, tenant_db, station_id) for a token."""
+    if not token:
+        return None
+    entry = _cached_kiosk_token_entry(token)
+    return None if entry is KIOSK_TOKEN_MISS else entry
+
+
+def _probe_kiosk_token(token: str):
+    def probe(alias, tables):
+        if "attendance_kiosk_stations" in tables:
+            station = AttendanceKioskStation.objects.using(alias).filter(kiosk_token=token, is_active=True).first()
+            if station:
+                return station, None, alias
+        if "attendance_configurations" in tables:
             config = AttendanceConfiguration.objects.using(alias).filter(kiosk_access_token=token, is_enabled=True).first()
             if config:
-                return config, alias
-        except Exception:
-            continue
+                return None, config, alias
+        return None
+
+    return probe
+
+
+def resolve_kiosk_token(token: str):
+    """
+    Resolve a kiosk token to (station, configuration, alias) using the central index.
+    Unindexed tokens fall back to a tenant scan (registering the hit) only when
+    TENANT_INDEX_SCAN_FALLBACK is on; a cached miss never scans.
+    """
+    if not token:
+        return None, None, None
+    entry = _cached_kiosk_token_entry(token)
+    if entry is KIOSK_TOKEN_MISS:
+        return None, None, None
+    if entry:
+        alias = resolve_indexed_tenant_alias(entry.get("tenant_db"), entry.get("employer_id"))
+        if not alias:
+            return None, None, None
+        if entry["kind"] == AttendanceKioskTokenIndex.KIND_STATION:
+            station = (
+                AttendanceKioskStation.objects.using(alias)
+                .filter(id=entry["station_id"], kiosk_token=token, is_active=True)
+                .first()
+            )
+            return (station, None, alias) if station else (None, None, None)
+        config = (
+            AttendanceConfiguration.objects.using(alias)
+            .filter(employer_id=entry["employer_id"], kiosk_access_token=token, is_enabled=True)
+            .first()
+        )
+        return (None, config, alias) if config else (None, None, None)
+
+    found = scan_tenant_databases(
+        ("attendance_kiosk_stations", "attendance_configurations"),
+        _probe_kiosk_token(token),
+    )
+    if not found:
+        # The index miss cached above now also covers the scan until it expires.
+        return None, None, None
+    station, config, alias = found
+    if station:
+        register_kiosk_token(
+            token, station.employer_id, alias, AttendanceKioskTokenIndex.KIND_STATION, station_id=station.id
+        )
+    else:
+        register_kiosk_token(token, config.employer_id, alias, AttendanceKioskTokenIndex.KIND_CONFIGURATION)
+    return station, config, alias
+
+
+def resolve_configuration_by_kiosk_token(token: str) -> Tuple[Optional[AttendanceConfiguration], Optional[str]]:
+    """Find configuration by kiosk token via the central token index."""
+    _station, config, alias = resolve_kiosk_token(token)
+    if config:
+        return config, alias
     return None, None
 
 
 def resolve_station_by_token(token: str) -> Tuple[Optional[AttendanceKioskStation], Optional[str]]:
-    """Find kiosk station by token across tenant databases."""
-    aliases = [alias for alias in settings.DATABASES.keys() if alias.startswith("tenant_")]
-    if "default" in settings.DATABASES:
-        aliases.append("default")
-    for alias in aliases:
-        try:
-            if "attendance_kiosk_stations" not in connections[alias].introspection.table_names():
-                continue
-            station = AttendanceKioskStation.objects.using(alias).filter(kiosk_token=token, is_active=True).first()
-            if station:
-                return station, alias
-        except Exception:
-            continue
+    """Find kiosk station by token via the central token index."""
+    station, _config, alias = resolve_kiosk_token(token)
+    if station:
+        return station, alias
     return None, None
 
+
+ATTENDANCE_REPORT_MEASURES = ("worked", "expected", "difference", "balance")
+
+
+def attendance_work_date(check_in_at: datetime):
+    """Day an attendance record is reported under (check-in date in the current timezone)."""
+    if timezone.is_aware(check_in_at):
+        check_in_at = timezone.localtime(check_in_at)
+    return check_in_at.date()
+
+
+def _record_rollup_aggregates() -> dict:
+    return {
+        "record_count": models.Count("id"),
+        "worked_minutes": Coalesce(models.Sum("worked_minutes"), models.Value(0)),
+        "expected_minutes": Coalesce(models.Sum(Coalesce("expected_minutes", models.Value(0))), models.Value(0)),
+        "overtime_balance_minutes": Coalesce(
+            models.Sum(models.F("overtime_worked_minutes") - models.F("overtime_approved_minutes")),
+            models.Value(0),
+        ),
+    }
+
+
+def refresh_daily_rollup(employee_id, employer_id: int, work_date, db_alias: str) -> None:
+    """Recompute the rollup row of one employee-day from its attendance records."""
+    totals = (
+        AttendanceRecord.objects.using(db_alias)
+        .filter(employee_id=employee_id, check_in_at__date=work_date)
+        .aggregate(**_record_rollup_aggregates())
+    )
+    rollups = AttendanceDailyRollup.objects.using(db_alias)
+    if not totals["record_count"]:
+        rollups.filter(employee_id=employee_id, work_date=work_date).delete()
+        return
+    rollups.bulk_create(
+        [AttendanceDailyRollup(employer_id=employer_id, employee_id=employee_id, work_date=work_date, **totals)],
+        update_conflicts=True,
+        unique_fields=["employee", "work_date"],
+        update_fields=[*totals, "employer_id", "updated_at"],
+    )
+
+
+def rebuild_daily_rollups(
+    db_alias: str,
+    employer_id: Optional[int] = None,
+    date_from=None,
+    date_to=None,
+    batch_size: int = 1000,
+) -> int:
+    """Rebuild rollup rows from raw records in one grouped query. Returns the rows written."""
+    records = AttendanceRecord.objects.using(db_alias)
+    rollups = AttendanceDailyRollup.objects.using(db_alias)
+    if employer_id:
+        records = records.filter(employer_id=employer_id)
+        rollups = rollups.filter(employer_id=employer_id)
+    if date_from:
+        records = records.filter(check_in_at__date__gte=date_from)
+        rollups = rollups.filter(work_date__gte=date_from)
+    if date_to:
+        records = records.filter(check_in_at__date__lte=date_to)
+        rollups = rollups.filter(work_date__lte=date_to)
+    rows = (
+        records.order_by()
+        .annotate(work_date=TruncDate("check_in_at"))
+        .values("employer_id", "employee_id", "work_date")
+        .annotate(**_record_rollup_aggregates())
+    )
+    with transaction.atomic(using=db_alias):
+        rollups.delete()
+        created = AttendanceDailyRollup.objects.using(db_alias).bulk_create(
+            [AttendanceDailyRollup(**row) for row in rows.iterator(chunk_size=batch_size)],
+            batch_size=batch_size,
+        )
+    return len(created)
+
+
+def _report_group_key(row: dict, group_by: list) -> str:
+    parts = []
+    for dim in group_by:
+        if dim == "month":
+            parts.append(row["report_month"].strftime("%Y-%m"))
+        elif dim == "employee":
+            parts.append(str(row["report_employee"]))
+        elif dim == "department":
+            department_id = row["report_department"]
+            parts.append(str(department_id) if department_id else "unassigned")
+    return "|".join(parts) if parts else "all"
+
+
+def attendance_report_rows(queryset, group_by: list, measures=ATTENDANCE_REPORT_MEASURES):
+    """
+    Yield ``{"group": key, <measure>: minutes}`` rows for an ``AttendanceRecord``
+    or ``AttendanceDailyRollup`` queryset, grouped and summed in SQL.
+    """
+    if queryset.model is AttendanceDailyRollup:
+        month_source = "work_date"
+        sums = {
+            "worked": models.Sum("worked_minutes"),
+            "expected": models.Sum("expected_minutes"),
+            "balance": models.Sum("overtime_balance_minutes"),
+        }
+    else:
+        month_source = "check_in_at"
+        sums = {
+            "worked": models.Sum("worked_minutes"),
+            "expected": models.Sum(Coalesce("expected_minutes", models.Value(0))),
+            "balance": models.Sum(models.F("overtime_worked_minutes") - models.F("overtime_approved_minutes")),
+        }
+    dimensions = {}
+    for dim in group_by:
+        if dim == "month":
+            dimensions["report_month"] = TruncMonth(month_source)
+        elif dim == "employee":
+            dimensions["report_employee"] = models.F("employee_id")
+        elif dim == "department":
+            dimensions["report_department"] = models.F("employee__department_id")
+
+    if dimensions:
+        rows = (
+            queryset.order_by()
+            .annotate(**dimensions)
+            .values(*dimensions)
+            .annotate(**sums)
+            .order_by(*dimensions)
+            .iterator(chunk_size=1000)
+        )
+    else:
+        totals = queryset.order_by().aggregate(**sums)
+        rows = [totals] if totals["worked"] is not None else []
+
+    for row in rows:
+        worked = int(row["worked"] or 0)
+        expected = int(row["expected"] or 0)
+        values = {
+            "worked": worked,
+            "expected": expected,
+            "difference": worked - expected,
+            "balance": int(row["balance"] or 0),
+        }
+        yield {"group": _report_group_key(row, group_by), **{k: values[k] for k in measures}}
@@ -0,0 +1,150 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from timeoff.models import TimeOffRequest
+
+from .models import (
+    AttendanceAllowedWifi,
+    AttendanceConfiguration,
+    AttendanceKioskStation,
+    AttendanceKioskTokenIndex,
+    AttendanceLocationSite,
+    AttendanceRecord,
+    WorkingSchedule,
+    WorkingScheduleDay,
+)
+from .services import (
+    attendance_work_date,
+    bump_attendance_configuration_version,
+    bump_geofence_version,
+    bump_leave_version,
+    bump_schedule_version,
+    lookup_kiosk_token,
+    refresh_daily_rollup,
+    register_kiosk_token,
+    unregister_kiosk_station,
+)
+
+
+def _index_is_current(token: str, employer_id: int, db_alias: str, station_id=None) -> bool:
+    entry = lookup_kiosk_token(token)
+    return bool(
+        entry
+        and entry.get("employer_id") == employer_id
+        and entry.get("tenant_db") == db_alias
+        and entry.get("station_id") == station_id
+    )
+
+
+@receiver(post_save, sender=AttendanceConfiguration)
+def sync_configuration_kiosk_token(sender, instance: AttendanceConfiguration, using=None, **kwargs):
+    """
+    Keep the central kiosk token index in sync whenever a configuration is
+    created or its kiosk token is rotated (tenant DB write).
+    """
+    if not instance.is_enabled:
+        return
+    db_alias = using or instance._state.db or "default"
+    if not instance.kiosk_access_token or _index_is_current(instance.kiosk_access_token, instance.employer_id, db_alias):
+        return
+    register_kiosk_token(
+        instance.kiosk_access_token,
+        instance.employer_id,
+        db_alias,
+        AttendanceKioskTokenIndex.KIND_CONFIGURATION,
+    )
+
+
+@receiver(post_save, sender=AttendanceKioskStation)
+def sync_station_kiosk_token(sender, instance: AttendanceKioskStation, using=None, **kwargs):
+    """Register (or re-point) a kiosk station token in the central index."""
+    db_alias = using or instance._state.db or "default"
+    if not instance.kiosk_token or _index_is_current(instance.kiosk_token, instance.employer_id, db_alias, instance.id):
+        return
+    register_kiosk_token(
+        instance.kiosk_token,
+        instance.employer_id,
+        db_alias,
+        AttendanceKioskTokenIndex.KIND_STATION,
+        station_id=instance.id,
+    )
+
+
+@receiver(post_delete, sender=AttendanceKioskStation)
+def drop_station_kiosk_token(sender, instance: AttendanceKioskStation, **kwargs):
+    unregister_kiosk_station(instance.id)
+
+
+@receiver(pre_save, sender=AttendanceRecord)
+def remember_attendance_rollup_day(sender, instance: AttendanceRecord, using=None, update_fields=None, **kwargs):
+    """Note the employee-day a stored record is counted under before a save can move it."""
+    instance._previous_rollup_day = None
+    if instance._state.adding or not instance.pk:
+        return
+    if update_fields is not None and not {"check_in_at", "employee", "employee_id"} & set(update_fields):
+        return
+    previous = (
+        AttendanceRecord.objects.using(using or instance._state.db or "default")
+        .filter(pk=instance.pk)
+        .values("employee_id", "check_in_at")
+        .first()
+    )
+    if previous and previous["check_in_at"]:
+        instance._previous_rollup_day = (previous["employee_id"], attendance_work_date(previous["check_in_at"]))
+
+
+@receiver(post_save, sender=AttendanceRecord)
+@receiver(post_delete, sender=AttendanceRecord)
+def sync_attendance_daily_rollup(sender, instance: AttendanceRecord, using=None, **kwargs):
+    """
+    Keep the employee-day rollup read by attendance reports in line with its
+    records, including the day a record was moved away from.
+    """
+    db_alias = using or instance._state.db or "default"
+    current_day = (instance.employee_id, attendance_work_date(instance.check_in_at)) if instance.check_in_at else None
+    previous_day = getattr(instance, "_previous_rollup_day", None)
+    instance._previous_rollup_day = None
+    for employee_id, work_date in {day for day in (current_day, previous_day) if day}:
+        refresh_daily_rollup(employee_id, instance.employer_id, work_date, db_alias)
+
+
+@receiver(post_save, sender=AttendanceLocationSite)
+@receiver(post_delete, sender=AttendanceLocationSite)
+@receiver(post_save, sender=AttendanceAllowedWifi)
+@receiver(post_delete, sender=AttendanceAllowedWifi)
+def invalidate_geofence_index(sender, instance, **kwargs):
+    """Drop the cached geofence index when a site or allowed Wi-Fi changes."""
+    bump_geofence_version(instance.employer_id)
+
+
+@receiver(post_save, sender=AttendanceConfiguration)
+@receiver(post_delete, sender=AttendanceConfiguration)
+def invalidate_cached_configuration(sender, instance: AttendanceConfiguration, **kwargs):
+    bump_attendance_configuration_version(instance.employer_id)
+
+
+@receiver(post_save, sender=WorkingSchedule)
+@receiver(post_delete, sender=WorkingSchedule)
+def invalidate_schedule_contexts(sender, instance: WorkingSchedule, **kwargs):
+    """Schedules feed every cached attendance day context of the employer."""
+    bump_schedule_version(instance.employer_id)
+
+
+@receiver(post_save, sender=WorkingScheduleDay)
+@receiver(post_delete, sender=WorkingScheduleDay)
+def invalidate_schedule_day_contexts(sender, instance: WorkingScheduleDay, using=None, **kwargs):
+    employer_id = (
+        WorkingSchedule.objects.using(using or instance._state.db or "default")
+        .filter(id=instance.schedule_id)
+        .values_list("employer_id", flat=True)
+        .first()
+    )
+    # A day deleted with its schedule is covered by the schedule's own signal.
+    bump_schedule_version(employer_id)
+
+
+@receiver(post_save, sender=TimeOffRequest)
+@receiver(post_delete, sender=TimeOffRequest)
+def invalidate_leave_day_contexts(sender, instance: TimeOffRequest, **kwargs):
+    """Leave submissions, approvals and cancellations change the employee's check-in eligibility."""
+    bump_leave_version(instance.employee_id)
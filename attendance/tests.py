@@ -0,0 +1,272 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import EmployerProfile
+from attendance import services as attendance_services
+from attendance.models import (
+    AttendanceConfiguration,
+    AttendanceDailyRollup,
+    AttendanceKioskTokenIndex,
+    AttendanceRecord,
+)
+from attendance.services import (
+    attendance_report_rows,
+    flag_missing_checkout_if_needed,
+    refresh_daily_rollup,
+    resolve_kiosk_token,
+    sweep_missing_checkouts,
+)
+from employees.models import Employee
+
+
+class MissingCheckoutSweepTests(TestCase):
+    # (anomaly_reason, status, overdue) of the open record of each employee.
+    RECORD_STATES = [
+        (None, AttendanceRecord.STATUS_APPROVED, True),
+        ("Late check-in", AttendanceRecord.STATUS_APPROVED, True),
+        ("Late check-in; Missing checkout", AttendanceRecord.STATUS_TO_APPROVE, True),
+        ("Missing checkout", AttendanceRecord.STATUS_APPROVED, True),
+        (None, AttendanceRecord.STATUS_REFUSED, True),
+        (None, AttendanceRecord.STATUS_APPROVED, False),
+    ]
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="employer@example.com", password="pass", is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=self.user,
+            company_name="Acme Corp",
+            employer_name_or_group="Acme",
+            organization_type="PRIVATE",
+            industry_sector="Tech",
+            date_of_incorporation=date.today(),
+            company_location="City",
+            physical_address="123 Street",
+            phone_number="1234567890",
+            official_company_email="hr@acme.test",
+            rccm="rccm",
+            taxpayer_identification_number="tin",
+            cnps_employer_number="cnps",
+            labour_inspectorate_declaration="decl",
+            business_license="license",
+            bank_name="Bank",
+            bank_account_number="123",
+        )
+        self.config = AttendanceConfiguration.objects.create(
+            employer_id=self.employer.id,
+            auto_flag_anomalies=True,
+            flag_missing_checkout=True,
+        )
+        now = timezone.now()
+        self.records = []
+        for index, (reason, status, overdue) in enumerate(self.RECORD_STATES):
+            employee = Employee.objects.create(
+                employer_id=self.employer.id,
+                employee_id=f"E{index}",
+                first_name="Employee",
+                last_name=str(index),
+                email=f"employee{index}@example.com",
+                job_title="Engineer",
+                employment_type="FULL_TIME",
+                hire_date=date.today(),
+            )
+            self.records.append(
+                AttendanceRecord.objects.create(
+                    employer_id=self.employer.id,
+                    employee=employee,
+                    check_in_at=now - timedelta(days=3) if overdue else now,
+                    status=status,
+                    anomaly_reason=reason,
+                )
+            )
+
+    def _reset_records(self):
+        for record, (reason, status, _overdue) in zip(self.records, self.RECORD_STATES):
+            AttendanceRecord.objects.filter(id=record.id).update(status=status, anomaly_reason=reason)
+
+    def _states(self):
+        rows = AttendanceRecord.objects.filter(id__in=[record.id for record in self.records])
+        return {row.id: (row.status, row.anomaly_reason) for row in rows}
+
+    def test_sweep_matches_per_record_flagging(self):
+        for penalty_mode in ("none", "auto_refuse"):
+            with self.subTest(penalty_mode=penalty_mode):
+                self.config.missing_checkout_penalty_mode = penalty_mode
+                self.config.save()
+
+                self._reset_records()
+                for record in AttendanceRecord.objects.filter(id__in=[record.id for record in self.records]):
+                    flag_missing_checkout_if_needed(record, self.config, "default")
+                expected = self._states()
+
+                self._reset_records()
+                sweep_missing_checkouts("default", employer_id=self.employer.id)
+                self.assertEqual(self._states(), expected)
+
+                # A second sweep finds nothing left to flag.
+                self.assertEqual(sweep_missing_checkouts("default", employer_id=self.employer.id), 0)
+                self.assertEqual(self._states(), expected)
+
+    def test_sweep_leaves_records_before_the_deadline(self):
+        sweep_missing_checkouts("default", employer_id=self.employer.id)
+        pending = AttendanceRecord.objects.get(id=self.records[-1].id)
+        self.assertEqual((pending.status, pending.anomaly_reason), (AttendanceRecord.STATUS_APPROVED, None))
+        flagged = AttendanceRecord.objects.get(id=self.records[1].id)
+        self.assertEqual(flagged.anomaly_reason, "Late check-in; Missing checkout")
+        self.assertEqual(flagged.status, AttendanceRecord.STATUS_TO_APPROVE)
+
+
+class KioskTokenResolutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.config = AttendanceConfiguration.objects.create(employer_id=4242, is_enabled=True)
+
+    def test_indexed_token_resolves_without_scanning(self):
+        self.assertTrue(AttendanceKioskTokenIndex.objects.filter(token=self.config.kiosk_access_token).exists())
+        with mock.patch.object(attendance_services, "scan_tenant_databases") as scan:
+            station, config, alias = resolve_kiosk_token(self.config.kiosk_access_token)
+        scan.assert_not_called()
+        self.assertIsNone(station)
+        self.assertEqual((config.id, alias), (self.config.id, "default"))
+
+    def test_unknown_token_is_rejected_without_scanning_tenants(self):
+        with mock.patch("accounts.database_utils.connections") as tenant_connections:
+            self.assertEqual(resolve_kiosk_token("unknown-token"), (None, None, None))
+            self.assertEqual(resolve_kiosk_token("unknown-token"), (None, None, None))
+        tenant_connections.__getitem__.assert_not_called()
+
+    @override_settings(TENANT_INDEX_SCAN_FALLBACK=True)
+    def test_fallback_scan_registers_unindexed_tokens(self):
+        AttendanceKioskTokenIndex.objects.filter(token=self.config.kiosk_access_token).delete()
+        cache.clear()
+
+        _station, config, alias = resolve_kiosk_token(self.config.kiosk_access_token)
+
+        self.assertEqual((config.id, alias), (self.config.id, "default"))
+        self.assertTrue(AttendanceKioskTokenIndex.objects.filter(token=self.config.kiosk_access_token).exists())
+
+
+class AttendanceRollupReportTests(TestCase):
+    GROUPINGS = ([], ["month"], ["employee"], ["department"], ["month", "employee"])
+
+    def setUp(self):
+        self.employees = [
+            Employee.objects.create(
+                employer_id=4242,
+                employee_id=f"R{index}",
+                first_name="Employee",
+                last_name=str(index),
+                email=f"rollup{index}@example.com",
+                job_title="Engineer",
+                employment_type="FULL_TIME",
+                hire_date=date(2025, 1, 1),
+            )
+            for index in range(2)
+        ]
+        # Two employees, two months, sometimes two records on the same day.
+        days = [(1, 10, 9), (1, 10, 14), (1, 25, 9), (2, 3, 9), (2, 3, 15)]
+        for employee_index, employee in enumerate(self.employees):
+            for offset, (month, day, hour) in enumerate(days):
+                check_in = timezone.make_aware(datetime(2026, month, day, hour))
+                self._create_record(
+                    employee,
+                    check_in,
+                    worked_minutes=180 + 15 * offset + employee_index,
+                    expected_minutes=None if offset == 2 else 240,
+                    overtime_worked_minutes=10 * offset,
+                    overtime_approved_minutes=5 * employee_index,
+                )
+
+    def _create_record(self, employee, check_in, **minutes):
+        return AttendanceRecord.objects.create(
+            employer_id=4242,
+            employee=employee,
+            check_in_at=check_in,
+            check_out_at=check_in + timedelta(hours=3),
+            **minutes,
+        )
+
+    def _per_record_report(self, group_by):
+        """The report as it used to be built: bucket every record in Python."""
+        buckets = defaultdict(list)
+        for record in AttendanceRecord.objects.filter(employer_id=4242).select_related("employee"):
+            parts = []
+            for dim in group_by:
+                if dim == "month":
+                    parts.append(record.check_in_at.strftime("%Y-%m"))
+                elif dim == "employee":
+                    parts.append(str(record.employee_id))
+                elif dim == "department":
+                    parts.append(str(record.employee.department_id) if record.employee.department_id else "unassigned")
+            buckets["|".join(parts) if parts else "all"].append(record)
+        rows = []
+        for key, records in buckets.items():
+            worked = sum(record.worked_minutes or 0 for record in records)
+            expected = sum(record.expected_minutes or 0 for record in records)
+            rows.append({
+                "group": key,
+                "worked": worked,
+                "expected": expected,
+                "difference": worked - expected,
+                "balance": sum(record.overtime_worked_minutes - record.overtime_approved_minutes for record in records),
+            })
+        return sorted(rows, key=lambda row: row["group"])
+
+    def test_rollup_report_matches_per_record_report(self):
+        for group_by in self.GROUPINGS:
+            with self.subTest(group_by=group_by):
+                expected = self._per_record_report(group_by)
+                from_rollups = attendance_report_rows(AttendanceDailyRollup.objects.filter(employer_id=4242), group_by)
+                from_records = attendance_report_rows(AttendanceRecord.objects.filter(employer_id=4242), group_by)
+                self.assertEqual(sorted(from_rollups, key=lambda row: row["group"]), expected)
+                self.assertEqual(sorted(from_records, key=lambda row: row["group"]), expected)
+
+    def test_moving_a_check_in_updates_both_days(self):
+        employee = self.employees[0]
+        old_day, new_day = date(2026, 1, 25), date(2026, 1, 26)
+        record = AttendanceRecord.objects.get(employee=employee, check_in_at__date=old_day)
+
+        record.check_in_at += timedelta(days=1)
+        record.check_out_at += timedelta(days=1)
+        record.save()
+
+        rollups = AttendanceDailyRollup.objects.filter(employee=employee)
+        self.assertFalse(rollups.filter(work_date=old_day).exists())
+        moved = rollups.get(work_date=new_day)
+        self.assertEqual((moved.record_count, moved.worked_minutes), (1, record.worked_minutes))
+
+        # Moving onto a day that already has records merges into its rollup.
+        busy_day = date(2026, 1, 10)
+        record.check_in_at = timezone.make_aware(datetime(2026, 1, 10, 18))
+        record.check_out_at = record.check_in_at + timedelta(hours=3)
+        record.save(update_fields=["check_in_at", "check_out_at"])
+
+        self.assertFalse(rollups.filter(work_date=new_day).exists())
+        merged = rollups.get(work_date=busy_day)
+        self.assertEqual(merged.record_count, 3)
+        day_records = AttendanceRecord.objects.filter(employee=employee, check_in_at__date=busy_day)
+        self.assertEqual(merged.worked_minutes, sum(day_records.values_list("worked_minutes", flat=True)))
+
+    def test_deleting_a_days_records_drops_its_rollup(self):
+        employee = self.employees[1]
+        work_date = date(2026, 2, 3)
+        AttendanceRecord.objects.filter(employee=employee, check_in_at__date=work_date).delete()
+        self.assertFalse(AttendanceDailyRollup.objects.filter(employee=employee, work_date=work_date).exists())
+
+    def test_refresh_recomputes_after_bulk_updates(self):
+        employee = self.employees[1]
+        work_date = date(2026, 2, 3)
+        # Queryset updates skip the signals, so the rollup goes stale until refreshed.
+        AttendanceRecord.objects.filter(employee=employee, check_in_at__date=work_date).update(worked_minutes=60)
+
+        refresh_daily_rollup(employee.id, 4242, work_date, "default")
+
+        rollup = AttendanceDailyRollup.objects.get(employee=employee, work_date=work_date)
+        self.assertEqual((rollup.record_count, rollup.worked_minutes), (2, 120))
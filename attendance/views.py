@@ -1,8 +1,10 @@
-from collections import defaultdict
 from datetime import timedelta
+from itertools import chain, islice
+import json
 import uuid
 
 from django.db import models
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
 from rest_framework.exceptions import PermissionDenied
@@ -26,6 +28,7 @@ User = get_user_model()
 from .models import (
     AttendanceAllowedWifi,
     AttendanceConfiguration,
+    AttendanceDailyRollup,
     AttendanceLocationSite,
     AttendanceKioskStation,
     AttendanceRecord,
@@ -48,16 +51,17 @@ from .serializers import (
     WorkingScheduleSerializer,
 )
 from .services import (
+    ATTENDANCE_REPORT_MEASURES,
     append_anomaly_reason,
+    attendance_report_rows,
     ensure_attendance_configuration,
+    get_cached_attendance_configuration,
     compute_worked_minutes_for_employee,
-    flag_missing_checkout_if_needed,
     _resolve_payload_timezone,
     perform_check_in,
     perform_check_out,
     resolve_check_in_timing,
-    resolve_station_by_token,
-    resolve_configuration_by_kiosk_token,
+    resolve_kiosk_token,
     resolve_expected_minutes,
     is_employee_on_leave,
     resolve_break_window,
@@ -651,61 +655,6 @@ class AttendanceRecordViewSet(viewsets.ReadOnlyModelViewSet):
     }
     serializer_class = AttendanceRecordSerializer
 
-    def _resolve_access_context(self):
-        user = self.request.user
-        employer = None
-        if getattr(user, "employer_profile", None):
-            employer = user.employer_profile
-        else:
-            resolved = get_active_employer(self.request, require_context=False)
-            if resolved and (user.is_admin or user.is_superuser or is_delegate_user(user, resolved.id)):
-                employer = resolved
-        if employer:
-            tenant_db = get_tenant_database_alias(employer)
-            return employer, None, tenant_db
-        if hasattr(user, "employee_profile") and user.employee_profile:
-            employee = user.employee_profile
-            tenant_db = employee._state.db or "default"
-            return None, employee, tenant_db
-        return None, None, None
-
-    def _auto_flag_missing_checkout(self, employer=None, employee=None, tenant_db=None):
-        if not tenant_db:
-            return
-        employer_id = employer.id if employer else getattr(employee, "employer_id", None)
-        if not employer_id:
-            return
-        config = ensure_attendance_configuration(employer_id, tenant_db)
-        if not config.auto_flag_anomalies or not getattr(config, "flag_missing_checkout", False):
-            return
-        qs = AttendanceRecord.objects.using(tenant_db).filter(check_out_at__isnull=True)
-        if employer:
-            qs = qs.filter(employer_id=employer.id)
-            if is_delegate_user(self.request.user, employer.id):
-                scope = get_delegate_scope(self.request.user, employer.id)
-                qs = apply_scope_filter(
-                    qs,
-                    scope,
-                    branch_field="employee__branch_id",
-                    branch_secondary_field="employee__secondary_branches__id",
-                    department_field="employee__department_id",
-                    self_field="employee_id",
-                )
-        elif employee:
-            qs = qs.filter(employee=employee)
-        for record in qs.select_related("employee"):
-            flag_missing_checkout_if_needed(record, config, tenant_db)
-
-    def list(self, request, *args, **kwargs):
-        employer, employee, tenant_db = self._resolve_access_context()
-        self._auto_flag_missing_checkout(employer=employer, employee=employee, tenant_db=tenant_db)
-        return super().list(request, *args, **kwargs)
-
-    def retrieve(self, request, *args, **kwargs):
-        employer, employee, tenant_db = self._resolve_access_context()
-        self._auto_flag_missing_checkout(employer=employer, employee=employee, tenant_db=tenant_db)
-        return super().retrieve(request, *args, **kwargs)
-
     def get_queryset(self):
         user = self.request.user
         params = self.request.query_params
@@ -767,7 +716,6 @@ class AttendanceRecordViewSet(viewsets.ReadOnlyModelViewSet):
     def to_approve(self, request):
         employer = get_active_employer(request, require_context=True)
         tenant_db = get_tenant_database_alias(employer)
-        self._auto_flag_missing_checkout(employer=employer, tenant_db=tenant_db)
         qs = AttendanceRecord.objects.using(tenant_db).filter(
             employer_id=employer.id, status=AttendanceRecord.STATUS_TO_APPROVE
         )
@@ -860,7 +808,7 @@ class PortalCheckInView(APIView):
         if not employee:
             return Response({"detail": "Employee not found."}, status=status.HTTP_400_BAD_REQUEST)
         tenant_db = employee._state.db or "default"
-        config = ensure_attendance_configuration(employee.employer_id, tenant_db)
+        config = get_cached_attendance_configuration(employee.employer_id, tenant_db)
         if not config.allow_systray_portal:
             return Response({"detail": "Portal check-ins are disabled."}, status=status.HTTP_403_FORBIDDEN)
         payload = dict(serializer.validated_data)
@@ -906,7 +854,7 @@ class PortalCheckOutView(APIView):
         if not employee:
             return Response({"detail": "Employee not found."}, status=status.HTTP_400_BAD_REQUEST)
         tenant_db = employee._state.db or "default"
-        config = ensure_attendance_configuration(employee.employer_id, tenant_db)
+        config = get_cached_attendance_configuration(employee.employer_id, tenant_db)
         if not config.allow_systray_portal:
             return Response({"detail": "Portal check-outs are disabled."}, status=status.HTTP_403_FORBIDDEN)
         payload = dict(serializer.validated_data)
@@ -944,15 +892,11 @@ class KioskCheckView(APIView):
         if not kiosk_token:
             return Response({"detail": "kiosk_token is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        station, tenant_db = resolve_station_by_token(kiosk_token)
-        if station and tenant_db:
-            employer_id = station.employer_id
-        else:
-            config, tenant_db = resolve_configuration_by_kiosk_token(kiosk_token)
-            if not config or not tenant_db:
-                return Response({"detail": "Invalid kiosk access"}, status=status.HTTP_404_NOT_FOUND)
-            employer_id = config.employer_id
-        config = ensure_attendance_configuration(employer_id, tenant_db)
+        station, token_config, tenant_db = resolve_kiosk_token(kiosk_token)
+        if not tenant_db or not (station or token_config):
+            return Response({"detail": "Invalid kiosk access"}, status=status.HTTP_404_NOT_FOUND)
+        employer_id = station.employer_id if station else token_config.employer_id
+        config = get_cached_attendance_configuration(employer_id, tenant_db)
         if not config.allow_kiosk:
             return Response({"detail": "Kiosk mode is disabled."}, status=status.HTTP_403_FORBIDDEN)
 
@@ -1193,15 +1137,37 @@ class ManualAttendanceCreateView(APIView):
         return Response(output.data, status=status.HTTP_201_CREATED)
 
 
+def _stream_report_results(rows):
+    yield '{"results": ['
+    for idx, row in enumerate(rows):
+        yield ("," if idx else "") + json.dumps(row)
+    yield "]}"
+
+
 class AttendanceReportView(APIView):
     permission_classes = [permissions.IsAuthenticated, EmployerOrEmployeeAccessPermission]
     required_permissions = ["attendance.manage"]
+    # Windows at least this long (or open-ended) are read from the daily rollups.
+    rollup_min_days = 31
+    # Reports with more groups than this are streamed instead of buffered.
+    stream_threshold = 1000
+
+    def _use_rollups(self, data) -> bool:
+        if not data.get("date_from"):
+            return True
+        date_to = data.get("date_to") or timezone.localdate()
+        return (date_to - data["date_from"]).days + 1 >= self.rollup_min_days
 
     def get(self, request):
         serializer = AttendanceReportQuerySerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
+        if self._use_rollups(data):
+            model, date_lookup = AttendanceDailyRollup, "work_date"
+        else:
+            model, date_lookup = AttendanceRecord, "check_in_at__date"
+
         employer = None
         if getattr(request.user, "employer_profile", None):
             employer = request.user.employer_profile
@@ -1212,72 +1178,44 @@ class AttendanceReportView(APIView):
 
         if employer:
             tenant_db = get_tenant_database_alias(employer)
-            qs = AttendanceRecord.objects.using(tenant_db).filter(employer_id=employer.id)
+            qs = model.objects.using(tenant_db).filter(employer_id=employer.id)
             if is_delegate_user(request.user, employer.id):
                 scope = get_delegate_scope(request.user, employer.id)
-                qs = apply_scope_filter(
-                    qs,
+                # Scope the employees first: joining secondary branches into the
+                # aggregated rows would count them once per matching branch.
+                scoped_employees = apply_scope_filter(
+                    Employee.objects.using(tenant_db).filter(employer_id=employer.id),
                     scope,
-                    branch_field="employee__branch_id",
-                    branch_secondary_field="employee__secondary_branches__id",
-                    department_field="employee__department_id",
-                    self_field="employee_id",
+                    branch_field="branch_id",
+                    branch_secondary_field="secondary_branches__id",
+                    department_field="department_id",
+                    self_field="id",
                 )
+                qs = qs.filter(employee_id__in=scoped_employees.values("id"))
         elif hasattr(request.user, "employee_profile") and request.user.employee_profile:
             employee = request.user.employee_profile
             tenant_db = employee._state.db or "default"
-            qs = AttendanceRecord.objects.using(tenant_db).filter(employee=employee)
+            qs = model.objects.using(tenant_db).filter(employee=employee)
         else:
             return Response({"detail": "Unable to resolve tenant."}, status=status.HTTP_403_FORBIDDEN)
 
         if data.get("date_from"):
-            qs = qs.filter(check_in_at__date__gte=data["date_from"])
+            qs = qs.filter(**{f"{date_lookup}__gte": data["date_from"]})
         if data.get("date_to"):
-            qs = qs.filter(check_in_at__date__lte=data["date_to"])
+            qs = qs.filter(**{f"{date_lookup}__lte": data["date_to"]})
         if data.get("employee_id"):
             qs = qs.filter(employee_id=data["employee_id"])
         if data.get("department_id"):
             qs = qs.filter(employee__department_id=data["department_id"])
 
-        measures = data.get("measures") or ["worked", "expected", "difference", "balance"]
+        measures = data.get("measures") or list(ATTENDANCE_REPORT_MEASURES)
         group_by = data.get("group_by") or []
 
-        def aggregate_records(records):
-            worked = sum(r.worked_minutes or 0 for r in records)
-            expected = sum(r.expected_minutes or 0 for r in records)
-            difference = worked - expected
-            balance = sum((r.overtime_worked_minutes or 0) - (r.overtime_approved_minutes or 0) for r in records)
-            return {
-                "worked": worked,
-                "expected": expected,
-                "difference": difference,
-                "balance": balance,
-            }
-
-        def group_key(rec):
-            parts = []
-            for dim in group_by:
-                if dim == "month":
-                    parts.append(rec.check_in_at.strftime("%Y-%m"))
-                elif dim == "employee":
-                    parts.append(str(rec.employee_id))
-                elif dim == "department":
-                    dept_key = (
-                        str(rec.employee.department_id)
-                        if rec.employee and rec.employee.department_id
-                        else "unassigned"
-                    )
-                    parts.append(dept_key)
-            return "|".join(parts) if parts else "all"
-
-        buckets = defaultdict(list)
-        iterable = qs.select_related("employee__department") if "department" in group_by else qs
-        for rec in iterable:
-            buckets[group_key(rec)].append(rec)
-
-        results = []
-        for key, records in buckets.items():
-            aggregates = aggregate_records(records)
-            results.append({"group": key, **{k: aggregates[k] for k in measures}})
-
-        return Response({"results": results}, status=status.HTTP_200_OK)
+        rows = attendance_report_rows(qs, group_by, measures)
+        results = list(islice(rows, self.stream_threshold + 1))
+        if len(results) <= self.stream_threshold:
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        return StreamingHttpResponse(
+            _stream_report_results(chain(results, rows)),
+            content_type="application/json",
+        )
@@ -1,17 +1,28 @@
 import hashlib
 import logging
+import queue
+import threading
+import time
+import uuid
 from datetime import timedelta
 from typing import Any, Dict, Optional, Tuple
 
 from django.conf import settings
-from django.db import transaction
+from django.db import connections, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.exceptions import ValidationError
 
 from employees.models import Employee
 
 from .crypto import decrypt_json, encrypt_json
-from .gbpay_service import EmployerGbPayContext, GbPayApiError, GbPayService
+from .gbpay_service import (
+    EmployerGbPayContext,
+    GbPayApiError,
+    GbPayCatalogCache,
+    GbPayService,
+    build_gbpay_session,
+)
 from .models import (
     BillingPaymentAttempt,
     BillingPayout,
@@ -38,6 +49,13 @@ CATEGORY_TYPE_MOBILE = "MOBILE_MONEY"
 FAILURE_ALERT_THRESHOLD = 0.3
 FAILURE_ALERT_MIN_COUNT = 5
 INSUFFICIENT_FUNDS_KEYWORDS = ("insufficient", "not enough", "balance")
+DISPATCH_STATE_RUNNING = "RUNNING"
+DISPATCH_STATE_INTERRUPTED = "INTERRUPTED"
+DISPATCH_STATE_STOPPED = "STOPPED"
+DISPATCH_STATE_FINISHED = "FINISHED"
+DISPATCH_CHECKPOINT_EVERY = 25
+DISPATCH_CHECKPOINT_SECONDS = 30
+DISPATCH_STALE_AFTER = timedelta(minutes=5)
 TERMINAL_SUCCESS = {"SUCCESS", "COMPLETED", "PAID"}
 TERMINAL_FAILURE = {"FAILED", "REJECTED", "CANCELLED", "CANCELED", "REVERSED"}
 
@@ -177,6 +195,8 @@ def save_gbpay_connection(
             connection.credentials_hint = hint
             connection.status = GbPayEmployerConnection.STATUS_PENDING
             connection.save(using=tenant_db, update_fields=["label", "environment", "credentials_encrypted", "credentials_hint", "status", "updated_at"])
+            # New credentials may see a different catalog; drop the cached one.
+            GbPayCatalogCache().invalidate(connection.environment, str(connection.id))
 
     # Validate credentials
     try:
@@ -541,7 +561,12 @@ def process_payout(
     tenant_db: str,
     actor_id: Optional[int] = None,
     allow_retry: bool = False,
+    service: Optional[GbPayService] = None,
 ) -> Dict[str, Any]:
+    """
+    Pay one payout through GbPay. ``service`` lets batch dispatch share one
+    authenticated client (and its connection pool) across payouts.
+    """
     if payout.status == BillingPayout.STATUS_PAID:
         return {"status": "skipped", "reason": "already_paid"}
 
@@ -631,22 +656,23 @@ def process_payout(
                 "next_retry_at",
             ])
 
-    connection = get_active_connection(payout.employer_id, tenant_db)
-    if not connection:
-        attempt.status = BillingPaymentAttempt.STATUS_FAILED
-        attempt.failure_message = "Active GbPay connection not found"
-        attempt.save(using=tenant_db, update_fields=["status", "failure_message"])
-        update_payout_status(
-            payout=payout,
-            tenant_db=tenant_db,
-            status=BillingPayout.STATUS_FAILED,
-            failure_reason="Active GbPay connection not found",
-            actor_id=actor_id,
-        )
-        return {"status": "failed", "reason": "no_connection"}
+    if service is None:
+        connection = get_active_connection(payout.employer_id, tenant_db)
+        if not connection:
+            attempt.status = BillingPaymentAttempt.STATUS_FAILED
+            attempt.failure_message = "Active GbPay connection not found"
+            attempt.save(using=tenant_db, update_fields=["status", "failure_message"])
+            update_payout_status(
+                payout=payout,
+                tenant_db=tenant_db,
+                status=BillingPayout.STATUS_FAILED,
+                failure_reason="Active GbPay connection not found",
+                actor_id=actor_id,
+            )
+            return {"status": "failed", "reason": "no_connection"}
 
-    ctx = build_gbpay_context(connection)
-    service = GbPayService(ctx)
+        ctx = build_gbpay_context(connection)
+        service = GbPayService(ctx)
 
     transfer = GbPayTransfer.objects.using(tenant_db).create(
         employer_id=payout.employer_id,
@@ -834,6 +860,120 @@ def update_batch_status_from_payouts(batch: BillingPayoutBatch, tenant_db: str):
     batch.save(using=tenant_db, update_fields=["status", "processed_at", "updated_at"])
 
 
+def _dispatch_is_stale(dispatch: Dict[str, Any], now) -> bool:
+    heartbeat = parse_datetime(dispatch.get("heartbeat_at") or "")
+    return heartbeat is None or now - heartbeat > DISPATCH_STALE_AFTER
+
+
+def _claim_batch_dispatch(batch: BillingPayoutBatch, tenant_db: str, allow_retry: bool) -> Dict[str, Any]:
+    """
+    Take the dispatch checkpoint of a batch. A run whose heartbeat is fresh
+    blocks the claim; an interrupted or stale run with the same retry mode is
+    resumed, skipping the payouts it already finished.
+    """
+    now = timezone.now()
+    with transaction.atomic(using=tenant_db):
+        locked = BillingPayoutBatch.objects.using(tenant_db).select_for_update().get(pk=batch.pk)
+        metadata = locked.metadata or {}
+        previous = metadata.get("dispatch") or {}
+        state = previous.get("state")
+        if state == DISPATCH_STATE_RUNNING and not _dispatch_is_stale(previous, now):
+            raise ValidationError("Payout batch is already being processed.")
+
+        resumable = state in (DISPATCH_STATE_RUNNING, DISPATCH_STATE_INTERRUPTED)
+        resume = resumable and bool(previous.get("allow_retry")) == allow_retry
+        dispatch = {
+            "run_id": uuid.uuid4().hex,
+            "allow_retry": allow_retry,
+            "started_at": now.isoformat(),
+            "heartbeat_at": now.isoformat(),
+            "state": DISPATCH_STATE_RUNNING,
+            "resumed_from": previous.get("run_id") if resume else None,
+            "completed_payout_ids": list(previous.get("completed_payout_ids") or []) if resume else [],
+            "outcomes": dict(previous.get("outcomes") or {}) if resume else {},
+        }
+        metadata["dispatch"] = dispatch
+        locked.metadata = metadata
+        locked.status = BillingPayoutBatch.STATUS_PROCESSING
+        locked.save(using=tenant_db, update_fields=["metadata", "status", "updated_at"])
+
+    batch.metadata = metadata
+    batch.status = locked.status
+    return dispatch
+
+
+def _save_batch_dispatch(batch: BillingPayoutBatch, tenant_db: str, dispatch: Dict[str, Any], **extra) -> bool:
+    """
+    Persist the checkpoint (and ``extra`` metadata keys) without clobbering
+    other metadata. Returns False when another run has taken the batch over.
+    """
+    dispatch["heartbeat_at"] = timezone.now().isoformat()
+    with transaction.atomic(using=tenant_db):
+        locked = BillingPayoutBatch.objects.using(tenant_db).select_for_update().get(pk=batch.pk)
+        metadata = locked.metadata or {}
+        current = metadata.get("dispatch") or {}
+        if current.get("run_id") != dispatch["run_id"]:
+            return False
+        metadata["dispatch"] = dispatch
+        metadata.update(extra)
+        locked.metadata = metadata
+        locked.save(using=tenant_db, update_fields=["metadata", "updated_at"])
+    batch.metadata = metadata
+    return True
+
+
+def _build_batch_service(batch: BillingPayoutBatch, tenant_db: str, pool_size: int) -> Optional[GbPayService]:
+    """One client per batch: a pooled session and a token fetched once, before workers start."""
+    connection = get_active_connection(batch.employer_id, tenant_db)
+    if not connection:
+        return None
+    service = GbPayService(build_gbpay_context(connection), session=build_gbpay_session(pool_size))
+    try:
+        service.authenticate()
+    except GbPayApiError as exc:
+        # Each payout retries authentication and records the failure itself.
+        logger.warning("GbPay authentication failed before dispatching batch %s: %s", batch.id, exc)
+    return service
+
+
+def _payout_dispatch_worker(
+    work: "queue.Queue",
+    results: "queue.Queue",
+    stop: threading.Event,
+    *,
+    tenant_db: str,
+    actor_id: Optional[int],
+    allow_retry: bool,
+    service: Optional[GbPayService],
+    threaded: bool,
+) -> None:
+    try:
+        while not stop.is_set():
+            try:
+                payout = work.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = process_payout(
+                    payout=payout,
+                    tenant_db=tenant_db,
+                    actor_id=actor_id,
+                    allow_retry=allow_retry,
+                    service=service,
+                )
+            except Exception as exc:  # re-raised by the dispatcher once workers stop
+                stop.set()
+                results.put((payout.id, None, exc))
+                return
+            if result.get("stop_batch"):
+                stop.set()
+            results.put((payout.id, result, None))
+    finally:
+        if threaded:
+            connections.close_all()
+        results.put(None)
+
+
 def process_batch(
     *,
     batch: BillingPayoutBatch,
@@ -841,6 +981,13 @@ def process_batch(
     actor_id: Optional[int] = None,
     allow_retry: bool = False,
 ) -> Dict[str, Any]:
+    """
+    Pay every unpaid payout of a batch, up to ``GBPAY_PAYOUT_CONCURRENCY`` at
+    a time over one shared GbPay client. Progress is checkpointed in
+    ``batch.metadata["dispatch"]`` so a crashed run resumes where it stopped.
+    An insufficient-funds failure stops new payouts from being dispatched;
+    the ones already in flight finish.
+    """
     if batch.status == BillingPayoutBatch.STATUS_COMPLETED:
         return {"status": "skipped", "reason": "already_completed"}
 
@@ -857,25 +1004,97 @@ def process_batch(
             batch.save(using=tenant_db, update_fields=["status", "updated_at"])
         return {"status": "manual", "reason": "manual_mode"}
 
-    batch.status = BillingPayoutBatch.STATUS_PROCESSING
-    batch.save(using=tenant_db, update_fields=["status", "updated_at"])
+    dispatch = _claim_batch_dispatch(batch, tenant_db, allow_retry)
+    completed = set(dispatch["completed_payout_ids"])
+    payouts = [
+        payout
+        for payout in batch.payouts.select_related("employee", "payout_method").all()
+        if payout.status != BillingPayout.STATUS_PAID and str(payout.id) not in completed
+    ]
+
+    concurrency = max(1, int(getattr(settings, "GBPAY_PAYOUT_CONCURRENCY", 1) or 1))
+    workers = min(concurrency, len(payouts))
+    # Worker threads use their own connections and could not see rows of an open transaction.
+    threaded = workers > 0 and not connections[tenant_db].in_atomic_block
+    service = _build_batch_service(batch, tenant_db, workers) if payouts and provider == PROVIDER_NAME else None
+
+    work: "queue.Queue" = queue.Queue()
+    for payout in payouts:
+        work.put(payout)
+    results: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    worker_kwargs = {
+        "tenant_db": tenant_db,
+        "actor_id": actor_id,
+        "allow_retry": allow_retry,
+        "service": service,
+        "threaded": threaded,
+    }
+
+    threads = []
+    if threaded:
+        threads = [
+            threading.Thread(
+                target=_payout_dispatch_worker,
+                args=(work, results, stop),
+                kwargs=worker_kwargs,
+                name=f"gbpay-batch-{batch.id}-{index}",
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+    elif payouts:
+        _payout_dispatch_worker(work, results, stop, **worker_kwargs)
 
     stop_batch = False
-    for payout in batch.payouts.select_related("employee", "payout_method").all():
-        if payout.status == BillingPayout.STATUS_PAID:
-            continue
-        result = process_payout(
-            payout=payout,
-            tenant_db=tenant_db,
-            actor_id=actor_id,
-            allow_retry=allow_retry,
-        )
-        if result.get("stop_batch"):
-            stop_batch = True
-            batch.metadata = batch.metadata or {}
-            batch.metadata["stop_reason"] = "INSUFFICIENT_FUNDS"
-            batch.save(using=tenant_db, update_fields=["metadata", "updated_at"])
-            break
+    error: Optional[BaseException] = None
+    running = len(threads) or (1 if payouts else 0)
+    unsaved = 0
+    last_saved = time.monotonic()
+    try:
+        while running:
+            try:
+                item = results.get(timeout=DISPATCH_CHECKPOINT_SECONDS)
+            except queue.Empty:
+                item = False
+            if item is None:
+                running -= 1
+            elif item:
+                payout_id, result, exc = item
+                if exc is not None:
+                    error = error or exc
+                else:
+                    dispatch["completed_payout_ids"].append(str(payout_id))
+                    outcome = result.get("status") or "unknown"
+                    dispatch["outcomes"][outcome] = dispatch["outcomes"].get(outcome, 0) + 1
+                    unsaved += 1
+                    if result.get("stop_batch") and not stop_batch:
+                        stop_batch = True
+                        _save_batch_dispatch(batch, tenant_db, dispatch, stop_reason="INSUFFICIENT_FUNDS")
+                        unsaved, last_saved = 0, time.monotonic()
+            if unsaved >= DISPATCH_CHECKPOINT_EVERY or time.monotonic() - last_saved >= DISPATCH_CHECKPOINT_SECONDS:
+                if not _save_batch_dispatch(batch, tenant_db, dispatch):
+                    logger.warning("Payout batch %s was taken over by another run; stopping dispatch.", batch.id)
+                    stop.set()
+                unsaved, last_saved = 0, time.monotonic()
+    except BaseException:
+        stop.set()
+        dispatch["state"] = DISPATCH_STATE_INTERRUPTED
+        _save_batch_dispatch(batch, tenant_db, dispatch)
+        raise
+    finally:
+        for thread in threads:
+            thread.join()
+
+    if error is not None:
+        dispatch["state"] = DISPATCH_STATE_INTERRUPTED
+        _save_batch_dispatch(batch, tenant_db, dispatch)
+        raise error
+
+    dispatch["state"] = DISPATCH_STATE_STOPPED if stop_batch else DISPATCH_STATE_FINISHED
+    _save_batch_dispatch(batch, tenant_db, dispatch)
 
     if stop_batch:
         paid_count = batch.payouts.filter(status=BillingPayout.STATUS_PAID).count()
@@ -888,6 +1107,23 @@ def process_batch(
     return {"status": batch.status, "stop_batch": stop_batch}
 
 
+def find_resumable_batches(*, tenant_db: str, employer_id: Optional[int] = None):
+    """Processing batches whose dispatch was interrupted or stopped heart-beating."""
+    now = timezone.now()
+    batches = BillingPayoutBatch.objects.using(tenant_db).filter(
+        status=BillingPayoutBatch.STATUS_PROCESSING,
+        metadata__dispatch__state__in=[DISPATCH_STATE_RUNNING, DISPATCH_STATE_INTERRUPTED],
+    )
+    if employer_id:
+        batches = batches.filter(employer_id=employer_id)
+    return [
+        batch
+        for batch in batches
+        if batch.metadata["dispatch"].get("state") == DISPATCH_STATE_INTERRUPTED
+        or _dispatch_is_stale(batch.metadata["dispatch"], now)
+    ]
+
+
 def _maybe_notify_failure_rate(batch: BillingPayoutBatch, tenant_db: str):
     try:
         total = batch.payouts.count()
@@ -1,11 +1,16 @@
+import hashlib
+import json
 import logging
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
 from django.conf import settings
 from django.core.cache import cache
 
+from accounts.cache_versions import bump_cache_version, get_cache_version
+
 try:
     import requests
 except Exception:  # pragma: no cover - dependency managed via requirements
@@ -53,13 +58,158 @@ class GbPayTokenStore:
         self.cache.set(self._key(connection_id), payload, timeout=expires_in)
 
 
+class GbPayRateLimiter:
+    """
+    Token bucket shared by every thread of this process that calls one GbPay
+    connection; ``GBPAY_MAX_REQUESTS_PER_SECOND`` <= 0 disables limiting.
+    """
+
+    _registry: Dict[str, "GbPayRateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_connection(cls, connection_id: str) -> Optional["GbPayRateLimiter"]:
+        rate = float(getattr(settings, "GBPAY_MAX_REQUESTS_PER_SECOND", 0) or 0)
+        if rate <= 0:
+            return None
+        with cls._registry_lock:
+            limiter = cls._registry.get(connection_id)
+            if limiter is None or limiter.rate != rate:
+                limiter = cls(rate)
+                cls._registry[connection_id] = limiter
+            return limiter
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_gbpay_session(pool_size: int = 10):
+    """``requests.Session`` whose connection pool can serve ``pool_size`` concurrent calls."""
+    if requests is None:
+        raise RuntimeError("requests is required for GbPayService but is not installed.")
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(1, int(pool_size)))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class GbPayCatalogCache:
+    """
+    Per-environment, per-connection cache for GbPay catalog lookups (countries,
+    banks, operators, products, currencies).
+
+    Entries are fresh for ``GBPAY_CATALOG_CACHE_TTL`` seconds. For a further
+    ``GBPAY_CATALOG_STALE_TTL`` seconds they are still served while a single
+    background refresh replaces them (stale-while-revalidate). ``invalidate``
+    drops every catalog of a connection by bumping its version key.
+    """
+
+    REFRESH_LOCK_SECONDS = 60
+
+    def __init__(self, cache_backend=None):
+        self.cache = cache_backend or cache
+        self.ttl = int(getattr(settings, "GBPAY_CATALOG_CACHE_TTL", 3600))
+        self.stale_ttl = int(getattr(settings, "GBPAY_CATALOG_STALE_TTL", 86400))
+
+    def _version_key(self, environment: str, connection_id: str) -> str:
+        return f"gbpay:catalog_version:{environment}:{connection_id}"
+
+    def _version(self, environment: str, connection_id: str) -> str:
+        return get_cache_version(self._version_key(environment, connection_id), cache_backend=self.cache)
+
+    def _key(self, context: EmployerGbPayContext, catalog: str, params: Optional[Dict[str, Any]]) -> str:
+        digest = hashlib.sha256(json.dumps(params or {}, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        version = self._version(context.environment, context.connection_id)
+        return f"gbpay:catalog:{context.environment}:{context.connection_id}:{version}:{catalog}:{digest}"
+
+    def invalidate(self, environment: str, connection_id: str) -> None:
+        bump_cache_version(self._version_key(environment, connection_id), cache_backend=self.cache)
+
+    def _store(self, key: str, data: Any) -> None:
+        self.cache.set(key, {"data": data, "fetched_at": time.time()}, timeout=self.ttl + self.stale_ttl)
+
+    def _refresh_in_background(self, key: str, catalog: str, context: EmployerGbPayContext, fetch: Callable[[], Any]):
+        from .gbpay_ops import emit_metric
+
+        if not self.cache.add(f"{key}:refreshing", True, self.REFRESH_LOCK_SECONDS):
+            return
+
+        def _refresh():
+            try:
+                self._store(key, fetch())
+            except Exception:  # noqa: BLE001 - keep serving the stale entry
+                logger.exception("GbPay %s catalog refresh failed (connection_id=%s)", catalog, context.connection_id)
+                emit_metric("gbpay.catalog.refresh_failed", catalog=catalog, environment=context.environment)
+            finally:
+                self.cache.delete(f"{key}:refreshing")
+
+        threading.Thread(target=_refresh, name=f"gbpay-catalog-{catalog}", daemon=True).start()
+
+    def get_or_fetch(
+        self,
+        context: EmployerGbPayContext,
+        catalog: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any],
+        *,
+        force: bool = False,
+    ) -> Any:
+        """
+        Return the cached value of ``catalog`` for ``params``, calling ``fetch``
+        (which should return the normalized data) on a miss or when ``force``.
+        """
+        from .gbpay_ops import emit_metric
+
+        tags = {"catalog": catalog, "environment": context.environment}
+        key = self._key(context, catalog, params)
+        entry = None if force else self.cache.get(key)
+        if entry is not None:
+            age = time.time() - entry.get("fetched_at", 0)
+            if age < self.ttl:
+                emit_metric("gbpay.catalog.hit", **tags)
+                return entry["data"]
+            if age < self.ttl + self.stale_ttl:
+                emit_metric("gbpay.catalog.stale", **tags)
+                self._refresh_in_background(key, catalog, context, fetch)
+                return entry["data"]
+
+        emit_metric("gbpay.catalog.refresh" if force else "gbpay.catalog.miss", **tags)
+        data = fetch()
+        self._store(key, data)
+        return data
+
+
 class GbPayService:
-    def __init__(self, context: EmployerGbPayContext, token_store: Optional[GbPayTokenStore] = None, session=None):
+    def __init__(
+        self,
+        context: EmployerGbPayContext,
+        token_store: Optional[GbPayTokenStore] = None,
+        session=None,
+        rate_limiter: Optional[GbPayRateLimiter] = None,
+    ):
         if requests is None:
             raise RuntimeError("requests is required for GbPayService but is not installed.")
         self.context = context
         self.token_store = token_store or GbPayTokenStore()
         self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter or GbPayRateLimiter.for_connection(context.connection_id)
         self.timeout = 30
         self.endpoints = getattr(
             settings,
@@ -124,6 +274,8 @@ class GbPayService:
             hdrs.update(headers)
         if auth:
             hdrs.update(self.createAuthenticatedHeaders())
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         try:
             response = self.session.request(
                 method=method.upper(),
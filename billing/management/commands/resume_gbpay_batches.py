@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from rest_framework.exceptions import ValidationError
+
+from accounts.database_utils import get_tenant_database_alias
+from accounts.models import EmployerProfile
+
+from billing.gbpay_ops import find_resumable_batches, process_batch
+
+
+class Command(BaseCommand):
+    help = "Resume GbPay payout batches whose dispatch was interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employer-id", type=int, help="Limit resuming to a specific employer id.")
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+
+        if employer_id:
+            employers = EmployerProfile.objects.filter(id=employer_id)
+        else:
+            employers = EmployerProfile.objects.filter(user__is_active=True)
+
+        resumed = 0
+        for employer in employers:
+            tenant_db = get_tenant_database_alias(employer)
+            if not tenant_db:
+                continue
+            for batch in find_resumable_batches(tenant_db=tenant_db, employer_id=employer.id):
+                try:
+                    result = process_batch(
+                        batch=batch,
+                        tenant_db=tenant_db,
+                        allow_retry=bool(batch.metadata["dispatch"].get("allow_retry")),
+                    )
+                except ValidationError as exc:
+                    self.stdout.write(self.style.WARNING(f"Batch {batch.id} skipped: {exc.detail}"))
+                    continue
+                resumed += 1
+                self.stdout.write(f"Batch {batch.id}: {result.get('status')}")
+
+        self.stdout.write(self.style.SUCCESS(f"Resumed {resumed} GbPay payout batches."))
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from billing import gbpay_ops
+from billing.gbpay_ops import (
+    DISPATCH_STALE_AFTER,
+    DISPATCH_STATE_INTERRUPTED,
+    DISPATCH_STATE_RUNNING,
+    DISPATCH_STATE_STOPPED,
+    _claim_batch_dispatch,
+    process_batch,
+)
+from billing.models import BillingPayout, BillingPayoutBatch
+
+
+class PayoutBatchDispatchTests(TestCase):
+    def setUp(self):
+        self.batch = BillingPayoutBatch.objects.create(
+            employer_id=4242,
+            batch_type=BillingPayoutBatch.TYPE_PAYROLL,
+            status=BillingPayoutBatch.STATUS_PROCESSING,
+        )
+        self.payouts = [
+            BillingPayout.objects.create(
+                employer_id=4242,
+                batch=self.batch,
+                category=BillingPayout.CATEGORY_PAYROLL,
+                amount=Decimal("1000.00"),
+            )
+            for _ in range(3)
+        ]
+        patches = [
+            mock.patch.object(gbpay_ops, "get_payout_provider", return_value=gbpay_ops.PROVIDER_NAME),
+            mock.patch.object(gbpay_ops, "get_active_connection", return_value=object()),
+            mock.patch.object(gbpay_ops, "_build_batch_service", return_value=None),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _set_dispatch(self, **dispatch):
+        self.batch.metadata = {"dispatch": dispatch}
+        self.batch.save(update_fields=["metadata", "updated_at"])
+
+    def test_insufficient_funds_stops_further_dispatch(self):
+        with mock.patch.object(
+            gbpay_ops, "process_payout", return_value={"status": "failed", "stop_batch": True}
+        ) as process_payout:
+            result = process_batch(batch=self.batch, tenant_db="default")
+
+        self.assertEqual(process_payout.call_count, 1)
+        self.assertTrue(result["stop_batch"])
+        self.batch.refresh_from_db()
+        self.assertEqual(self.batch.status, BillingPayoutBatch.STATUS_FAILED)
+        self.assertEqual(self.batch.metadata["stop_reason"], "INSUFFICIENT_FUNDS")
+        self.assertEqual(self.batch.metadata["dispatch"]["state"], DISPATCH_STATE_STOPPED)
+        self.assertEqual(len(self.batch.metadata["dispatch"]["completed_payout_ids"]), 1)
+
+    def test_resumed_run_skips_completed_payouts(self):
+        done = str(self.payouts[0].id)
+        self._set_dispatch(run_id="crashed", state=DISPATCH_STATE_INTERRUPTED, allow_retry=False, completed_payout_ids=[done])
+
+        with mock.patch.object(gbpay_ops, "process_payout", return_value={"status": "processing"}) as process_payout:
+            process_batch(batch=self.batch, tenant_db="default")
+
+        dispatched = {str(call.kwargs["payout"].id) for call in process_payout.call_args_list}
+        self.assertEqual(dispatched, {str(payout.id) for payout in self.payouts[1:]})
+        dispatch = BillingPayoutBatch.objects.get(pk=self.batch.pk).metadata["dispatch"]
+        self.assertEqual(dispatch["resumed_from"], "crashed")
+        self.assertEqual(set(dispatch["completed_payout_ids"]), {str(payout.id) for payout in self.payouts})
+
+    def test_claim_rejects_a_live_run(self):
+        self._set_dispatch(run_id="live", state=DISPATCH_STATE_RUNNING, heartbeat_at=timezone.now().isoformat())
+        with self.assertRaises(ValidationError):
+            _claim_batch_dispatch(self.batch, "default", allow_retry=False)
+
+    def test_claim_takes_over_a_stale_run(self):
+        heartbeat = timezone.now() - DISPATCH_STALE_AFTER - timedelta(minutes=1)
+        done = str(self.payouts[0].id)
+        self._set_dispatch(
+            run_id="stale",
+            state=DISPATCH_STATE_RUNNING,
+            allow_retry=False,
+            heartbeat_at=heartbeat.isoformat(),
+            completed_payout_ids=[done],
+        )
+
+        dispatch = _claim_batch_dispatch(self.batch, "default", allow_retry=False)
+
+        self.assertNotEqual(dispatch["run_id"], "stale")
+        self.assertEqual(dispatch["resumed_from"], "stale")
+        self.assertEqual(dispatch["completed_payout_ids"], [done])
+        stored = BillingPayoutBatch.objects.get(pk=self.batch.pk).metadata["dispatch"]
+        self.assertEqual(stored["run_id"], dispatch["run_id"])
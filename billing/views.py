@@ -68,7 +68,7 @@ from .gbpay_ops import (
     save_gbpay_connection,
     set_connection_active,
 )
-from .gbpay_service import GbPayApiError, GbPayService
+from .gbpay_service import GbPayApiError, GbPayCatalogCache, GbPayService
 from .services import (
     create_invoice_for_subscription,
     create_payout_with_transactions,
@@ -285,6 +285,7 @@ class GbPayConnectionViewSet(BillingTenantViewSet):
         "test": ["billing.gbpay.manage", "billing.manage"],
         "enable": ["billing.gbpay.manage", "billing.manage"],
         "disable": ["billing.gbpay.manage", "billing.manage"],
+        "refresh_catalogs": ["billing.gbpay.manage", "billing.manage"],
         "*": ["billing.manage"],
     }
 
@@ -390,6 +391,12 @@ class GbPayConnectionViewSet(BillingTenantViewSet):
         )
         return api_response(success=True, message="GbPay connection disabled.", data=GbPayConnectionSerializer(connection).data)
 
+    @action(detail=True, methods=["post"], url_path="refresh-catalogs")
+    def refresh_catalogs(self, request, pk=None):
+        connection = self.get_object()
+        GbPayCatalogCache().invalidate(connection.environment, str(connection.id))
+        return api_response(success=True, message="GbPay catalogs will be reloaded on next use.", data=GbPayConnectionSerializer(connection).data)
+
 
 class PayoutMethodViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsEmployee]
@@ -462,6 +469,11 @@ class GbPayCatalogContextMixin(BillingEmployerContextMixin):
         ctx = build_gbpay_context(connection)
         return GbPayService(ctx)
 
+    def cached_catalog(self, service: GbPayService, catalog: str, params, fetch):
+        """Serve a normalized catalog from the connection's catalog cache (``?refresh=true`` bypasses it)."""
+        force = str(self.request.query_params.get("refresh") or "").lower() in ["true", "1", "yes"]
+        return GbPayCatalogCache().get_or_fetch(service.context, catalog, params, fetch, force=force)
+
     @staticmethod
     def _unwrap_payload(payload):
         if isinstance(payload, dict):
@@ -590,11 +602,16 @@ class GbPayCountriesView(GbPayCatalogContextMixin, APIView):
         provider_type = self._normalize_provider_type(provider_type)
         if not provider_type:
             provider_type = "BANK_ACCOUNT"
+        service = self.get_gbpay_service()
         try:
-            payload = self.get_gbpay_service().getCountries(provider_type)
+            data = self.cached_catalog(
+                service,
+                "countries",
+                {"type": provider_type},
+                lambda: self._normalize_countries(self._unwrap_payload(service.getCountries(provider_type)) or []),
+            )
         except GbPayApiError as exc:
             raise ValidationError(str(exc))
-        data = self._normalize_countries(self._unwrap_payload(payload) or [])
         return api_response(success=True, message="GbPay countries retrieved.", data=data)
 
 
@@ -606,11 +623,18 @@ class GbPayBanksView(GbPayCatalogContextMixin, APIView):
         country_id = request.query_params.get("country_id") or request.query_params.get("countryId")
         if not country_id:
             raise ValidationError("country_id is required.")
+        service = self.get_gbpay_service()
         try:
-            payload = self.get_gbpay_service().getSimplifiedBanksByCountry(country_id)
+            data = self.cached_catalog(
+                service,
+                "banks",
+                {"country_id": country_id},
+                lambda: self._normalize_banks(
+                    self._unwrap_payload(service.getSimplifiedBanksByCountry(country_id)) or []
+                ),
+            )
         except GbPayApiError as exc:
             raise ValidationError(str(exc))
-        data = self._normalize_banks(self._unwrap_payload(payload) or [])
         return api_response(success=True, message="GbPay banks retrieved.", data=data)
 
 
@@ -622,11 +646,18 @@ class GbPayOperatorsView(GbPayCatalogContextMixin, APIView):
         country_id = request.query_params.get("country_id") or request.query_params.get("countryId")
         if not country_id:
             raise ValidationError("country_id is required.")
+        service = self.get_gbpay_service()
         try:
-            payload = self.get_gbpay_service().getSimplifiedOperatorsByCountry(country_id)
+            data = self.cached_catalog(
+                service,
+                "operators",
+                {"country_id": country_id},
+                lambda: self._normalize_operators(
+                    self._unwrap_payload(service.getSimplifiedOperatorsByCountry(country_id)) or []
+                ),
+            )
         except GbPayApiError as exc:
             raise ValidationError(str(exc))
-        data = self._normalize_operators(self._unwrap_payload(payload) or [])
         return api_response(success=True, message="GbPay operators retrieved.", data=data)
 
 
@@ -647,11 +678,18 @@ class GbPayProductsView(GbPayCatalogContextMixin, APIView):
             raise ValidationError("category is required.")
         if not country_id:
             raise ValidationError("country_id is required.")
+        service = self.get_gbpay_service()
         try:
-            payload = self.get_gbpay_service().getCategoryProducts(category, country_id)
+            data = self.cached_catalog(
+                service,
+                "products",
+                {"category": category, "country_id": country_id},
+                lambda: self._normalize_products(
+                    self._unwrap_payload(service.getCategoryProducts(category, country_id)) or []
+                ),
+            )
         except GbPayApiError as exc:
             raise ValidationError(str(exc))
-        data = self._normalize_products(self._unwrap_payload(payload) or [])
         return api_response(success=True, message="GbPay products retrieved.", data=data)
 
 
@@ -663,11 +701,18 @@ class GbPayCurrenciesView(GbPayCatalogContextMixin, APIView):
         country_code = request.query_params.get("country_code") or request.query_params.get("countryCode")
         if not country_code:
             raise ValidationError("country_code is required.")
+        service = self.get_gbpay_service()
         try:
-            payload = self.get_gbpay_service().getSupportedCurrencies(country_code)
+            data = self.cached_catalog(
+                service,
+                "currencies",
+                {"country_code": country_code},
+                lambda: self._normalize_currencies(
+                    self._unwrap_payload(service.getSupportedCurrencies(country_code)) or []
+                ),
+            )
         except GbPayApiError as exc:
             raise ValidationError(str(exc))
-        data = self._normalize_currencies(self._unwrap_payload(payload) or [])
         return api_response(success=True, message="GbPay currencies retrieved.", data=data)
 
 
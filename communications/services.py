@@ -185,7 +185,7 @@ def create_audit_log(
 
 
 def send_communication(*, communication, employer, tenant_db, actor_user_id=None, request=None):
-    from employees.utils import notify_employee_user
+    from accounts.notifications import create_notifications_bulk
 
     targets = list(communication.targets.all())
     employees = resolve_target_employees(
@@ -206,26 +206,28 @@ def send_communication(*, communication, employer, tenant_db, actor_user_id=None
     communication.updated_by_id = actor_user_id
     communication.save(using=tenant_db, update_fields=["status", "sent_at", "updated_by_id", "updated_at"])
 
-    for employee in employees:
-        try:
-            notify_employee_user(
-                employee,
-                title=communication.title,
-                body=communication.body[:180] if communication.body else "",
-                type="ACTION" if communication.requires_ack else "INFO",
-                data={
-                    "event": "communications.sent",
-                    "communication_id": str(communication.id),
-                    "type": communication.type,
-                    "priority": communication.priority,
-                    "requires_ack": communication.requires_ack,
-                    "allow_response": communication.allow_response,
-                    "path": f"/employee/communications/{communication.id}",
-                },
-                employer_profile=employer,
-            )
-        except Exception:
-            continue
+    payload = {
+        "title": communication.title,
+        "body": communication.body[:180] if communication.body else "",
+        "type": "ACTION" if communication.requires_ack else "INFO",
+        "data": {
+            "event": "communications.sent",
+            "communication_id": str(communication.id),
+            "type": communication.type,
+            "priority": communication.priority,
+            "requires_ack": communication.requires_ack,
+            "allow_response": communication.allow_response,
+            "path": f"/employee/communications/{communication.id}",
+        },
+    }
+    try:
+        create_notifications_bulk(
+            [(employee.user_id, payload) for employee in employees if employee.user_id],
+            employer_profile=employer,
+        )
+    except Exception:
+        # In-app notifications must not block sending the communication.
+        pass
 
     create_audit_log(
         communication=communication,
@@ -80,6 +80,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'accounts.middleware.TenantDatabaseMiddleware',  # Add tenant context middleware
+    'contracts.middleware.ContractConfigScopeMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -118,12 +119,17 @@ DATABASES = {
     }
 }
 
+# Tenant database connections (see accounts.database_utils.TenantConnectionManager)
+TENANT_DB_CONN_MAX_AGE = config('TENANT_DB_CONN_MAX_AGE', default=60, cast=int)
+TENANT_DB_CONN_HEALTH_CHECKS = config('TENANT_DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+TENANT_DB_MAX_OPEN_CONNECTIONS = config('TENANT_DB_MAX_OPEN_CONNECTIONS', default=50, cast=int)
+TENANT_ADMIN_DB_POOL_SIZE = config('TENANT_ADMIN_DB_POOL_SIZE', default=2, cast=int)
+# Probe every tenant for kiosk tokens/slugs missing from the central indexes (legacy, off once backfilled)
+TENANT_INDEX_SCAN_FALLBACK = config('TENANT_INDEX_SCAN_FALLBACK', default=False, cast=bool)
+
 # Database Router for Multi-tenancy
 DATABASE_ROUTERS = ['accounts.database_router.TenantDatabaseRouter']
 
-# Thread-local tenant context (set by middleware)
-CURRENT_TENANT_DB = None
-
 
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
@@ -259,6 +265,12 @@ ASSISTANT_OPENAI_MAX_TOKENS = config('ASSISTANT_OPENAI_MAX_TOKENS', default=700,
 # GbPay Integration
 GBPAY_API_BASE_URL = config('GBPAY_API_BASE_URL', default='https://mygbpay.com/backend/api/v1')
 GBPAY_MOCK_MODE = config('GBPAY_MOCK_MODE', default=False, cast=bool)
+# GbPay catalog cache: fresh for CACHE_TTL seconds, then served stale (and refreshed) for STALE_TTL more.
+GBPAY_CATALOG_CACHE_TTL = config('GBPAY_CATALOG_CACHE_TTL', default=3600, cast=int)
+GBPAY_CATALOG_STALE_TTL = config('GBPAY_CATALOG_STALE_TTL', default=86400, cast=int)
+# Payout batches: concurrent payouts per batch and per-connection request rate (0 = unlimited).
+GBPAY_PAYOUT_CONCURRENCY = config('GBPAY_PAYOUT_CONCURRENCY', default=4, cast=int)
+GBPAY_MAX_REQUESTS_PER_SECOND = config('GBPAY_MAX_REQUESTS_PER_SECOND', default=10, cast=float)
 GBPAY_ENCRYPTION_KEY = config('GBPAY_ENCRYPTION_KEY', default='')
 GBPAY_ENDPOINTS = {
     "authenticate": "/authenticate/auth/login",
@@ -279,12 +291,22 @@ GBPAY_MOCK_BANKS = []
 GBPAY_MOCK_OPERATORS = []
 
 # Multi-tenancy Settings
-CURRENT_TENANT_DB = None  # Thread-local storage for current tenant database
 REQUIRE_EMPLOYER_CONTEXT_FOR_EMPLOYEE_ENDPOINTS = config(
     'REQUIRE_EMPLOYER_CONTEXT_FOR_EMPLOYEE_ENDPOINTS',
     default=False,
     cast=bool,
 )
+# HMAC key for the cross-tenant duplicate-detection index (employees.match_index).
+# Changing it requires `python manage.py build_employee_match_index`.
+EMPLOYEE_MATCH_INDEX_SECRET = config('EMPLOYEE_MATCH_INDEX_SECRET', default=SECRET_KEY)
+# Run API-triggered time-off accrual runs in a background thread (inline when False).
+TIMEOFF_ACCRUAL_RUN_ASYNC = config('TIMEOFF_ACCRUAL_RUN_ASYNC', default=True, cast=bool)
+# Render queued contract documents on a background worker pool (inline when False).
+CONTRACTS_DOCUMENT_RENDER_ASYNC = config('CONTRACTS_DOCUMENT_RENDER_ASYNC', default=True, cast=bool)
+CONTRACTS_DOCUMENT_RENDER_WORKERS = config('CONTRACTS_DOCUMENT_RENDER_WORKERS', default=2, cast=int)
+# Bulk document generation: render processes and per-request contract cap.
+CONTRACTS_DOCUMENT_RENDER_PROCESSES = config('CONTRACTS_DOCUMENT_RENDER_PROCESSES', default=4, cast=int)
+CONTRACTS_BULK_DOCUMENT_MAX_CONTRACTS = config('CONTRACTS_BULK_DOCUMENT_MAX_CONTRACTS', default=500, cast=int)
 
 
 # Cache Configuration (for password reset codes)
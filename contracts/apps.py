@@ -5,3 +5,7 @@ class ContractsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contracts'
     verbose_name = 'Employee Contracts'
+
+    def ready(self):
+        # Import signals so configuration writes invalidate the resolver cache
+        from . import signals  # noqa: F401
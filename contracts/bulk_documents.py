@@ -0,0 +1,297 @@
+"""
+Bulk contract document generation.
+
+Contracts matching a filter are prepared in the calling process: templates are
+resolved and compiled once per contract type, and the employer profile and
+user signatures once per batch. The CPU-bound rendering runs in a process pool,
+and every contract ends with a ``ContractDocument`` row: GENERATED with its
+file, or FAILED with the error. ``stream_documents_zip`` packs the generated
+files (plus a manifest of per-contract statuses) into a streamed ZIP archive.
+
+This module must stay importable before ``django.setup()`` runs (spawned
+workers unpickle ``_render_document_task`` first), so model imports are local.
+"""
+import csv
+import io
+import logging
+import multiprocessing
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class DocumentRenderTask:
+    index: int
+    contract_id: str
+    compiled: Any
+    inputs: Dict[str, Any]
+
+
+@dataclass
+class BulkDocumentReport:
+    batch_id: uuid.UUID
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def generated(self) -> int:
+        return sum(1 for row in self.results if row["status"] == "GENERATED")
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for row in self.results if row["status"] == "FAILED")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "batch_id": str(self.batch_id),
+            "total": len(self.results),
+            "generated": self.generated,
+            "failed": self.failed,
+            "results": self.results,
+        }
+
+
+def select_bulk_contracts(
+    *,
+    queryset,
+    branch_id=None,
+    department_id=None,
+    contract_type=None,
+    status=None,
+    expiring_within_days=None,
+    contract_ids=None,
+    today=None,
+):
+    """Apply the bulk filters to a contract queryset (already scoped to one employer)."""
+    from django.utils import timezone
+
+    if branch_id:
+        queryset = queryset.filter(branch_id=branch_id)
+    if department_id:
+        queryset = queryset.filter(department_id=department_id)
+    if contract_type:
+        queryset = queryset.filter(contract_type=contract_type)
+    if status:
+        queryset = queryset.filter(status=status)
+    if contract_ids:
+        queryset = queryset.filter(id__in=contract_ids)
+    if expiring_within_days is not None:
+        today = today or timezone.now().date()
+        queryset = queryset.filter(
+            end_date__isnull=False,
+            end_date__gte=today,
+            end_date__lte=today + timedelta(days=int(expiring_within_days)),
+        )
+    return queryset
+
+
+def _init_render_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _render_document_task(task: DocumentRenderTask) -> Dict[str, Any]:
+    """Worker entry point: render one contract and return its bytes."""
+    from contracts.services import render_contract_content
+
+    payload: Dict[str, Any] = {"index": task.index, "content": None, "file_name": None, "error": None}
+    try:
+        content_file, file_name = render_contract_content(task.contract_id, task.compiled, task.inputs)
+    except Exception as exc:  # noqa: BLE001 - reported per contract
+        payload["error"] = str(exc)
+        return payload
+    payload["content"] = content_file.read()
+    payload["file_name"] = file_name
+    return payload
+
+
+def _render_tasks(tasks: List[DocumentRenderTask], max_workers: int) -> Iterator[Dict[str, Any]]:
+    if max_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield _render_document_task(task)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(tasks)),
+        mp_context=context,
+        initializer=_init_render_worker,
+    ) as executor:
+        futures = {executor.submit(_render_document_task, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                yield future.result()
+            except Exception as exc:  # noqa: BLE001 - worker crashed
+                yield {"index": task.index, "content": None, "file_name": None, "error": str(exc)}
+
+
+def generate_contract_documents(
+    contracts: Iterable,
+    *,
+    template=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_id: Optional[uuid.UUID] = None,
+) -> BulkDocumentReport:
+    """
+    Generate the document of every contract. Contracts whose render
+    fingerprint matches their current document are not re-rendered.
+    """
+    from django.core.files.base import ContentFile
+
+    from contracts.services import (
+        build_contract_render_inputs,
+        contract_render_fingerprint,
+        find_cached_contract_document,
+        get_compiled_template,
+        record_failed_contract_document,
+        resolve_default_template,
+        store_contract_document,
+    )
+
+    report = BulkDocumentReport(batch_id=batch_id or uuid.uuid4())
+    contracts = list(contracts)
+    shared: Dict[Any, Any] = {}
+    templates: Dict[str, Any] = {}
+    pending: Dict[int, Dict[str, Any]] = {}
+    tasks: List[DocumentRenderTask] = []
+
+    def _result(contract, status, document=None, error=None, cached=False):
+        return {
+            "contract": str(contract.id),
+            "contract_id": contract.contract_id,
+            "status": status,
+            "document_id": document.id if document else None,
+            "cached": cached,
+            "error": error,
+        }
+
+    def _fail(contract, contract_template, error):
+        document = record_failed_contract_document(contract, contract_template, error, batch_id=report.batch_id)
+        report.results.append(_result(contract, "FAILED", document, error))
+
+    def _template_for(contract):
+        if template is not None:
+            return template
+        if contract.contract_type not in templates:
+            try:
+                templates[contract.contract_type] = resolve_default_template(contract)
+            except ValueError:
+                templates[contract.contract_type] = None
+        return templates[contract.contract_type]
+
+    for index, contract in enumerate(contracts):
+        contract_template = _template_for(contract)
+        if contract_template is None:
+            _fail(contract, None, f"No default template found for contract type {contract.contract_type}")
+            continue
+        try:
+            compiled = get_compiled_template(contract_template, contract.contract_type)
+            inputs = build_contract_render_inputs(contract, shared=shared)
+            fingerprint = contract_render_fingerprint(contract, compiled, inputs)
+        except Exception as exc:  # noqa: BLE001 - reported per contract
+            _fail(contract, contract_template, str(exc))
+            continue
+
+        cached = find_cached_contract_document(contract, contract_template, fingerprint)
+        if cached:
+            report.results.append(_result(contract, "GENERATED", cached, cached=True))
+            continue
+
+        pending[index] = {"contract": contract, "template": contract_template, "fingerprint": fingerprint}
+        tasks.append(
+            DocumentRenderTask(index=index, contract_id=contract.contract_id, compiled=compiled, inputs=inputs)
+        )
+
+    for rendered in _render_tasks(tasks, max_workers):
+        entry = pending.pop(rendered["index"])
+        contract = entry["contract"]
+        if rendered["error"]:
+            _fail(contract, entry["template"], rendered["error"])
+            continue
+        try:
+            document = store_contract_document(
+                contract,
+                entry["template"],
+                ContentFile(rendered["content"]),
+                rendered["file_name"],
+                entry["fingerprint"],
+                batch_id=report.batch_id,
+            )
+        except Exception as exc:  # noqa: BLE001 - reported per contract
+            logger.exception("Storing the document of contract %s failed", contract.id)
+            _fail(contract, entry["template"], str(exc))
+            continue
+        report.results.append(_result(contract, "GENERATED", document))
+
+    return report
+
+
+class _ZipStream:
+    """Write-only sink that hands buffered ZIP bytes back to the caller."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _manifest_csv(report: BulkDocumentReport) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["contract_id", "status", "document_id", "cached", "error"])
+    for row in report.results:
+        writer.writerow([row["contract_id"], row["status"], row["document_id"] or "", row["cached"], row["error"] or ""])
+    return buffer.getvalue()
+
+
+def stream_documents_zip(report: BulkDocumentReport, db_alias: str) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the generated documents of a bulk run, one file at a
+    time, followed by ``manifest.csv`` with every contract's status.
+    """
+    from contracts.models import ContractDocument
+
+    document_ids = [row["document_id"] for row in report.results if row["status"] == "GENERATED"]
+    documents = ContractDocument.objects.using(db_alias).filter(id__in=document_ids).order_by("name")
+
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for document in documents.iterator():
+            if not document.file:
+                continue
+            try:
+                document.file.open("rb")
+            except Exception:  # noqa: BLE001 - file vanished; listed in the manifest
+                logger.warning("Skipping missing file of contract document %s", document.id)
+                continue
+            try:
+                with archive.open(document.name, mode="w") as entry:
+                    for chunk in iter(lambda: document.file.read(ZIP_CHUNK_SIZE), b""):
+                        entry.write(chunk)
+                        data = stream.pop()
+                        if data:
+                            yield data
+            finally:
+                document.file.close()
+        archive.writestr("manifest.csv", _manifest_csv(report))
+    yield stream.pop()
@@ -0,0 +1,90 @@
+"""
+Memoized ``ContractConfiguration`` lookups.
+
+``Contract.get_config_for`` resolves the (global, type-specific) configuration
+pair of an employer through ``resolve_contract_configs``. Inside a
+``contract_config_scope`` (every HTTP request via ``ContractConfigScopeMiddleware``,
+payroll runs and validation) each (db_alias, employer, contract_type) pair is
+loaded at most once. Across requests the pair is cached under a key embedding a
+per-employer version that the ContractConfiguration post_save/post_delete
+signals bump, so viewset, admin and ``global_config`` writes are seen at once.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+
+from accounts.cache_versions import bump_cache_version, get_cache_version
+
+CONTRACT_CONFIG_CACHE_TTL_SECONDS = 300
+
+_scope_memo = ContextVar('contract_config_scope', default=None)
+
+
+@contextmanager
+def contract_config_scope():
+    """
+    Memoize configuration lookups until the block exits. Nested scopes share
+    the outermost memo; also usable as a function decorator.
+    """
+    if _scope_memo.get() is not None:
+        yield
+        return
+    token = _scope_memo.set({})
+    try:
+        yield
+    finally:
+        _scope_memo.reset(token)
+
+
+def _version_key(employer_id) -> str:
+    return f"contract_config_version:{employer_id}"
+
+
+def get_contract_config_version(employer_id) -> str:
+    return get_cache_version(_version_key(employer_id))
+
+
+def bump_contract_config_version(employer_id) -> None:
+    """Invalidate the cached configurations of an employer, including the current scope."""
+    if not employer_id:
+        return
+    bump_cache_version(_version_key(employer_id))
+    memo = _scope_memo.get()
+    if memo:
+        for key in [key for key in memo if key[1] == str(employer_id)]:
+            memo.pop(key, None)
+
+
+def _load_contract_configs(employer_id, contract_type, db_alias):
+    from .models import ContractConfiguration
+
+    configs = ContractConfiguration.objects.using(db_alias).filter(employer_id=employer_id)
+    type_config = None
+    if contract_type:
+        type_config = configs.filter(contract_type=contract_type).first()
+    global_config = configs.filter(contract_type__isnull=True).first()
+    return global_config, type_config
+
+
+def resolve_contract_configs(employer_id, contract_type=None, db_alias='default'):
+    """Return the (global_config, type_config) pair, memoized per scope and cached across requests."""
+    if not employer_id:
+        return None, None
+    memo_key = (db_alias, str(employer_id), contract_type or '')
+    memo = _scope_memo.get()
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    cache_key = (
+        f"contract_config:{db_alias}:{employer_id}:{contract_type or '-'}:"
+        f"{get_contract_config_version(employer_id)}"
+    )
+    configs = cache.get(cache_key)
+    if configs is None:
+        configs = _load_contract_configs(employer_id, contract_type, db_alias)
+        cache.set(cache_key, configs, timeout=CONTRACT_CONFIG_CACHE_TTL_SECONDS)
+
+    if memo is not None:
+        memo[memo_key] = configs
+    return configs
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from contracts.bulk_documents import (
+    DEFAULT_MAX_WORKERS,
+    generate_contract_documents,
+    select_bulk_contracts,
+    stream_documents_zip,
+)
+from contracts.models import Contract
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate contract documents in bulk (e.g. year-end renewals) for every tenant or one employer. "
+        "Each contract gets a GENERATED or FAILED ContractDocument row; --output-dir also writes one ZIP per tenant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employer-id", dest="employer_id", type=int, help="Limit the run to a single employer.")
+        parser.add_argument("--branch-id", dest="branch_id", help="Only contracts of this branch.")
+        parser.add_argument("--department-id", dest="department_id", help="Only contracts of this department.")
+        parser.add_argument("--contract-type", dest="contract_type", help="Only contracts of this type (e.g. FIXED_TERM).")
+        parser.add_argument("--status", dest="status", help="Only contracts in this status (e.g. ACTIVE).")
+        parser.add_argument(
+            "--expiring-within-days",
+            dest="expiring_within_days",
+            type=int,
+            help="Only contracts ending between today and today + N days.",
+        )
+        parser.add_argument(
+            "--workers",
+            dest="workers",
+            type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=f"Render processes (default {DEFAULT_MAX_WORKERS}; 1 renders inline).",
+        )
+        parser.add_argument("--output-dir", dest="output_dir", help="Write contracts_<employer>_<batch>.zip files here.")
+
+    def handle(self, *args, **options):
+        if options.get("expiring_within_days") is not None and options["expiring_within_days"] < 0:
+            raise CommandError("--expiring-within-days must be zero or positive.")
+        output_dir = Path(options["output_dir"]) if options.get("output_dir") else None
+        if output_dir:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if options.get("employer_id"):
+            tenants = tenants.filter(id=options["employer_id"])
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        generated = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Generating contract documents for {alias}...")
+            try:
+                contracts = select_bulk_contracts(
+                    queryset=Contract.objects.using(alias).filter(employer_id=employer.id),
+                    branch_id=options.get("branch_id"),
+                    department_id=options.get("department_id"),
+                    contract_type=options.get("contract_type"),
+                    status=options.get("status"),
+                    expiring_within_days=options.get("expiring_within_days"),
+                )
+                contracts = (
+                    contracts.select_related("employee", "branch", "department")
+                    .prefetch_related("allowances", "deductions")
+                    .order_by("contract_id")
+                )
+                report = generate_contract_documents(contracts, max_workers=options["workers"])
+                if output_dir and report.results:
+                    archive_path = output_dir / f"contracts_{employer.id}_{report.batch_id}.zip"
+                    with archive_path.open("wb") as archive:
+                        for chunk in stream_documents_zip(report, alias):
+                            archive.write(chunk)
+                    self.stdout.write(f"  Wrote {archive_path}")
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+                continue
+            generated += report.generated
+            self.stdout.write(
+                f"  {report.generated}/{len(report.results)} document(s) generated, {report.failed} failed "
+                f"(batch {report.batch_id})."
+            )
+            for row in report.results:
+                if row["status"] == "FAILED":
+                    self.stderr.write(f"    {row['contract_id']}: {row['error']}")
+            if report.failed:
+                failures += 1
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} tenant(s) reporting failures."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Generated {generated} document(s) across {total} tenant(s)."))
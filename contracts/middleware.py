@@ -0,0 +1,15 @@
+"""
+Middleware scoping ContractConfiguration lookups to the request.
+"""
+from .config_resolver import contract_config_scope
+
+
+class ContractConfigScopeMiddleware:
+    """Memoize contract configuration lookups for the duration of each request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with contract_config_scope():
+            return self.get_response(request)
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:48
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0014_merge_20260226_0903'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractdocument',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the render inputs (contract data, template version, signatures)', max_length=64, null=True),
+        ),
+        migrations.CreateModel(
+            name='ContractDocumentJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('employer_id', models.IntegerField(db_index=True, help_text='ID of the employer (from main database)')),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], db_index=True, default='QUEUED', max_length=10)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_by', models.IntegerField(blank=True, help_text='User ID from main DB', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('contract', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_jobs', to='contracts.contract')),
+                ('document', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contracts.contractdocument')),
+                ('template', models.ForeignKey(blank=True, help_text='Explicit template; the default template of the contract type when empty', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contracts.contracttemplate')),
+            ],
+            options={
+                'db_table': 'contract_document_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contracts', '0015_document_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contractdocument',
+            name='batch_id',
+            field=models.UUIDField(blank=True, db_index=True, help_text='Bulk generation run that produced this row', null=True),
+        ),
+        migrations.AddField(
+            model_name='contractdocument',
+            name='error',
+            field=models.TextField(blank=True, help_text='Why generation failed', null=True),
+        ),
+        migrations.AddField(
+            model_name='contractdocument',
+            name='status',
+            field=models.CharField(choices=[('GENERATED', 'Generated'), ('FAILED', 'Failed')], db_index=True, default='GENERATED', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='contractdocument',
+            name='file',
+            field=models.FileField(blank=True, help_text='The generated document file (empty when generation failed)', upload_to='contract_documents/'),
+        ),
+    ]
@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 import uuid
 from decimal import Decimal
 from datetime import timedelta
+from .config_resolver import resolve_contract_configs
 from .configuration_defaults import SIGNATURE_METHOD_CHOICES
 
 User = get_user_model()
@@ -234,24 +235,9 @@ class Contract(models.Model):
     def get_config_for(cls, employer_id, contract_type=None, db_alias='default'):
         """
         Fetch the global and type-specific configurations for an employer.
-        Returns a tuple of (global_config, type_config).
+        Returns a tuple of (global_config, type_config), memoized per request.
         """
-        if not employer_id:
-            return None, None
-
-        type_config = None
-        if contract_type:
-            type_config = ContractConfiguration.objects.using(db_alias).filter(
-                employer_id=employer_id, 
-                contract_type=contract_type
-            ).first()
-
-        global_config = ContractConfiguration.objects.using(db_alias).filter(
-            employer_id=employer_id, 
-            contract_type__isnull=True
-        ).first()
-
-        return global_config, type_config
+        return resolve_contract_configs(employer_id, contract_type, db_alias)
 
     @classmethod
     def get_effective_config_value(cls, employer_id, contract_type, field_name, default=None, db_alias='default'):
@@ -1715,6 +1701,11 @@ class ContractTemplate(models.Model):
 
 class ContractDocument(models.Model):
     """Generated contract document (PDF/DOCX)"""
+
+    STATUS_CHOICES = [
+        ('GENERATED', 'Generated'),
+        ('FAILED', 'Failed'),
+    ]
     
     contract = models.ForeignKey(
         Contract,
@@ -1735,7 +1726,27 @@ class ContractDocument(models.Model):
     
     file = models.FileField(
         upload_to='contract_documents/',
-        help_text='The generated document file'
+        blank=True,
+        help_text='The generated document file (empty when generation failed)'
+    )
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='GENERATED', db_index=True)
+
+    error = models.TextField(blank=True, null=True, help_text='Why generation failed')
+
+    batch_id = models.UUIDField(
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text='Bulk generation run that produced this row'
+    )
+
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text='SHA-256 of the render inputs (contract data, template version, signatures)'
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -1750,6 +1761,54 @@ class ContractDocument(models.Model):
         return f"{self.name} - {self.contract.contract_id}"
 
 
+class ContractDocumentJob(models.Model):
+    """Background rendering request for a contract document."""
+
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+    ACTIVE_STATUSES = ('QUEUED', 'RUNNING')
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employer_id = models.IntegerField(db_index=True, help_text='ID of the employer (from main database)')
+    contract = models.ForeignKey(
+        Contract,
+        on_delete=models.CASCADE,
+        related_name='document_jobs',
+    )
+    template = models.ForeignKey(
+        ContractTemplate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Explicit template; the default template of the contract type when empty'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED', db_index=True)
+    document = models.ForeignKey(
+        ContractDocument,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+    error = models.TextField(blank=True, null=True)
+    created_by = models.IntegerField(null=True, blank=True, help_text='User ID from main DB')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'contract_document_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Document job {self.id} ({self.status})"
+
+
 class ContractTemplateVersion(models.Model):
     """Snapshot of a contract template version."""
 
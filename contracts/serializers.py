@@ -5,7 +5,7 @@ from django.db import transaction
 from .models import (
     Contract, Allowance, Deduction, ContractElement, ContractAmendment,
     ContractConfiguration, ContractComponentTemplate, SalaryScale, CalculationScale, ScaleRange,
-    ContractTemplate, ContractTemplateVersion
+    ContractTemplate, ContractTemplateVersion, ContractDocumentJob
 )
 from timeoff.defaults import merge_time_off_defaults, validate_time_off_config
 from accounts.rbac import get_active_employer, is_delegate_user
@@ -137,6 +137,48 @@ class ContractTemplateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ContractDocumentJobSerializer(serializers.ModelSerializer):
+    document = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContractDocumentJob
+        fields = [
+            'id',
+            'contract',
+            'template',
+            'status',
+            'document',
+            'error',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_document(self, obj):
+        document = obj.document
+        if not document:
+            return None
+        file_url = None
+        if document.file:
+            try:
+                file_url = document.file.url
+            except Exception:
+                file_url = None
+            request = self.context.get('request')
+            if file_url and request:
+                try:
+                    file_url = request.build_absolute_uri(file_url)
+                except Exception:
+                    pass
+        return {
+            'id': document.id,
+            'name': document.name,
+            'file_url': file_url,
+            'created_at': document.created_at,
+        }
+
+
 class ContractTemplateVersionSerializer(serializers.ModelSerializer):
     file_url = serializers.SerializerMethodField()
 
@@ -1,12 +1,28 @@
-﻿import os
+﻿import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
+from typing import NamedTuple, Tuple
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from accounts.models import EmployerProfile
-from .models import Contract, ContractTemplate, ContractDocument
+from accounts.tenant_context import tenant_db_context
+from .models import Contract, ContractTemplate, ContractDocument, ContractDocumentJob
+
+logger = logging.getLogger(__name__)
 
 
 def _basic_pdf_bytes(title: str, body: str) -> bytes:
@@ -135,60 +151,147 @@ def _should_skip_body_line(line: str, employer_info=None, employee_info=None) ->
     return False
 
 
-def generate_contract_pdf(contract, template=None):
-    """
-    Generates a PDF contract document based on a template.
+CONTRACT_RENDERER_VERSION = 1
+TEMPLATE_LAYOUT_CACHE_SIZE = 64
+CONTRACT_DOCUMENT_JOB_STALE_AFTER = timedelta(minutes=15)
 
-    Args:
-        contract (Contract): The contract instance.
-        template (ContractTemplate, optional): Specific template to use.
-            If None, finds default for contract type.
+_PLACEHOLDER_RE = re.compile(r"\{[A-Z_]+\}")
+_template_layouts = OrderedDict()
+_template_layouts_lock = threading.Lock()
 
-    Returns:
-        ContractDocument: The generated document object.
 
-    Raises:
-        ValueError: If no template found.
-        ImportError: If python-docx is not installed.
-    """
+class CompiledTemplate(NamedTuple):
+    """Contract-independent part of a template, reused across renders."""
 
-    # -------------------------------------------------------------------------
-    # 1) Resolve Template
-    # -------------------------------------------------------------------------
-    if not template:
-        db_alias = contract._state.db or "default"
-        template = (
-            ContractTemplate.objects.using(db_alias)
-            .filter(
-                employer_id=contract.employer_id,
-                contract_type=contract.contract_type,
-                is_default=True,
-            )
-            .order_by("-created_at")
-            .first()
-        )
-        if not template:
-            raise ValueError(f"No default template found for contract type {contract.contract_type}")
+    key: str
+    kind: str  # "body" renders through reportlab, "docx" fills a python-docx copy
+    title: str
+    body: str = ""
+    placeholders: Tuple[str, ...] = ()
+    docx_bytes: bytes = b""
+
+
+def _default_template_body(contract_type: str) -> str:
+    from contracts.management.commands.seed_contract_template import BASE_BODY, TYPE_BODIES
+
+    return TYPE_BODIES.get(contract_type, BASE_BODY)
+
+
+def _template_version_key(template, contract_type: str) -> str:
+    file_name = (template.file.name or "") if template.file else ""
+    updated = template.updated_at.isoformat() if template.updated_at else ""
+    return f"{template._state.db}:{template.pk}:{updated}:{file_name}:{contract_type}"
 
-    # -------------------------------------------------------------------------
-    # 2) Prepare Context (placeholder-style strings for templating)
-    # -------------------------------------------------------------------------
-    employer_profile = EmployerProfile.objects.using("default").get(id=contract.employer_id)
-    User = get_user_model()
 
-    def _get_user_signature_path(user_id):
-        """Resolve signature file path + user object from default DB."""
-        if not user_id:
-            return None, None
+def _compile_body(key: str, title: str, body: str) -> CompiledTemplate:
+    body = _clean_body(body) or "Contract"
+    placeholders = tuple(dict.fromkeys(_PLACEHOLDER_RE.findall(body)))
+    return CompiledTemplate(key=key, kind="body", title=title, body=body, placeholders=placeholders)
+
+
+def _compile_template(template, contract_type: str) -> CompiledTemplate:
+    key = _template_version_key(template, contract_type)
+    title = f"{contract_type} CONTRACT"
+    has_file = bool(getattr(template, "file", None)) and bool(getattr(template.file, "name", None))
+    ext = (template.file.name or "").lower() if has_file else ""
+
+    if not has_file or ext.endswith(".pdf"):
+        # PDF templates are always re-rendered from the body with merged context.
+        return _compile_body(key, title, template.body_override or _default_template_body(contract_type))
+
+    try:
+        import docx  # noqa: F401
+    except ImportError:
+        # Fallback if python-docx missing: render a simple PDF from the stock body
+        return _compile_body(key, title, _default_template_body(contract_type))
+
+    try:
+        template.file.open("rb")
         try:
-            user_obj = User.objects.using("default").get(id=user_id)
-            if user_obj.signature and user_obj.signature.name:
-                return user_obj.signature.path, user_obj
-        except Exception:
-            return None, None
+            docx_bytes = template.file.read()
+        finally:
+            template.file.close()
+    except Exception as e:
+        raise ValueError(f"Could not open template file: {e}")
+    return CompiledTemplate(key=key, kind="docx", title=title, docx_bytes=docx_bytes)
+
+
+def get_compiled_template(template, contract_type: str) -> CompiledTemplate:
+    """
+    Return the cleaned body (or DOCX bytes) of a template, compiled once per
+    template version and contract type and kept in a small per-process LRU.
+    """
+    key = _template_version_key(template, contract_type)
+    with _template_layouts_lock:
+        compiled = _template_layouts.get(key)
+        if compiled is not None:
+            _template_layouts.move_to_end(key)
+            return compiled
+    compiled = _compile_template(template, contract_type)
+    with _template_layouts_lock:
+        _template_layouts[key] = compiled
+        while len(_template_layouts) > TEMPLATE_LAYOUT_CACHE_SIZE:
+            _template_layouts.popitem(last=False)
+    return compiled
+
+
+def resolve_default_template(contract):
+    """Return the default template for the contract type, raising ValueError when none exists."""
+    db_alias = contract._state.db or "default"
+    template = (
+        ContractTemplate.objects.using(db_alias)
+        .filter(
+            employer_id=contract.employer_id,
+            contract_type=contract.contract_type,
+            is_default=True,
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if not template:
+        raise ValueError(f"No default template found for contract type {contract.contract_type}")
+    return template
+
+
+def _get_user_signature(user_id):
+    """Resolve signature file path + user object from default DB."""
+    if not user_id:
         return None, None
+    User = get_user_model()
+    try:
+        user_obj = User.objects.using("default").get(id=user_id)
+        if user_obj.signature and user_obj.signature.name:
+            return user_obj.signature.path, user_obj
+    except Exception:
+        return None, None
+    return None, None
+
+
+def _shared_lookup(shared, key, loader):
+    if shared is None:
+        return loader()
+    if key not in shared:
+        shared[key] = loader()
+    return shared[key]
+
 
-    employer_sig_path, employer_user = _get_user_signature_path(getattr(employer_profile, "user_id", None))
+def build_contract_render_inputs(contract, shared=None) -> dict:
+    """
+    Collect everything a render needs: the placeholder ``context`` and the
+    ``employer_info`` / ``employee_info`` party blocks (including signature paths).
+
+    ``shared`` is an optional dict reused across contracts of a batch so the
+    employer profile and user signatures are loaded once.
+    """
+    employer_profile = _shared_lookup(
+        shared,
+        ("employer", contract.employer_id),
+        lambda: EmployerProfile.objects.using("default").get(id=contract.employer_id),
+    )
+    employer_user_id = getattr(employer_profile, "user_id", None)
+    employer_sig_path, employer_user = _shared_lookup(
+        shared, ("signature", employer_user_id), lambda: _get_user_signature(employer_user_id)
+    )
 
     try:
         employee_obj = contract.employee
@@ -196,7 +299,9 @@ def generate_contract_pdf(contract, template=None):
         employee_obj = None
 
     if employee_obj and getattr(employee_obj, "user_id", None):
-        employee_sig_path, employee_user = _get_user_signature_path(employee_obj.user_id)
+        employee_sig_path, employee_user = _shared_lookup(
+            shared, ("signature", employee_obj.user_id), lambda: _get_user_signature(employee_obj.user_id)
+        )
     else:
         employee_sig_path, employee_user = None, None
 
@@ -212,23 +317,7 @@ def generate_contract_pdf(contract, template=None):
 
     allowances_list = [f"{a.name}: {a.amount} ({a.type})" for a in contract.allowances.all()]
     deductions_list = [f"{d.name}: {d.amount} ({d.type})" for d in contract.deductions.all()]
-    allowances_data = [
-        {
-            "name": getattr(a, "name", ""),
-            "amount": getattr(a, "amount", ""),
-            "type": getattr(a, "type", ""),
-        }
-        
-        for a in contract.allowances.all()
-    ]
-    deductions_data = [
-        {
-            "name": getattr(d, "name", ""),
-            "amount": getattr(d, "amount", ""),
-            "type": getattr(d, "type", ""),
-        }
-        for d in contract.deductions.all()
-    ]
+    today = timezone.now().strftime("%Y-%m-%d")
 
     context = {
         "{CO_NAME}": employer_profile.company_name,
@@ -253,8 +342,8 @@ def generate_contract_pdf(contract, template=None):
         "{PROBATION_PERIOD}": getattr(contract, "probation_period", "") if hasattr(contract, "probation_period") else "",
         "{NOTICE_PERIOD}": getattr(contract, "notice_period", "") if hasattr(contract, "notice_period") else "",
         "{HOURS_PER_WEEK}": getattr(contract, "hours_per_week", "") if hasattr(contract, "hours_per_week") else "",
-        "{SIGN_DATE_CO}": timezone.now().strftime("%Y-%m-%d"),
-        "{SIGN_DATE_EMP}": timezone.now().strftime("%Y-%m-%d"),
+        "{SIGN_DATE_CO}": today,
+        "{SIGN_DATE_EMP}": today,
     }
 
     employer_info = {
@@ -262,7 +351,7 @@ def generate_contract_pdf(contract, template=None):
         "email": getattr(employer_user, "email", "") or "",
         "phone": getattr(employer_profile, "phone_number", "") or "",
         "address": getattr(employer_profile, "physical_address", "") or "",
-        "date": timezone.now().strftime("%Y-%m-%d"),
+        "date": today,
         "sig_path": employer_sig_path,
     }
 
@@ -271,407 +360,482 @@ def generate_contract_pdf(contract, template=None):
         "email": getattr(employee_user, "email", "") or getattr(employee_obj, "email", "") or "",
         "phone": getattr(employee_obj, "phone_number", "") or getattr(employee_obj, "phone", "") or "",
         "address": getattr(employee_obj, "address", "") or "",
-        "date": timezone.now().strftime("%Y-%m-%d"),
+        "date": today,
         "sig_path": employee_sig_path,
     }
 
-    signatures_ctx = {
-        "employer": {"path": employer_sig_path, "name": employer_info["name"]},
-        "employee": {"path": employee_sig_path, "name": employee_info["name"]},
-    }
+    return {"context": context, "employer_info": employer_info, "employee_info": employee_info}
 
-    # -------------------------------------------------------------------------
-    # 2b) PDF Renderer (Sweet design, same function/signature)
-    # -------------------------------------------------------------------------
-    def render_pdf_from_body(title: str, body: str) -> ContentFile:
-        """Render a polished PDF using reportlab with placeholder substitution."""
-        body = _clean_body(body or "")
 
-        # Replace placeholders
-        for key, val in context.items():
-            body = body.replace(key, str(val))
-            title = title.replace(key, str(val))
+def _signature_stamp(path):
+    if not path:
+        return None
+    try:
+        return [path, os.path.getmtime(path)]
+    except OSError:
+        return [path, None]
 
-        try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
-            from reportlab.lib import colors
-        except ImportError:
-            # Fallback to a minimal PDF built with stdlib to avoid broken files
-            missing = []
-            if not signatures_ctx["employer"]["path"]:
-                missing.append("Employer signature missing")
-            if not signatures_ctx["employee"]["path"]:
-                missing.append("Employee signature missing")
-            footer = "\n\n".join(missing) if missing else "\n\nSignatures on file."
-            return ContentFile(_basic_pdf_bytes(title, body + "\n\n" + footer))
-
-        def wrap_lines(text, font_name, font_size, max_width, canv):
-            """Wrap text to fit within max_width using the canvas width metrics."""
-            words = text.split()
-            if not words:
-                return [""]
-
-            lines = []
-            current = ""
-            for word in words:
-                candidate = f"{current} {word}".strip()
-                if canv.stringWidth(candidate, font_name, font_size) <= max_width:
-                    current = candidate
-                else:
-                    if current:
-                        lines.append(current)
-                    current = word
+
+def contract_render_fingerprint(contract, compiled: CompiledTemplate, inputs: dict) -> str:
+    """
+    Content hash of a render: contract data, template version and signature
+    files. Two renders with the same fingerprint produce the same document.
+    """
+    payload = {
+        "renderer": CONTRACT_RENDERER_VERSION,
+        "contract_id": contract.contract_id,
+        "template": compiled.key,
+        "context": inputs["context"],
+        "employer": {k: v for k, v in inputs["employer_info"].items() if k != "sig_path"},
+        "employee": {k: v for k, v in inputs["employee_info"].items() if k != "sig_path"},
+        "signatures": [
+            _signature_stamp(inputs["employer_info"]["sig_path"]),
+            _signature_stamp(inputs["employee_info"]["sig_path"]),
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@lru_cache(maxsize=8192)
+def _word_width(word: str, font_name: str, font_size: float) -> float:
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    return stringWidth(word, font_name, font_size)
+
+
+def _wrap_lines(text, font_name, font_size, max_width):
+    """Wrap text to fit within max_width, summing memoized per-word widths."""
+    words = text.split()
+    if not words:
+        return [""]
+
+    space = _word_width(" ", font_name, font_size)
+    lines = []
+    current = []
+    current_width = 0.0
+    for word in words:
+        word_width = _word_width(word, font_name, font_size)
+        candidate_width = current_width + space + word_width if current else word_width
+        if candidate_width <= max_width:
+            current.append(word)
+            current_width = candidate_width
+        else:
             if current:
-                lines.append(current)
-            return lines
-
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-
-        # Layout constants (formal document spacing)
-        margin = 48
-        header_h = 54
-        footer_h = 26
-        content_top = height - margin - header_h
-        content_bottom = margin + footer_h
-        max_width = width - (2 * margin)
-        # Monochrome palette for professional/legal docs
-        ink = colors.HexColor("#111111")
-        muted = colors.HexColor("#666666")
-        line = colors.HexColor("#CFCFCF")
-        y = content_top
-        header_drawn = False
-        def draw_page_frame():
-            # Minimal footer only (no decorative separators)
-            c.setFillColor(muted)
-            c.setFont("Helvetica", 8.5)
-            c.drawString(margin, margin + 10, f"{employer_info['name']} - Employment Contract")
-            c.drawRightString(width - margin, margin + 10, f"Page {c.getPageNumber()}")
-        def draw_title_block():
-            nonlocal y
-            c.setFillColor(ink)
-            c.setFont("Helvetica-Bold", 15)
-            c.drawString(margin, height - margin - 24, title)
-            # Generation metadata
+                lines.append(" ".join(current))
+            current = [word]
+            current_width = word_width
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def _render_pdf(compiled: CompiledTemplate, inputs: dict) -> ContentFile:
+    """Render a polished PDF using reportlab with placeholder substitution."""
+    context = inputs["context"]
+    employer_info = inputs["employer_info"]
+    employee_info = inputs["employee_info"]
+
+    title = compiled.title
+    body = compiled.body
+    for key in compiled.placeholders:
+        if key in context:
+            body = body.replace(key, str(context[key]))
+
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        from reportlab.lib import colors
+    except ImportError:
+        # Fallback to a minimal PDF built with stdlib to avoid broken files
+        missing = []
+        if not employer_info["sig_path"]:
+            missing.append("Employer signature missing")
+        if not employee_info["sig_path"]:
+            missing.append("Employee signature missing")
+        footer = "\n\n".join(missing) if missing else "\n\nSignatures on file."
+        return ContentFile(_basic_pdf_bytes(title, body + "\n\n" + footer))
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    # Layout constants (formal document spacing)
+    margin = 48
+    header_h = 54
+    footer_h = 26
+    content_top = height - margin - header_h
+    content_bottom = margin + footer_h
+    max_width = width - (2 * margin)
+    # Monochrome palette for professional/legal docs
+    ink = colors.HexColor("#111111")
+    muted = colors.HexColor("#666666")
+    y = content_top
+    header_drawn = False
+
+    def draw_page_frame():
+        # Minimal footer only (no decorative separators)
+        c.setFillColor(muted)
+        c.setFont("Helvetica", 8.5)
+        c.drawString(margin, margin + 10, f"{employer_info['name']} - Employment Contract")
+        c.drawRightString(width - margin, margin + 10, f"Page {c.getPageNumber()}")
+
+    def draw_title_block():
+        nonlocal y
+        c.setFillColor(ink)
+        c.setFont("Helvetica-Bold", 15)
+        c.drawString(margin, height - margin - 24, title)
+        # Generation metadata
+        c.setFillColor(muted)
+        c.setFont("Helvetica", 9)
+        c.drawString(margin, height - margin - 39, f"Generated on {timezone.now().strftime('%Y-%m-%d %H:%M')}")
+        y = content_top - 8
+
+    def draw_header_block():
+        """Render formal party metadata rows."""
+        nonlocal y, header_drawn
+        if header_drawn:
+            return
+        c.setFillColor(ink)
+        c.setFont("Helvetica-Bold", 10.2)
+        c.drawString(margin, y, "Contract Parties")
+        y -= 16
+        c.setFont("Helvetica", 9.6)
+        rows = [
+            ("Prepared by", employer_info["name"] or "-"),
+            ("Prepared for", employee_info["name"] or "-"),
+            ("Employer date", employer_info["date"] or "-"),
+            ("Employee date", employee_info["date"] or "-"),
+        ]
+        label_width = 98
+        row_h = 14
+        for label, value in rows:
+            ensure_space(20)
             c.setFillColor(muted)
-            c.setFont("Helvetica", 9)
-            c.drawString(margin, height - margin - 39, f"Generated on {timezone.now().strftime('%Y-%m-%d %H:%M')}")
-            y = content_top - 8
-        def draw_header_block():
-            """Render formal party metadata rows."""
-            nonlocal y, header_drawn
-            if header_drawn:
-                return
+            c.drawString(margin, y, f"{label}:")
             c.setFillColor(ink)
-            c.setFont("Helvetica-Bold", 10.2)
-            c.drawString(margin, y, "Contract Parties")
-            y -= 16
-            c.setFont("Helvetica", 9.6)
-            rows = [
-                ("Prepared by", employer_info["name"] or "-"),
-                ("Prepared for", employee_info["name"] or "-"),
-                ("Employer date", employer_info["date"] or "-"),
-                ("Employee date", employee_info["date"] or "-"),
-            ]
-            label_width = 98
-            row_h = 14
-            for label, value in rows:
-                ensure_space(20)
-                c.setFillColor(muted)
-                c.drawString(margin, y, f"{label}:")
-                c.setFillColor(ink)
-                wrapped_value = wrap_lines(str(value), "Helvetica", 9.6, max_width - label_width, c)
-                c.drawString(margin + label_width, y, wrapped_value[0] if wrapped_value else "-")
+            wrapped_value = _wrap_lines(str(value), "Helvetica", 9.6, max_width - label_width)
+            c.drawString(margin + label_width, y, wrapped_value[0] if wrapped_value else "-")
+            y -= row_h
+            for continuation in wrapped_value[1:2]:
+                c.drawString(margin + label_width, y, continuation)
                 y -= row_h
-                for continuation in wrapped_value[1:2]:
-                    c.drawString(margin + label_width, y, continuation)
-                    y -= row_h
-            y -= 8
-            header_drawn = True
-
-        def new_page():
-            c.showPage()
-            draw_page_frame()
-            draw_title_block()
-
-        def ensure_space(min_needed: float):
-            nonlocal y
-            if y - min_needed < content_bottom:
-                new_page()
-                y = content_top - 8
-
-        # Start first page
+        y -= 8
+        header_drawn = True
+
+    def new_page():
+        c.showPage()
         draw_page_frame()
         draw_title_block()
-        ensure_space(90)
-        draw_header_block()
 
-        # Body rendering
-        c.setFillColor(ink)
-        c.setFont("Helvetica", 10)
-
-        for para in body.split("\n\n"):
-            # Flatten paragraph into wrapped lines
-            para_lines = []
-            for raw_line in para.split("\n"):
-                raw_line = raw_line.strip()
-                if not raw_line:
-                    para_lines.append("")
-                    continue
-                para_lines.extend(wrap_lines(raw_line, "Helvetica", 10, max_width, c))
-
-            # Render lines
-            for line_text in para_lines:
-                lower_text = line_text.strip().lower()
-
-                # Skip legacy signature placeholders from templates and header/address lines
-                if (
-                    lower_text.startswith("12. signatures")
-                    or lower_text.startswith("for ")
-                    or lower_text.startswith("employee (")
-                    or _should_skip_body_line(line_text, employer_info, employee_info)
-                ):
-                    continue
+    def ensure_space(min_needed: float):
+        nonlocal y
+        if y - min_needed < content_bottom:
+            new_page()
+            y = content_top - 8
 
-                # Spacing between empty lines
-                if not line_text.strip():
-                    y -= 8
-                    continue
+    # Start first page
+    draw_page_frame()
+    draw_title_block()
+    ensure_space(90)
+    draw_header_block()
+
+    # Body rendering
+    c.setFillColor(ink)
+    c.setFont("Helvetica", 10)
+
+    for para in body.split("\n\n"):
+        # Flatten paragraph into wrapped lines
+        para_lines = []
+        for raw_line in para.split("\n"):
+            raw_line = raw_line.strip()
+            if not raw_line:
+                para_lines.append("")
+                continue
+            para_lines.extend(_wrap_lines(raw_line, "Helvetica", 10, max_width))
+
+        # Render lines
+        for line_text in para_lines:
+            lower_text = line_text.strip().lower()
+
+            # Skip legacy signature placeholders from templates and header/address lines
+            if (
+                lower_text.startswith("12. signatures")
+                or lower_text.startswith("for ")
+                or lower_text.startswith("employee (")
+                or _should_skip_body_line(line_text, employer_info, employee_info)
+            ):
+                continue
+
+            # Spacing between empty lines
+            if not line_text.strip():
+                y -= 8
+                continue
+
+            ensure_space(24)
+
+            text = line_text.strip()
+
+            # Headings: "1. TERM" style OR all-caps
+            is_heading = (text[:1].isdigit() and ". " in text[:6]) or (text.isupper() and len(text) > 3)
+            if is_heading:
+                # Section heading styling (no rules/lines)
+                c.setFillColor(ink)
+                c.setFont("Helvetica-Bold", 11.2)
+                c.drawString(margin, y, text)
+                y -= 18
+                c.setFillColor(ink)
+                c.setFont("Helvetica", 10)
+                continue
 
-                ensure_space(24)
+            # Normal text
+            c.setFillColor(ink)
+            # Bold important labels
+            bold_line = text.lower().startswith("base salary") or text.lower().startswith("allowances") or text.lower().startswith("deductions")
+            c.setFont("Helvetica-Bold" if bold_line else "Helvetica", 10)
+            c.drawString(margin, y, text)
+            y -= 16
 
-                text = line_text.strip()
+        y -= 14  # paragraph spacing
 
-                # Headings: "1. TERM" style OR all-caps
-                is_heading = (text[:1].isdigit() and ". " in text[:6]) or (text.isupper() and len(text) > 3)
-                if is_heading:
-                    # Section heading styling (no rules/lines)
-                    c.setFillColor(ink)
-                    c.setFont("Helvetica-Bold", 11.2)
-                    c.drawString(margin, y, text)
-                    y -= 18
-                    c.setFillColor(ink)
-                    c.setFont("Helvetica", 10)
-                    continue
+    # ---------------------------------------------------------------------
+    # Signature block (two columns: employer left, employee right)
+    block_height = 140
+    ensure_space(block_height + 24)
 
-                # Normal text
-                c.setFillColor(ink)
-                # Bold important labels
-                bold_line = text.lower().startswith("base salary") or text.lower().startswith("allowances") or text.lower().startswith("deductions")
-                c.setFont("Helvetica-Bold" if bold_line else "Helvetica", 10)
-                c.drawString(margin, y, text)
-                y -= 16
-
-            y -= 14  # paragraph spacing
+    y_sig = y - 6
+    if y_sig - block_height < content_bottom:
+        new_page()
+        y_sig = content_top - 10
 
-        # ---------------------------------------------------------------------
-        # Signature block (two columns: employer left, employee right)
-        block_height = 140
-        ensure_space(block_height + 24)
+    c.setFillColor(ink)
+    c.setFont("Helvetica-Bold", 11)
+    c.drawString(margin, y_sig, "Signatures")
+    y_sig -= 18
 
-        y_sig = y - 6
-        if y_sig - block_height < content_bottom:
-            new_page()
-            y_sig = content_top - 10
+    col_gap = 28
+    col_width = (width - (2 * margin) - col_gap) / 2
+    left_x = margin
+    right_x = margin + col_width + col_gap
 
+    def draw_signature_party(info, x, y_top, role_label):
+        row_h = 14
         c.setFillColor(ink)
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(margin, y_sig, "Signatures")
-        y_sig -= 18
-
-        col_gap = 28
-        col_width = (width - (2 * margin) - col_gap) / 2
-        left_x = margin
-        right_x = margin + col_width + col_gap
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(x, y_top, role_label)
 
-        def draw_signature_party(info, x, y_top, role_label):
-            row_h = 14
-            c.setFillColor(ink)
-            c.setFont("Helvetica-Bold", 10)
-            c.drawString(x, y_top, role_label)
+        c.setFont("Helvetica", 9.5)
+        c.drawString(x, y_top - row_h, f"Name: {info['name'] or '-'}")
+        c.setFillColor(muted)
+        c.drawString(x, y_top - (2 * row_h), f"Email: {info['email'] or '-'}")
+        c.drawString(x, y_top - (3 * row_h), f"Phone: {info['phone'] or '-'}")
+        c.drawString(x, y_top - (4 * row_h), f"Date: {info['date'] or '-'}")
 
-            c.setFont("Helvetica", 9.5)
-            c.drawString(x, y_top - row_h, f"Name: {info['name'] or '-'}")
+        c.setFillColor(ink)
+        c.setFont("Helvetica", 9.5)
+        sig_label_y = y_top - (5 * row_h) - 4
+        c.drawString(x, sig_label_y, "Signature:")
+
+        if info["sig_path"]:
+            try:
+                c.drawImage(
+                    info["sig_path"],
+                    x + 62,
+                    sig_label_y - 2,
+                    width=max(80, col_width - 72),
+                    height=24,
+                    preserveAspectRatio=True,
+                    mask="auto",
+                )
+            except Exception:
+                c.setFillColor(muted)
+                c.drawString(x + 62, sig_label_y + 8, "Signature on file")
+        else:
             c.setFillColor(muted)
-            c.drawString(x, y_top - (2 * row_h), f"Email: {info['email'] or '-'}")
-            c.drawString(x, y_top - (3 * row_h), f"Phone: {info['phone'] or '-'}")
-            c.drawString(x, y_top - (4 * row_h), f"Date: {info['date'] or '-'}")
+            c.drawString(x + 62, sig_label_y + 8, "Signature missing")
+
+    draw_signature_party(employer_info, left_x, y_sig, "Employer")
+    draw_signature_party(employee_info, right_x, y_sig, "Employee")
+
+    c.save()
+
+    buffer.seek(0)
+    return ContentFile(buffer.getvalue())
+
+
+def _render_docx(compiled: CompiledTemplate, inputs: dict) -> ContentFile:
+    """Fill a copy of a DOCX template with python-docx."""
+    from docx import Document
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    from docx.shared import Inches
+
+    context = inputs["context"]
+    employer_info = inputs["employer_info"]
+    employee_info = inputs["employee_info"]
+
+    doc = Document(BytesIO(compiled.docx_bytes))
+
+    # Helper to replace text in runs (preserves formatting)
+    def replace_text_in_paragraph(paragraph, key, value):
+        if key in paragraph.text:
+            paragraph.text = paragraph.text.replace(key, str(value))
+
+    # Replace placeholders and strip legacy signature/header lines
+    for paragraph in doc.paragraphs:
+        lower_text = paragraph.text.strip().lower()
+
+        if (
+            lower_text.startswith("12. signatures")
+            or lower_text.startswith("for ")
+            or lower_text.startswith("employee (")
+            or _should_skip_body_line(paragraph.text, employer_info, employee_info)
+        ):
+            paragraph.text = ""
+            continue
+
+        for key, value in context.items():
+            if key in paragraph.text:
+                replace_text_in_paragraph(paragraph, key, value)
+
+    # Insert canonical parties metadata at the top of the document
+    if doc.paragraphs:
+        anchor = doc.paragraphs[0]
+        anchor.insert_paragraph_before("")
+        anchor.insert_paragraph_before(f"Employee date: {employee_info['date']}")
+        anchor.insert_paragraph_before(f"Employer date: {employer_info['date']}")
+        anchor.insert_paragraph_before(f"Prepared for: {employee_info['name']}")
+        anchor.insert_paragraph_before(f"Prepared by: {employer_info['name']}")
+        party_title = anchor.insert_paragraph_before("Contract Parties")
+        if party_title.runs:
+            party_title.runs[0].bold = True
+
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.paragraphs:
+                    for key, value in context.items():
+                        if key in paragraph.text:
+                            replace_text_in_paragraph(paragraph, key, value)
+
+    # Add signature section in two columns (Employer left, Employee right)
+    doc.add_paragraph("")
+    sig_title = doc.add_paragraph("Signatures")
+    if sig_title.runs:
+        sig_title.runs[0].bold = True
+
+    sig_table = doc.add_table(rows=1, cols=2)
+
+    # Remove table borders to keep the section clean while preserving left/right layout.
+    tbl = sig_table._tbl
+    tbl_pr = tbl.tblPr
+    borders = OxmlElement("w:tblBorders")
+    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
+        edge_tag = OxmlElement(f"w:{edge}")
+        edge_tag.set(qn("w:val"), "nil")
+        borders.append(edge_tag)
+    tbl_pr.append(borders)
+
+    def fill_signature_cell(cell, role_label, info):
+        cell.text = ""
+        role_para = cell.add_paragraph(role_label)
+        if role_para.runs:
+            role_para.runs[0].bold = True
+        cell.add_paragraph(f"Name: {info['name'] or '-'}")
+        cell.add_paragraph(f"Email: {info['email'] or '-'}")
+        cell.add_paragraph(f"Phone: {info['phone'] or '-'}")
+        cell.add_paragraph(f"Date: {info['date'] or '-'}")
+
+        sig_para = cell.add_paragraph("Signature:")
+        if info["sig_path"]:
+            try:
+                sig_para.add_run().add_picture(info["sig_path"], width=Inches(2.0))
+            except Exception:
+                sig_para.add_run(" [Signature on file]")
+        else:
+            sig_para.add_run(" Missing signature")
+
+    fill_signature_cell(sig_table.cell(0, 0), "Employer", employer_info)
+    fill_signature_cell(sig_table.cell(0, 1), "Employee", employee_info)
+
+    docx_io = BytesIO()
+    doc.save(docx_io)
+    docx_io.seek(0)
+    return ContentFile(docx_io.getvalue())
+
+
+def render_contract_content(contract_id: str, compiled: CompiledTemplate, inputs: dict) -> Tuple[ContentFile, str]:
+    """Render one contract from its compiled template and inputs; returns (content, file name)."""
+    stamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+    if compiled.kind == "docx":
+        try:
+            content_file = _render_docx(compiled, inputs)
+        except Exception as e:
+            raise ValueError(f"Could not open template file: {e}")
+        return content_file, f"Contract_{contract_id}_{stamp}.docx"
+    return _render_pdf(compiled, inputs), f"Contract_{contract_id}_{stamp}.pdf"
 
-            c.setFillColor(ink)
-            c.setFont("Helvetica", 9.5)
-            sig_label_y = y_top - (5 * row_h) - 4
-            c.drawString(x, sig_label_y, "Signature:")
-
-            if info["sig_path"]:
-                try:
-                    c.drawImage(
-                        info["sig_path"],
-                        x + 62,
-                        sig_label_y - 2,
-                        width=max(80, col_width - 72),
-                        height=24,
-                        preserveAspectRatio=True,
-                        mask="auto",
-                    )
-                except Exception:
-                    c.setFillColor(muted)
-                    c.drawString(x + 62, sig_label_y + 8, "Signature on file")
-            else:
-                c.setFillColor(muted)
-                c.drawString(x + 62, sig_label_y + 8, "Signature missing")
 
-        draw_signature_party(employer_info, left_x, y_sig, "Employer")
-        draw_signature_party(employee_info, right_x, y_sig, "Employee")
+def _document_file_exists(document) -> bool:
+    if not document.file or not document.file.name:
+        return False
+    try:
+        return document.file.storage.exists(document.file.name)
+    except Exception:
+        return False
 
-        c.save()
 
-        buffer.seek(0)
-        return ContentFile(buffer.getvalue())
+def generate_contract_pdf(contract, template=None):
+    """
+    Generates a PDF contract document based on a template.
 
-    # -------------------------------------------------------------------------
-    # 3) Load and Process DOCX
-    # -------------------------------------------------------------------------
-    db_alias = contract._state.db or "default"
-    has_file = bool(getattr(template, "file", None)) and bool(getattr(template.file, "name", None))
-    ext = (template.file.name or "").lower() if has_file else ""
+    The render inputs are fingerprinted first; when the contract already has a
+    document with the same content hash, that document is returned as-is.
 
-    if not has_file:
-        try:
-            from contracts.management.commands.seed_contract_template import TYPE_BODIES, BASE_BODY
-            body_text = _clean_body(template.body_override or TYPE_BODIES.get(contract.contract_type, BASE_BODY))
-        except Exception:
-            body_text = _clean_body(template.body_override or "")
-        content_file = render_pdf_from_body(f"{contract.contract_type} CONTRACT", body_text or "Contract")
-        file_name = f"Contract_{contract.contract_id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    elif ext.endswith(".pdf"):
-        # Always render a fresh PDF with merged context (do not reuse raw template bytes).
-        try:
-            from contracts.management.commands.seed_contract_template import TYPE_BODIES, BASE_BODY
+    Args:
+        contract (Contract): The contract instance.
+        template (ContractTemplate, optional): Specific template to use.
+            If None, finds default for contract type.
 
-            body_text = _clean_body(template.body_override or TYPE_BODIES.get(contract.contract_type, BASE_BODY))
-        except Exception:
-            body_text = template.body_override or ""
+    Returns:
+        ContractDocument: The generated document object.
 
-        content_file = render_pdf_from_body(f"{contract.contract_type} CONTRACT", body_text or "Contract")
-        file_name = f"Contract_{contract.contract_id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    Raises:
+        ValueError: If no template found.
+        ImportError: If python-docx is not installed.
+    """
+    if not template:
+        template = resolve_default_template(contract)
 
-    else:
-        # DOCX path with python-docx
-        try:
-            from docx import Document
-            from docx.oxml import OxmlElement
-            from docx.oxml.ns import qn
-            from docx.shared import Inches
+    compiled = get_compiled_template(template, contract.contract_type)
+    inputs = build_contract_render_inputs(contract)
+    fingerprint = contract_render_fingerprint(contract, compiled, inputs)
 
-            template.file.open("rb")
-            doc = Document(template.file)
-            template.file.close()
+    existing = find_cached_contract_document(contract, template, fingerprint)
+    if existing:
+        return existing
 
-            # Helper to replace text in runs (preserves formatting)
-            def replace_text_in_paragraph(paragraph, key, value):
-                if key in paragraph.text:
-                    paragraph.text = paragraph.text.replace(key, str(value))
-
-            # Replace placeholders and strip legacy signature/header lines
-            for paragraph in doc.paragraphs:
-                lower_text = paragraph.text.strip().lower()
-
-                if (
-                    lower_text.startswith("12. signatures")
-                    or lower_text.startswith("for ")
-                    or lower_text.startswith("employee (")
-                    or _should_skip_body_line(paragraph.text, employer_info, employee_info)
-                ):
-                    paragraph.text = ""
-                    continue
+    content_file, file_name = render_contract_content(contract.contract_id, compiled, inputs)
+    return store_contract_document(contract, template, content_file, file_name, fingerprint)
 
-                for key, value in context.items():
-                    if key in paragraph.text:
-                        replace_text_in_paragraph(paragraph, key, value)
-
-            # Insert canonical parties metadata at the top of the document
-            if doc.paragraphs:
-                anchor = doc.paragraphs[0]
-                anchor.insert_paragraph_before("")
-                anchor.insert_paragraph_before(f"Employee date: {employee_info['date']}")
-                anchor.insert_paragraph_before(f"Employer date: {employer_info['date']}")
-                anchor.insert_paragraph_before(f"Prepared for: {employee_info['name']}")
-                anchor.insert_paragraph_before(f"Prepared by: {employer_info['name']}")
-                party_title = anchor.insert_paragraph_before("Contract Parties")
-                if party_title.runs:
-                    party_title.runs[0].bold = True
-
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.paragraphs:
-                            for key, value in context.items():
-                                if key in paragraph.text:
-                                    replace_text_in_paragraph(paragraph, key, value)
-
-            # Add signature section in two columns (Employer left, Employee right)
-            doc.add_paragraph("")
-            sig_title = doc.add_paragraph("Signatures")
-            if sig_title.runs:
-                sig_title.runs[0].bold = True
-
-            sig_table = doc.add_table(rows=1, cols=2)
-
-            # Remove table borders to keep the section clean while preserving left/right layout.
-            tbl = sig_table._tbl
-            tbl_pr = tbl.tblPr
-            borders = OxmlElement("w:tblBorders")
-            for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
-                edge_tag = OxmlElement(f"w:{edge}")
-                edge_tag.set(qn("w:val"), "nil")
-                borders.append(edge_tag)
-            tbl_pr.append(borders)
-
-            def fill_signature_cell(cell, role_label, info):
-                cell.text = ""
-                role_para = cell.add_paragraph(role_label)
-                if role_para.runs:
-                    role_para.runs[0].bold = True
-                cell.add_paragraph(f"Name: {info['name'] or '-'}")
-                cell.add_paragraph(f"Email: {info['email'] or '-'}")
-                cell.add_paragraph(f"Phone: {info['phone'] or '-'}")
-                cell.add_paragraph(f"Date: {info['date'] or '-'}")
-
-                sig_para = cell.add_paragraph("Signature:")
-                if info["sig_path"]:
-                    try:
-                        sig_para.add_run().add_picture(info["sig_path"], width=Inches(2.0))
-                    except Exception:
-                        sig_para.add_run(" [Signature on file]")
-                else:
-                    sig_para.add_run(" Missing signature")
-
-            fill_signature_cell(sig_table.cell(0, 0), "Employer", employer_info)
-            fill_signature_cell(sig_table.cell(0, 1), "Employee", employee_info)
-
-            docx_io = BytesIO()
-            doc.save(docx_io)
-            docx_io.seek(0)
-
-            content_file = ContentFile(docx_io.getvalue())
-            file_name = f"Contract_{contract.contract_id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.docx"
-
-        except ImportError:
-            # Fallback if python-docx missing: render a simple PDF from body
-            from contracts.management.commands.seed_contract_template import TYPE_BODIES, BASE_BODY
-
-            body_text = _clean_body(TYPE_BODIES.get(contract.contract_type, BASE_BODY))
-            content_file = render_pdf_from_body(f"{contract.contract_type} CONTRACT", body_text)
-            file_name = f"Contract_{contract.contract_id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-        except Exception as e:
-            raise ValueError(f"Could not open template file: {e}")
+def find_cached_contract_document(contract, template, fingerprint: str):
+    """Return the generated document of ``contract`` matching a render fingerprint, if its file still exists."""
+    existing = (
+        ContractDocument.objects.using(contract._state.db or "default")
+        .filter(contract=contract, generated_from=template, content_hash=fingerprint, status="GENERATED")
+        .first()
+    )
+    if existing and _document_file_exists(existing):
+        return existing
+    return None
+
+
+def store_contract_document(contract, template, content_file, file_name: str, fingerprint: str, batch_id=None):
+    """Save a rendered document, replacing every previous document (and file) of the contract."""
+    db_alias = contract._state.db or "default"
 
-    # -------------------------------------------------------------------------
-    # 4) Replace any previous generated docs (and their files) to avoid stale files
-    # -------------------------------------------------------------------------
+    # Replace any previous generated docs (and their files) to avoid stale files
     old_docs = ContractDocument.objects.using(db_alias).filter(contract=contract)
     for old in old_docs:
         if old.file:
@@ -682,8 +846,122 @@ def generate_contract_pdf(contract, template=None):
         contract=contract,
         generated_from=template,
         name=file_name,
+        content_hash=fingerprint,
+        batch_id=batch_id,
     )
     doc_obj.file.save(file_name, content_file, save=False)
     doc_obj.save(using=db_alias)
     return doc_obj
 
+
+def record_failed_contract_document(contract, template, error: str, batch_id=None):
+    """
+    Record a failed generation. Earlier failures are replaced; the last
+    generated document, if any, is kept.
+    """
+    documents = ContractDocument.objects.using(contract._state.db or "default")
+    documents.filter(contract=contract, status="FAILED").delete()
+    return documents.create(
+        contract=contract,
+        generated_from=template,
+        name=f"Contract_{contract.contract_id}_failed",
+        status="FAILED",
+        error=error,
+        batch_id=batch_id,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Background rendering queue
+# -----------------------------------------------------------------------------
+_render_executor = None
+_render_executor_lock = threading.Lock()
+
+
+def _get_render_executor() -> ThreadPoolExecutor:
+    global _render_executor
+    with _render_executor_lock:
+        if _render_executor is None:
+            workers = max(1, int(getattr(settings, "CONTRACTS_DOCUMENT_RENDER_WORKERS", 2)))
+            _render_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="contract-render")
+        return _render_executor
+
+
+def fail_abandoned_contract_document_jobs(contract, db_alias: str) -> int:
+    """
+    Mark jobs of ``contract`` stranded by a restart (QUEUED or RUNNING past the
+    staleness cutoff; the render pool is in-process) as FAILED.
+    Returns the number of jobs released.
+    """
+    cutoff = timezone.now() - CONTRACT_DOCUMENT_JOB_STALE_AFTER
+    stale = ContractDocumentJob.objects.using(db_alias).filter(
+        Q(status="QUEUED", created_at__lt=cutoff) | Q(status="RUNNING", started_at__lt=cutoff),
+        contract=contract,
+    )
+    return stale.update(
+        status="FAILED",
+        error="Abandoned: the render did not finish before the staleness cutoff.",
+        finished_at=timezone.now(),
+    )
+
+
+def queue_contract_document(contract, template=None, created_by=None) -> Tuple[ContractDocumentJob, bool]:
+    """
+    Queue a render of ``contract``, reusing a job still waiting for the same
+    template unless it is stale. Returns ``(job, created)``; only created jobs
+    need dispatching.
+    """
+    db_alias = contract._state.db or "default"
+    fail_abandoned_contract_document_jobs(contract, db_alias)
+    jobs = ContractDocumentJob.objects.using(db_alias)
+    pending = jobs.filter(contract=contract, template=template, status="QUEUED").first()
+    if pending:
+        return pending, False
+    job = jobs.create(
+        employer_id=contract.employer_id,
+        contract=contract,
+        template=template,
+        created_by=created_by,
+    )
+    return job, True
+
+
+def execute_contract_document_job(job_id, db_alias: str) -> ContractDocumentJob:
+    """
+    Render the document of a queued job and record the outcome on the job row.
+    The job is claimed atomically, so a job handed out twice renders once.
+    """
+    jobs = ContractDocumentJob.objects.using(db_alias)
+    if not jobs.filter(id=job_id, status="QUEUED").update(status="RUNNING", started_at=timezone.now()):
+        return jobs.get(id=job_id)
+    job = jobs.select_related("contract", "template").get(id=job_id)
+    try:
+        with tenant_db_context(db_alias):
+            document = generate_contract_pdf(job.contract, job.template)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Contract document job %s failed on %s", job.id, db_alias)
+        jobs.filter(id=job.id).update(status="FAILED", error=str(exc), finished_at=timezone.now())
+    else:
+        jobs.filter(id=job.id).update(status="COMPLETED", document=document, finished_at=timezone.now())
+    return jobs.get(id=job.id)
+
+
+def _execute_contract_document_job_in_worker(job_id, db_alias: str) -> None:
+    try:
+        execute_contract_document_job(job_id, db_alias)
+    finally:
+        connections.close_all()
+
+
+def dispatch_contract_document_job(job: ContractDocumentJob, db_alias: str) -> None:
+    """
+    Hand a queued job to the render worker pool once the surrounding
+    transaction commits (inline when CONTRACTS_DOCUMENT_RENDER_ASYNC is off).
+    """
+    if not getattr(settings, "CONTRACTS_DOCUMENT_RENDER_ASYNC", True):
+        execute_contract_document_job(job.id, db_alias)
+        return
+    transaction.on_commit(
+        lambda: _get_render_executor().submit(_execute_contract_document_job_in_worker, job.id, db_alias),
+        using=db_alias,
+    )
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .config_resolver import bump_contract_config_version
+from .models import ContractConfiguration
+
+
+@receiver(post_save, sender=ContractConfiguration)
+@receiver(post_delete, sender=ContractConfiguration)
+def invalidate_contract_config_cache(sender, instance, **kwargs):
+    bump_contract_config_version(instance.employer_id)
@@ -0,0 +1,88 @@
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import EmployerProfile
+from contracts.models import Contract, ContractDocumentJob
+from contracts.services import CONTRACT_DOCUMENT_JOB_STALE_AFTER, queue_contract_document
+from employees.models import Employee
+
+
+class ContractDocumentJobQueueTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(email="owner@acme.test", password="pass", is_employer=True)
+        self.employer = EmployerProfile.objects.create(
+            user=self.user,
+            company_name="Acme Contracts",
+            employer_name_or_group="Acme",
+            organization_type="PRIVATE",
+            industry_sector="Tech",
+            date_of_incorporation=date.today(),
+            company_location="City",
+            physical_address="123 Street",
+            phone_number="1234567890",
+            official_company_email="hr@acme.test",
+            rccm="rccm",
+            taxpayer_identification_number="tin",
+            cnps_employer_number="cnps",
+            labour_inspectorate_declaration="decl",
+            business_license="license",
+            bank_name="Bank",
+            bank_account_number="123",
+        )
+        employee = Employee.objects.create(
+            employer_id=self.employer.id,
+            employee_id="EMP-001",
+            first_name="Jane",
+            last_name="Doe",
+            email="jane@example.com",
+            job_title="Engineer",
+            employment_type="FULL_TIME",
+            employment_status="ACTIVE",
+            hire_date=date(2025, 1, 1),
+        )
+        self.contract = Contract.objects.create(
+            employer_id=self.employer.id,
+            contract_id=f"CNT-{uuid.uuid4().hex[:8].upper()}",
+            employee=employee,
+            contract_type="PERMANENT",
+            start_date=date(2026, 1, 1),
+            status="ACTIVE",
+            base_salary=Decimal("100000.00"),
+            currency="XAF",
+            pay_frequency="MONTHLY",
+            created_by=self.user.id,
+        )
+
+    def test_fresh_queued_job_is_reused(self):
+        job, created = queue_contract_document(self.contract, created_by=self.user.id)
+        self.assertTrue(created)
+        again, created = queue_contract_document(self.contract, created_by=self.user.id)
+        self.assertFalse(created)
+        self.assertEqual(again.id, job.id)
+
+    def test_stale_jobs_are_failed_and_replaced(self):
+        stale_at = timezone.now() - CONTRACT_DOCUMENT_JOB_STALE_AFTER - timedelta(minutes=1)
+        queued, _ = queue_contract_document(self.contract, created_by=self.user.id)
+        ContractDocumentJob.objects.filter(id=queued.id).update(created_at=stale_at)
+        running = ContractDocumentJob.objects.create(
+            employer_id=self.employer.id,
+            contract=self.contract,
+            status="RUNNING",
+            started_at=stale_at,
+        )
+
+        job, created = queue_contract_document(self.contract, created_by=self.user.id)
+
+        self.assertTrue(created)
+        self.assertNotIn(job.id, {queued.id, running.id})
+        self.assertEqual(job.status, "QUEUED")
+        for stranded in (queued, running):
+            stranded.refresh_from_db()
+            self.assertEqual(stranded.status, "FAILED")
+            self.assertIsNotNone(stranded.finished_at)
@@ -3,9 +3,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, ValidationError as DRFValidationError
 from django.db import connections
+from django.http import StreamingHttpResponse
 from .models import (
     Contract, ContractConfiguration, ContractComponentTemplate, ContractTemplate, ContractTemplateVersion, SalaryScale,
-    CalculationScale, ScaleRange, ContractDocument, ContractSignature
+    CalculationScale, ScaleRange, ContractDocument, ContractDocumentJob, ContractSignature
 )
 from .serializers import (
     ContractSerializer,
@@ -16,6 +17,7 @@ from .serializers import (
     ScaleRangeSerializer,
     ContractTemplateSerializer,
     ContractTemplateVersionSerializer,
+    ContractDocumentJobSerializer,
 )
 from .notifications import (
     notify_contract_created,
@@ -61,8 +63,10 @@ class ContractViewSet(viewsets.ModelViewSet):
         "send_for_approval": ["contracts.contract.send_for_approval", "contracts.manage"],
         "send_for_signature_alias": ["contracts.contract.send_for_signature", "contracts.manage"],
         "generate_document": ["contracts.contract.generate_document", "contracts.manage"],
+        "document_job": ["contracts.contract.generate_document", "contracts.manage"],
         "sign_contract": ["contracts.contract.sign", "contracts.manage"],
         "renew": ["contracts.contract.renew", "contracts.manage"],
+        "bulk_generate_documents": ["contracts.contract.generate_document", "contracts.manage"],
         "terminate": ["contracts.contract.terminate", "contracts.manage"],
         "expire": ["contracts.contract.expire", "contracts.manage"],
         "*": ["contracts.manage"],
@@ -333,11 +337,28 @@ class ContractViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'], url_path='generate-document')
     def generate_document(self, request, pk=None):
-        """Generate a PDF contract document"""
+        """
+        Generate a PDF contract document.
+        With ``async=true`` the render is queued and a job is returned (202);
+        poll ``document-jobs/<job_id>/`` for its status.
+        """
         contract = self.get_object()
         
         # Optional: Allow selecting a specific template via query param or body
         # template_id = request.data.get('template_id')
+
+        async_flag = request.data.get('async', request.query_params.get('async'))
+        if str(async_flag).lower() in ["true", "1", "yes"]:
+            from .services import dispatch_contract_document_job, queue_contract_document
+            db_alias = contract._state.db or 'default'
+            job, created = queue_contract_document(contract, created_by=request.user.id)
+            if created:
+                dispatch_contract_document_job(job, db_alias)
+            job = ContractDocumentJob.objects.using(db_alias).select_related('document').get(id=job.id)
+            return Response(
+                ContractDocumentJobSerializer(job, context={'request': request}).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
         
         try:
             from .services import generate_contract_pdf
@@ -364,6 +385,28 @@ class ContractViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': f"Generation failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=True, methods=['get'], url_path=r'document-jobs/(?P<job_id>[^/.]+)')
+    def document_job(self, request, pk=None, job_id=None):
+        """Status of a queued document render for this contract."""
+        import uuid
+        contract = self.get_object()
+        db_alias = contract._state.db or 'default'
+        try:
+            job_uuid = uuid.UUID(str(job_id))
+        except ValueError:
+            job_uuid = None
+        job = None
+        if job_uuid:
+            job = (
+                ContractDocumentJob.objects.using(db_alias)
+                .select_related('document')
+                .filter(id=job_uuid, contract=contract)
+                .first()
+            )
+        if not job:
+            return Response({'error': 'Document job not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ContractDocumentJobSerializer(job, context={'request': request}).data)
+
     @action(detail=True, methods=['post'], url_path='sign')
     def sign_contract(self, request, pk=None):
         """
@@ -461,6 +504,87 @@ class ContractViewSet(viewsets.ModelViewSet):
             'signed_at': signature.signed_at
         }, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'], url_path='bulk-generate-documents')
+    def bulk_generate_documents(self, request):
+        """
+        Generate documents for every contract matching the filters and stream
+        them back as a ZIP archive (with a manifest.csv of per-contract statuses).
+        Filters: branch_id, department_id, contract_type, status,
+        expiring_within_days, contract_ids. Optional: template_id, output=json
+        for the report instead of the archive.
+        """
+        from django.conf import settings
+        from .bulk_documents import generate_contract_documents, select_bulk_contracts, stream_documents_zip
+
+        user = request.user
+        employer = get_active_employer(request, require_context=False)
+        if not employer or not (
+            user.is_admin
+            or user.is_superuser
+            or getattr(getattr(user, 'employer_profile', None), 'id', None) == employer.id
+            or is_delegate_user(user, employer.id)
+        ):
+            return Response({'error': 'Only the employer can generate documents in bulk.'}, status=status.HTTP_403_FORBIDDEN)
+
+        data = request.data
+        expiring_within_days = data.get('expiring_within_days')
+        if expiring_within_days not in (None, ''):
+            try:
+                expiring_within_days = int(expiring_within_days)
+            except (TypeError, ValueError):
+                expiring_within_days = -1
+            if expiring_within_days < 0:
+                return Response({'error': 'expiring_within_days must be a non-negative integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            expiring_within_days = None
+
+        contracts = self.get_queryset().filter(employer_id=employer.id)
+        db_alias = contracts.db
+        contracts = select_bulk_contracts(
+            queryset=contracts,
+            branch_id=data.get('branch_id'),
+            department_id=data.get('department_id'),
+            contract_type=data.get('contract_type'),
+            status=data.get('status'),
+            expiring_within_days=expiring_within_days,
+            contract_ids=data.get('contract_ids') or None,
+        )
+
+        template = None
+        template_id = data.get('template_id')
+        if template_id:
+            template = ContractTemplate.objects.using(db_alias).filter(id=template_id, employer_id=employer.id).first()
+            if not template:
+                return Response({'error': 'Template not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        max_contracts = getattr(settings, 'CONTRACTS_BULK_DOCUMENT_MAX_CONTRACTS', 500)
+        contracts = list(
+            contracts.select_related('employee', 'branch', 'department')
+            .prefetch_related('allowances', 'deductions')
+            .distinct()
+            .order_by('contract_id')[:max_contracts + 1]
+        )
+        if not contracts:
+            return Response({'error': 'No contracts match the filters.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(contracts) > max_contracts:
+            return Response(
+                {'error': f'At most {max_contracts} contracts can be generated per request; narrow the filters.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = generate_contract_documents(
+            contracts,
+            template=template,
+            max_workers=getattr(settings, 'CONTRACTS_DOCUMENT_RENDER_PROCESSES', 4),
+        )
+        if str(data.get('output') or '').lower() == 'json':
+            return Response(report.to_dict(), status=status.HTTP_201_CREATED)
+
+        response = StreamingHttpResponse(stream_documents_zip(report, db_alias), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="contracts_{report.batch_id}.zip"'
+        response['X-Batch-Id'] = str(report.batch_id)
+        return response
+
     @action(detail=True, methods=['post'], url_path='renew')
     def renew(self, request, pk=None):
         """
@@ -0,0 +1,59 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from employees.match_index import rebuild_tenant_match_keys
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the central hashed duplicate-detection index from every tenant "
+        "database so onboarding duplicate checks avoid probing each tenant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the rebuild to a single employer.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=1000,
+            help="Number of index rows written per bulk insert.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+        batch_size = max(options.get("batch_size") or 1, 1)
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        written = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Indexing employees for {alias}...")
+            try:
+                written += rebuild_tenant_match_keys(employer.id, alias, batch_size=batch_size)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} match key(s) across {total} tenant(s)."))
@@ -0,0 +1,189 @@
+"""
+Cross-tenant duplicate-detection index.
+
+Every tenant employee without a user account is mirrored into
+``EmployeeMatchKey`` (default DB) as keyed HMAC-SHA256 digests of its
+normalized national ID, emails, phone numbers and date of birth. The date of
+birth digest is a blocking key for name + DOB matching: candidates sharing it
+are loaded from their tenant and compared by name there, so no names leave the
+tenant database. Keys are refreshed by the Employee post_save/post_delete
+signals; ``build_employee_match_index`` backfills existing tenants.
+"""
+import hashlib
+import hmac
+import re
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from .models import Employee, EmployeeMatchKey
+
+
+def normalize_national_id(value):
+    return value.strip() if isinstance(value, str) else ''
+
+
+def normalize_email(value):
+    return value.strip().lower() if isinstance(value, str) else ''
+
+
+def normalize_phone(value):
+    return re.sub(r'\D', '', value) if isinstance(value, str) else ''
+
+
+def normalize_date_of_birth(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, str):
+        value = parse_date(value.strip())
+    return value.isoformat() if isinstance(value, date) else ''
+
+
+NORMALIZERS = {
+    EmployeeMatchKey.KIND_NATIONAL_ID: normalize_national_id,
+    EmployeeMatchKey.KIND_EMAIL: normalize_email,
+    EmployeeMatchKey.KIND_PHONE: normalize_phone,
+    EmployeeMatchKey.KIND_DATE_OF_BIRTH: normalize_date_of_birth,
+}
+
+
+def match_digest(kind, normalized_value):
+    secret = (getattr(settings, 'EMPLOYEE_MATCH_INDEX_SECRET', None) or settings.SECRET_KEY).encode()
+    return hmac.new(secret, f"{kind}:{normalized_value}".encode(), hashlib.sha256).hexdigest()
+
+
+def employee_match_keys(employee):
+    """Return the set of (kind, digest) pairs describing ``employee``."""
+    raw_values = [
+        (EmployeeMatchKey.KIND_NATIONAL_ID, employee.national_id_number),
+        (EmployeeMatchKey.KIND_EMAIL, employee.email),
+        (EmployeeMatchKey.KIND_EMAIL, employee.personal_email),
+        (EmployeeMatchKey.KIND_PHONE, employee.phone_number),
+        (EmployeeMatchKey.KIND_PHONE, employee.alternative_phone),
+        (EmployeeMatchKey.KIND_DATE_OF_BIRTH, employee.date_of_birth),
+    ]
+    keys = set()
+    for kind, raw in raw_values:
+        normalized = NORMALIZERS[kind](raw)
+        if normalized:
+            keys.add((kind, match_digest(kind, normalized)))
+    return keys
+
+
+def remove_employee_match_keys(employee_id):
+    EmployeeMatchKey.objects.using('default').filter(employee_id=employee_id).delete()
+
+
+def sync_employee_match_keys(employee, tenant_db):
+    """
+    Bring the index rows of one employee in line with its current values.
+    Employees linked to a user account are covered by ``EmployeeRegistry`` and
+    are dropped from the index.
+    """
+    index = EmployeeMatchKey.objects.using('default')
+    if employee.user_id:
+        remove_employee_match_keys(employee.id)
+        return
+
+    wanted = employee_match_keys(employee)
+    existing = {
+        (row['kind'], row['digest']): row
+        for row in index.filter(employee_id=employee.id).values('id', 'kind', 'digest', 'employer_id', 'tenant_db')
+    }
+    stale_ids = [
+        row['id']
+        for key, row in existing.items()
+        if key not in wanted or row['employer_id'] != employee.employer_id or row['tenant_db'] != tenant_db
+    ]
+    if stale_ids:
+        index.filter(id__in=stale_ids).delete()
+    current = {key for key, row in existing.items() if row['id'] not in stale_ids}
+    missing = wanted - current
+    if missing:
+        index.bulk_create(
+            [
+                EmployeeMatchKey(
+                    kind=kind,
+                    digest=digest,
+                    employer_id=employee.employer_id,
+                    tenant_db=tenant_db,
+                    employee_id=employee.id,
+                )
+                for kind, digest in missing
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_tenant_match_keys(employer_id, tenant_db, batch_size=1000):
+    """Replace every index row of one tenant. Returns the number of keys written."""
+    index = EmployeeMatchKey.objects.using('default')
+    index.filter(employer_id=employer_id, tenant_db=tenant_db).delete()
+    employees = (
+        Employee.objects.using(tenant_db)
+        .filter(employer_id=employer_id, user_id__isnull=True)
+        .only(
+            'id',
+            'employer_id',
+            'user_id',
+            'national_id_number',
+            'email',
+            'personal_email',
+            'phone_number',
+            'alternative_phone',
+            'date_of_birth',
+        )
+        .order_by()
+    )
+    written = 0
+    pending = []
+    for employee in employees.iterator(chunk_size=batch_size):
+        pending.extend(
+            EmployeeMatchKey(
+                kind=kind,
+                digest=digest,
+                employer_id=employer_id,
+                tenant_db=tenant_db,
+                employee_id=employee.id,
+            )
+            for kind, digest in employee_match_keys(employee)
+        )
+        if len(pending) >= batch_size:
+            index.bulk_create(pending, ignore_conflicts=True)
+            written += len(pending)
+            pending = []
+    if pending:
+        index.bulk_create(pending, ignore_conflicts=True)
+        written += len(pending)
+    return written
+
+
+def find_match_candidates(values_by_kind):
+    """
+    Look up candidate employees for the given raw values, e.g.
+    ``{KIND_EMAIL: ['a@b.c'], KIND_PHONE: ['+237 6...']}``.
+
+    Returns ``{(employer_id, tenant_db): {employee_id: set(kinds)}}`` built from
+    a single indexed query on the default database.
+    """
+    digests = {}
+    for kind, values in values_by_kind.items():
+        for value in values:
+            normalized = NORMALIZERS[kind](value)
+            if normalized:
+                digests.setdefault(kind, set()).add(match_digest(kind, normalized))
+    if not digests:
+        return {}
+
+    condition = Q()
+    for kind, kind_digests in digests.items():
+        condition |= Q(kind=kind, digest__in=kind_digests)
+    candidates = {}
+    rows = EmployeeMatchKey.objects.using('default').filter(condition).values_list(
+        'employer_id', 'tenant_db', 'employee_id', 'kind'
+    )
+    for employer_id, tenant_db, employee_id, kind in rows:
+        candidates.setdefault((employer_id, tenant_db), {}).setdefault(employee_id, set()).add(kind)
+    return candidates
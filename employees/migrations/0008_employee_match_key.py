@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_alter_employeedocument_document_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeMatchKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('national_id', 'National ID'), ('email', 'Email'), ('phone', 'Phone'), ('date_of_birth', 'Date of birth (name + DOB blocking key)')], max_length=20)),
+                ('digest', models.CharField(max_length=64)),
+                ('employer_id', models.IntegerField(db_index=True, help_text='Employer ID owning the employee')),
+                ('tenant_db', models.CharField(help_text='Database alias holding the employee', max_length=64)),
+                ('employee_id', models.UUIDField(db_index=True, help_text='Employee ID in tenant database')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Employee Match Key',
+                'verbose_name_plural': 'Employee Match Keys',
+                'db_table': 'employee_match_keys',
+                'indexes': [models.Index(fields=['kind', 'digest'], name='emp_match_key_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee_id', 'kind', 'digest'), name='uniq_employee_match_key')],
+            },
+        ),
+    ]
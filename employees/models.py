@@ -920,3 +920,44 @@ class EmploymentCertificateShare(models.Model):
         if self.expires_at and timezone.now() > self.expires_at:
             return False
         return True
+
+
+class EmployeeMatchKey(models.Model):
+    """
+    Central duplicate-detection index (default database).
+    One row per hashed identifier of a tenant employee without a user account,
+    so onboarding can find cross-institution duplicates without probing every
+    tenant database. Only keyed HMAC digests are stored, never raw values.
+    """
+
+    KIND_NATIONAL_ID = 'national_id'
+    KIND_EMAIL = 'email'
+    KIND_PHONE = 'phone'
+    KIND_DATE_OF_BIRTH = 'date_of_birth'
+    KIND_CHOICES = [
+        (KIND_NATIONAL_ID, 'National ID'),
+        (KIND_EMAIL, 'Email'),
+        (KIND_PHONE, 'Phone'),
+        (KIND_DATE_OF_BIRTH, 'Date of birth (name + DOB blocking key)'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    digest = models.CharField(max_length=64)
+    employer_id = models.IntegerField(db_index=True, help_text='Employer ID owning the employee')
+    tenant_db = models.CharField(max_length=64, help_text='Database alias holding the employee')
+    employee_id = models.UUIDField(db_index=True, help_text='Employee ID in tenant database')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'employee_match_keys'
+        verbose_name = 'Employee Match Key'
+        verbose_name_plural = 'Employee Match Keys'
+        constraints = [
+            models.UniqueConstraint(fields=['employee_id', 'kind', 'digest'], name='uniq_employee_match_key'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'digest'], name='emp_match_key_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} key for employee {self.employee_id} ({self.tenant_db})"
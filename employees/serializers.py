@@ -31,10 +31,11 @@ def _employee_branch_ids(employee):
     branch_ids = []
     if getattr(employee, 'branch_id', None):
         branch_ids.append(str(employee.branch_id))
-    for branch_id in list(employee.secondary_branches.values_list('id', flat=True)):
-        if branch_id is None:
+    # Iterate .all() so a prefetch of secondary_branches is reused.
+    for branch in employee.secondary_branches.all():
+        if not branch:
             continue
-        as_str = str(branch_id)
+        as_str = str(branch.id)
         if as_str not in branch_ids:
             branch_ids.append(as_str)
     return branch_ids
@@ -52,6 +53,105 @@ def _employee_branch_names(employee):
     return names
 
 
+EMPLOYEE_LIST_CONTEXT_KEY = 'employee_list_maps'
+
+
+def build_employee_list_context(employees, request=None):
+    """
+    Precompute the lookups EmployeeListSerializer needs for a batch of employees:
+    department/branch/manager names, whether cross-institution visibility is
+    enabled and which employees have approved employment-dates consent.
+    Costs a constant number of queries regardless of the batch size.
+    """
+    from employees.utils import CONSENT_SCOPE_EMPLOYMENT_DATES, consent_scopes_allow
+
+    employees = [employee for employee in employees if employee is not None]
+    maps = {
+        'employee_ids': {employee.pk for employee in employees},
+        'department_names': {},
+        'branch_names': {},
+        'manager_names': {},
+        'cross_institution_visible': True,
+        'approved_consent_ids': set(),
+    }
+    if not employees:
+        return maps
+    tenant_db = getattr(employees[0]._state, 'db', None) or 'default'
+
+    missing = {'department': set(), 'branch': set(), 'manager': set()}
+    for employee in employees:
+        for relation, names_key in (
+            ('department', 'department_names'),
+            ('branch', 'branch_names'),
+            ('manager', 'manager_names'),
+        ):
+            related_id = getattr(employee, f'{relation}_id')
+            if not related_id:
+                continue
+            field = Employee._meta.get_field(relation)
+            if field.is_cached(employee):
+                related = field.get_cached_value(employee)
+                if related is not None:
+                    maps[names_key][related_id] = (
+                        related.full_name if relation == 'manager' else related.name
+                    )
+                    continue
+            missing[relation].add(related_id)
+
+    if missing['department']:
+        maps['department_names'].update(
+            Department.objects.using(tenant_db).filter(id__in=missing['department']).values_list('id', 'name')
+        )
+    if missing['branch']:
+        maps['branch_names'].update(
+            Branch.objects.using(tenant_db).filter(id__in=missing['branch']).values_list('id', 'name')
+        )
+    if missing['manager']:
+        for manager in Employee.objects.using(tenant_db).filter(id__in=missing['manager']).only(
+            'id', 'first_name', 'middle_name', 'last_name'
+        ):
+            maps['manager_names'][manager.id] = manager.full_name
+
+    try:
+        if request and hasattr(request.user, 'employer_profile'):
+            from accounts.rbac import get_active_employer
+            from accounts.database_utils import get_tenant_database_alias
+            from employees.utils import get_or_create_employee_config
+
+            employer = get_active_employer(request, require_context=True)
+            config = get_or_create_employee_config(employer.id, get_tenant_database_alias(employer))
+            if getattr(config, 'cross_institution_visibility_level', 'NONE') == 'NONE':
+                maps['cross_institution_visible'] = False
+    except Exception:
+        maps['cross_institution_visible'] = False
+
+    if maps['cross_institution_visible']:
+        concurrent_ids = [employee.pk for employee in employees if getattr(employee, 'is_concurrent_employment', False)]
+        if concurrent_ids:
+            records = EmployeeCrossInstitutionRecord.objects.using(tenant_db).filter(
+                employee_id__in=concurrent_ids,
+                consent_status='APPROVED',
+            ).values_list('employee_id', 'consent_scopes')
+            maps['approved_consent_ids'] = {
+                employee_id
+                for employee_id, scopes in records
+                if consent_scopes_allow(scopes, [CONSENT_SCOPE_EMPLOYMENT_DATES])
+            }
+    return maps
+
+
+class EmployeeListBatchSerializer(serializers.ListSerializer):
+    """Builds the EmployeeListSerializer lookup maps once for the whole list."""
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        employees = list(iterable)
+        self.context[EMPLOYEE_LIST_CONTEXT_KEY] = build_employee_list_context(
+            employees, self.context.get('request')
+        )
+        return [self.child.to_representation(item) for item in employees]
+
+
 class DepartmentSerializer(serializers.ModelSerializer):
     """Serializer for Department model"""
     branch = serializers.PrimaryKeyRelatedField(
@@ -88,6 +188,9 @@ class DepartmentSerializer(serializers.ModelSerializer):
                 )
     
     def get_employee_count(self, obj):
+        annotated = getattr(obj, 'employee_count', None)
+        if annotated is not None:
+            return annotated
         return obj.employees.count()
     
     def create(self, validated_data):
@@ -130,6 +233,9 @@ class BranchSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'employer_id', 'created_at', 'updated_at']
     
     def get_employee_count(self, obj):
+        annotated = getattr(obj, 'employee_count', None)
+        if annotated is not None:
+            return annotated
         return obj.employees.count()
     
     def create(self, validated_data):
@@ -168,6 +274,7 @@ class EmployeeListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Employee
+        list_serializer_class = EmployeeListBatchSerializer
         fields = [
             'id', 'employee_id', 'first_name', 'last_name', 'full_name',
             'email', 'phone_number', 'job_title', 'department', 'department_name',
@@ -175,88 +282,41 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'manager_name', 'employment_status',
             'employment_type', 'hire_date', 'profile_photo', 'is_concurrent_employment'
         ]
-    
+
+    def _lookup_maps(self, obj):
+        """Lookup maps built by the list serializer, or for this object alone."""
+        maps = self.context.get(EMPLOYEE_LIST_CONTEXT_KEY)
+        if maps is None or obj.pk not in maps['employee_ids']:
+            maps = build_employee_list_context([obj], self.context.get('request'))
+        return maps
+
     def get_department_name(self, obj):
-        """Get department name from tenant database"""
         if not obj.department_id:
             return None
-        
-        try:
-            from accounts.database_utils import get_tenant_database_alias
-            request = self.context.get('request')
-            if request and hasattr(request.user, 'employer_profile'):
-                tenant_db = get_tenant_database_alias(request.user.employer_profile)
-                department = Department.objects.using(tenant_db).get(id=obj.department_id)
-                return department.name
-        except Department.DoesNotExist:
-            pass
-        return None
-    
+        return self._lookup_maps(obj)['department_names'].get(obj.department_id)
+
     def get_branch_name(self, obj):
-        """Get branch name from tenant database"""
         if not obj.branch_id:
             return None
-        
-        try:
-            from accounts.database_utils import get_tenant_database_alias
-            request = self.context.get('request')
-            if request and hasattr(request.user, 'employer_profile'):
-                tenant_db = get_tenant_database_alias(request.user.employer_profile)
-                branch = Branch.objects.using(tenant_db).get(id=obj.branch_id)
-                return branch.name
-        except Branch.DoesNotExist:
-            pass
-        return None
+        return self._lookup_maps(obj)['branch_names'].get(obj.branch_id)
 
     def get_branch_names(self, obj):
         return _employee_branch_names(obj)
 
     def get_branches(self, obj):
         return _employee_branch_ids(obj)
-    
+
     def get_manager_name(self, obj):
-        """Get manager name from tenant database"""
         if not obj.manager_id:
             return None
-        
-        try:
-            from accounts.database_utils import get_tenant_database_alias
-            request = self.context.get('request')
-            if request and hasattr(request.user, 'employer_profile'):
-                tenant_db = get_tenant_database_alias(request.user.employer_profile)
-                manager = Employee.objects.using(tenant_db).get(id=obj.manager_id)
-                return manager.full_name
-        except Employee.DoesNotExist:
-            pass
-        return None
+        return self._lookup_maps(obj)['manager_names'].get(obj.manager_id)
 
     def get_is_concurrent_employment(self, obj):
         """Mask concurrent employment unless consent has been approved."""
-        try:
-            from accounts.rbac import get_active_employer
-            from accounts.database_utils import get_tenant_database_alias
-            from employees.utils import (
-                get_or_create_employee_config,
-                has_approved_cross_institution_records,
-                CONSENT_SCOPE_EMPLOYMENT_DATES,
-            )
-
-            request = self.context.get('request')
-            if request and hasattr(request.user, 'employer_profile'):
-                employer = get_active_employer(request, require_context=True)
-                tenant_db = get_tenant_database_alias(employer)
-                config = get_or_create_employee_config(employer.id, tenant_db)
-                if getattr(config, 'cross_institution_visibility_level', 'NONE') == 'NONE':
-                    return False
-
-            if not has_approved_cross_institution_records(
-                obj,
-                required_scopes=[CONSENT_SCOPE_EMPLOYMENT_DATES]
-            ):
-                return False
-        except Exception:
+        if not getattr(obj, 'is_concurrent_employment', False):
             return False
-        return bool(getattr(obj, 'is_concurrent_employment', False))
+        maps = self._lookup_maps(obj)
+        return maps['cross_institution_visible'] and obj.pk in maps['approved_consent_ids']
 
 
 class EmployeeDetailSerializer(serializers.ModelSerializer):
@@ -1,8 +1,9 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from accounts.models import EmployeeMembership, EmployerProfile
+from employees.match_index import remove_employee_match_keys, sync_employee_match_keys
 from employees.models import Employee
 
 User = get_user_model()
@@ -42,3 +43,14 @@ def sync_employee_membership(sender, instance: Employee, **kwargs):
         id=instance.user_id,
         last_active_employer_id__isnull=True,
     ).update(last_active_employer_id=employer.id)
+
+
+@receiver(post_save, sender=Employee)
+def sync_employee_match_index(sender, instance: Employee, using=None, **kwargs):
+    """Refresh the hashed duplicate-detection keys of a tenant employee."""
+    sync_employee_match_keys(instance, using or instance._state.db or 'default')
+
+
+@receiver(post_delete, sender=Employee)
+def drop_employee_match_index(sender, instance: Employee, **kwargs):
+    remove_employee_match_keys(instance.id)
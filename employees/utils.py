@@ -222,92 +222,95 @@ def detect_duplicate_employees(employer, national_id=None, email=None, phone=Non
             for profile in registry_matches:
                 match_reasons[f'registry_{profile.id}'] = ['National ID match']
     
-    # PART 2: Search across all tenant databases (for employees without accounts)
+    # PART 2: Search employees without accounts across all tenants. The central
+    # hashed match index narrows candidates with one query; only tenants holding
+    # a candidate are opened, and every candidate is re-checked on its live row.
+    from employees.match_index import (
+        find_match_candidates,
+        normalize_date_of_birth,
+        normalize_email,
+        normalize_national_id,
+        normalize_phone,
+    )
+    from employees.models import EmployeeMatchKey
+
     tenant_matches = []
-    all_employers = EmployerProfile.objects.filter(user__is_active=True).select_related('user')
     current_tenant_db = get_tenant_database_alias(employer)
     ensure_tenant_database_loaded(employer)
-    
-    for emp_profile in all_employers:
+
+    target_national_id = normalize_national_id(national_id)
+    target_email = normalize_email(email)
+    target_phone = normalize_phone(phone)
+    target_dob = normalize_date_of_birth(date_of_birth)
+
+    lookups = {}
+    if config:
+        if check_national_id and target_national_id:
+            lookups[EmployeeMatchKey.KIND_NATIONAL_ID] = [target_national_id]
+        if check_email and target_email:
+            lookups[EmployeeMatchKey.KIND_EMAIL] = [target_email]
+        if check_phone and target_phone:
+            lookups[EmployeeMatchKey.KIND_PHONE] = [target_phone]
+        if check_name_dob and normalized_first and normalized_last and target_dob:
+            lookups[EmployeeMatchKey.KIND_DATE_OF_BIRTH] = [target_dob]
+    elif target_national_id:
+        # Default: national ID only
+        lookups[EmployeeMatchKey.KIND_NATIONAL_ID] = [target_national_id]
+
+    def _tenant_match_reasons(emp):
+        reasons = []
+        if EmployeeMatchKey.KIND_NATIONAL_ID in lookups and normalize_national_id(emp.national_id_number) == target_national_id:
+            reasons.append('National ID match')
+        if EmployeeMatchKey.KIND_EMAIL in lookups and target_email in {
+            normalize_email(emp.email), normalize_email(emp.personal_email)
+        }:
+            reasons.append('Email match')
+        if EmployeeMatchKey.KIND_PHONE in lookups and target_phone in {
+            normalize_phone(emp.phone_number), normalize_phone(emp.alternative_phone)
+        }:
+            reasons.append('Phone match')
+        if (
+            not reasons
+            and EmployeeMatchKey.KIND_DATE_OF_BIRTH in lookups
+            and normalize_date_of_birth(emp.date_of_birth) == target_dob
+            and _name_matches(emp.first_name, emp.last_name)
+        ):
+            reasons.append('Name + DOB match')
+        return reasons
+
+    candidates = find_match_candidates(lookups)
+    candidate_employers = EmployerProfile.objects.filter(
+        id__in={candidate_employer_id for candidate_employer_id, _ in candidates},
+        user__is_active=True,
+    ).in_bulk() if candidates else {}
+
+    for (candidate_employer_id, tenant_db), candidate_ids in sorted(candidates.items()):
+        emp_profile = candidate_employers.get(candidate_employer_id)
+        if emp_profile is None:
+            continue
         try:
-            tenant_db = get_tenant_database_alias(emp_profile)
             ensure_tenant_database_loaded(emp_profile)
-            employee_query = Employee.objects.using(tenant_db).all()
-            
+            # Only search employees without user accounts (those with accounts are in registry)
+            employee_query = Employee.objects.using(tenant_db).filter(
+                id__in=list(candidate_ids),
+                user_id__isnull=True,
+            )
+
             # Exclude the employee being updated
             if exclude_employee_id and tenant_db == current_tenant_db:
                 employee_query = employee_query.exclude(id=exclude_employee_id)
-            
-            # Only search employees without user accounts (those with accounts are in registry)
-            employee_query = employee_query.filter(user_id__isnull=True)
-            
-            if config:
-                if check_national_id and normalized_national_id:
-                    for emp in employee_query.filter(national_id_number=normalized_national_id):
-                        tenant_matches.append({
-                            'employee': emp,
-                            'employer_id': emp_profile.id,
-                            'employer_name': emp_profile.company_name,
-                            'tenant_db': tenant_db
-                        })
-                        match_reasons[f'tenant_{emp.id}'] = ['National ID match']
-                
-                if check_email and normalized_email:
-                    for emp in employee_query.filter(
-                        Q(email__iexact=normalized_email) | Q(personal_email__iexact=normalized_email)
-                    ):
-                        match_key = f'tenant_{emp.id}'
-                        if not any(m['employee'].id == emp.id for m in tenant_matches):
-                            tenant_matches.append({
-                                'employee': emp,
-                                'employer_id': emp_profile.id,
-                                'employer_name': emp_profile.company_name,
-                                'tenant_db': tenant_db
-                            })
-                            match_reasons[match_key] = ['Email match']
-                        elif match_key in match_reasons:
-                            match_reasons[match_key].append('Email match')
-                
-                if check_phone and phone_variants:
-                    for emp in employee_query.filter(
-                        Q(phone_number__in=phone_variants) | Q(alternative_phone__in=phone_variants)
-                    ):
-                        match_key = f'tenant_{emp.id}'
-                        if not any(m['employee'].id == emp.id for m in tenant_matches):
-                            tenant_matches.append({
-                                'employee': emp,
-                                'employer_id': emp_profile.id,
-                                'employer_name': emp_profile.company_name,
-                                'tenant_db': tenant_db
-                            })
-                            match_reasons[match_key] = ['Phone match']
-                        elif match_key in match_reasons:
-                            match_reasons[match_key].append('Phone match')
-
-                if check_name_dob and normalized_first and normalized_last and date_of_birth:
-                    for emp in employee_query.filter(date_of_birth=date_of_birth):
-                        match_key = f'tenant_{emp.id}'
-                        if any(m['employee'].id == emp.id for m in tenant_matches):
-                            continue
-                        if _name_matches(emp.first_name, emp.last_name):
-                            tenant_matches.append({
-                                'employee': emp,
-                                'employer_id': emp_profile.id,
-                                'employer_name': emp_profile.company_name,
-                                'tenant_db': tenant_db
-                            })
-                            match_reasons[match_key] = ['Name + DOB match']
-            else:
-                # Default: national ID only
-                if normalized_national_id:
-                    for emp in employee_query.filter(national_id_number=normalized_national_id):
-                        tenant_matches.append({
-                            'employee': emp,
-                            'employer_id': emp_profile.id,
-                            'employer_name': emp_profile.company_name,
-                            'tenant_db': tenant_db
-                        })
-                        match_reasons[f'tenant_{emp.id}'] = ['National ID match']
+
+            for emp in employee_query:
+                reasons = _tenant_match_reasons(emp)
+                if not reasons:
+                    continue
+                tenant_matches.append({
+                    'employee': emp,
+                    'employer_id': emp_profile.id,
+                    'employer_name': emp_profile.company_name,
+                    'tenant_db': tenant_db
+                })
+                match_reasons[f'tenant_{emp.id}'] = reasons
         except Exception as e:
             # Skip this tenant if there's an error
             import logging
@@ -1341,18 +1344,14 @@ def get_employer_notification_recipients(employer, *, exclude_user_id=None):
 
 def notify_employer_users(employer, title, body="", *, type="INFO", data=None, exclude_user_id=None):
     """Send in-app notification to employer owner/HR/manager users."""
-    from accounts.notifications import create_notification
+    from accounts.notifications import create_notifications_bulk
 
     recipients = get_employer_notification_recipients(employer, exclude_user_id=exclude_user_id)
-    for user in recipients:
-        create_notification(
-            user=user,
-            title=title,
-            body=body,
-            type=type,
-            data=data or {},
-            employer_profile=employer,
-        )
+    payload = {'title': title, 'body': body, 'type': type, 'data': data or {}}
+    create_notifications_bulk(
+        [(user.id, payload) for user in recipients],
+        employer_profile=employer,
+    )
     return recipients
 
 
@@ -1379,6 +1378,93 @@ def notify_employee_user(employee, title, body="", *, type="INFO", data=None, em
     )
 
 
+def _birthday_age(date_of_birth, today):
+    age = today.year - date_of_birth.year
+    if (today.month, today.day) < (date_of_birth.month, date_of_birth.day):
+        age -= 1
+    return age
+
+
+def fan_out_birthday_notifications(employer, *, tenant_db=None, today=None):
+    """
+    Emit today's birthday notifications for one employer in a single bulk insert.
+
+    Each row carries a dedup_key (event, employee, recipient, date), so re-running
+    the daily job is a no-op. Returns the number of notifications created.
+    """
+    from accounts.database_utils import get_tenant_database_alias
+    from accounts.notifications import create_notifications_bulk
+    from employees.models import Employee
+    from notifications.models import Notification
+
+    today = today or timezone.localdate()
+    today_str = today.isoformat()
+    tenant_db = tenant_db or get_tenant_database_alias(employer)
+
+    employees = list(
+        Employee.objects.using(tenant_db).filter(
+            employer_id=employer.id,
+            employment_status='ACTIVE',
+            date_of_birth__isnull=False,
+            date_of_birth__month=today.month,
+            date_of_birth__day=today.day,
+        )
+    )
+    if not employees:
+        return 0
+
+    recipients = get_employer_notification_recipients(employer)
+
+    pending = {}
+    for employee in employees:
+        employee_name = employee.full_name
+        age = _birthday_age(employee.date_of_birth, today)
+        admin_payload = {
+            'event': 'employees.birthday_admin',
+            'employee_id': str(employee.id),
+            'employee_number': employee.employee_id,
+            'name': employee_name,
+            'birthday_date': today_str,
+            'age': age,
+            'path': f'/employer/employees/{employee.id}',
+        }
+        for recipient in recipients:
+            dedup_key = f"employees.birthday_admin:{employer.id}:{employee.id}:{recipient.id}:{today_str}"
+            pending[dedup_key] = (recipient.id, {
+                'title': 'Employee birthday today',
+                'body': f"Today is {employee_name}'s birthday ({age} years old).",
+                'data': admin_payload,
+                'dedup_key': dedup_key,
+            })
+
+        if employee.user_id:
+            dedup_key = f"employees.birthday:{employer.id}:{employee.id}:{employee.user_id}:{today_str}"
+            pending[dedup_key] = (employee.user_id, {
+                'title': 'Happy Birthday!',
+                'body': f'Happy Birthday, {employee_name}! Wishing you a great day.',
+                'data': {
+                    'event': 'employees.birthday',
+                    'employee_id': str(employee.id),
+                    'name': employee_name,
+                    'birthday_date': today_str,
+                    'celebration': True,
+                    'path': '/employee',
+                },
+                'dedup_key': dedup_key,
+            })
+
+    existing = set(
+        Notification.objects.filter(dedup_key__in=list(pending)).values_list('dedup_key', flat=True)
+    )
+    # ignore_conflicts covers a concurrent run racing on the same dedup keys.
+    created = create_notifications_bulk(
+        [entry for key, entry in pending.items() if key not in existing],
+        employer_profile=employer,
+        ignore_conflicts=True,
+    )
+    return len(created)
+
+
 def generate_consent_token():
     """Generate a secure random token for consent requests"""
     import secrets
@@ -4,7 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError
 from datetime import timedelta
@@ -78,7 +78,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
             scope = get_delegate_scope(self.request.user, employer.id)
             qs = apply_scope_filter(qs, scope, branch_field="branch_id", department_field="id")
 
-        return qs
+        return qs.annotate(employee_count=Count('employees', distinct=True))
     
     def perform_create(self, serializer):
         """Set employer when creating department in tenant database"""
@@ -127,7 +127,7 @@ class BranchViewSet(viewsets.ModelViewSet):
             scope = get_delegate_scope(self.request.user, employer.id)
             qs = apply_scope_filter(qs, scope, branch_field="id")
 
-        return qs
+        return qs.annotate(employee_count=Count('employees', distinct=True))
     
     def perform_create(self, serializer):
         """Set employer when creating branch in tenant database"""
@@ -1,8 +1,8 @@
-from django.conf import settings
 from rest_framework import serializers
 from rest_framework.utils import model_meta
 
 from accounts.database_utils import ensure_tenant_database_loaded, get_tenant_database_alias
+from accounts.tenant_context import get_tenant_db_context
 
 from employees.models import Branch, Employee
 
@@ -107,7 +107,7 @@ class EmployerScopedSerializer(serializers.ModelSerializer):
         tenant_db = self.context.get("tenant_db")
         if tenant_db:
             return tenant_db
-        tenant_db = getattr(settings, "CURRENT_TENANT_DB", None)
+        tenant_db = get_tenant_db_context()
         if tenant_db:
             return tenant_db
 
@@ -0,0 +1,54 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from frontdesk.models import FrontdeskStation
+from frontdesk.services import register_station_slug
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the central frontdesk kiosk slug index from every tenant database so "
+        "public kiosk endpoints resolve their station with a single indexed lookup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the sync to a single employer.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        registered = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Indexing frontdesk stations for {alias}...")
+            try:
+                for station in FrontdeskStation.objects.using(alias).filter(employer_id=employer.id):
+                    register_station_slug(station, alias)
+                    registered += 1
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {registered} station slug(s) across {total} tenant(s)."))
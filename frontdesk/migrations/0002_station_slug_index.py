@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontdesk', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FrontdeskStationSlugIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kiosk_slug', models.CharField(max_length=100, unique=True)),
+                ('employer_id', models.IntegerField(db_index=True, help_text='Employer/company id from main database')),
+                ('tenant_db', models.CharField(help_text='Database alias holding the station', max_length=64)),
+                ('station_id', models.UUIDField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Frontdesk Station Slug Index',
+                'verbose_name_plural': 'Frontdesk Station Slug Index',
+                'db_table': 'frontdesk_station_slug_index',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+import io
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def backfill_station_slug_index(apps, schema_editor):
+    """Index the kiosk slugs of every tenant (the index lives in the default database)."""
+    if schema_editor.connection.alias != 'default':
+        return
+    try:
+        call_command('sync_frontdesk_station_index', stdout=io.StringIO(), stderr=io.StringIO())
+    except SystemExit:
+        print("\n  Some tenants could not be indexed; re-run `manage.py sync_frontdesk_station_index`.")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontdesk', '0002_station_slug_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_station_slug_index, migrations.RunPython.noop),
+    ]
@@ -82,6 +82,29 @@ class FrontdeskStation(models.Model):
         return f"{self.name} ({'Active' if self.is_active else 'Inactive'})"
 
 
+class FrontdeskStationSlugIndex(models.Model):
+    """
+    Central kiosk slug registry (default database).
+    Maps a station kiosk_slug to the tenant database and station that own it
+    so public kiosk endpoints do not have to probe every tenant database.
+    """
+
+    kiosk_slug = models.CharField(max_length=100, unique=True)
+    employer_id = models.IntegerField(db_index=True, help_text="Employer/company id from main database")
+    tenant_db = models.CharField(max_length=64, help_text="Database alias holding the station")
+    station_id = models.UUIDField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "frontdesk_station_slug_index"
+        verbose_name = "Frontdesk Station Slug Index"
+        verbose_name_plural = "Frontdesk Station Slug Index"
+
+    def __str__(self):
+        return f"{self.kiosk_slug} -> {self.tenant_db}"
+
+
 class StationResponsible(models.Model):
     """
     HR/Office admins responsible for a station. Scoped to the station's branch.
@@ -0,0 +1,195 @@
+"""
+Kiosk slug resolution and cached kiosk payloads.
+
+``FrontdeskStationSlugIndex`` (default DB) maps every station kiosk_slug to its
+tenant database. ``FrontdeskStationViewSet`` registers stations on create and
+update and drops them on delete; unindexed slugs fall back to a one-off tenant
+scan that registers the hit. The public kiosk UI reads a cached station + hosts
+payload whose key embeds a per-employer version bumped whenever a station,
+branch or employee of that employer changes.
+"""
+from typing import Optional, Tuple
+
+from django.core.cache import cache
+
+from accounts.cache_versions import bump_cache_version, get_cache_version
+from accounts.database_utils import resolve_indexed_tenant_alias, scan_tenant_databases
+from employees.models import Employee
+
+from .models import FrontdeskStation, FrontdeskStationSlugIndex
+
+KIOSK_SLUG_CACHE_TTL_SECONDS = 300
+KIOSK_SLUG_MISS_CACHE_TTL_SECONDS = 60
+KIOSK_SLUG_MISS = object()
+KIOSK_PAYLOAD_CACHE_TTL_SECONDS = 300
+
+
+def _kiosk_slug_cache_key(kiosk_slug: str) -> str:
+    return f"frontdesk_kiosk_slug:{kiosk_slug}"
+
+
+def _invalidate_kiosk_slugs(slugs) -> None:
+    keys = [_kiosk_slug_cache_key(slug) for slug in slugs if slug]
+    if keys:
+        cache.delete_many(keys)
+
+
+def _kiosk_version_key(employer_id) -> str:
+    return f"frontdesk_kiosk_version:{employer_id}"
+
+
+def get_kiosk_version(employer_id) -> str:
+    return get_cache_version(_kiosk_version_key(employer_id))
+
+
+def bump_kiosk_version(employer_id) -> None:
+    """Invalidate every cached kiosk payload of an employer."""
+    if employer_id:
+        bump_cache_version(_kiosk_version_key(employer_id))
+
+
+def register_station_slug(station: FrontdeskStation, db_alias: str) -> None:
+    """Record (or re-point) the kiosk slug of a station in the central index."""
+    if not station.kiosk_slug:
+        return
+    index = FrontdeskStationSlugIndex.objects.using("default")
+    stale_slugs = list(
+        index.filter(station_id=station.id).exclude(kiosk_slug=station.kiosk_slug).values_list("kiosk_slug", flat=True)
+    )
+    if stale_slugs:
+        index.filter(kiosk_slug__in=stale_slugs).delete()
+    index.update_or_create(
+        kiosk_slug=station.kiosk_slug,
+        defaults={
+            "employer_id": station.employer_id,
+            "tenant_db": db_alias,
+            "station_id": station.id,
+        },
+    )
+    _invalidate_kiosk_slugs(stale_slugs + [station.kiosk_slug])
+    bump_kiosk_version(station.employer_id)
+
+
+def unregister_station(station_id, employer_id=None) -> None:
+    """Drop the index row of a deleted station."""
+    index = FrontdeskStationSlugIndex.objects.using("default").filter(station_id=station_id)
+    slugs = list(index.values_list("kiosk_slug", flat=True))
+    index.delete()
+    _invalidate_kiosk_slugs(slugs)
+    bump_kiosk_version(employer_id)
+
+
+def _cached_station_slug_entry(kiosk_slug: str):
+    """
+    Index entry of a slug, ``KIOSK_SLUG_MISS`` for a cached miss, or None
+    when the slug was just looked up and is not indexed.
+    """
+    key = _kiosk_slug_cache_key(kiosk_slug)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached or KIOSK_SLUG_MISS
+    entry = (
+        FrontdeskStationSlugIndex.objects.using("default")
+        .filter(kiosk_slug=kiosk_slug)
+        .values("employer_id", "tenant_db", "station_id")
+        .first()
+    )
+    if entry:
+        cache.set(key, entry, timeout=KIOSK_SLUG_CACHE_TTL_SECONDS)
+    else:
+        # Negative entries are short-lived; registration clears them immediately anyway.
+        cache.set(key, {}, timeout=KIOSK_SLUG_MISS_CACHE_TTL_SECONDS)
+    return entry
+
+
+def lookup_station_slug(kiosk_slug: str) -> Optional[dict]:
+    """Return the cached index entry (employer_id, tenant_db, station_id) for a slug."""
+    if not kiosk_slug:
+        return None
+    entry = _cached_station_slug_entry(kiosk_slug)
+    return None if entry is KIOSK_SLUG_MISS else entry
+
+
+def _probe_station_slug(kiosk_slug: str):
+    def probe(alias, tables):
+        station = FrontdeskStation.objects.using(alias).select_related("branch").filter(kiosk_slug=kiosk_slug).first()
+        return (station, alias) if station else None
+
+    return probe
+
+
+def resolve_station_entry(kiosk_slug: str) -> Tuple[Optional[dict], Optional[str]]:
+    """
+    Resolve a slug to its (index entry, alias) without touching the tenant
+    database. Unindexed slugs fall back to a tenant scan (registering the hit)
+    only when TENANT_INDEX_SCAN_FALLBACK is on; a cached miss never scans.
+    """
+    if not kiosk_slug:
+        return None, None
+    entry = _cached_station_slug_entry(kiosk_slug)
+    if entry is KIOSK_SLUG_MISS:
+        return None, None
+    if entry:
+        alias = resolve_indexed_tenant_alias(entry.get("tenant_db"), entry.get("employer_id"))
+        return (entry, alias) if alias else (None, None)
+
+    found = scan_tenant_databases(("frontdesk_stations",), _probe_station_slug(kiosk_slug))
+    if not found:
+        return None, None
+    station, alias = found
+    register_station_slug(station, alias)
+    return {"employer_id": station.employer_id, "tenant_db": alias, "station_id": station.id}, alias
+
+
+def resolve_station_by_slug(kiosk_slug: str) -> Tuple[Optional[FrontdeskStation], Optional[str]]:
+    """Find a station by kiosk_slug via the central slug index."""
+    entry, alias = resolve_station_entry(kiosk_slug)
+    if not entry:
+        return None, None
+    station = (
+        FrontdeskStation.objects.using(alias)
+        .select_related("branch")
+        .filter(id=entry["station_id"], kiosk_slug=kiosk_slug)
+        .first()
+    )
+    if not station:
+        # Slug rotated or station removed outside the viewset: forget the stale row.
+        unregister_station(entry["station_id"], entry.get("employer_id"))
+        return None, None
+    return station, alias
+
+
+def get_kiosk_payload(kiosk_slug: str) -> Optional[dict]:
+    """
+    Return the public kiosk payload ``{"station": ..., "hosts": [...]}`` for a
+    slug, served from cache while the employer's kiosk version is unchanged.
+    The station logo URL is relative; views make it absolute per request.
+    """
+    from .serializers import KioskHostSerializer, KioskStationSerializer
+
+    entry, alias = resolve_station_entry(kiosk_slug)
+    if not entry:
+        return None
+    key = f"frontdesk_kiosk_payload:{entry['station_id']}:{get_kiosk_version(entry['employer_id'])}"
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    station, alias = resolve_station_by_slug(kiosk_slug)
+    if not station:
+        return None
+    hosts = (
+        Employee.objects.using(alias)
+        .filter(
+            employer_id=station.employer_id,
+            branch_id=station.branch_id,
+            employment_status="ACTIVE",
+        )
+        .order_by("last_name", "first_name")
+    )
+    payload = {
+        "station": dict(KioskStationSerializer(station).data),
+        "hosts": [dict(row) for row in KioskHostSerializer(hosts, many=True).data],
+    }
+    cache.set(key, payload, timeout=KIOSK_PAYLOAD_CACHE_TTL_SECONDS)
+    return payload
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from employees.models import Branch, Employee
+
+from .models import FrontdeskStation
+from .services import bump_kiosk_version
+
+
+@receiver(post_save, sender=FrontdeskStation)
+@receiver(post_delete, sender=FrontdeskStation)
+@receiver(post_save, sender=Branch)
+@receiver(post_delete, sender=Branch)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_kiosk_payloads(sender, instance, **kwargs):
+    """Station, branch names and host lists are part of the cached kiosk payload."""
+    bump_kiosk_version(instance.employer_id)
@@ -0,0 +1,46 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from employees.models import Branch
+from frontdesk import services as frontdesk_services
+from frontdesk.models import FrontdeskStation, FrontdeskStationSlugIndex
+from frontdesk.services import register_station_slug, resolve_station_by_slug
+
+
+class KioskSlugResolutionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        branch = Branch.objects.create(
+            employer_id=4242,
+            name="Head Office",
+            code="HQ",
+            address="1 Main Street",
+            city="City",
+            state_region="Region",
+            country="Country",
+        )
+        self.station = FrontdeskStation.objects.create(employer_id=4242, branch=branch, name="Lobby")
+
+    def test_indexed_slug_resolves_without_scanning(self):
+        register_station_slug(self.station, "default")
+        with mock.patch.object(frontdesk_services, "scan_tenant_databases") as scan:
+            station, alias = resolve_station_by_slug(self.station.kiosk_slug)
+        scan.assert_not_called()
+        self.assertEqual((station.id, alias), (self.station.id, "default"))
+
+    def test_unknown_slug_is_rejected_without_scanning_tenants(self):
+        with mock.patch("accounts.database_utils.connections") as tenant_connections:
+            self.assertEqual(resolve_station_by_slug("unknown-slug"), (None, None))
+            self.assertEqual(resolve_station_by_slug("unknown-slug"), (None, None))
+        tenant_connections.__getitem__.assert_not_called()
+
+    @override_settings(TENANT_INDEX_SCAN_FALLBACK=True)
+    def test_fallback_scan_registers_unindexed_slugs(self):
+        self.assertFalse(FrontdeskStationSlugIndex.objects.filter(kiosk_slug=self.station.kiosk_slug).exists())
+
+        station, alias = resolve_station_by_slug(self.station.kiosk_slug)
+
+        self.assertEqual((station.id, alias), (self.station.id, "default"))
+        self.assertTrue(FrontdeskStationSlugIndex.objects.filter(kiosk_slug=self.station.kiosk_slug).exists())
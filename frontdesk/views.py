@@ -1,4 +1,3 @@
-from django.conf import settings
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -17,12 +16,15 @@ from .serializers import (
     VisitorSerializer,
     VisitSerializer,
     KioskCheckInSerializer,
-    KioskStationSerializer,
-    KioskHostSerializer,
+)
+from .services import (
+    get_kiosk_payload,
+    register_station_slug,
+    resolve_station_by_slug,
+    unregister_station,
 )
 
 User = get_user_model()
-from employees.models import Employee
 
 
 class FrontdeskStationViewSet(viewsets.ModelViewSet):
@@ -55,15 +57,24 @@ class FrontdeskStationViewSet(viewsets.ModelViewSet):
             qs = apply_scope_filter(qs, scope, branch_field="branch_id")
         return qs
 
+    def perform_create(self, serializer):
+        station = serializer.save()
+        register_station_slug(station, station._state.db)
+
+    def perform_update(self, serializer):
+        station = serializer.save()
+        register_station_slug(station, station._state.db)
+
     def perform_destroy(self, instance):
         tenant_db = get_tenant_database_alias(get_active_employer(self.request, require_context=True))
+        station_id, employer_id = instance.id, instance.employer_id
         instance.delete(using=tenant_db)
+        unregister_station(station_id, employer_id)
 
     @action(detail=True, methods=["delete"], url_path="delete")
     def delete_station(self, request, pk=None):
         station = self.get_object()
-        tenant_db = get_tenant_database_alias(get_active_employer(request, require_context=True))
-        station.delete(using=tenant_db)
+        self.perform_destroy(station)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -225,19 +236,12 @@ class VisitViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-def resolve_station_by_slug(kiosk_slug):
-    """Find station across tenant databases by kiosk_slug."""
-    aliases = list(settings.DATABASES.keys())
-    # Prefer tenant databases first, then default
-    tenant_aliases = [a for a in aliases if a.startswith("tenant_")]
-    ordered_aliases = tenant_aliases + [a for a in aliases if a not in tenant_aliases]
-    for alias in ordered_aliases:
-        try:
-            station = FrontdeskStation.objects.using(alias).select_related("branch").get(kiosk_slug=kiosk_slug)
-            return station, alias
-        except FrontdeskStation.DoesNotExist:
-            continue
-    return None, None
+def _absolute_kiosk_station(request, station_data):
+    data = dict(station_data)
+    logo_url = data.get("kiosk_logo_url")
+    if logo_url and request and not logo_url.startswith(("http://", "https://")):
+        data["kiosk_logo_url"] = request.build_absolute_uri(logo_url)
+    return data
 
 
 def process_kiosk_check_in(request, kiosk_slug):
@@ -275,11 +279,10 @@ class KioskStationView(APIView):
     authentication_classes = []
 
     def get(self, request, kiosk_slug):
-        station, tenant_db = resolve_station_by_slug(kiosk_slug)
-        if not station:
+        payload = get_kiosk_payload(kiosk_slug)
+        if not payload:
             return Response({"detail": "Invalid kiosk."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = KioskStationSerializer(station, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(_absolute_kiosk_station(request, payload["station"]), status=status.HTTP_200_OK)
 
 
 class KioskHostsView(APIView):
@@ -289,23 +292,13 @@ class KioskHostsView(APIView):
     authentication_classes = []
 
     def get(self, request, kiosk_slug):
-        station, tenant_db = resolve_station_by_slug(kiosk_slug)
-        if not station:
+        payload = get_kiosk_payload(kiosk_slug)
+        if not payload:
             return Response({"detail": "Invalid kiosk."}, status=status.HTTP_404_NOT_FOUND)
-        if not station.is_active or not station.allow_self_check_in:
+        station = payload["station"]
+        if not station.get("is_active") or not station.get("allow_self_check_in"):
             return Response({"detail": "Self check-in is disabled for this station."}, status=status.HTTP_400_BAD_REQUEST)
-
-        hosts = (
-            Employee.objects.using(tenant_db)
-            .filter(
-                employer_id=station.employer_id,
-                branch_id=station.branch_id,
-                employment_status="ACTIVE",
-            )
-            .order_by("last_name", "first_name")
-        )
-        serializer = KioskHostSerializer(hosts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(payload["hosts"], status=status.HTTP_200_OK)
 
 
 class GlobalKioskCheckInView(APIView):
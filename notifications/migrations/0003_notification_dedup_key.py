@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notification_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='dedup_key',
+            field=models.CharField(blank=True, help_text='Idempotency key for scheduled fan-outs (e.g. daily birthdays)', max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -38,6 +38,13 @@ class Notification(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES, default=TYPE_INFO)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UNREAD, db_index=True)
     data = models.JSONField(null=True, blank=True, help_text='Additional payload for the frontend')
+    dedup_key = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        unique=True,
+        help_text='Idempotency key for scheduled fan-outs (e.g. daily birthdays)',
+    )
     read_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -47,6 +54,7 @@ class Notification(models.Model):
             models.Index(fields=['user', 'status']),
             models.Index(fields=['employer_profile', 'status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_feed_idx'),
         ]
         ordering = ['-created_at']
 
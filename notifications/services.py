@@ -0,0 +1,102 @@
+"""
+Feed state helpers for in-app notifications.
+
+Every user has an opaque feed version in the cache that changes whenever one of
+their notifications is created, deleted or marked read. The list/unread views
+derive their ETags from it, so an unchanged feed is answered without touching
+the database. Unread counts are cached and dropped on the same events.
+"""
+import base64
+import binascii
+import hashlib
+from datetime import datetime
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from accounts.cache_versions import bump_cache_version, get_cache_version
+
+from .models import Notification
+
+FEED_DEFAULT_LIMIT = 50
+FEED_MAX_LIMIT = 200
+UNREAD_COUNT_CACHE_TTL_SECONDS = 600
+
+
+def _feed_version_key(user_id):
+    return f"notifications:feed-version:{user_id}"
+
+
+def _unread_count_key(user_id):
+    return f"notifications:unread-count:{user_id}"
+
+
+def get_feed_version(user_id):
+    return get_cache_version(_feed_version_key(user_id))
+
+
+def touch_notification_feeds(user_ids):
+    """Invalidate feed versions and unread counts for the given users."""
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+    bump_cache_version(*[_feed_version_key(user_id) for user_id in user_ids])
+    cache.delete_many([_unread_count_key(user_id) for user_id in user_ids])
+
+
+def get_unread_count(user_id):
+    key = _unread_count_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, status=Notification.STATUS_UNREAD).count()
+        cache.set(key, count, UNREAD_COUNT_CACHE_TTL_SECONDS)
+    return count
+
+
+def build_feed_etag(user_id, *parts):
+    raw = "|".join([get_feed_version(user_id), *[str(part or "") for part in parts]])
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("If-None-Match") if hasattr(request, "headers") else None
+    if not header:
+        return False
+    candidates = {value.strip() for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def encode_cursor(notification):
+    raw = f"{notification.created_at.isoformat()}|{notification.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from an opaque cursor, or raise ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, id_raw = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_raw), int(id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def paginate_feed(queryset, *, cursor=None, since_id=None, limit=FEED_DEFAULT_LIMIT):
+    """
+    Keyset pagination over (created_at, id), newest first.
+    Returns (items, next_cursor).
+    """
+    queryset = queryset.order_by("-created_at", "-id")
+    if since_id is not None:
+        queryset = queryset.filter(id__gt=since_id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+        )
+    items = list(queryset[: limit + 1])
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1])
+    return items, next_cursor
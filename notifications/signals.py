@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services import touch_notification_feeds
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def touch_feed_on_change(sender, instance: Notification, **kwargs):
+    touch_notification_feeds([instance.user_id])
@@ -1,8 +1,14 @@
+from datetime import date
+
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from accounts.models import User
+from accounts.notifications import create_notifications_bulk
+from accounts.tests import create_employer_profile
+from employees.models import Employee
+from employees.utils import fan_out_birthday_notifications
 from notifications.models import Notification
 
 
@@ -27,3 +33,68 @@ class NotificationTests(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         note.refresh_from_db()
         self.assertEqual(note.status, Notification.STATUS_READ)
+
+    def test_feed_is_cursor_paginated(self):
+        for index in range(3):
+            Notification.objects.create(user=self.user, title=f'Extra {index}', body='Body')
+        self.client.force_authenticate(self.user)
+        url = reverse('notifications:notifications')
+
+        first = self.client.get(url, {'limit': 3})
+        self.assertEqual(len(first.data['data']), 3)
+        self.assertTrue(first.data['pagination']['has_more'])
+
+        second = self.client.get(url, {'limit': 3, 'cursor': first.data['pagination']['next_cursor']})
+        self.assertEqual(len(second.data['data']), 2)
+        self.assertIsNone(second.data['pagination']['next_cursor'])
+        first_ids = {row['id'] for row in first.data['data']}
+        self.assertFalse(first_ids & {row['id'] for row in second.data['data']})
+
+    def test_unread_count_and_etag_short_circuit(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('notifications:notifications-unread-count')
+        resp = self.client.get(url)
+        self.assertEqual(resp.data['data']['unread_count'], 1)
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Notification.objects.create(user=self.user, title='New', body='Body')
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(fresh.status_code, status.HTTP_200_OK)
+        self.assertEqual(fresh.data['data']['unread_count'], 2)
+
+    def test_bulk_create_skips_inactive_users(self):
+        inactive = User.objects.create_user(email='inactive@example.com', password='pass', is_active=False)
+        payload = {'title': 'Announcement', 'body': 'Hello all'}
+        created = create_notifications_bulk([(self.user.id, payload), (inactive.id, payload)])
+        self.assertEqual([note.user_id for note in created], [self.user.id])
+        self.assertFalse(Notification.objects.filter(user=inactive).exists())
+
+
+class BirthdayFanOutTests(APITestCase):
+    def test_fan_out_is_idempotent(self):
+        today = date(2026, 3, 14)
+        employer_user = User.objects.create_user(email='bday-employer@example.com', password='pass', is_employer=True)
+        employer = create_employer_profile(employer_user, name_suffix="BDAY")
+        employee_user = User.objects.create_user(email='bday@example.com', password='pass', is_employee=True)
+        Employee.objects.create(
+            employer_id=employer.id,
+            user_id=employee_user.id,
+            first_name='Birthday',
+            last_name='Person',
+            job_title='Dev',
+            employment_type='FULL_TIME',
+            employment_status='ACTIVE',
+            hire_date=date(2024, 1, 1),
+            date_of_birth=date(1990, 3, 14),
+            email='bday@test.com',
+        )
+
+        created = fan_out_birthday_notifications(employer, tenant_db='default', today=today)
+        self.assertEqual(created, 2)
+        self.assertEqual(fan_out_birthday_notifications(employer, tenant_db='default', today=today), 0)
+        self.assertEqual(
+            Notification.objects.filter(data__event='employees.birthday', user=employee_user).count(),
+            1,
+        )
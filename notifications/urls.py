@@ -1,10 +1,11 @@
 from django.urls import path
 
-from .views import NotificationListView, NotificationMarkReadView
+from .views import NotificationListView, NotificationMarkReadView, NotificationUnreadCountView
 
 app_name = 'notifications'
 
 urlpatterns = [
     path('', NotificationListView.as_view(), name='notifications'),
     path('mark-read/', NotificationMarkReadView.as_view(), name='notifications-mark-read'),
+    path('unread-count/', NotificationUnreadCountView.as_view(), name='notifications-unread-count'),
 ]
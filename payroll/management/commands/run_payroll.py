@@ -0,0 +1,96 @@
+import json
+import sys
+
+from django.core.management import BaseCommand, CommandError
+
+from payroll.models import Salary
+from payroll.parallel import (
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_SHARD_SIZE,
+    run_payroll_for_all_tenants,
+    run_payroll_parallel,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run month-end payroll with contracts split into shards computed by a process pool. "
+        "Targets one employer (--employer-id) or every tenant (--all-tenants)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, required=True)
+        parser.add_argument("--month", type=int, required=True)
+        parser.add_argument(
+            "--mode",
+            default=Salary.STATUS_SIMULATED,
+            choices=[Salary.STATUS_SIMULATED, Salary.STATUS_GENERATED],
+            help="Payroll mode (default: SIMULATED).",
+        )
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_ids",
+            type=int,
+            action="append",
+            help="Employer to process (repeatable).",
+        )
+        parser.add_argument(
+            "--all-tenants",
+            action="store_true",
+            help="Process every tenant database (auto-load aliases from EmployerProfile).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_MAX_WORKERS,
+            help=f"Maximum worker processes across all shards (default: {DEFAULT_MAX_WORKERS}).",
+        )
+        parser.add_argument(
+            "--shard-size",
+            type=int,
+            default=DEFAULT_SHARD_SIZE,
+            help=f"Contracts per shard (default: {DEFAULT_SHARD_SIZE}).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the full run report as JSON.",
+        )
+
+    def handle(self, *args, **options):
+        employer_ids = options.get("employer_ids") or []
+        if not employer_ids and not options.get("all_tenants"):
+            raise CommandError("Provide --employer-id or --all-tenants.")
+
+        params = {
+            "year": options["year"],
+            "month": options["month"],
+            "mode": options["mode"],
+            "shard_size": options["shard_size"],
+            "max_workers": options["workers"],
+        }
+        if len(employer_ids) == 1 and not options.get("all_tenants"):
+            report = run_payroll_parallel(employer_id=employer_ids[0], **params)
+        else:
+            report = run_payroll_for_all_tenants(employer_ids=employer_ids or None, **params)
+
+        summary = report.to_dict()
+        if options.get("json"):
+            self.stdout.write(json.dumps(summary, indent=2, default=str))
+        else:
+            self.stdout.write(
+                f"{summary['mode']} {summary['month']:02d}/{summary['year']}: "
+                f"{summary['processed']} processed, {summary['skipped']} skipped "
+                f"across {summary['shards']} shard(s)."
+            )
+            for error in report.errors:
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"Employer {error['employer_id']} shard {error['shard']}: {error['error']}"
+                    )
+                )
+
+        if report.errors:
+            self.stderr.write(self.style.ERROR(f"Completed with {len(report.errors)} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS("Payroll run completed."))
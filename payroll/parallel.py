@@ -0,0 +1,319 @@
+"""
+Multi-process payroll execution.
+
+Contracts are split into shards and every shard is computed by
+``PayrollCalculationService.run(batch=True)`` inside a worker process that
+holds its own tenant database connection. Shard outcomes are merged into a
+single ``PayrollRunReport``.
+
+This module must stay importable before ``django.setup()`` runs (spawned
+workers unpickle ``_run_payroll_shard`` first), so model imports are local.
+"""
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 250
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass
+class PayrollShardTask:
+    employer_id: int
+    year: int
+    month: int
+    mode: str
+    contract_ids: List[str]
+    shard_index: int = 0
+
+
+@dataclass
+class PayrollRunReport:
+    year: int
+    month: int
+    mode: str
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    shards: int = 0
+
+    @property
+    def ok(self) -> int:
+        return sum(1 for row in self.results if row["outcome"] == "OK")
+
+    @property
+    def skipped(self) -> int:
+        return sum(1 for row in self.results if row["outcome"] == "SKIPPED")
+
+    def merge(self, shard_result: Dict[str, Any]) -> None:
+        self.shards += 1
+        self.results.extend(shard_result.get("results") or [])
+        if shard_result.get("error"):
+            self.errors.append(
+                {
+                    "employer_id": shard_result.get("employer_id"),
+                    "shard": shard_result.get("shard"),
+                    "contract_ids": shard_result.get("contract_ids") or [],
+                    "error": shard_result["error"],
+                }
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year,
+            "month": self.month,
+            "mode": self.mode,
+            "shards": self.shards,
+            "processed": self.ok,
+            "skipped": self.skipped,
+            "failed_shards": len(self.errors),
+            "results": self.results,
+            "errors": self.errors,
+        }
+
+
+def _format_error(exc: Exception) -> str:
+    detail = getattr(exc, "detail", None)
+    if isinstance(detail, dict):
+        parts = []
+        for key, value in detail.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            parts.append(f"{key}: {' '.join(str(item) for item in values)}")
+        return "; ".join(parts)
+    if isinstance(detail, (list, tuple)):
+        return " ".join(str(item) for item in detail)
+    return str(detail or exc)
+
+
+def _chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    size = max(int(size or 1), 1)
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def _init_payroll_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _resolve_tenant_db(employer_id: int) -> Optional[str]:
+    from accounts.database_utils import ensure_tenant_database_loaded
+    from accounts.models import EmployerProfile
+
+    employer = EmployerProfile.objects.filter(id=employer_id).first()
+    if not employer:
+        return None
+    return ensure_tenant_database_loaded(employer)
+
+
+def _run_payroll_shard(task: PayrollShardTask) -> Dict[str, Any]:
+    """Worker entry point: compute one shard and return a picklable summary."""
+    from payroll.services import PayrollCalculationService
+
+    payload: Dict[str, Any] = {
+        "employer_id": task.employer_id,
+        "shard": task.shard_index,
+        "contract_ids": task.contract_ids,
+        "results": [],
+        "error": None,
+    }
+    try:
+        tenant_db = _resolve_tenant_db(task.employer_id)
+        if not tenant_db:
+            payload["error"] = f"Employer {task.employer_id} not found."
+            return payload
+        service = PayrollCalculationService(
+            employer_id=task.employer_id,
+            year=task.year,
+            month=task.month,
+            tenant_db=tenant_db,
+        )
+        results = service.run(mode=task.mode, contract_ids=task.contract_ids, batch=True)
+    except Exception as exc:  # noqa: BLE001 - reported per shard
+        logger.exception(
+            "Payroll shard %s failed for employer %s (%02d/%s)",
+            task.shard_index,
+            task.employer_id,
+            task.month,
+            task.year,
+        )
+        payload["error"] = _format_error(exc)
+        return payload
+
+    payload["results"] = [
+        {
+            "employer_id": task.employer_id,
+            "contract_id": str(result.salary.contract_id),
+            "salary_id": str(result.salary.id),
+            "outcome": result.outcome,
+            "reason": result.reason,
+        }
+        for result in results
+    ]
+    return payload
+
+
+def build_shard_tasks(
+    *,
+    employer_id: int,
+    year: int,
+    month: int,
+    mode: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    branch_id=None,
+    department_id=None,
+) -> List[PayrollShardTask]:
+    """
+    Resolve the eligible contracts of one employer and split them into shards.
+    Building the service here also seeds default scales/bases once, before any
+    worker starts, so shards never race on those inserts.
+    """
+    from payroll.services import PayrollCalculationService
+
+    tenant_db = _resolve_tenant_db(employer_id)
+    if not tenant_db:
+        return []
+    service = PayrollCalculationService(
+        employer_id=employer_id,
+        year=year,
+        month=month,
+        tenant_db=tenant_db,
+    )
+    contract_ids = [
+        str(contract.id)
+        for contract in service.eligible_contracts(branch_id=branch_id, department_id=department_id)
+    ]
+    return [
+        PayrollShardTask(
+            employer_id=employer_id,
+            year=year,
+            month=month,
+            mode=mode,
+            contract_ids=chunk,
+            shard_index=index,
+        )
+        for index, chunk in enumerate(_chunked(contract_ids, shard_size))
+    ]
+
+
+def execute_shard_tasks(
+    tasks: List[PayrollShardTask],
+    *,
+    year: int,
+    month: int,
+    mode: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> PayrollRunReport:
+    """
+    Run shard tasks in a process pool capped at ``max_workers`` processes and
+    merge their outcomes. ``max_workers <= 1`` runs the shards inline.
+    """
+    report = PayrollRunReport(year=year, month=month, mode=mode)
+    if not tasks:
+        return report
+
+    if max_workers <= 1 or len(tasks) == 1:
+        for task in tasks:
+            report.merge(_run_payroll_shard(task))
+        return report
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=min(max_workers, len(tasks)),
+        mp_context=context,
+        initializer=_init_payroll_worker,
+    ) as executor:
+        futures = {executor.submit(_run_payroll_shard, task): task for task in tasks}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                report.merge(future.result())
+            except Exception as exc:  # noqa: BLE001 - worker crashed
+                report.merge(
+                    {
+                        "employer_id": task.employer_id,
+                        "shard": task.shard_index,
+                        "contract_ids": task.contract_ids,
+                        "results": [],
+                        "error": _format_error(exc),
+                    }
+                )
+    return report
+
+
+def run_payroll_parallel(
+    *,
+    employer_id: int,
+    year: int,
+    month: int,
+    mode: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    branch_id=None,
+    department_id=None,
+) -> PayrollRunReport:
+    """Shard one employer's contracts across worker processes."""
+    tasks = build_shard_tasks(
+        employer_id=employer_id,
+        year=year,
+        month=month,
+        mode=mode,
+        shard_size=shard_size,
+        branch_id=branch_id,
+        department_id=department_id,
+    )
+    return execute_shard_tasks(tasks, year=year, month=month, mode=mode, max_workers=max_workers)
+
+
+def run_payroll_for_all_tenants(
+    *,
+    year: int,
+    month: int,
+    mode: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    employer_ids: Optional[List[int]] = None,
+) -> PayrollRunReport:
+    """
+    Fan payroll out over every tenant with a created database. All shards of all
+    tenants share one pool, so ``max_workers`` caps platform-wide concurrency.
+    Tenants whose setup fails (module disabled, missing bases...) are reported
+    as errors without blocking the others.
+    """
+    from accounts.models import EmployerProfile
+
+    employers = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+    if employer_ids:
+        employers = employers.filter(id__in=employer_ids)
+
+    tasks: List[PayrollShardTask] = []
+    setup_errors: List[Dict[str, Any]] = []
+    for employer_id in employers.order_by("id").values_list("id", flat=True):
+        try:
+            tasks.extend(
+                build_shard_tasks(
+                    employer_id=employer_id,
+                    year=year,
+                    month=month,
+                    mode=mode,
+                    shard_size=shard_size,
+                )
+            )
+        except Exception as exc:  # noqa: BLE001 - reported per tenant
+            logger.exception("Payroll setup failed for employer %s", employer_id)
+            setup_errors.append(
+                {
+                    "employer_id": employer_id,
+                    "shard": None,
+                    "contract_ids": [],
+                    "error": _format_error(exc),
+                }
+            )
+
+    report = execute_shard_tasks(tasks, year=year, month=month, mode=mode, max_workers=max_workers)
+    report.errors = setup_errors + report.errors
+    return report
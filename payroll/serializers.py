@@ -436,6 +436,7 @@ class PayrollRunSerializer(serializers.Serializer):
     contract_id = serializers.UUIDField(required=False, allow_null=True)
     branch_id = serializers.UUIDField(required=False, allow_null=True)
     department_id = serializers.UUIDField(required=False, allow_null=True)
+    batch = serializers.BooleanField(required=False, default=False)
 
 
 class PayrollValidateSerializer(serializers.Serializer):
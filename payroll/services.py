@@ -15,6 +15,7 @@ from accounts.models import EmployerProfile
 from accounts.rbac import get_active_employer
 from attendance.models import AttendanceConfiguration, AttendanceRecord, WorkingSchedule, WorkingScheduleDay
 from attendance.services import resolve_check_in_timing
+from contracts.config_resolver import contract_config_scope
 from contracts.models import (
     Allowance,
     CalculationScale,
@@ -71,6 +72,26 @@ BASIS_ALIASES = {
     "IRPP-TAXABLE-GROSS-SALARY": "SAL-BRUT-TAX-IRPP",
 }
 
+PAYROLL_BATCH_FLUSH_SIZE = 200
+PAYROLL_BULK_BATCH_SIZE = 500
+
+SALARY_COMPUTED_FIELDS = [
+    "status",
+    "base_salary",
+    "gross_salary",
+    "taxable_gross_salary",
+    "irpp_taxable_gross_salary",
+    "contribution_base_af_pv",
+    "contribution_base_at",
+    "total_advantages",
+    "total_employee_deductions",
+    "total_employer_deductions",
+    "net_salary",
+    "leave_days",
+    "absence_days",
+    "overtime_hours",
+]
+
 DEFAULT_IRPP_WITHHOLDING_THRESHOLD = Decimal("62000.00")
 DEFAULT_CAC_RATE_PERCENTAGE = Decimal("10.00")
 
@@ -166,6 +187,11 @@ def _days_inclusive(start: date, end: date) -> Decimal:
     return Decimal(str((end - start).days + 1))
 
 
+def _chunked(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
 @dataclass
 class MonthlyAdjustments:
     paid_days: Decimal = Decimal("0.00")
@@ -181,6 +207,42 @@ class PayrollRunResult:
     reason: str = ""
 
 
+@dataclass
+class ContractPayrollComputation:
+    contract: Contract
+    salary: Salary
+    advantage_lines: List[SalaryAdvantage]
+    deduction_lines: List[SalaryDeduction]
+
+
+@dataclass
+class PayrollBatchData:
+    """
+    Lookup maps loaded once per batch run so the per-contract computation reads
+    memory instead of issuing its own queries.
+    """
+
+    salaries: Dict[Any, Salary]
+    advantage_elements: Dict[Any, List[ContractElement]]
+    deduction_elements: Dict[Any, List[ContractElement]]
+    timeoff_requests: Dict[Any, List[TimeOffRequest]]
+    attendance_records: Dict[Any, List[AttendanceRecord]]
+    timeoff_config: Optional[TimeOffConfiguration]
+    timeoff_types: Dict[str, TimeOffType]
+    attendance_config: Optional[AttendanceConfiguration]
+    schedules: Dict[Any, WorkingSchedule]
+    default_schedule: Optional[WorkingSchedule]
+    basis_membership: Dict[str, Dict[str, set]]
+    impact_configs: List[AttendancePayrollImpactConfig]
+
+    def schedule_for(self, employee) -> Optional[WorkingSchedule]:
+        schedule = None
+        employee_schedule_id = getattr(employee, "working_schedule_id", None)
+        if employee_schedule_id:
+            schedule = self.schedules.get(employee_schedule_id)
+        return schedule or self.default_schedule
+
+
 class AttendancePayrollImpactService:
     def __init__(
         self,
@@ -199,6 +261,7 @@ class AttendancePayrollImpactService:
         self._month_start, self._month_end, self._month_days = _month_bounds(self.year, self.month)
         self._attendance_config_cache: Dict[int, Optional[AttendanceConfiguration]] = {}
         self._unpaid_leave_codes: Optional[Set[str]] = None
+        self.batch: Optional[PayrollBatchData] = None
 
     def has_active_configs(self) -> bool:
         return AttendancePayrollImpactConfig.objects.using(self.tenant_db).filter(
@@ -233,19 +296,22 @@ class AttendancePayrollImpactService:
             return None, None
 
         schedule = None
-        employee_schedule_id = getattr(employee, "working_schedule_id", None)
-        if employee_schedule_id:
-            schedule = (
-                WorkingSchedule.objects.using(self.tenant_db)
-                .filter(employer_id=self.employer_id, id=employee_schedule_id)
-                .first()
-            )
-        if not schedule:
-            schedule = (
-                WorkingSchedule.objects.using(self.tenant_db)
-                .filter(employer_id=self.employer_id, is_default=True)
-                .first()
-            )
+        if self.batch is not None:
+            schedule = self.batch.schedule_for(employee)
+        else:
+            employee_schedule_id = getattr(employee, "working_schedule_id", None)
+            if employee_schedule_id:
+                schedule = (
+                    WorkingSchedule.objects.using(self.tenant_db)
+                    .filter(employer_id=self.employer_id, id=employee_schedule_id)
+                    .first()
+                )
+            if not schedule:
+                schedule = (
+                    WorkingSchedule.objects.using(self.tenant_db)
+                    .filter(employer_id=self.employer_id, is_default=True)
+                    .first()
+                )
         if not schedule:
             return None, None
 
@@ -292,18 +358,27 @@ class AttendancePayrollImpactService:
         if not employee:
             return []
 
-        records_qs = AttendanceRecord.objects.using(self.tenant_db).filter(
-            employer_id=self.employer_id,
-            employee=employee,
-            check_out_at__isnull=False,
-            check_in_at__date__gte=self._month_start,
-            check_in_at__date__lte=self._month_end,
-        )
         if config.requires_validation:
-            records_qs = records_qs.filter(status=AttendanceRecord.STATUS_APPROVED)
+            allowed_statuses = [AttendanceRecord.STATUS_APPROVED]
+        else:
+            allowed_statuses = [AttendanceRecord.STATUS_APPROVED, AttendanceRecord.STATUS_TO_APPROVE]
+        if self.batch is not None:
+            # Batch records are already limited to this employer/month and ordered by check-in.
+            records = [
+                record
+                for record in self.batch.attendance_records.get(employee.id, [])
+                if record.check_out_at is not None and record.status in allowed_statuses
+            ]
         else:
-            records_qs = records_qs.filter(status__in=[AttendanceRecord.STATUS_APPROVED, AttendanceRecord.STATUS_TO_APPROVE])
-        records = list(records_qs.order_by("check_in_at"))
+            records_qs = AttendanceRecord.objects.using(self.tenant_db).filter(
+                employer_id=self.employer_id,
+                employee=employee,
+                check_out_at__isnull=False,
+                check_in_at__date__gte=self._month_start,
+                check_in_at__date__lte=self._month_end,
+                status__in=allowed_statuses,
+            )
+            records = list(records_qs.order_by("check_in_at"))
 
         grace_minutes = max(int(config.grace_minutes or 0), 0)
         metrics: List[Dict[str, Any]] = []
@@ -410,15 +485,22 @@ class AttendancePayrollImpactService:
         if timezone.is_naive(end_dt):
             end_dt = timezone.make_aware(end_dt)
 
-        requests_qs = TimeOffRequest.objects.using(self.tenant_db).filter(
-            employer_id=self.employer_id,
-            employee=employee,
-            leave_type_code__in=unpaid_codes,
-            start_at__lte=end_dt,
-            end_at__gte=start_dt,
-            status="APPROVED",
-        )
-        requests = list(requests_qs.order_by("start_at"))
+        if self.batch is not None:
+            requests = [
+                request
+                for request in self.batch.timeoff_requests.get(employee.id, [])
+                if request.leave_type_code in unpaid_codes
+            ]
+        else:
+            requests_qs = TimeOffRequest.objects.using(self.tenant_db).filter(
+                employer_id=self.employer_id,
+                employee=employee,
+                leave_type_code__in=unpaid_codes,
+                start_at__lte=end_dt,
+                end_at__gte=start_dt,
+                status="APPROVED",
+            )
+            requests = list(requests_qs.order_by("start_at"))
 
         metrics: List[Dict[str, Any]] = []
         for request in requests:
@@ -546,11 +628,14 @@ class AttendancePayrollImpactService:
         if not employee:
             return [], []
 
-        configs = list(
-            AttendancePayrollImpactConfig.objects.using(self.tenant_db)
-            .filter(employer_id=self.employer_id, is_active=True)
-            .order_by("event_code", "id")
-        )
+        if self.batch is not None:
+            configs = self.batch.impact_configs
+        else:
+            configs = list(
+                AttendancePayrollImpactConfig.objects.using(self.tenant_db)
+                .filter(employer_id=self.employer_id, is_active=True)
+                .order_by("event_code", "id")
+            )
         if not configs:
             return [], []
 
@@ -756,6 +841,7 @@ class PayrollCalculationService:
         self.tenant_db = tenant_db or "default"
         self.config = self._ensure_config()
         self._ranges_cache: Dict[str, List[ScaleRange]] = {}
+        self._batch: Optional[PayrollBatchData] = None
         self.attendance_impact_service = AttendancePayrollImpactService(
             employer_id=self.employer_id,
             year=self.year,
@@ -876,9 +962,12 @@ class PayrollCalculationService:
         if not _to_bool(contract_attendance.get("attendance_required"), default=True):
             return False
 
-        attendance_config = AttendanceConfiguration.objects.using(self.tenant_db).filter(
-            employer_id=self.employer_id
-        ).first()
+        if self._batch is not None:
+            attendance_config = self._batch.attendance_config
+        else:
+            attendance_config = AttendanceConfiguration.objects.using(self.tenant_db).filter(
+                employer_id=self.employer_id
+            ).first()
         if attendance_config and not attendance_config.is_enabled:
             return False
         return True
@@ -886,25 +975,28 @@ class PayrollCalculationService:
     def _resolve_attendance_minutes_per_day(self, contract: Contract) -> Decimal:
         # Keep the previous Time Off working-hours fallback for tenants without attendance schedules.
         fallback_minutes = Decimal("480")
-        timeoff_config = TimeOffConfiguration.objects.using(self.tenant_db).filter(employer_id=self.employer_id).first()
+        timeoff_config = self._get_timeoff_configuration()
         if timeoff_config:
             fallback_hours = int(getattr(timeoff_config, "working_hours_per_day", 8) or 8)
             fallback_minutes = Decimal(str(max(fallback_hours, 1) * 60))
 
         schedule = None
-        employee_schedule_id = getattr(contract.employee, "working_schedule_id", None)
-        if employee_schedule_id:
-            schedule = (
-                WorkingSchedule.objects.using(self.tenant_db)
-                .filter(employer_id=self.employer_id, id=employee_schedule_id)
-                .first()
-            )
-        if not schedule:
-            schedule = (
-                WorkingSchedule.objects.using(self.tenant_db)
-                .filter(employer_id=self.employer_id, is_default=True)
-                .first()
-            )
+        if self._batch is not None:
+            schedule = self._batch.schedule_for(contract.employee)
+        else:
+            employee_schedule_id = getattr(contract.employee, "working_schedule_id", None)
+            if employee_schedule_id:
+                schedule = (
+                    WorkingSchedule.objects.using(self.tenant_db)
+                    .filter(employer_id=self.employer_id, id=employee_schedule_id)
+                    .first()
+                )
+            if not schedule:
+                schedule = (
+                    WorkingSchedule.objects.using(self.tenant_db)
+                    .filter(employer_id=self.employer_id, is_default=True)
+                    .first()
+                )
         if schedule:
             schedule_minutes = int(getattr(schedule, "default_daily_minutes", 0) or 0)
             if schedule_minutes > 0:
@@ -918,8 +1010,21 @@ class PayrollCalculationService:
 
         return fallback_minutes
 
+    def _get_timeoff_configuration(self) -> Optional[TimeOffConfiguration]:
+        if self._batch is not None:
+            return self._batch.timeoff_config
+        return TimeOffConfiguration.objects.using(self.tenant_db).filter(employer_id=self.employer_id).first()
+
+    def _get_timeoff_type(self, leave_code: str) -> Optional[TimeOffType]:
+        if self._batch is not None:
+            return self._batch.timeoff_types.get(leave_code)
+        return TimeOffType.objects.using(self.tenant_db).filter(
+            employer_id=self.employer_id,
+            code=leave_code,
+        ).first()
+
     def _resolve_timeoff_adjustments(self, contract: Contract) -> Tuple[Decimal, Decimal]:
-        config = TimeOffConfiguration.objects.using(self.tenant_db).filter(employer_id=self.employer_id).first()
+        config = self._get_timeoff_configuration()
         if config and not config.module_enabled:
             return Decimal("0.00"), Decimal("0.00")
 
@@ -936,17 +1041,24 @@ class PayrollCalculationService:
             start_dt = timezone.make_aware(start_dt)
         if timezone.is_naive(end_dt):
             end_dt = timezone.make_aware(end_dt)
-        requests = (
-            TimeOffRequest.objects.using(self.tenant_db)
-            .filter(
-                employer_id=self.employer_id,
-                employee=contract.employee,
-                status="APPROVED",
-                start_at__lte=end_dt,
-                end_at__gte=start_dt,
+        if self._batch is not None:
+            requests = [
+                request
+                for request in self._batch.timeoff_requests.get(contract.employee_id, [])
+                if request.start_at <= end_dt and request.end_at >= start_dt
+            ]
+        else:
+            requests = (
+                TimeOffRequest.objects.using(self.tenant_db)
+                .filter(
+                    employer_id=self.employer_id,
+                    employee=contract.employee,
+                    status="APPROVED",
+                    start_at__lte=end_dt,
+                    end_at__gte=start_dt,
+                )
+                .order_by("start_at")
             )
-            .order_by("start_at")
-        )
 
         leave_type_cache: Dict[str, Optional[TimeOffType]] = {}
         paid_minutes = Decimal("0.00")
@@ -955,10 +1067,7 @@ class PayrollCalculationService:
         for request in requests:
             leave_code = request.leave_type_code
             if leave_code not in leave_type_cache:
-                leave_type_cache[leave_code] = TimeOffType.objects.using(self.tenant_db).filter(
-                    employer_id=self.employer_id,
-                    code=leave_code,
-                ).first()
+                leave_type_cache[leave_code] = self._get_timeoff_type(leave_code)
             leave_type = leave_type_cache[leave_code]
             if not leave_type:
                 continue
@@ -992,13 +1101,21 @@ class PayrollCalculationService:
         if contract_end < contract_start:
             return Decimal("0.00"), Decimal("0.00")
 
-        records = AttendanceRecord.objects.using(self.tenant_db).filter(
-            employer_id=self.employer_id,
-            employee=contract.employee,
-            check_in_at__date__gte=contract_start,
-            check_in_at__date__lte=contract_end,
-            status=AttendanceRecord.STATUS_APPROVED,
-        )
+        if self._batch is not None:
+            records = [
+                record
+                for record in self._batch.attendance_records.get(contract.employee_id, [])
+                if record.status == AttendanceRecord.STATUS_APPROVED
+                and contract_start <= timezone.localtime(record.check_in_at).date() <= contract_end
+            ]
+        else:
+            records = AttendanceRecord.objects.using(self.tenant_db).filter(
+                employer_id=self.employer_id,
+                employee=contract.employee,
+                check_in_at__date__gte=contract_start,
+                check_in_at__date__lte=contract_end,
+                status=AttendanceRecord.STATUS_APPROVED,
+            )
 
         absence_minutes = Decimal("0.00")
         overtime_minutes = Decimal("0.00")
@@ -1124,6 +1241,8 @@ class PayrollCalculationService:
         return lines
 
     def _build_basis_membership(self) -> Dict[str, Dict[str, set]]:
+        if self._batch is not None:
+            return self._batch.basis_membership
         links = CalculationBasisAdvantage.objects.using(self.tenant_db).filter(
             employer_id=self.employer_id,
             is_active=True,
@@ -1769,19 +1888,330 @@ class PayrollCalculationService:
 
         return None
 
-    def run(self, *, mode: str, contract_id=None, branch_id=None, department_id=None) -> List[PayrollRunResult]:
-        if mode not in {Salary.STATUS_SIMULATED, Salary.STATUS_GENERATED}:
-            raise ValidationError({"mode": "Mode must be SIMULATED or GENERATED."})
-        if not (1 <= int(self.month) <= 12):
-            raise ValidationError({"month": "Month must be between 1 and 12."})
-        if not int(self.year):
-            raise ValidationError({"year": "Year is required."})
-        if not self.config.module_enabled:
-            raise ValidationError({"detail": "Payroll module is disabled for this institution."})
-
-        self._validate_required_bases()
+    def _load_batch_data(self, contracts: List[Contract]) -> PayrollBatchData:
         month_start, month_end, _ = _month_bounds(self.year, self.month)
+        month_start_dt, month_end_dt = _month_bounds_dt(self.year, self.month)
+        contract_ids = [contract.id for contract in contracts]
+        employee_ids = list({contract.employee_id for contract in contracts})
+
+        salaries: Dict[Any, Salary] = {}
+        advantage_elements: Dict[Any, List[ContractElement]] = {}
+        deduction_elements: Dict[Any, List[ContractElement]] = {}
+        for ids in _chunked(contract_ids, PAYROLL_BULK_BATCH_SIZE):
+            for salary in Salary.objects.using(self.tenant_db).filter(
+                employer_id=self.employer_id,
+                contract_id__in=ids,
+                year=self.year,
+                month=self.month,
+            ):
+                salaries.setdefault(salary.contract_id, salary)
+            elements_qs = ContractElement.objects.using(self.tenant_db).filter(
+                institution_id=self.employer_id,
+                contract_id__in=ids,
+                is_enable=True,
+            )
+            for element in elements_qs.filter(advantage__isnull=False).select_related("advantage"):
+                advantage_elements.setdefault(element.contract_id, []).append(element)
+            for element in elements_qs.filter(deduction__isnull=False).select_related("deduction"):
+                deduction_elements.setdefault(element.contract_id, []).append(element)
+
+        timeoff_requests: Dict[Any, List[TimeOffRequest]] = {}
+        attendance_records: Dict[Any, List[AttendanceRecord]] = {}
+        for ids in _chunked(employee_ids, PAYROLL_BULK_BATCH_SIZE):
+            for request in (
+                TimeOffRequest.objects.using(self.tenant_db)
+                .filter(
+                    employer_id=self.employer_id,
+                    employee_id__in=ids,
+                    status="APPROVED",
+                    start_at__lte=month_end_dt,
+                    end_at__gte=month_start_dt,
+                )
+                .order_by("start_at", "id")
+            ):
+                timeoff_requests.setdefault(request.employee_id, []).append(request)
+            for record in (
+                AttendanceRecord.objects.using(self.tenant_db)
+                .filter(
+                    employer_id=self.employer_id,
+                    employee_id__in=ids,
+                    check_in_at__date__gte=month_start,
+                    check_in_at__date__lte=month_end,
+                    status__in=[AttendanceRecord.STATUS_APPROVED, AttendanceRecord.STATUS_TO_APPROVE],
+                )
+                .order_by("check_in_at", "id")
+            ):
+                attendance_records.setdefault(record.employee_id, []).append(record)
+
+        timeoff_types: Dict[str, TimeOffType] = {}
+        for leave_type in TimeOffType.objects.using(self.tenant_db).filter(employer_id=self.employer_id):
+            timeoff_types.setdefault(leave_type.code, leave_type)
+
+        schedules_qs = WorkingSchedule.objects.using(self.tenant_db).filter(employer_id=self.employer_id)
+        impact_configs: List[AttendancePayrollImpactConfig] = []
+        if self._has_attendance_impact_configs:
+            impact_configs = list(
+                AttendancePayrollImpactConfig.objects.using(self.tenant_db)
+                .filter(employer_id=self.employer_id, is_active=True)
+                .select_related("deduction", "allowance")
+                .order_by("event_code", "id")
+            )
+
+        return PayrollBatchData(
+            salaries=salaries,
+            advantage_elements=advantage_elements,
+            deduction_elements=deduction_elements,
+            timeoff_requests=timeoff_requests,
+            attendance_records=attendance_records,
+            timeoff_config=TimeOffConfiguration.objects.using(self.tenant_db).filter(employer_id=self.employer_id).first(),
+            timeoff_types=timeoff_types,
+            attendance_config=AttendanceConfiguration.objects.using(self.tenant_db).filter(employer_id=self.employer_id).first(),
+            schedules={schedule.id: schedule for schedule in schedules_qs},
+            default_schedule=schedules_qs.filter(is_default=True).first(),
+            basis_membership=self._build_basis_membership(),
+            impact_configs=impact_configs,
+        )
+
+    def _get_existing_salary(self, contract: Contract) -> Optional[Salary]:
+        if self._batch is not None:
+            return self._batch.salaries.get(contract.id)
+        return Salary.objects.using(self.tenant_db).filter(
+            employer_id=self.employer_id,
+            contract=contract,
+            year=self.year,
+            month=self.month,
+        ).first()
+
+    def _get_contract_elements(self, contract: Contract) -> Tuple[List[ContractElement], List[ContractElement]]:
+        if self._batch is not None:
+            return (
+                self._filter_elements(self._batch.advantage_elements.get(contract.id, [])),
+                self._filter_elements(self._batch.deduction_elements.get(contract.id, [])),
+            )
+        advantage_elements_qs = ContractElement.objects.using(self.tenant_db).filter(
+            institution_id=self.employer_id,
+            contract=contract,
+            is_enable=True,
+            advantage__isnull=False,
+        ).select_related("advantage")
+        deduction_elements_qs = ContractElement.objects.using(self.tenant_db).filter(
+            institution_id=self.employer_id,
+            contract=contract,
+            is_enable=True,
+            deduction__isnull=False,
+        ).select_related("deduction")
+        return self._filter_elements(advantage_elements_qs), self._filter_elements(deduction_elements_qs)
 
+    def _compute_contract(
+        self,
+        *,
+        mode: str,
+        contract: Contract,
+        existing_salary: Optional[Salary],
+    ) -> ContractPayrollComputation:
+        adjustments = self.build_monthly_adjustments(contract)
+        prorata = self._resolve_prorata_factor(contract, adjustments)
+        adjusted_basic_salary = _to_decimal(contract.base_salary) * prorata
+
+        advantage_elements, deduction_elements = self._get_contract_elements(contract)
+
+        advantage_lines = self._build_advantage_lines(
+            contract=contract,
+            advantage_elements=advantage_elements,
+            adjusted_basic_salary=adjusted_basic_salary,
+            adjustments=adjustments,
+        )
+        attendance_advantage_lines: List[SalaryAdvantage] = []
+        attendance_deduction_lines: List[SalaryDeduction] = []
+        if self._has_attendance_impact_configs:
+            attendance_advantage_lines, attendance_deduction_lines = self.attendance_impact_service.generate_for_contract(
+                contract=contract,
+                existing_salary=existing_salary,
+                minutes_per_day=self._resolve_attendance_minutes_per_day(contract),
+            )
+            if attendance_advantage_lines:
+                advantage_lines.extend(attendance_advantage_lines)
+
+        membership = self._build_basis_membership()
+        bases = self._calculate_bases(
+            advantage_lines,
+            adjusted_basic_salary,
+            membership=membership,
+        )
+        gross_salary = _to_decimal(bases.get("SAL-BRUT"), default=Decimal("0.00"))
+        basic_component = self._sum_basic_advantages(advantage_lines)
+        if basic_component > Decimal("0.00") and not self._gross_basis_has_basic_mapping(
+            advantage_lines=advantage_lines,
+            membership=membership,
+        ):
+            gross_salary += basic_component
+            bases["SAL-BRUT"] = gross_salary
+
+        non_taxable_amount = _to_decimal(bases.get("SAL-NON-TAX"), default=Decimal("0.00"))
+
+        if self.config.pit_gross_salary_percentage_mode:
+            percentage = _to_decimal(self.config.pit_gross_salary_percentage)
+            taxable_gross_salary = gross_salary * percentage / Decimal("100")
+            irpp_taxable_gross_salary = gross_salary * percentage / Decimal("100")
+        else:
+            taxable_gross_salary = gross_salary - non_taxable_amount
+            irpp_taxable_gross_salary = _to_decimal(bases.get("SAL-BRUT-TAX-IRPP"), default=Decimal("0.00"))
+
+        taxable_gross_salary = max(taxable_gross_salary, Decimal("0.00"))
+        irpp_taxable_gross_salary = max(irpp_taxable_gross_salary, Decimal("0.00"))
+        bases["SAL-BRUT-TAX"] = taxable_gross_salary
+
+        deduction_lines, deduction_totals = self._compute_deductions(
+            deduction_elements=deduction_elements,
+            bases=bases,
+            adjusted_basic_salary=adjusted_basic_salary,
+        )
+        for line in attendance_deduction_lines:
+            amount = self._round_money(_to_decimal(line.amount))
+            if amount <= Decimal("0.00"):
+                continue
+            line.amount = amount
+            line.base_amount = self._round_money(_to_decimal(line.base_amount))
+            deduction_lines.append(line)
+            should_count = True
+            if line.deduction and line.deduction.is_count is False:
+                should_count = False
+            if should_count and line.is_employee:
+                deduction_totals["employee"] += amount
+            if should_count and line.is_employer:
+                deduction_totals["employer"] += amount
+
+        total_advantages = self._sum_advantage_amounts(advantage_lines)
+        total_employee_deductions = deduction_totals["employee"]
+        total_employer_deductions = deduction_totals["employer"]
+        net_salary = gross_salary - total_employee_deductions
+
+        gross_salary = self._round_money(gross_salary)
+        taxable_gross_salary = self._round_money(taxable_gross_salary)
+        irpp_taxable_gross_salary = self._round_money(irpp_taxable_gross_salary)
+        contribution_base_af_pv = self._round_money(_to_decimal(bases.get("SAL-BRUT-COT-AF-PV")))
+        contribution_base_at = self._round_money(_to_decimal(bases.get("SAL-BRUT-COT-AT")))
+        total_advantages = self._round_money(total_advantages)
+        total_employee_deductions = self._round_money(total_employee_deductions)
+        total_employer_deductions = self._round_money(total_employer_deductions)
+        net_salary = self._round_money(net_salary)
+
+        salary = existing_salary or Salary(
+            employer_id=self.employer_id,
+            contract=contract,
+            employee=contract.employee,
+            year=self.year,
+            month=self.month,
+        )
+
+        salary.status = mode
+        salary.base_salary = self._round_money(adjusted_basic_salary)
+        salary.gross_salary = gross_salary
+        salary.taxable_gross_salary = taxable_gross_salary
+        salary.irpp_taxable_gross_salary = irpp_taxable_gross_salary
+        salary.contribution_base_af_pv = contribution_base_af_pv
+        salary.contribution_base_at = contribution_base_at
+        salary.total_advantages = total_advantages
+        salary.total_employee_deductions = total_employee_deductions
+        salary.total_employer_deductions = total_employer_deductions
+        salary.net_salary = net_salary
+        salary.leave_days = self._round_money(adjustments.paid_days + adjustments.unpaid_days)
+        salary.absence_days = self._round_money(adjustments.absence_days)
+        salary.overtime_hours = self._round_money(adjustments.overtime_hours)
+        return ContractPayrollComputation(
+            contract=contract,
+            salary=salary,
+            advantage_lines=advantage_lines,
+            deduction_lines=deduction_lines,
+        )
+
+    def _persist_contract(self, computation: ContractPayrollComputation) -> None:
+        salary = computation.salary
+        with transaction.atomic(using=self.tenant_db):
+            salary.save(using=self.tenant_db)
+            if self._has_attendance_impact_configs:
+                self.attendance_impact_service.attach_salary_to_generated_items(
+                    contract=computation.contract,
+                    salary=salary,
+                )
+
+            SalaryAdvantage.objects.using(self.tenant_db).filter(salary=salary).delete()
+            SalaryDeduction.objects.using(self.tenant_db).filter(salary=salary).delete()
+
+            for line in computation.advantage_lines:
+                line.salary = salary
+                line.employer_id = self.employer_id
+            if computation.advantage_lines:
+                SalaryAdvantage.objects.using(self.tenant_db).bulk_create(computation.advantage_lines)
+
+            for line in computation.deduction_lines:
+                line.salary = salary
+                line.employer_id = self.employer_id
+            if computation.deduction_lines:
+                SalaryDeduction.objects.using(self.tenant_db).bulk_create(computation.deduction_lines)
+
+    def _persist_batch(self, computations: List[ContractPayrollComputation]) -> None:
+        """Persist a chunk of computed salaries with bulk writes in one transaction."""
+        if not computations:
+            return
+        now = timezone.now()
+        new_salaries = [item.salary for item in computations if item.salary._state.adding]
+        existing_salaries = [item.salary for item in computations if not item.salary._state.adding]
+        for salary in existing_salaries:
+            salary.updated_at = now
+
+        with transaction.atomic(using=self.tenant_db):
+            if new_salaries:
+                Salary.objects.using(self.tenant_db).bulk_create(new_salaries, batch_size=PAYROLL_BULK_BATCH_SIZE)
+            if existing_salaries:
+                Salary.objects.using(self.tenant_db).bulk_update(
+                    existing_salaries,
+                    SALARY_COMPUTED_FIELDS + ["updated_at"],
+                    batch_size=PAYROLL_BULK_BATCH_SIZE,
+                )
+            if self._has_attendance_impact_configs:
+                for item in computations:
+                    self.attendance_impact_service.attach_salary_to_generated_items(
+                        contract=item.contract,
+                        salary=item.salary,
+                    )
+
+            salary_ids = [item.salary.id for item in computations]
+            SalaryAdvantage.objects.using(self.tenant_db).filter(salary_id__in=salary_ids).delete()
+            SalaryDeduction.objects.using(self.tenant_db).filter(salary_id__in=salary_ids).delete()
+
+            advantage_lines: List[SalaryAdvantage] = []
+            deduction_lines: List[SalaryDeduction] = []
+            for item in computations:
+                for line in item.advantage_lines:
+                    line.salary = item.salary
+                    line.employer_id = self.employer_id
+                    advantage_lines.append(line)
+                for line in item.deduction_lines:
+                    line.salary = item.salary
+                    line.employer_id = self.employer_id
+                    deduction_lines.append(line)
+            if advantage_lines:
+                SalaryAdvantage.objects.using(self.tenant_db).bulk_create(
+                    advantage_lines,
+                    batch_size=PAYROLL_BULK_BATCH_SIZE,
+                )
+            if deduction_lines:
+                SalaryDeduction.objects.using(self.tenant_db).bulk_create(
+                    deduction_lines,
+                    batch_size=PAYROLL_BULK_BATCH_SIZE,
+                )
+
+    def eligible_contracts(
+        self,
+        *,
+        contract_id=None,
+        contract_ids=None,
+        branch_id=None,
+        department_id=None,
+    ) -> List[Contract]:
+        """Active contracts with a payable employee overlapping the period, in run order."""
+        month_start, month_end, _ = _month_bounds(self.year, self.month)
         contracts_qs = (
             Contract.objects.using(self.tenant_db)
             .filter(employer_id=self.employer_id, status="ACTIVE")
@@ -1789,6 +2219,8 @@ class PayrollCalculationService:
         )
         if contract_id:
             contracts_qs = contracts_qs.filter(id=contract_id)
+        if contract_ids is not None:
+            contracts_qs = contracts_qs.filter(id__in=list(contract_ids))
         if branch_id:
             contracts_qs = contracts_qs.filter(
                 Q(branch_id=branch_id) | Q(employee__secondary_branches__id=branch_id)
@@ -1796,7 +2228,7 @@ class PayrollCalculationService:
         if department_id:
             contracts_qs = contracts_qs.filter(department_id=department_id)
 
-        results: List[PayrollRunResult] = []
+        contracts: List[Contract] = []
         for contract in contracts_qs:
             if not contract.employee or contract.employee.employment_status not in {"ACTIVE", "PROBATION"}:
                 continue
@@ -1804,177 +2236,89 @@ class PayrollCalculationService:
                 continue
             if contract.end_date and contract.end_date < month_start:
                 continue
+            contracts.append(contract)
+        return contracts
 
-            existing_salary = Salary.objects.using(self.tenant_db).filter(
-                employer_id=self.employer_id,
-                contract=contract,
-                year=self.year,
-                month=self.month,
-            ).first()
-            rule = self._apply_status_rules(mode=mode, existing_salary=existing_salary, contract=contract)
-            if rule == "SKIPPED_GENERATED":
-                results.append(
-                    PayrollRunResult(
-                        salary=existing_salary,
-                        outcome="SKIPPED",
-                        reason="Salary already generated for this period.",
-                    )
-                )
-                continue
-            if rule == "SKIPPED_LOCKED":
-                results.append(
-                    PayrollRunResult(
-                        salary=existing_salary,
-                        outcome="SKIPPED",
-                        reason="Salary already validated/archived.",
-                    )
-                )
-                continue
-
-            adjustments = self.build_monthly_adjustments(contract)
-            prorata = self._resolve_prorata_factor(contract, adjustments)
-            adjusted_basic_salary = _to_decimal(contract.base_salary) * prorata
-
-            advantage_elements_qs = ContractElement.objects.using(self.tenant_db).filter(
-                institution_id=self.employer_id,
-                contract=contract,
-                is_enable=True,
-                advantage__isnull=False,
-            ).select_related("advantage")
-            deduction_elements_qs = ContractElement.objects.using(self.tenant_db).filter(
-                institution_id=self.employer_id,
-                contract=contract,
-                is_enable=True,
-                deduction__isnull=False,
-            ).select_related("deduction")
-
-            advantage_elements = self._filter_elements(advantage_elements_qs)
-            deduction_elements = self._filter_elements(deduction_elements_qs)
-
-            advantage_lines = self._build_advantage_lines(
-                contract=contract,
-                advantage_elements=advantage_elements,
-                adjusted_basic_salary=adjusted_basic_salary,
-                adjustments=adjustments,
-            )
-            attendance_advantage_lines: List[SalaryAdvantage] = []
-            attendance_deduction_lines: List[SalaryDeduction] = []
-            if self._has_attendance_impact_configs:
-                attendance_advantage_lines, attendance_deduction_lines = self.attendance_impact_service.generate_for_contract(
-                    contract=contract,
-                    existing_salary=existing_salary,
-                    minutes_per_day=self._resolve_attendance_minutes_per_day(contract),
-                )
-                if attendance_advantage_lines:
-                    advantage_lines.extend(attendance_advantage_lines)
-
-            membership = self._build_basis_membership()
-            bases = self._calculate_bases(
-                advantage_lines,
-                adjusted_basic_salary,
-                membership=membership,
-            )
-            gross_salary = _to_decimal(bases.get("SAL-BRUT"), default=Decimal("0.00"))
-            basic_component = self._sum_basic_advantages(advantage_lines)
-            if basic_component > Decimal("0.00") and not self._gross_basis_has_basic_mapping(
-                advantage_lines=advantage_lines,
-                membership=membership,
-            ):
-                gross_salary += basic_component
-                bases["SAL-BRUT"] = gross_salary
-
-            non_taxable_amount = _to_decimal(bases.get("SAL-NON-TAX"), default=Decimal("0.00"))
+    @contract_config_scope()
+    def run(
+        self,
+        *,
+        mode: str,
+        contract_id=None,
+        contract_ids=None,
+        branch_id=None,
+        department_id=None,
+        batch: bool = False,
+    ) -> List[PayrollRunResult]:
+        """
+        Compute salaries for every eligible contract of the period.
+
+        With ``batch=True`` all per-contract inputs are bulk-loaded up front and
+        results are written with chunked bulk operations; the computed amounts
+        are identical to the per-contract path.
+        """
+        if mode not in {Salary.STATUS_SIMULATED, Salary.STATUS_GENERATED}:
+            raise ValidationError({"mode": "Mode must be SIMULATED or GENERATED."})
+        if not (1 <= int(self.month) <= 12):
+            raise ValidationError({"month": "Month must be between 1 and 12."})
+        if not int(self.year):
+            raise ValidationError({"year": "Year is required."})
+        if not self.config.module_enabled:
+            raise ValidationError({"detail": "Payroll module is disabled for this institution."})
 
-            if self.config.pit_gross_salary_percentage_mode:
-                percentage = _to_decimal(self.config.pit_gross_salary_percentage)
-                taxable_gross_salary = gross_salary * percentage / Decimal("100")
-                irpp_taxable_gross_salary = gross_salary * percentage / Decimal("100")
-            else:
-                taxable_gross_salary = gross_salary - non_taxable_amount
-                irpp_taxable_gross_salary = _to_decimal(bases.get("SAL-BRUT-TAX-IRPP"), default=Decimal("0.00"))
+        self._validate_required_bases()
+        contracts = self.eligible_contracts(
+            contract_id=contract_id,
+            contract_ids=contract_ids,
+            branch_id=branch_id,
+            department_id=department_id,
+        )
 
-            taxable_gross_salary = max(taxable_gross_salary, Decimal("0.00"))
-            irpp_taxable_gross_salary = max(irpp_taxable_gross_salary, Decimal("0.00"))
-            bases["SAL-BRUT-TAX"] = taxable_gross_salary
+        if batch:
+            self._batch = self._load_batch_data(contracts)
+            self.attendance_impact_service.batch = self._batch
 
-            deduction_lines, deduction_totals = self._compute_deductions(
-                deduction_elements=deduction_elements,
-                bases=bases,
-                adjusted_basic_salary=adjusted_basic_salary,
-            )
-            for line in attendance_deduction_lines:
-                amount = self._round_money(_to_decimal(line.amount))
-                if amount <= Decimal("0.00"):
+        results: List[PayrollRunResult] = []
+        pending: List[ContractPayrollComputation] = []
+        try:
+            for contract in contracts:
+                existing_salary = self._get_existing_salary(contract)
+                rule = self._apply_status_rules(mode=mode, existing_salary=existing_salary, contract=contract)
+                if rule == "SKIPPED_GENERATED":
+                    results.append(
+                        PayrollRunResult(
+                            salary=existing_salary,
+                            outcome="SKIPPED",
+                            reason="Salary already generated for this period.",
+                        )
+                    )
+                    continue
+                if rule == "SKIPPED_LOCKED":
+                    results.append(
+                        PayrollRunResult(
+                            salary=existing_salary,
+                            outcome="SKIPPED",
+                            reason="Salary already validated/archived.",
+                        )
+                    )
                     continue
-                line.amount = amount
-                line.base_amount = self._round_money(_to_decimal(line.base_amount))
-                deduction_lines.append(line)
-                should_count = True
-                if line.deduction and line.deduction.is_count is False:
-                    should_count = False
-                if should_count and line.is_employee:
-                    deduction_totals["employee"] += amount
-                if should_count and line.is_employer:
-                    deduction_totals["employer"] += amount
-
-            total_advantages = self._sum_advantage_amounts(advantage_lines)
-            total_employee_deductions = deduction_totals["employee"]
-            total_employer_deductions = deduction_totals["employer"]
-            net_salary = gross_salary - total_employee_deductions
-
-            gross_salary = self._round_money(gross_salary)
-            taxable_gross_salary = self._round_money(taxable_gross_salary)
-            irpp_taxable_gross_salary = self._round_money(irpp_taxable_gross_salary)
-            contribution_base_af_pv = self._round_money(_to_decimal(bases.get("SAL-BRUT-COT-AF-PV")))
-            contribution_base_at = self._round_money(_to_decimal(bases.get("SAL-BRUT-COT-AT")))
-            total_advantages = self._round_money(total_advantages)
-            total_employee_deductions = self._round_money(total_employee_deductions)
-            total_employer_deductions = self._round_money(total_employer_deductions)
-            net_salary = self._round_money(net_salary)
-
-            with transaction.atomic(using=self.tenant_db):
-                salary = existing_salary or Salary(
-                    employer_id=self.employer_id,
-                    contract=contract,
-                    employee=contract.employee,
-                    year=self.year,
-                    month=self.month,
-                )
-
-                salary.status = mode
-                salary.base_salary = self._round_money(adjusted_basic_salary)
-                salary.gross_salary = gross_salary
-                salary.taxable_gross_salary = taxable_gross_salary
-                salary.irpp_taxable_gross_salary = irpp_taxable_gross_salary
-                salary.contribution_base_af_pv = contribution_base_af_pv
-                salary.contribution_base_at = contribution_base_at
-                salary.total_advantages = total_advantages
-                salary.total_employee_deductions = total_employee_deductions
-                salary.total_employer_deductions = total_employer_deductions
-                salary.net_salary = net_salary
-                salary.leave_days = self._round_money(adjustments.paid_days + adjustments.unpaid_days)
-                salary.absence_days = self._round_money(adjustments.absence_days)
-                salary.overtime_hours = self._round_money(adjustments.overtime_hours)
-                salary.save(using=self.tenant_db)
-                if self._has_attendance_impact_configs:
-                    self.attendance_impact_service.attach_salary_to_generated_items(contract=contract, salary=salary)
-
-                SalaryAdvantage.objects.using(self.tenant_db).filter(salary=salary).delete()
-                SalaryDeduction.objects.using(self.tenant_db).filter(salary=salary).delete()
-
-                for line in advantage_lines:
-                    line.salary = salary
-                    line.employer_id = self.employer_id
-                if advantage_lines:
-                    SalaryAdvantage.objects.using(self.tenant_db).bulk_create(advantage_lines)
-
-                for line in deduction_lines:
-                    line.salary = salary
-                    line.employer_id = self.employer_id
-                if deduction_lines:
-                    SalaryDeduction.objects.using(self.tenant_db).bulk_create(deduction_lines)
 
-            results.append(PayrollRunResult(salary=salary, outcome="OK"))
+                computation = self._compute_contract(mode=mode, contract=contract, existing_salary=existing_salary)
+                if batch:
+                    pending.append(computation)
+                    if len(pending) >= PAYROLL_BATCH_FLUSH_SIZE:
+                        chunk, pending = pending, []
+                        self._persist_batch(chunk)
+                else:
+                    self._persist_contract(computation)
+                results.append(PayrollRunResult(salary=computation.salary, outcome="OK"))
+            # Only flush after a clean loop: after a failure the original error
+            # must surface (and an outer transaction may already be broken).
+            chunk, pending = pending, []
+            self._persist_batch(chunk)
+        finally:
+            self._batch = None
+            self.attendance_impact_service.batch = None
 
         return results
 
@@ -2038,6 +2382,7 @@ def _resolve_or_create_payroll_bank_source(
     return account, "created"
 
 
+@contract_config_scope()
 def validate_payroll(*, request, tenant_db: str, salaries: Iterable[Salary], allow_simulated: bool = False):
     salaries = list(salaries or [])
     if not salaries:
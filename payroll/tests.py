@@ -34,6 +34,7 @@ from payroll.models import (
     SalaryAdvantage,
     SalaryDeduction,
 )
+from payroll.parallel import run_payroll_parallel
 from payroll.services import PayrollCalculationService, validate_payroll
 
 
@@ -971,6 +972,102 @@ class PayrollFeatureTests(TestCase):
         self.assertEqual(salary.absence_days, Decimal("0"))
         self.assertEqual(salary.base_salary, Decimal("310000"))
 
+    def test_batch_run_matches_per_contract_run(self):
+        basic = self._create_allowance(name="Basic Salary", code="BASIC", amount="310000", sys="BASIC_SALARY")
+        transport = self._create_allowance(name="Transport", code="TRSP", amount="20000")
+        self._link_basis("SAL-BRUT", allowance=basic)
+        self._link_basis("SAL-BRUT", allowance=transport)
+        self._link_basis("SAL-NON-TAX", allowance=transport)
+        self._link_basis("SAL-BRUT-TAX", allowance=basic)
+        self._link_basis("SAL-BRUT-TAX-IRPP", allowance=basic)
+        self._add_advantage_element(basic, amount="310000")
+        self._add_advantage_element(transport, amount="20000")
+        cnps = self._create_deduction(
+            name="CNPS",
+            code="CNPS",
+            sys="PVID",
+            calculation_basis="SAL-BRUT-TAX",
+            is_rate=True,
+            employee_rate=Decimal("4.20"),
+        )
+        self._add_deduction_element(cnps)
+        self.contract.base_salary = Decimal("310000.00")
+        self.contract.save()
+
+        config_defaults = TimeOffConfiguration.build_defaults(self.employer.id)
+        timeoff_config = TimeOffConfiguration.objects.create(**config_defaults)
+        TimeOffType.objects.create(
+            configuration=timeoff_config,
+            employer_id=self.employer.id,
+            code="UNPAID",
+            name="Unpaid Leave",
+            paid=False,
+        )
+        TimeOffRequest.objects.create(
+            employer_id=self.employer.id,
+            employee=self.employee,
+            leave_type_code="UNPAID",
+            start_at=timezone.make_aware(datetime(self.year, self.month, 10, 9, 0, 0)),
+            end_at=timezone.make_aware(datetime(self.year, self.month, 10, 17, 0, 0)),
+            duration_minutes=480,
+            status="APPROVED",
+            created_by=self.user.id,
+            updated_by=self.user.id,
+        )
+
+        def snapshot(salary):
+            salary.refresh_from_db()
+            fields = {
+                name: getattr(salary, name)
+                for name in ["base_salary", "gross_salary", "taxable_gross_salary", "net_salary", "leave_days"]
+            }
+            advantages = sorted(
+                SalaryAdvantage.objects.filter(salary=salary).values_list("code", "base", "amount")
+            )
+            deductions = sorted(
+                SalaryDeduction.objects.filter(salary=salary).values_list("code", "base_amount", "rate", "amount")
+            )
+            return fields, advantages, deductions
+
+        service = PayrollCalculationService(
+            employer_id=self.employer.id,
+            year=self.year,
+            month=self.month,
+            tenant_db="default",
+        )
+        batch_salary = service.run(mode=Salary.STATUS_SIMULATED, batch=True)[0].salary
+        batch_snapshot = snapshot(batch_salary)
+
+        single_salary = self._run()
+        self.assertEqual(single_salary.id, batch_salary.id)
+        self.assertEqual(snapshot(single_salary), batch_snapshot)
+        self.assertEqual(Salary.objects.filter(contract=self.contract).count(), 1)
+
+    def test_parallel_run_merges_shard_outcomes(self):
+        basic = self._create_allowance(name="Basic Salary", code="BASIC", amount="100000", sys="BASIC_SALARY")
+        self._add_advantage_element(basic, amount="100000")
+
+        report = run_payroll_parallel(
+            employer_id=self.employer.id,
+            year=self.year,
+            month=self.month,
+            mode=Salary.STATUS_GENERATED,
+            max_workers=1,
+        )
+        self.assertEqual(report.ok, 1)
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.results[0]["contract_id"], str(self.contract.id))
+
+        rerun = run_payroll_parallel(
+            employer_id=self.employer.id,
+            year=self.year,
+            month=self.month,
+            mode=Salary.STATUS_GENERATED,
+            max_workers=1,
+        )
+        self.assertEqual(rerun.ok, 0)
+        self.assertEqual(rerun.skipped, 1)
+
     def test_validate_creates_treasury_batch(self):
         basic = self._create_allowance(name="Basic Salary", code="BASIC", amount="100000", sys="BASIC_SALARY")
         self._link_basis("SAL-BRUT", allowance=basic)
@@ -236,6 +236,7 @@ class PayrollRunView(EmployerContextMixin, APIView):
             contract_id=data.get("contract_id"),
             branch_id=data.get("branch_id"),
             department_id=data.get("department_id"),
+            batch=data.get("batch", False),
         )
 
         payload = []
@@ -0,0 +1,264 @@
+"""
+Cross-tenant public job board index.
+
+Publicly visible jobs are copied into ``PublicJobListing`` (default DB) when a
+job is created, updated, published, unpublished or archived, and when an
+employer's recruitment settings change. The careers page without employer
+context searches that table only: Postgres full-text search over a weighted
+search vector, keyset pagination over (job_created_at, id) and a short-TTL
+response cache whose key embeds an index version bumped on every change.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.core.exceptions import ValidationError
+from django.db.models import Q, Value
+
+from accounts.cache_versions import bump_cache_version, get_cache_version
+
+from .models import JobPosition, PublicJobListing, RecruitmentSettings
+
+PUBLIC_JOB_INDEX_CACHE_TTL_SECONDS = 60
+PUBLIC_JOB_INDEX_MAX_PAGE_SIZE = 100
+SEARCH_CONFIG = "simple"
+
+EMPLOYER_FIELDS = (
+    "employer_name",
+    "employer_slug",
+    "company_name",
+    "company_logo",
+    "company_tagline",
+    "company_overview",
+    "company_website",
+    "company_size",
+    "careers_email",
+    "linkedin_url",
+)
+
+_INDEX_VERSION_KEY = "recruitment:public-job-index:version"
+
+
+def get_index_version():
+    return get_cache_version(_INDEX_VERSION_KEY)
+
+
+def bump_index_version():
+    bump_cache_version(_INDEX_VERSION_KEY)
+
+
+def job_is_publicly_listed(job, settings_obj):
+    from .services import job_visible_to_public
+
+    if not job.is_published or job.status != JobPosition.STATUS_OPEN:
+        return False
+    if not job_visible_to_public(settings_obj):
+        return False
+    return not job.publish_scope or job.publish_scope in {
+        RecruitmentSettings.PUBLISH_SCOPE_PUBLIC,
+        RecruitmentSettings.PUBLISH_SCOPE_BOTH,
+    }
+
+
+def _search_document(job):
+    parts = [
+        job.description,
+        job.requirements,
+        job.responsibilities,
+        job.qualifications,
+        job.location,
+        " ".join(str(skill) for skill in (job.skills or []) if skill),
+    ]
+    return " ".join(part for part in parts if part)
+
+
+def remove_public_job_listing(job_id):
+    deleted, _ = PublicJobListing.objects.using("default").filter(job_id=job_id).delete()
+    if deleted:
+        bump_index_version()
+    return deleted
+
+
+def sync_public_job_listing(job, settings_obj=None, *, bump=True):
+    """
+    Upsert or drop the index row for one job. Returns True when the job is listed.
+    """
+    from .serializers import JobPositionPublicSerializer
+    from .services import ensure_recruitment_settings
+
+    if not job.is_published or job.status != JobPosition.STATUS_OPEN:
+        remove_public_job_listing(job.id)
+        return False
+
+    tenant_db = job._state.db or "default"
+    settings_obj = settings_obj or ensure_recruitment_settings(job.employer_id, tenant_db)
+    if not job_is_publicly_listed(job, settings_obj):
+        remove_public_job_listing(job.id)
+        return False
+
+    payload = dict(JobPositionPublicSerializer(job).data)
+    for field in EMPLOYER_FIELDS:
+        payload.pop(field, None)
+
+    listing, _ = PublicJobListing.objects.using("default").update_or_create(
+        job_id=job.id,
+        defaults={
+            "employer_id": job.employer_id,
+            "tenant_db": tenant_db,
+            "title": job.title,
+            "location": job.location,
+            "department_id": str(job.department_id) if job.department_id else None,
+            "employment_type": job.employment_type,
+            "is_remote": job.is_remote,
+            "payload": payload,
+            "job_created_at": job.created_at,
+            "published_at": job.published_at,
+        },
+    )
+    PublicJobListing.objects.using("default").filter(pk=listing.pk).update(
+        search_vector=(
+            SearchVector(Value(job.title), weight="A", config=SEARCH_CONFIG)
+            + SearchVector(Value(_search_document(job)), weight="B", config=SEARCH_CONFIG)
+        )
+    )
+    if bump:
+        bump_index_version()
+    return True
+
+
+def sync_employer_public_jobs(employer_id, tenant_db, settings_obj=None):
+    """Rebuild the index rows of one employer. Returns the number of listed jobs."""
+    from .services import ensure_recruitment_settings
+
+    settings_obj = settings_obj or ensure_recruitment_settings(employer_id, tenant_db)
+    listed_ids = []
+    jobs = JobPosition.objects.using(tenant_db).filter(
+        employer_id=employer_id,
+        status=JobPosition.STATUS_OPEN,
+        is_published=True,
+    )
+    for job in jobs:
+        if sync_public_job_listing(job, settings_obj, bump=False):
+            listed_ids.append(job.id)
+
+    PublicJobListing.objects.using("default").filter(employer_id=employer_id).exclude(
+        job_id__in=listed_ids
+    ).delete()
+    bump_index_version()
+    return len(listed_ids)
+
+
+def _encode_cursor(listing):
+    raw = f"{listing.job_created_at.isoformat()}|{listing.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_raw, id_raw = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_raw), int(id_raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+
+
+def _employer_fields(employer_ids):
+    from accounts.models import EmployerProfile
+
+    fields = {}
+    for profile in EmployerProfile.objects.filter(id__in=employer_ids):
+        try:
+            logo = profile.company_logo.url if profile.company_logo else None
+        except Exception:
+            logo = None
+        fields[profile.id] = {
+            "employer_name": profile.company_name,
+            "employer_slug": profile.slug,
+            "company_name": profile.company_name,
+            "company_logo": logo,
+            "company_tagline": profile.company_tagline,
+            "company_overview": profile.company_overview,
+            "company_website": profile.company_website,
+            "company_size": profile.company_size,
+            "careers_email": profile.careers_email,
+            "linkedin_url": profile.linkedin_url,
+        }
+    return fields
+
+
+def search_public_job_listings(
+    *,
+    keyword=None,
+    location=None,
+    department=None,
+    employment_type=None,
+    remote=None,
+    cursor=None,
+    page=1,
+    page_size=10,
+):
+    """
+    Search the index. `cursor` (keyset) takes precedence over `page` (offset,
+    kept for existing clients). Raises ValueError for a malformed cursor.
+    """
+    from .serializers import JobPositionPublicSerializer
+
+    page_size = max(1, min(int(page_size or 10), PUBLIC_JOB_INDEX_MAX_PAGE_SIZE))
+    qs = PublicJobListing.objects.using("default").all()
+    if keyword:
+        qs = qs.filter(search_vector=SearchQuery(keyword, config=SEARCH_CONFIG, search_type="websearch"))
+    if location:
+        qs = qs.filter(location__icontains=location)
+    if department:
+        qs = qs.filter(department_id=department)
+    if employment_type:
+        qs = qs.filter(employment_type=employment_type)
+    if remote:
+        qs = qs.filter(is_remote=str(remote).lower() in ["true", "1", "yes"])
+
+    count = qs.count()
+    qs = qs.order_by("-job_created_at", "-id")
+    offset = 0
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor)
+        qs = qs.filter(Q(job_created_at__lt=created_at) | Q(job_created_at=created_at, id__lt=last_id))
+    else:
+        offset = (max(int(page or 1), 1) - 1) * page_size
+
+    rows = list(qs.defer("search_vector")[offset:offset + page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1])
+
+    employer_fields = _employer_fields({row.employer_id for row in rows})
+    field_order = JobPositionPublicSerializer.Meta.fields
+    results = []
+    for row in rows:
+        merged = {**row.payload, **employer_fields.get(row.employer_id, dict.fromkeys(EMPLOYER_FIELDS))}
+        results.append({key: merged.get(key) for key in field_order})
+
+    return {
+        "count": count,
+        "next": None,
+        "previous": None,
+        "next_cursor": next_cursor,
+        "results": results,
+    }
+
+
+def public_search_cache_key(params):
+    raw = json.dumps(params, sort_keys=True, default=str)
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"recruitment:public-jobs:{get_index_version()}:{digest}"
+
+
+def find_public_job_listing(job_id):
+    """Return the index row for a job (locates its tenant without a scan)."""
+    try:
+        return PublicJobListing.objects.using("default").defer("search_vector").filter(job_id=job_id).first()
+    except (TypeError, ValueError, ValidationError):
+        return None
@@ -0,0 +1,51 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from recruitment.job_index import sync_employer_public_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the cross-tenant public job board index from every tenant database "
+        "so the careers page no longer scans tenants on each request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the rebuild to a single employer.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        listed = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Indexing public jobs for {alias}...")
+            try:
+                listed += sync_employer_public_jobs(employer.id, alias)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {listed} public job(s) across {total} tenant(s)."))
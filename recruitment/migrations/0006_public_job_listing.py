@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:28
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0005_rename_recruitment_job_employer_status_idx_recruitment_employe_b2ecd3_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicJobListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField(unique=True)),
+                ('employer_id', models.IntegerField(db_index=True)),
+                ('tenant_db', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('department_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('employment_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('is_remote', models.BooleanField(default=False)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='JobPositionPublicSerializer output without employer fields')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+                ('job_created_at', models.DateTimeField()),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'recruitment_public_job_listings',
+                'ordering': ['-job_created_at', '-id'],
+                'indexes': [models.Index(fields=['-job_created_at', '-id'], name='recruit_pub_job_feed_idx'), models.Index(fields=['employment_type'], name='recruit_pub_job_type_idx'), django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='recruit_pub_job_search_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,8 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
@@ -414,6 +417,44 @@ class JobPosition(models.Model):
         super().save(*args, **kwargs)
 
 
+class PublicJobListing(models.Model):
+    """
+    Denormalized copy of publicly visible jobs across all tenants (default DB).
+    Maintained by recruitment.job_index when jobs are published, updated,
+    unpublished or closed; the cross-employer careers page reads only this table.
+    """
+
+    job_id = models.UUIDField(unique=True)
+    employer_id = models.IntegerField(db_index=True)
+    tenant_db = models.CharField(max_length=100)
+    title = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, blank=True, null=True)
+    department_id = models.CharField(max_length=64, blank=True, null=True)
+    employment_type = models.CharField(max_length=50, blank=True, null=True)
+    is_remote = models.BooleanField(default=False)
+    payload = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        help_text="JobPositionPublicSerializer output without employer fields",
+    )
+    search_vector = SearchVectorField(null=True, blank=True)
+    job_created_at = models.DateTimeField()
+    published_at = models.DateTimeField(blank=True, null=True)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "recruitment_public_job_listings"
+        ordering = ["-job_created_at", "-id"]
+        indexes = [
+            models.Index(fields=["-job_created_at", "-id"], name="recruit_pub_job_feed_idx"),
+            models.Index(fields=["employment_type"], name="recruit_pub_job_type_idx"),
+            GinIndex(fields=["search_vector"], name="recruit_pub_job_search_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.employer_id})"
+
+
 class RecruitmentApplicant(models.Model):
     STATUS_NEW = "NEW"
     STATUS_IN_PROGRESS = "IN_PROGRESS"
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.db.models import Q
 from django.utils import timezone
 from django_ratelimit.core import is_ratelimited
@@ -7,6 +8,12 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .job_index import (
+    PUBLIC_JOB_INDEX_CACHE_TTL_SECONDS,
+    find_public_job_listing,
+    public_search_cache_key,
+    search_public_job_listings,
+)
 from .models import JobPosition, RecruitmentApplicant, RecruitmentApplicantStageHistory, RecruitmentAttachment
 from .serializers import JobPositionPublicSerializer, RecruitmentApplySerializer
 from .services import (
@@ -29,47 +36,52 @@ from .services import (
 class PublicJobListView(APIView):
     permission_classes = [permissions.AllowAny]
 
-    def get(self, request):
-        from accounts.models import EmployerProfile
-        from accounts.database_utils import get_tenant_database_alias, ensure_tenant_database_loaded
+    def _search_index(self, request):
+        """Cross-employer listing served from the PublicJobListing index."""
+        try:
+            page_num = int(request.query_params.get("page", 1))
+        except (TypeError, ValueError):
+            page_num = 1
+        params = {
+            "keyword": request.query_params.get("keyword"),
+            "location": request.query_params.get("location"),
+            "department": request.query_params.get("department"),
+            "employment_type": request.query_params.get("employment_type"),
+            "remote": request.query_params.get("remote"),
+            "cursor": request.query_params.get("cursor"),
+            "page": page_num,
+            "page_size": PageNumberPagination.page_size or 10,
+        }
+        # Anonymous careers-page traffic shares a short-lived response cache
+        use_cache = not (request.user and request.user.is_authenticated)
+        cache_key = public_search_cache_key(params) if use_cache else None
+        data = cache.get(cache_key) if use_cache else None
+        if data is None:
+            try:
+                data = search_public_job_listings(**params)
+            except ValueError:
+                return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            if use_cache:
+                cache.set(cache_key, data, PUBLIC_JOB_INDEX_CACHE_TTL_SECONDS)
+        return Response(data)
 
+    def get(self, request):
         employer, tenant_db = resolve_public_employer(request)
 
-        # If employer context is provided, filter by that employer
-        if employer:
-            settings_obj = ensure_recruitment_settings(employer.id, tenant_db)
-            if not job_visible_to_public(settings_obj):
-                return Response([])
-
-            qs = JobPosition.objects.using(tenant_db).filter(
-                employer_id=employer.id,
-                status=JobPosition.STATUS_OPEN,
-                is_published=True,
-            )
-            qs = qs.filter(Q(publish_scope__in=["PUBLIC_ONLY", "BOTH"]) | Q(publish_scope__isnull=True))
-        else:
-            # No employer context - show jobs from ALL employers
-            all_jobs = []
-            employers = EmployerProfile.objects.filter(database_created=True)
-
-            for emp in employers:
-                emp_tenant_db = get_tenant_database_alias(emp)
-                ensure_tenant_database_loaded(emp)
-
-                settings_obj = ensure_recruitment_settings(emp.id, emp_tenant_db)
-                if not job_visible_to_public(settings_obj):
-                    continue
+        # No employer context - show jobs from ALL employers via the index
+        if not employer:
+            return self._search_index(request)
 
-                jobs = JobPosition.objects.using(emp_tenant_db).filter(
-                    employer_id=emp.id,
-                    status=JobPosition.STATUS_OPEN,
-                    is_published=True,
-                )
-                jobs = jobs.filter(Q(publish_scope__in=["PUBLIC_ONLY", "BOTH"]) | Q(publish_scope__isnull=True))
-                all_jobs.extend(list(jobs))
+        settings_obj = ensure_recruitment_settings(employer.id, tenant_db)
+        if not job_visible_to_public(settings_obj):
+            return Response([])
 
-            # Create a queryset-like list for filtering
-            qs = all_jobs
+        qs = JobPosition.objects.using(tenant_db).filter(
+            employer_id=employer.id,
+            status=JobPosition.STATUS_OPEN,
+            is_published=True,
+        )
+        qs = qs.filter(Q(publish_scope__in=["PUBLIC_ONLY", "BOTH"]) | Q(publish_scope__isnull=True))
 
         # Apply filters
         keyword = request.query_params.get("keyword")
@@ -78,57 +90,23 @@ class PublicJobListView(APIView):
         employment_type = request.query_params.get("employment_type")
         remote_flag = request.query_params.get("remote")
 
-        if isinstance(qs, list):
-            # Filter list of jobs
-            if keyword:
-                qs = [job for job in qs if keyword.lower() in job.title.lower() or (job.description and keyword.lower() in job.description.lower())]
-            if location:
-                qs = [job for job in qs if job.location and location.lower() in job.location.lower()]
-            if department:
-                qs = [job for job in qs if str(job.department_id) == department]
-            if employment_type:
-                qs = [job for job in qs if job.employment_type == employment_type]
-            if remote_flag:
-                is_remote = str(remote_flag).lower() in ["true", "1", "yes"]
-                qs = [job for job in qs if job.is_remote == is_remote]
-
-            # Sort by created_at
-            qs = sorted(qs, key=lambda x: x.created_at, reverse=True)
-
-            # Manual pagination
-            paginator = PageNumberPagination()
-            page_size = paginator.page_size or 10
-            page_num = int(request.query_params.get('page', 1))
-            start = (page_num - 1) * page_size
-            end = start + page_size
-            page = qs[start:end]
-
-            serializer = JobPositionPublicSerializer(page, many=True)
-            return Response({
-                "count": len(qs),
-                "next": None,
-                "previous": None,
-                "results": serializer.data
-            })
-        else:
-            # QuerySet filtering
-            if keyword:
-                qs = qs.filter(Q(title__icontains=keyword) | Q(description__icontains=keyword))
-            if location:
-                qs = qs.filter(location__icontains=location)
-            if department:
-                qs = qs.filter(department_id=department)
-            if employment_type:
-                qs = qs.filter(employment_type=employment_type)
-            if remote_flag:
-                qs = qs.filter(is_remote=str(remote_flag).lower() in ["true", "1", "yes"])
-
-            qs = qs.order_by("-created_at")
-
-            paginator = PageNumberPagination()
-            page = paginator.paginate_queryset(qs, request)
-            serializer = JobPositionPublicSerializer(page, many=True)
-            return paginator.get_paginated_response(serializer.data)
+        if keyword:
+            qs = qs.filter(Q(title__icontains=keyword) | Q(description__icontains=keyword))
+        if location:
+            qs = qs.filter(location__icontains=location)
+        if department:
+            qs = qs.filter(department_id=department)
+        if employment_type:
+            qs = qs.filter(employment_type=employment_type)
+        if remote_flag:
+            qs = qs.filter(is_remote=str(remote_flag).lower() in ["true", "1", "yes"])
+
+        qs = qs.order_by("-created_at")
+
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(qs, request)
+        serializer = JobPositionPublicSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class PublicJobDetailView(APIView):
@@ -140,6 +118,13 @@ class PublicJobDetailView(APIView):
 
         employer, tenant_db = resolve_public_employer(request)
 
+        # Locate the tenant through the job board index before scanning tenants
+        if not employer:
+            listing = find_public_job_listing(job_id)
+            if listing:
+                employer = EmployerProfile.objects.filter(id=listing.employer_id).first()
+                tenant_db = ensure_tenant_database_loaded(employer) if employer else None
+
         # If employer context is provided, use it
         if employer:
             settings_obj = ensure_recruitment_settings(employer.id, tenant_db)
@@ -7,8 +7,9 @@ from django.core.mail import send_mail
 from django.utils import timezone
 
 from accounts.database_utils import ensure_tenant_database_loaded
+from accounts.tenant_context import get_tenant_db_context
 from accounts.models import EmployeeMembership, EmployerProfile
-from accounts.notifications import create_notification
+from accounts.notifications import create_notification, create_notifications_bulk
 
 from .models import (
     JobPosition,
@@ -112,9 +113,9 @@ def resolve_public_employer(request):
     if employer_id:
         employer = EmployerProfile.objects.filter(id=employer_id).first()
 
-    # Priority 4: Fallback to CURRENT_TENANT_DB setting
+    # Priority 4: Fallback to the request-scoped tenant context
     if not employer:
-        tenant_db = getattr(django_settings, "CURRENT_TENANT_DB", None)
+        tenant_db = get_tenant_db_context()
         if tenant_db and tenant_db.startswith("tenant_"):
             try:
                 employer_id = int(tenant_db.split("_")[1])
@@ -509,15 +510,16 @@ def notify_internal_job_posted(
         "publish_scope": job.publish_scope or settings_obj.job_publish_scope,
     }
 
-    for user in recipients:
-        create_notification(
-            user=user,
-            title=title,
-            body=body,
-            type="INFO",
-            data=payload,
-            employer_profile=employer,
-        )
+    notification = {
+        "title": title,
+        "body": body,
+        "type": "INFO",
+        "data": payload,
+    }
+    create_notifications_bulk(
+        [(user.id, notification) for user in recipients],
+        employer_profile=employer,
+    )
 
     return len(recipients)
 
@@ -592,15 +594,16 @@ def notify_employer_application_received(
         "is_duplicate": bool(is_duplicate),
     }
 
-    for user in recipients:
-        create_notification(
-            user=user,
-            title=title,
-            body=body,
-            type="ACTION",
-            data=data,
-            employer_profile=employer,
-        )
+    payload = {
+        "title": title,
+        "body": body,
+        "type": "ACTION",
+        "data": data,
+    }
+    create_notifications_bulk(
+        [(user.id, payload) for user in recipients],
+        employer_profile=employer,
+    )
 
     return len(recipients)
 
@@ -661,22 +664,23 @@ def notify_recruitment_stage_moved(
         exclude_user_id=actor_user_id,
     )
     if recipients:
-        for user in recipients:
-            create_notification(
-                user=user,
-                title="Applicant moved stage",
-                body=f"{applicant.full_name} moved to {stage_name} for {job_title}.",
-                type="ACTION",
-                data={
-                    "applicant_id": str(applicant.id),
-                    "job_id": str(applicant.job_id) if applicant.job_id else None,
-                    "path": "/employer/recruitment",
-                    "event": "recruitment.stage_moved",
-                    "to_stage": stage_name,
-                    "from_stage": from_stage.name if from_stage else None,
-                },
-                employer_profile=employer,
-            )
+        payload = {
+            "title": "Applicant moved stage",
+            "body": f"{applicant.full_name} moved to {stage_name} for {job_title}.",
+            "type": "ACTION",
+            "data": {
+                "applicant_id": str(applicant.id),
+                "job_id": str(applicant.job_id) if applicant.job_id else None,
+                "path": "/employer/recruitment",
+                "event": "recruitment.stage_moved",
+                "to_stage": stage_name,
+                "from_stage": from_stage.name if from_stage else None,
+            },
+        }
+        create_notifications_bulk(
+            [(user.id, payload) for user in recipients],
+            employer_profile=employer,
+        )
 
     user = _get_applicant_user(applicant)
     if user:
@@ -714,21 +718,22 @@ def notify_recruitment_refused(
         exclude_user_id=actor_user_id,
     )
     if recipients:
-        for user in recipients:
-            create_notification(
-                user=user,
-                title="Application refused",
-                body=f"{applicant.full_name} was marked refused for {job_title}.",
-                type="ALERT",
-                data={
-                    "applicant_id": str(applicant.id),
-                    "job_id": str(applicant.job_id) if applicant.job_id else None,
-                    "path": "/employer/recruitment",
-                    "event": "recruitment.refused",
-                    "reason": reason_name or None,
-                },
-                employer_profile=employer,
-            )
+        payload = {
+            "title": "Application refused",
+            "body": f"{applicant.full_name} was marked refused for {job_title}.",
+            "type": "ALERT",
+            "data": {
+                "applicant_id": str(applicant.id),
+                "job_id": str(applicant.job_id) if applicant.job_id else None,
+                "path": "/employer/recruitment",
+                "event": "recruitment.refused",
+                "reason": reason_name or None,
+            },
+        }
+        create_notifications_bulk(
+            [(user.id, payload) for user in recipients],
+            employer_profile=employer,
+        )
 
     user = _get_applicant_user(applicant)
     if user:
@@ -763,20 +768,21 @@ def notify_recruitment_hired(
         exclude_user_id=actor_user_id,
     )
     if recipients:
-        for user in recipients:
-            create_notification(
-                user=user,
-                title="Applicant hired",
-                body=f"{applicant.full_name} was marked hired for {job_title}.",
-                type="ACTION",
-                data={
-                    "applicant_id": str(applicant.id),
-                    "job_id": str(applicant.job_id) if applicant.job_id else None,
-                    "path": "/employer/recruitment",
-                    "event": "recruitment.hired",
-                },
-                employer_profile=employer,
-            )
+        payload = {
+            "title": "Applicant hired",
+            "body": f"{applicant.full_name} was marked hired for {job_title}.",
+            "type": "ACTION",
+            "data": {
+                "applicant_id": str(applicant.id),
+                "job_id": str(applicant.job_id) if applicant.job_id else None,
+                "path": "/employer/recruitment",
+                "event": "recruitment.hired",
+            },
+        }
+        create_notifications_bulk(
+            [(user.id, payload) for user in recipients],
+            employer_profile=employer,
+        )
 
     user = _get_applicant_user(applicant)
     if user:
@@ -832,22 +838,23 @@ def notify_recruitment_offer_sent(
         if esign_enabled:
             title = "Offer sent for e-signature"
             body = f"Offer sent to {applicant.full_name} for e-signature on {job_title}."
-        for user in recipients:
-            create_notification(
-                user=user,
-                title=title,
-                body=body,
-                type="ACTION",
-                data={
-                    "applicant_id": str(applicant.id),
-                    "job_id": str(applicant.job_id) if applicant.job_id else None,
-                    "offer_id": str(getattr(offer, "id", "")) or None,
-                    "path": "/employer/recruitment",
-                    "event": "recruitment.offer_sent",
-                    "integration_esign_enabled": esign_enabled,
-                },
-                employer_profile=employer,
-            )
+        payload = {
+            "title": title,
+            "body": body,
+            "type": "ACTION",
+            "data": {
+                "applicant_id": str(applicant.id),
+                "job_id": str(applicant.job_id) if applicant.job_id else None,
+                "offer_id": str(getattr(offer, "id", "")) or None,
+                "path": "/employer/recruitment",
+                "event": "recruitment.offer_sent",
+                "integration_esign_enabled": esign_enabled,
+            },
+        }
+        create_notifications_bulk(
+            [(user.id, payload) for user in recipients],
+            employer_profile=employer,
+        )
 
     user = _get_applicant_user(applicant)
     if user:
@@ -915,15 +922,16 @@ def notify_integration_job_board_ingest(
         "event": "recruitment.integration.job_board_ingest",
     }
 
-    for user in recipients:
-        create_notification(
-            user=user,
-            title=title,
-            body=body,
-            type="INFO",
-            data=payload,
-            employer_profile=employer,
-        )
+    notification = {
+        "title": title,
+        "body": body,
+        "type": "INFO",
+        "data": payload,
+    }
+    create_notifications_bulk(
+        [(user.id, notification) for user in recipients],
+        employer_profile=employer,
+    )
 
     return len(recipients)
 
@@ -967,15 +975,16 @@ def notify_integration_resume_ocr_queued(
         "event": "recruitment.integration.resume_ocr",
     }
 
-    for user in recipients:
-        create_notification(
-            user=user,
-            title=title,
-            body=body,
-            type="INFO",
-            data=payload,
-            employer_profile=employer,
-        )
+    notification = {
+        "title": title,
+        "body": body,
+        "type": "INFO",
+        "data": payload,
+    }
+    create_notifications_bulk(
+        [(user.id, notification) for user in recipients],
+        employer_profile=employer,
+    )
 
     return len(recipients)
 
@@ -1006,21 +1015,22 @@ def notify_integration_interview_scheduling(
         exclude_user_id=actor_user_id,
     )
     if recipients:
-        for user in recipients:
-            create_notification(
-                user=user,
-                title="Interview scheduling needed",
-                body=f"Schedule {stage_name} for {applicant.full_name} ({job_title}).",
-                type="ACTION",
-                data={
-                    "applicant_id": str(applicant.id),
-                    "job_id": str(applicant.job_id) if applicant.job_id else None,
-                    "path": "/employer/recruitment",
-                    "event": "recruitment.integration.interview_scheduling",
-                    "stage": stage_name,
-                },
-                employer_profile=employer,
-            )
+        payload = {
+            "title": "Interview scheduling needed",
+            "body": f"Schedule {stage_name} for {applicant.full_name} ({job_title}).",
+            "type": "ACTION",
+            "data": {
+                "applicant_id": str(applicant.id),
+                "job_id": str(applicant.job_id) if applicant.job_id else None,
+                "path": "/employer/recruitment",
+                "event": "recruitment.integration.interview_scheduling",
+                "stage": stage_name,
+            },
+        }
+        create_notifications_bulk(
+            [(user.id, payload) for user in recipients],
+            employer_profile=employer,
+        )
 
     user = _get_applicant_user(applicant)
     if user:
@@ -15,6 +15,7 @@ from recruitment.services import (
     internal_apply_allowed,
     duplicate_application_blocked,
 )
+from recruitment.job_index import sync_public_job_listing
 from recruitment.views import RecruitmentSettingsView
 from recruitment.public_views import PublicJobApplyView, PublicJobListView
 from recruitment.models import JobPosition
@@ -197,3 +198,20 @@ class RecruitmentPublicApplyTests(TestCase):
         )
         response2 = view(request2, job_id=job.id)
         self.assertEqual(response2.status_code, 409)
+
+    def test_public_job_index_search(self):
+        job = self._create_job()
+        sync_public_job_listing(job)
+        view = PublicJobListView.as_view()
+
+        response = view(self.factory.get("/api/v1/public/jobs/", {"keyword": "engineer"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], str(job.id))
+        self.assertEqual(response.data["results"][0]["company_name"], "Public Co")
+
+        job.is_published = False
+        job.save()
+        sync_public_job_listing(job)
+        response = view(self.factory.get("/api/v1/public/jobs/", {"keyword": "engineer"}))
+        self.assertEqual(response.data["count"], 0)
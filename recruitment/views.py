@@ -12,6 +12,7 @@ from accounts.database_utils import get_tenant_database_alias
 from accounts.permissions import EmployerAccessPermission
 from accounts.rbac import apply_scope_filter, get_active_employer, get_delegate_scope, is_delegate_user
 
+from .job_index import remove_public_job_listing, sync_employer_public_jobs, sync_public_job_listing
 from .models import (
     JobPosition,
     RecruitmentApplicant,
@@ -97,6 +98,8 @@ class RecruitmentSettingsView(viewsets.ViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         invalidate_recruitment_settings_cache(employer.id, tenant_db)
+        # Publish scope changes can show/hide every job on the public board
+        sync_employer_public_jobs(employer.id, tenant_db)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -256,6 +259,7 @@ class JobPositionViewSet(viewsets.ModelViewSet):
             instance.save(using=tenant_db, update_fields=["published_at", "status"])
 
         serializer.instance = instance
+        sync_public_job_listing(instance, settings_obj)
 
         if instance.is_published and job_scope_allows_internal(instance, settings_obj):
             notify_internal_job_posted(
@@ -338,6 +342,8 @@ class JobPositionViewSet(viewsets.ModelViewSet):
                 instance.status = JobPosition.STATUS_OPEN
             instance.save(using=tenant_db, update_fields=["published_at", "status"])
 
+        sync_public_job_listing(instance, settings_obj)
+
         is_internal_visible = job_scope_allows_internal(instance, settings_obj)
         is_public_visible = job_scope_allows_public(instance, settings_obj)
         newly_published = instance.is_published and not was_published
@@ -365,6 +371,7 @@ class JobPositionViewSet(viewsets.ModelViewSet):
         instance.is_published = False
         instance.archived_at = timezone.now()
         instance.save(using=tenant_db)
+        remove_public_job_listing(instance.id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=["patch"], url_path="publish")
@@ -393,6 +400,7 @@ class JobPositionViewSet(viewsets.ModelViewSet):
             job.is_published = False
         job.updated_by = request.user.id
         job.save(using=tenant_db)
+        sync_public_job_listing(job, settings_obj)
 
         if flag and not was_published and job_scope_allows_internal(job, settings_obj):
             notify_internal_job_posted(
@@ -0,0 +1,90 @@
+import sys
+from datetime import date
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from timeoff.services import execute_accrual_run, start_accrual_run
+
+
+class Command(BaseCommand):
+    help = (
+        "Run monthly time-off accruals for every tenant (or one employer) up to a date. "
+        "Each tenant gets a tracked accrual run; re-running over the same window writes nothing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--upto",
+            dest="upto",
+            help="Accrue periods up to this date (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the run to a single employer.",
+        )
+        parser.add_argument(
+            "--created-by",
+            dest="created_by",
+            type=int,
+            default=0,
+            help="User id recorded on the generated ledger entries (default 0 = system).",
+        )
+
+    def handle(self, *args, **options):
+        upto = self._resolve_upto(options.get("upto"))
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        created = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Running time-off accruals for {alias} up to {upto}...")
+            try:
+                run = start_accrual_run(
+                    employer_id=employer.id,
+                    upto_date=upto,
+                    created_by=options["created_by"],
+                    db_alias=alias,
+                )
+                run = execute_accrual_run(run.id, alias)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+                continue
+            if run.status != "COMPLETED":
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {run.error}"))
+                continue
+            created += run.entries_created
+            self.stdout.write(
+                f"  {run.processed_subscriptions}/{run.total_subscriptions} subscription(s), "
+                f"{run.entries_created} accrual entr(ies) written."
+            )
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {created} accrual entr(ies) across {total} tenant(s)."))
+
+    def _resolve_upto(self, value) -> date:
+        if value:
+            try:
+                return date.fromisoformat(value)
+            except ValueError as exc:
+                raise CommandError("Invalid --upto date. Use YYYY-MM-DD.") from exc
+        return timezone.localdate()
@@ -0,0 +1,68 @@
+import sys
+from datetime import date, timedelta
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from timeoff.services import snapshot_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Capture time-off balance snapshots so as-of balance queries only fold the "
+        "ledger entries after the latest snapshot. Defaults to the last day of the "
+        "previous month; schedule it monthly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--as-of",
+            dest="as_of",
+            help="Snapshot date (YYYY-MM-DD). Defaults to the end of last month.",
+        )
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the snapshot to a single employer.",
+        )
+
+    def handle(self, *args, **options):
+        as_of = self._resolve_as_of(options.get("as_of"))
+        employer_id = options.get("employer_id")
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        written = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Snapshotting time-off balances for {alias} as of {as_of}...")
+            try:
+                written += snapshot_balances(alias, as_of, employer_id=employer.id)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures:
+            self.stderr.write(self.style.ERROR(f"Completed with {failures} failure(s)."))
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} snapshot row(s) across {total} tenant(s)."))
+
+    def _resolve_as_of(self, value) -> date:
+        if value:
+            try:
+                return date.fromisoformat(value)
+            except ValueError as exc:
+                raise CommandError("Invalid --as-of date. Use YYYY-MM-DD.") from exc
+        return timezone.localdate().replace(day=1) - timedelta(days=1)
@@ -0,0 +1,88 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from accounts.database_utils import ensure_tenant_database_loaded, load_all_tenant_databases
+from accounts.models import EmployerProfile
+from timeoff.services import find_balance_drift, repair_balance, snapshot_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute time-off balances from the ledger and report materialized balances "
+        "(and optionally snapshots) that drifted. Exits non-zero when drift is found "
+        "unless --fix repairs it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--employer-id",
+            dest="employer_id",
+            type=int,
+            help="Limit the check to a single employer.",
+        )
+        parser.add_argument(
+            "--snapshots",
+            action="store_true",
+            help="Also verify balance snapshots.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rebuild drifted balances and snapshots from the ledger.",
+        )
+
+    def handle(self, *args, **options):
+        employer_id = options.get("employer_id")
+        fix = options.get("fix", False)
+
+        self.stdout.write("Loading tenant database aliases...")
+        load_all_tenant_databases()
+        tenants = EmployerProfile.objects.filter(database_created=True, database_name__isnull=False)
+        if employer_id:
+            tenants = tenants.filter(id=employer_id)
+        total = tenants.count()
+        if not total:
+            self.stdout.write(self.style.WARNING("No tenant databases found."))
+            return
+
+        failures = 0
+        unresolved = 0
+        for idx, employer in enumerate(tenants, start=1):
+            alias = ensure_tenant_database_loaded(employer)
+            self.stdout.write(f"[{idx}/{total}] Verifying time-off balances for {alias}...")
+            try:
+                drift = find_balance_drift(alias, employer_id=employer.id, include_snapshots=options.get("snapshots"))
+                for row in drift:
+                    label = f"snapshot {row['as_of']}" if row["as_of"] else "balance"
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"  {label} {row['employee_id']}/{row['leave_type_code']}: "
+                            f"stored={row['actual']} ledger={row['expected']}"
+                        )
+                    )
+                if drift and fix:
+                    self._repair(alias, employer.id, drift)
+                    self.stdout.write(f"  Repaired {len(drift)} row(s).")
+                elif drift:
+                    unresolved += len(drift)
+            except Exception as exc:  # noqa: BLE001
+                failures += 1
+                self.stderr.write(self.style.ERROR(f"Failed on {alias}: {exc}"))
+
+        if failures or unresolved:
+            self.stderr.write(
+                self.style.ERROR(f"Completed with {failures} failure(s) and {unresolved} drifted row(s).")
+            )
+            sys.exit(1)
+        self.stdout.write(self.style.SUCCESS(f"Time-off balances verified across {total} tenant(s)."))
+
+    def _repair(self, alias: str, employer_id: int, drift) -> None:
+        snapshot_dates = set()
+        for row in drift:
+            if row["as_of"]:
+                snapshot_dates.add(row["as_of"])
+            else:
+                repair_balance(row["employee_id"], row["leave_type_code"], alias, employer_id)
+        for as_of in sorted(snapshot_dates):
+            snapshot_balances(alias, as_of, employer_id=employer_id)
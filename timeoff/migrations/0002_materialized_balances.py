@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:35
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+from django.db.models import Case, F, IntegerField, Sum, Value, When
+from django.db.models.functions import Abs, Coalesce
+
+
+def backfill_balances(apps, schema_editor):
+    """Fold the existing ledger into one running balance row per employee and leave type."""
+    alias = schema_editor.connection.alias
+    TimeOffLedgerEntry = apps.get_model('timeoff', 'TimeOffLedgerEntry')
+    TimeOffBalance = apps.get_model('timeoff', 'TimeOffBalance')
+
+    def _sum(*whens):
+        return Coalesce(Sum(Case(*whens, default=Value(0), output_field=IntegerField())), Value(0))
+
+    rows = (
+        TimeOffLedgerEntry.objects.using(alias)
+        .order_by()
+        .values('employer_id', 'employee_id', 'leave_type_code')
+        .annotate(
+            earned=_sum(
+                When(
+                    entry_type__in=['ACCRUAL', 'ALLOCATION', 'ADJUSTMENT', 'CARRYOVER', 'REVERSAL'],
+                    then=F('amount_minutes'),
+                ),
+                When(entry_type__in=['EXPIRY', 'ENCASHMENT'], then=-Abs(F('amount_minutes'))),
+            ),
+            reserved=_sum(When(entry_type='RESERVATION', then=Abs(F('amount_minutes')))),
+            taken=_sum(When(entry_type='DEBIT', then=Abs(F('amount_minutes')))),
+        )
+    )
+    TimeOffBalance.objects.using(alias).bulk_create(
+        [
+            TimeOffBalance(
+                id=uuid.uuid4(),
+                employer_id=row['employer_id'],
+                employee_id=row['employee_id'],
+                leave_type_code=row['leave_type_code'],
+                earned_minutes=row['earned'],
+                reserved_minutes=row['reserved'],
+                taken_minutes=row['taken'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_employee_match_key'),
+        ('timeoff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeOffBalance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('employer_id', models.IntegerField(db_index=True)),
+                ('leave_type_code', models.CharField(max_length=50)),
+                ('earned_minutes', models.BigIntegerField(default=0)),
+                ('reserved_minutes', models.BigIntegerField(default=0)),
+                ('taken_minutes', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_off_balances', to='employees.employee')),
+            ],
+            options={
+                'db_table': 'timeoff_balances',
+                'constraints': [models.UniqueConstraint(fields=('employee', 'leave_type_code'), name='uniq_timeoff_balance')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TimeOffBalanceSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('employer_id', models.IntegerField(db_index=True)),
+                ('leave_type_code', models.CharField(max_length=50)),
+                ('as_of', models.DateField()),
+                ('earned_minutes', models.BigIntegerField(default=0)),
+                ('reserved_minutes', models.BigIntegerField(default=0)),
+                ('taken_minutes', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_off_balance_snapshots', to='employees.employee')),
+            ],
+            options={
+                'db_table': 'timeoff_balance_snapshots',
+                'ordering': ['-as_of'],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'leave_type_code', 'as_of'), name='uniq_timeoff_balance_snapshot')],
+            },
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:38
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0002_materialized_balances'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeOffAccrualRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('employer_id', models.IntegerField(db_index=True)),
+                ('upto_date', models.DateField()),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], db_index=True, default='QUEUED', max_length=10)),
+                ('total_subscriptions', models.IntegerField(default=0)),
+                ('processed_subscriptions', models.IntegerField(default=0)),
+                ('entries_created', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_by', models.IntegerField(db_index=True, help_text='User ID from main DB')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'timeoff_accrual_runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
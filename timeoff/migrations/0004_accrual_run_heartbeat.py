@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:06
+
+from django.db import migrations, models
+
+
+def release_duplicate_active_runs(apps, schema_editor):
+    """Keep only the newest active run per employer so the constraint can be added."""
+    TimeOffAccrualRun = apps.get_model('timeoff', 'TimeOffAccrualRun')
+    runs = TimeOffAccrualRun.objects.using(schema_editor.connection.alias)
+    seen = set()
+    for run in runs.filter(status__in=('QUEUED', 'RUNNING')).order_by('employer_id', '-created_at'):
+        if run.employer_id in seen:
+            runs.filter(id=run.id).update(status='FAILED', error='Superseded by a newer active run.')
+        seen.add(run.employer_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0003_accrual_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeoffaccrualrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(release_duplicate_active_runs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='timeoffaccrualrun',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ('QUEUED', 'RUNNING'))), fields=('employer_id',), name='timeoff_accrual_run_one_active'),
+        ),
+    ]
@@ -765,6 +765,72 @@ class TimeOffLedgerEntry(models.Model):
         raise ValidationError("Ledger entries are immutable and cannot be deleted.")
 
 
+class TimeOffBalance(models.Model):
+    """
+    Running ledger totals per employee and leave type (all effective dates).
+    Maintained by ``services.write_ledger_entry`` in the same transaction as
+    the entry it folds in; availability is derived at read time because it
+    depends on the leave type's reservation policy.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employer_id = models.IntegerField(db_index=True)
+    employee = models.ForeignKey(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        related_name="time_off_balances",
+    )
+    leave_type_code = models.CharField(max_length=50)
+    earned_minutes = models.BigIntegerField(default=0)
+    reserved_minutes = models.BigIntegerField(default=0)
+    taken_minutes = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "timeoff_balances"
+        constraints = [
+            models.UniqueConstraint(fields=["employee", "leave_type_code"], name="uniq_timeoff_balance"),
+        ]
+
+    def __str__(self):
+        return f"{self.leave_type_code} balance for {self.employee_id}"
+
+
+class TimeOffBalanceSnapshot(models.Model):
+    """
+    Ledger totals of entries effective on or before ``as_of``, captured
+    periodically so as-of balances only fold the entries after the snapshot.
+    Back-dated ledger entries adjust every later snapshot of their key.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employer_id = models.IntegerField(db_index=True)
+    employee = models.ForeignKey(
+        "employees.Employee",
+        on_delete=models.CASCADE,
+        related_name="time_off_balance_snapshots",
+    )
+    leave_type_code = models.CharField(max_length=50)
+    as_of = models.DateField()
+    earned_minutes = models.BigIntegerField(default=0)
+    reserved_minutes = models.BigIntegerField(default=0)
+    taken_minutes = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "timeoff_balance_snapshots"
+        ordering = ["-as_of"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee", "leave_type_code", "as_of"],
+                name="uniq_timeoff_balance_snapshot",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.leave_type_code} snapshot for {self.employee_id} as of {self.as_of}"
+
+
 class TimeOffAllocation(models.Model):
     """Represents a granted or accrual-based allocation header."""
 
@@ -935,6 +1001,46 @@ class TimeOffAccrualSubscription(models.Model):
         return f"{self.employee_id} -> {self.plan_id}"
 
 
+class TimeOffAccrualRun(models.Model):
+    """Progress record of one accrual run over a tenant's active subscriptions."""
+
+    STATUS_CHOICES = [
+        ("QUEUED", "Queued"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+    ACTIVE_STATUSES = ("QUEUED", "RUNNING")
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    employer_id = models.IntegerField(db_index=True)
+    upto_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="QUEUED", db_index=True)
+    total_subscriptions = models.IntegerField(default=0)
+    processed_subscriptions = models.IntegerField(default=0)
+    entries_created = models.IntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    created_by = models.IntegerField(help_text="User ID from main DB", db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "timeoff_accrual_runs"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employer_id"],
+                condition=models.Q(status__in=("QUEUED", "RUNNING")),
+                name="timeoff_accrual_run_one_active",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Accrual run up to {self.upto_date} ({self.status})"
+
+
 class TimeOffAllocationRequest(models.Model):
     """Employee-initiated allocation requests for extra leave."""
 
@@ -14,6 +14,7 @@ from employees.models import Employee
 
 from .models import (
     TimeOffAccrualPlan,
+    TimeOffAccrualRun,
     TimeOffAccrualSubscription,
     TimeOffAllocation,
     TimeOffAllocationLine,
@@ -30,10 +31,10 @@ from .services import (
     apply_rejection_or_cancellation_transitions,
     apply_submit_transitions,
     calculate_duration_minutes,
-    compute_balances,
     convert_amount_to_minutes,
     get_available_balance,
     has_overlap,
+    with_available_minutes,
 )
 
 
@@ -647,22 +648,17 @@ class TimeOffBalanceSerializer(serializers.Serializer):
     available_minutes = serializers.IntegerField()
 
     @staticmethod
-    def from_entries(entries, reservation_policy, as_of=None, reservation_policy_by_code=None):
-        grouped = {}
-        for entry in entries:
-            code = entry.leave_type_code
-            grouped.setdefault(code, []).append(entry)
-
+    def from_totals(totals_by_code, reservation_policy, reservation_policy_by_code=None):
+        """Build rows from materialized totals (see ``services.get_balance_totals``)."""
         results = []
-        for code, items in grouped.items():
+        for code, totals in totals_by_code.items():
             policy = reservation_policy
             if reservation_policy_by_code and code in reservation_policy_by_code:
                 policy = reservation_policy_by_code[code]
-            balances = compute_balances(items, reservation_policy=policy, as_of=as_of)
             results.append(
                 {
                     "leave_type_code": code,
-                    **balances,
+                    **with_available_minutes(totals, policy),
                 }
             )
         return results
@@ -675,6 +671,26 @@ class TimeOffLedgerEntrySerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at")
 
 
+class TimeOffAccrualRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimeOffAccrualRun
+        fields = (
+            "id",
+            "upto_date",
+            "status",
+            "total_subscriptions",
+            "processed_subscriptions",
+            "entries_created",
+            "error",
+            "created_by",
+            "created_at",
+            "started_at",
+            "heartbeat_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+
 class TimeOffAllocationLineSerializer(serializers.ModelSerializer):
     class Meta:
         model = TimeOffAllocationLine
@@ -1,22 +1,38 @@
 """
 Core helpers for time off balances, request transitions, and allocations.
 """
+import calendar
+import logging
+import threading
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal
-from typing import Iterable, Optional, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Sum, Value, When
+from django.db.models.functions import Abs, Coalesce
+from django.utils import timezone
 
 from .defaults import get_time_off_defaults
 from .models import (
     TimeOffAllocation,
     TimeOffAllocationLine,
     TimeOffAllocationRequest,
+    TimeOffAccrualRun,
     TimeOffAccrualSubscription,
+    TimeOffBalance,
+    TimeOffBalanceSnapshot,
     TimeOffLedgerEntry,
     TimeOffRequest,
 )
 
+logger = logging.getLogger(__name__)
+
+EARNING_ENTRY_TYPES = {"ACCRUAL", "ALLOCATION", "ADJUSTMENT", "CARRYOVER", "REVERSAL"}
+LAPSING_ENTRY_TYPES = {"EXPIRY", "ENCASHMENT"}
+BALANCE_TOTAL_FIELDS = ("earned_minutes", "reserved_minutes", "taken_minutes")
+
 WEEKDAY_NAME_TO_INDEX = {
     "MONDAY": 0,
     "TUESDAY": 1,
@@ -28,11 +44,6 @@ WEEKDAY_NAME_TO_INDEX = {
 }
 
 
-def _abs_amount(entry: TimeOffLedgerEntry) -> int:
-    """Return absolute minutes for reservation/debit math."""
-    return abs(int(entry.amount_minutes or 0))
-
-
 def round_minutes(minutes: int, rounding: dict) -> int:
     """Apply rounding config to a minutes value."""
     inc = int(rounding.get("increment_minutes") or 0) or 0
@@ -132,28 +143,41 @@ def compute_balances(
         else:
             entries = [e for e in entries if getattr(e, "effective_date", None) and e.effective_date <= as_of]
 
-    earned = 0
-    reserved = 0
-    taken = 0
-
+    totals = empty_balance_totals()
     for entry in entries:
-        etype = entry.entry_type
-        amt = int(entry.amount_minutes or 0)
-
-        if etype in {"ACCRUAL", "ALLOCATION", "ADJUSTMENT", "CARRYOVER", "REVERSAL"}:
-            earned += amt
-        elif etype in {"EXPIRY", "ENCASHMENT"}:
-            earned -= abs(amt)
-        elif etype == "RESERVATION":
-            reserved += _abs_amount(entry)
-        elif etype == "DEBIT":
-            taken += _abs_amount(entry)
+        for field, delta in ledger_entry_deltas(entry.entry_type, entry.amount_minutes).items():
+            totals[field] += delta
+    return with_available_minutes(totals, reservation_policy)
+
+
+def ledger_entry_deltas(entry_type: str, amount_minutes) -> dict:
+    """How one ledger entry moves the earned/reserved/taken totals."""
+    amount = int(amount_minutes or 0)
+    deltas = empty_balance_totals()
+    if entry_type in EARNING_ENTRY_TYPES:
+        deltas["earned_minutes"] = amount
+    elif entry_type in LAPSING_ENTRY_TYPES:
+        deltas["earned_minutes"] = -abs(amount)
+    elif entry_type == "RESERVATION":
+        deltas["reserved_minutes"] = abs(amount)
+    elif entry_type == "DEBIT":
+        deltas["taken_minutes"] = abs(amount)
+    return deltas
+
+
+def empty_balance_totals() -> dict:
+    return {field: 0 for field in BALANCE_TOTAL_FIELDS}
+
 
+def with_available_minutes(totals: dict, reservation_policy: str = "RESERVE_ON_SUBMIT") -> dict:
+    """Return earned/reserved/taken totals plus the policy-dependent available minutes."""
+    earned = int(totals.get("earned_minutes") or 0)
+    reserved = int(totals.get("reserved_minutes") or 0)
+    taken = int(totals.get("taken_minutes") or 0)
     if reservation_policy == "RESERVE_ON_SUBMIT":
         available = earned - reserved - taken
     else:
         available = earned - taken
-
     return {
         "earned_minutes": earned,
         "reserved_minutes": reserved,
@@ -162,6 +186,200 @@ def compute_balances(
     }
 
 
+def ledger_total_aggregates() -> dict:
+    """SQL equivalents of ``ledger_entry_deltas`` summed over a ledger queryset."""
+
+    def _sum(*whens):
+        return Coalesce(
+            Sum(Case(*whens, default=Value(0), output_field=IntegerField())),
+            Value(0),
+        )
+
+    return {
+        "earned_minutes": _sum(
+            When(entry_type__in=EARNING_ENTRY_TYPES, then=F("amount_minutes")),
+            When(entry_type__in=LAPSING_ENTRY_TYPES, then=-Abs(F("amount_minutes"))),
+        ),
+        "reserved_minutes": _sum(When(entry_type="RESERVATION", then=Abs(F("amount_minutes")))),
+        "taken_minutes": _sum(When(entry_type="DEBIT", then=Abs(F("amount_minutes")))),
+    }
+
+
+def _grouped_ledger_totals(entries, *group_by) -> dict:
+    """Aggregate ledger totals per ``group_by`` tuple in one GROUP BY query."""
+    rows = entries.order_by().values(*group_by).annotate(**ledger_total_aggregates())
+    return {
+        tuple(row[key] for key in group_by): {field: int(row[field]) for field in BALANCE_TOTAL_FIELDS}
+        for row in rows
+    }
+
+
+def _fold_entry_into_balances(entry: TimeOffLedgerEntry, db_alias: str) -> None:
+    """
+    Apply a freshly written entry to the running balance row (creating it from
+    the ledger when missing) and to every snapshot on or after its effective date.
+    Runs inside the caller's transaction.
+    """
+    deltas = ledger_entry_deltas(entry.entry_type, entry.amount_minutes)
+    increments = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    key = {"employee_id": entry.employee_id, "leave_type_code": entry.leave_type_code}
+    balances = TimeOffBalance.objects.using(db_alias)
+
+    if not balances.filter(**key).update(**increments, updated_at=timezone.now()):
+        totals = _grouped_ledger_totals(
+            TimeOffLedgerEntry.objects.using(db_alias).filter(**key), "employee_id"
+        ).get((entry.employee_id,), deltas)
+        try:
+            with transaction.atomic(using=db_alias):
+                balances.create(employer_id=entry.employer_id, **key, **totals)
+        except IntegrityError:
+            # A concurrent writer created the row first; its totals exclude this entry.
+            balances.filter(**key).update(**increments, updated_at=timezone.now())
+
+    if increments:
+        TimeOffBalanceSnapshot.objects.using(db_alias).filter(
+            **key,
+            as_of__gte=entry.effective_date,
+        ).update(**increments)
+
+
+def _fold_entries_into_balances(entries: list, db_alias: str) -> None:
+    """
+    Set-based ``_fold_entry_into_balances`` for bulk-inserted entries: one
+    locked read and one bulk update for the existing balance rows, one grouped
+    aggregate for the missing ones and one pass over the affected snapshots.
+    Runs inside the caller's transaction.
+    """
+    deltas_by_key = {}
+    dated_deltas_by_key = {}
+    employer_by_key = {}
+    for entry in entries:
+        deltas = ledger_entry_deltas(entry.entry_type, entry.amount_minutes)
+        if not any(deltas.values()):
+            continue
+        key = (entry.employee_id, entry.leave_type_code)
+        totals = deltas_by_key.setdefault(key, empty_balance_totals())
+        for field, delta in deltas.items():
+            totals[field] += delta
+        dated_deltas_by_key.setdefault(key, []).append((entry.effective_date, deltas))
+        employer_by_key[key] = entry.employer_id
+    if not deltas_by_key:
+        return
+
+    employee_ids = {employee_id for employee_id, _ in deltas_by_key}
+    balances = TimeOffBalance.objects.using(db_alias)
+    now = timezone.now()
+    existing = {}
+    for balance in balances.select_for_update().filter(employee_id__in=employee_ids):
+        key = (balance.employee_id, balance.leave_type_code)
+        if key not in deltas_by_key:
+            continue
+        for field, delta in deltas_by_key[key].items():
+            setattr(balance, field, getattr(balance, field) + delta)
+        balance.updated_at = now
+        existing[key] = balance
+    if existing:
+        balances.bulk_update(existing.values(), [*BALANCE_TOTAL_FIELDS, "updated_at"], batch_size=1000)
+
+    missing = [key for key in deltas_by_key if key not in existing]
+    if missing:
+        condition = Q()
+        for employee_id, code in missing:
+            condition |= Q(employee_id=employee_id, leave_type_code=code)
+        totals = _grouped_ledger_totals(
+            TimeOffLedgerEntry.objects.using(db_alias).filter(condition), "employee_id", "leave_type_code"
+        )
+        created = {
+            key: TimeOffBalance(
+                employer_id=employer_by_key[key],
+                employee_id=key[0],
+                leave_type_code=key[1],
+                **totals.get(key, deltas_by_key[key]),
+            )
+            for key in missing
+        }
+        balances.bulk_create(created.values(), batch_size=1000, ignore_conflicts=True)
+        # Primary keys are assigned client-side: rows not found under ours were
+        # created first by a concurrent writer whose totals exclude these entries.
+        inserted = set(balances.filter(id__in=[balance.id for balance in created.values()]).values_list("id", flat=True))
+        for key, balance in created.items():
+            if balance.id in inserted:
+                continue
+            increments = {field: F(field) + delta for field, delta in deltas_by_key[key].items() if delta}
+            balances.filter(employee_id=key[0], leave_type_code=key[1]).update(**increments, updated_at=now)
+
+    earliest = min(effective for dated in dated_deltas_by_key.values() for effective, _ in dated)
+    changed = []
+    snapshots = TimeOffBalanceSnapshot.objects.using(db_alias).select_for_update().filter(
+        employee_id__in=employee_ids,
+        as_of__gte=earliest,
+    )
+    for snapshot in snapshots:
+        dated = dated_deltas_by_key.get((snapshot.employee_id, snapshot.leave_type_code))
+        if not dated:
+            continue
+        applied = False
+        for effective, deltas in dated:
+            if effective <= snapshot.as_of:
+                for field, delta in deltas.items():
+                    setattr(snapshot, field, getattr(snapshot, field) + delta)
+                applied = True
+        if applied:
+            changed.append(snapshot)
+    if changed:
+        TimeOffBalanceSnapshot.objects.using(db_alias).bulk_update(changed, list(BALANCE_TOTAL_FIELDS), batch_size=1000)
+
+
+def get_balance_totals(
+    employee,
+    db_alias: str = "default",
+    *,
+    leave_type_code: Optional[str] = None,
+    as_of: Optional[date] = None,
+) -> dict:
+    """
+    Return ``{leave_type_code: {earned/reserved/taken minutes}}`` for an employee.
+    Without ``as_of`` this reads the running balance rows; with ``as_of`` it
+    starts from the latest snapshot on or before that date per leave type and
+    folds only the ledger entries between the snapshot and ``as_of``.
+    """
+    employee_id = getattr(employee, "pk", employee)
+    if as_of is None:
+        rows = TimeOffBalance.objects.using(db_alias).filter(employee_id=employee_id)
+        if leave_type_code:
+            rows = rows.filter(leave_type_code=leave_type_code)
+        return {
+            row["leave_type_code"]: {field: int(row[field]) for field in BALANCE_TOTAL_FIELDS}
+            for row in rows.values("leave_type_code", *BALANCE_TOTAL_FIELDS)
+        }
+
+    snapshots = TimeOffBalanceSnapshot.objects.using(db_alias).filter(employee_id=employee_id, as_of__lte=as_of)
+    if leave_type_code:
+        snapshots = snapshots.filter(leave_type_code=leave_type_code)
+    latest = dict(
+        snapshots.order_by().values("leave_type_code").annotate(latest=Max("as_of")).values_list("leave_type_code", "latest")
+    )
+    totals = {}
+    if latest:
+        condition = Q()
+        for code, snapshot_date in latest.items():
+            condition |= Q(leave_type_code=code, as_of=snapshot_date)
+        for row in snapshots.filter(condition).values("leave_type_code", *BALANCE_TOTAL_FIELDS):
+            totals[row["leave_type_code"]] = {field: int(row[field]) for field in BALANCE_TOTAL_FIELDS}
+
+    entries = TimeOffLedgerEntry.objects.using(db_alias).filter(employee_id=employee_id, effective_date__lte=as_of)
+    if leave_type_code:
+        entries = entries.filter(leave_type_code=leave_type_code)
+    after_snapshot = ~Q(leave_type_code__in=list(latest))
+    for code, snapshot_date in latest.items():
+        after_snapshot |= Q(leave_type_code=code, effective_date__gt=snapshot_date)
+    for (code,), delta in _grouped_ledger_totals(entries.filter(after_snapshot), "leave_type_code").items():
+        current = totals.setdefault(code, empty_balance_totals())
+        for field in BALANCE_TOTAL_FIELDS:
+            current[field] += delta[field]
+    return totals
+
+
 def get_available_balance(
     employee,
     leave_type_code: str,
@@ -170,11 +388,109 @@ def get_available_balance(
     as_of: Optional[date] = None,
 ) -> int:
     """Return available minutes for an employee/leave type (optionally as of a date)."""
-    entries = TimeOffLedgerEntry.objects.using(db_alias).filter(
-        employee=employee,
-        leave_type_code=leave_type_code,
+    totals = get_balance_totals(employee, db_alias, leave_type_code=leave_type_code, as_of=as_of)
+    return with_available_minutes(
+        totals.get(leave_type_code) or empty_balance_totals(),
+        reservation_policy,
+    )["available_minutes"]
+
+
+def snapshot_balances(db_alias: str, as_of: date, employer_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """Capture (or refresh) balance snapshots as of a date. Returns the number of rows written."""
+    entries = TimeOffLedgerEntry.objects.using(db_alias).filter(effective_date__lte=as_of)
+    if employer_id:
+        entries = entries.filter(employer_id=employer_id)
+    grouped = _grouped_ledger_totals(entries, "employer_id", "employee_id", "leave_type_code")
+    snapshots = [
+        TimeOffBalanceSnapshot(
+            employer_id=row_employer_id,
+            employee_id=employee_id,
+            leave_type_code=code,
+            as_of=as_of,
+            **totals,
+        )
+        for (row_employer_id, employee_id, code), totals in grouped.items()
+    ]
+    TimeOffBalanceSnapshot.objects.using(db_alias).bulk_create(
+        snapshots,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["employee", "leave_type_code", "as_of"],
+        update_fields=list(BALANCE_TOTAL_FIELDS),
     )
-    return compute_balances(entries, reservation_policy, as_of=as_of).get("available_minutes", 0)
+    return len(snapshots)
+
+
+def find_balance_drift(db_alias: str, employer_id: Optional[int] = None, include_snapshots: bool = False) -> list:
+    """
+    Recompute balances from the ledger and return every running balance (and
+    optionally snapshot) that disagrees with it.
+    """
+    entries = TimeOffLedgerEntry.objects.using(db_alias).all()
+    balances = TimeOffBalance.objects.using(db_alias).all()
+    if employer_id:
+        entries = entries.filter(employer_id=employer_id)
+        balances = balances.filter(employer_id=employer_id)
+
+    drift = []
+    expected = _grouped_ledger_totals(entries, "employee_id", "leave_type_code")
+    actual = {
+        (row["employee_id"], row["leave_type_code"]): {field: int(row[field]) for field in BALANCE_TOTAL_FIELDS}
+        for row in balances.values("employee_id", "leave_type_code", *BALANCE_TOTAL_FIELDS)
+    }
+    for key in sorted(set(expected) | set(actual), key=lambda item: (str(item[0]), item[1])):
+        if expected.get(key) != actual.get(key):
+            drift.append(
+                {
+                    "employee_id": key[0],
+                    "leave_type_code": key[1],
+                    "as_of": None,
+                    "expected": expected.get(key),
+                    "actual": actual.get(key),
+                }
+            )
+
+    if include_snapshots:
+        snapshots = TimeOffBalanceSnapshot.objects.using(db_alias).all()
+        if employer_id:
+            snapshots = snapshots.filter(employer_id=employer_id)
+        for snapshot_date in snapshots.order_by().values_list("as_of", flat=True).distinct():
+            expected = _grouped_ledger_totals(
+                entries.filter(effective_date__lte=snapshot_date), "employee_id", "leave_type_code"
+            )
+            rows = snapshots.filter(as_of=snapshot_date).values("employee_id", "leave_type_code", *BALANCE_TOTAL_FIELDS)
+            for row in rows:
+                key = (row["employee_id"], row["leave_type_code"])
+                stored = {field: int(row[field]) for field in BALANCE_TOTAL_FIELDS}
+                if stored != expected.get(key, empty_balance_totals()):
+                    drift.append(
+                        {
+                            "employee_id": key[0],
+                            "leave_type_code": key[1],
+                            "as_of": snapshot_date,
+                            "expected": expected.get(key, empty_balance_totals()),
+                            "actual": stored,
+                        }
+                    )
+    return drift
+
+
+def repair_balance(employee_id, leave_type_code: str, db_alias: str, employer_id: int) -> None:
+    """Rebuild one running balance row from the ledger under a row lock."""
+    key = {"employee_id": employee_id, "leave_type_code": leave_type_code}
+    with transaction.atomic(using=db_alias):
+        balance = TimeOffBalance.objects.using(db_alias).select_for_update().filter(**key).first()
+        totals = _grouped_ledger_totals(
+            TimeOffLedgerEntry.objects.using(db_alias).filter(**key), "employee_id"
+        ).get((employee_id,))
+        if totals is None:
+            if balance:
+                balance.delete(using=db_alias)
+            return
+        if balance:
+            TimeOffBalance.objects.using(db_alias).filter(pk=balance.pk).update(**totals, updated_at=timezone.now())
+        else:
+            TimeOffBalance.objects.using(db_alias).create(employer_id=employer_id, **key, **totals)
 
 
 def has_overlap(employee, start_at: datetime, end_at: datetime, db_alias: str, exclude_request_id=None) -> bool:
@@ -208,24 +524,27 @@ def write_ledger_entry(
     metadata: Optional[dict] = None,
     db_alias: str = "default",
 ) -> TimeOffLedgerEntry:
-    """Create a ledger entry in an atomic, reusable way."""
+    """Create a ledger entry and fold it into the materialized balances atomically."""
     effective = effective_date or date.today()
-    return TimeOffLedgerEntry.objects.using(db_alias).create(
-        employer_id=employer_id,
-        tenant_id=tenant_id or employer_id,
-        employee=employee,
-        leave_type_code=leave_type_code,
-        entry_type=entry_type,
-        amount_minutes=amount_minutes,
-        effective_date=effective,
-        request=request,
-        allocation=allocation,
-        allocation_request=allocation_request,
-        source_reference=source_reference,
-        notes=notes,
-        created_by=created_by,
-        metadata=metadata or {},
-    )
+    with transaction.atomic(using=db_alias):
+        entry = TimeOffLedgerEntry.objects.using(db_alias).create(
+            employer_id=employer_id,
+            tenant_id=tenant_id or employer_id,
+            employee=employee,
+            leave_type_code=leave_type_code,
+            entry_type=entry_type,
+            amount_minutes=amount_minutes,
+            effective_date=effective,
+            request=request,
+            allocation=allocation,
+            allocation_request=allocation_request,
+            source_reference=source_reference,
+            notes=notes,
+            created_by=created_by,
+            metadata=metadata or {},
+        )
+        _fold_entry_into_balances(entry, db_alias)
+    return entry
 
 
 def apply_submit_transitions(
@@ -419,70 +738,228 @@ def post_allocation_entries(
         line.save(using=db_alias)
 
 
+ACCRUAL_BATCH_SIZE = 500
+ACCRUAL_RUN_STALE_AFTER = timedelta(minutes=15)
+
+
+def _accrual_period_start(d: date, gain: str) -> date:
+    first = d.replace(day=1)
+    if gain == "START":
+        return first
+    # END -> next period start
+    return _add_month(first)
+
+
+def _add_month(d: date) -> date:
+    year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+    return date(year, month, min(d.day, calendar.monthrange(year, month)[1]))
+
+
+def accrual_periods(sub: TimeOffAccrualSubscription, upto_date: date) -> list:
+    """
+    Effective dates a monthly subscription should have accrued up to ``upto_date``,
+    starting again from ``last_accrual_date`` (already-written periods are
+    filtered out against the ledger by the caller).
+    """
+    current = sub.last_accrual_date or _accrual_period_start(sub.start_date, sub.plan.accrual_gain_time)
+    # Skip until inside window
+    while current < sub.start_date:
+        current = _add_month(current)
+    periods = []
+    while current <= upto_date and (sub.end_date is None or current <= sub.end_date):
+        periods.append(current)
+        current = _add_month(current)
+    return periods
+
+
+def _accrue_subscription_batch(subs: list, *, upto_date: date, created_by: int, db_alias: str) -> int:
+    """Write the missing accrual entries of a batch of subscriptions. Returns the entries created."""
+    periods_by_sub = {sub.id: accrual_periods(sub, upto_date) for sub in subs}
+    all_periods = [period for periods in periods_by_sub.values() for period in periods]
+    if not all_periods:
+        return 0
+
+    with transaction.atomic(using=db_alias):
+        existing = set(
+            TimeOffLedgerEntry.objects.using(db_alias)
+            .filter(
+                entry_type="ACCRUAL",
+                employee_id__in={sub.employee_id for sub in subs},
+                effective_date__gte=min(all_periods),
+                effective_date__lte=max(all_periods),
+            )
+            .values_list("allocation_id", "employee_id", "leave_type_code", "effective_date")
+        )
+        entries = []
+        advanced = []
+        for sub in subs:
+            periods = periods_by_sub[sub.id]
+            if not periods:
+                continue
+            employer_id = sub.employee.employer_id
+            for period in periods:
+                key = (sub.allocation_id, sub.employee_id, sub.leave_type_code, period)
+                if key in existing:
+                    continue
+                existing.add(key)
+                entries.append(
+                    TimeOffLedgerEntry(
+                        employer_id=employer_id,
+                        tenant_id=(sub.allocation.tenant_id if sub.allocation else None) or employer_id,
+                        employee_id=sub.employee_id,
+                        leave_type_code=sub.leave_type_code,
+                        entry_type="ACCRUAL",
+                        amount_minutes=sub.plan.amount_minutes,
+                        effective_date=period,
+                        allocation_id=sub.allocation_id,
+                        source_reference=f"accrual_plan:{sub.plan_id}",
+                        created_by=created_by,
+                        metadata={"source": "accrual_run", "subscription_id": str(sub.id)},
+                    )
+                )
+            if sub.last_accrual_date is None or periods[-1] > sub.last_accrual_date:
+                sub.last_accrual_date = periods[-1]
+                advanced.append(sub)
+
+        TimeOffLedgerEntry.objects.using(db_alias).bulk_create(entries, batch_size=1000)
+        _fold_entries_into_balances(entries, db_alias)
+        if advanced:
+            TimeOffAccrualSubscription.objects.using(db_alias).bulk_update(
+                advanced, ["last_accrual_date"], batch_size=1000
+            )
+    return len(entries)
+
+
 def run_accruals_for_subscriptions(
     *,
     upto_date: date,
     created_by: int,
     db_alias: str,
-):
+    batch_size: int = ACCRUAL_BATCH_SIZE,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
     """
     Generate accrual ledger entries up to a given date for active subscriptions.
     Currently supports monthly frequency.
+
+    Subscriptions are processed in batches, each in its own transaction: the
+    accrual keys already in the ledger for the batch window are loaded in one
+    query, missing periods are computed in memory, then entries are bulk
+    inserted, folded into the materialized balances and ``last_accrual_date``
+    is bulk updated. Re-running over the same window writes nothing. ``progress``
+    is called with the running summary after every batch.
     """
-    subs = TimeOffAccrualSubscription.objects.using(db_alias).select_related("plan", "employee").filter(
+    subs = TimeOffAccrualSubscription.objects.using(db_alias).filter(
         status="ACTIVE",
         start_date__lte=upto_date,
+        plan__frequency="MONTHLY",
     )
-    for sub in subs:
-        plan = sub.plan
-        if plan.frequency != "MONTHLY":
-            continue
+    sub_ids = list(subs.order_by("id").values_list("id", flat=True))
+    summary = {"total_subscriptions": len(sub_ids), "processed_subscriptions": 0, "entries_created": 0}
+    for offset in range(0, len(sub_ids), batch_size):
+        chunk = sub_ids[offset : offset + batch_size]
+        batch = list(subs.filter(id__in=chunk).select_related("plan", "employee", "allocation"))
+        summary["entries_created"] += _accrue_subscription_batch(
+            batch,
+            upto_date=upto_date,
+            created_by=created_by,
+            db_alias=db_alias,
+        )
+        summary["processed_subscriptions"] += len(chunk)
+        if progress:
+            progress(dict(summary))
+    return summary
 
-        def snap_start(d: date, gain: str) -> date:
-            first = d.replace(day=1)
-            if gain == "START":
-                return first
-            # END -> next period start
-            if first.month == 12:
-                return date(first.year + 1, 1, 1)
-            return date(first.year, first.month + 1, 1)
-
-        def add_month(d: date) -> date:
-            if d.month == 12:
-                return date(d.year + 1, 1, d.day)
-            return date(d.year, d.month + 1, d.day)
-
-        current = sub.last_accrual_date or snap_start(sub.start_date, plan.accrual_gain_time)
-        # Skip until inside window
-        while current < sub.start_date:
-            current = add_month(current)
-
-        while current <= upto_date and (sub.end_date is None or current <= sub.end_date):
-            exists = TimeOffLedgerEntry.objects.using(db_alias).filter(
-                allocation=sub.allocation,
-                employee=sub.employee,
-                leave_type_code=sub.leave_type_code,
-                entry_type="ACCRUAL",
-                effective_date=current,
-            ).exists()
-            if not exists:
-                write_ledger_entry(
-                    employer_id=sub.employee.employer_id,
-                    tenant_id=sub.allocation.tenant_id if sub.allocation else sub.employee.employer_id,
-                    employee=sub.employee,
-                    leave_type_code=sub.leave_type_code,
-                    entry_type="ACCRUAL",
-                    amount_minutes=plan.amount_minutes,
-                    created_by=created_by,
-                    allocation=sub.allocation,
-                    effective_date=current,
-                    source_reference=f"accrual_plan:{plan.id}",
-                    metadata={"source": "accrual_run", "subscription_id": str(sub.id)},
-                    db_alias=db_alias,
-                )
-                sub.last_accrual_date = current
-                sub.save(using=db_alias)
-            current = add_month(current)
+
+def fail_abandoned_accrual_runs(*, employer_id: int, db_alias: str) -> int:
+    """
+    Mark active runs that stopped heart-beating (e.g. their process restarted)
+    as FAILED so a new run can start. Returns the number of runs released.
+    """
+    cutoff = timezone.now() - ACCRUAL_RUN_STALE_AFTER
+    return (
+        TimeOffAccrualRun.objects.using(db_alias)
+        .filter(employer_id=employer_id, status__in=TimeOffAccrualRun.ACTIVE_STATUSES)
+        .filter(Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, created_at__lt=cutoff))
+        .update(
+            status="FAILED",
+            error="Abandoned: no progress recorded before the staleness cutoff.",
+            finished_at=timezone.now(),
+        )
+    )
+
+
+def start_accrual_run(*, employer_id: int, upto_date: date, created_by: int, db_alias: str) -> TimeOffAccrualRun:
+    """
+    Queue an accrual run, refusing to start a second one while another is
+    active. The one-active-run constraint settles concurrent starts.
+    """
+    fail_abandoned_accrual_runs(employer_id=employer_id, db_alias=db_alias)
+    try:
+        with transaction.atomic(using=db_alias):
+            return TimeOffAccrualRun.objects.using(db_alias).create(
+                employer_id=employer_id,
+                upto_date=upto_date,
+                created_by=created_by,
+            )
+    except IntegrityError:
+        raise ValueError("An accrual run is already in progress for this employer.")
+
+
+def execute_accrual_run(run_id, db_alias: str) -> TimeOffAccrualRun:
+    """
+    Run a queued accrual run, recording progress (and a heartbeat) on the run
+    row after every batch. A run that is no longer QUEUED is left alone.
+    """
+    runs = TimeOffAccrualRun.objects.using(db_alias)
+    now = timezone.now()
+    if not runs.filter(id=run_id, status="QUEUED").update(status="RUNNING", started_at=now, heartbeat_at=now):
+        return runs.get(id=run_id)
+    run = runs.get(id=run_id)
+
+    def _record_progress(summary: dict) -> None:
+        if not runs.filter(id=run.id, status="RUNNING").update(heartbeat_at=timezone.now(), **summary):
+            raise RuntimeError("Accrual run was released as abandoned while it was running.")
+
+    try:
+        summary = run_accruals_for_subscriptions(
+            upto_date=run.upto_date,
+            created_by=run.created_by,
+            db_alias=db_alias,
+            progress=_record_progress,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Accrual run %s failed on %s", run.id, db_alias)
+        runs.filter(id=run.id).update(status="FAILED", error=str(exc), finished_at=timezone.now())
+    else:
+        runs.filter(id=run.id).update(status="COMPLETED", finished_at=timezone.now(), **summary)
+    return runs.get(id=run.id)
+
+
+def _execute_accrual_run_in_thread(run_id, db_alias: str) -> None:
+    try:
+        execute_accrual_run(run_id, db_alias)
+    finally:
+        connections.close_all()
+
+
+def dispatch_accrual_run(run: TimeOffAccrualRun, db_alias: str) -> None:
+    """
+    Execute a queued run in a background thread once the surrounding
+    transaction commits (inline when TIMEOFF_ACCRUAL_RUN_ASYNC is off).
+    """
+    if not getattr(settings, "TIMEOFF_ACCRUAL_RUN_ASYNC", True):
+        execute_accrual_run(run.id, db_alias)
+        return
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_execute_accrual_run_in_thread,
+            args=(run.id, db_alias),
+            name=f"timeoff-accrual-{run.id}",
+            daemon=True,
+        ).start(),
+        using=db_alias,
+    )
 
 
 def write_adjustment(
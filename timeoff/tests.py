@@ -7,8 +7,12 @@ from rest_framework import serializers
 
 from employees.models import Employee
 from timeoff.models import (
+    TimeOffAccrualPlan,
+    TimeOffAccrualRun,
+    TimeOffAccrualSubscription,
     TimeOffAllocation,
     TimeOffAllocationLine,
+    TimeOffBalance,
     TimeOffConfiguration,
     TimeOffLedgerEntry,
     TimeOffRequest,
@@ -21,8 +25,16 @@ from timeoff.services import (
     apply_rejection_or_cancellation_transitions,
     apply_submit_transitions,
     calculate_duration_minutes,
+    execute_accrual_run,
+    find_balance_drift,
+    get_available_balance,
     post_allocation_entries,
     round_minutes,
+    run_accruals_for_subscriptions,
+    snapshot_balances,
+    start_accrual_run,
+    write_adjustment,
+    write_ledger_entry,
 )
 
 
@@ -353,3 +365,144 @@ class TimeOffFeatureTests(TestCase):
         )
         with self.assertRaises(serializers.ValidationError):
             serializer.is_valid(raise_exception=True)
+
+    def test_ledger_writes_maintain_materialized_balance_and_snapshots(self):
+        today = date.today()
+        write_adjustment(
+            employer_id=self.employer_profile.id,
+            tenant_id=self.employer_profile.id,
+            employee=self.employee,
+            leave_type_code="ANL",
+            amount_minutes=960,
+            created_by=self.employer_user.id,
+            effective_date=today - timedelta(days=40),
+            source_reference="test:grant",
+        )
+        snapshot_balances("default", today - timedelta(days=30))
+        # Back-dated entry before the snapshot must be folded into it as well.
+        write_adjustment(
+            employer_id=self.employer_profile.id,
+            tenant_id=self.employer_profile.id,
+            employee=self.employee,
+            leave_type_code="ANL",
+            amount_minutes=-60,
+            created_by=self.employer_user.id,
+            effective_date=today - timedelta(days=35),
+            source_reference="test:correction",
+        )
+        req = TimeOffRequest.objects.create(
+            employer_id=self.employer_profile.id,
+            tenant_id=self.employer_profile.id,
+            employee=self.employee,
+            leave_type_code="ANL",
+            start_at=datetime.combine(today, dtime.min),
+            end_at=datetime.combine(today, dtime.max),
+            duration_minutes=120,
+            status="DRAFT",
+            created_by=self.employer_user.id,
+            updated_by=self.employer_user.id,
+        )
+        apply_submit_transitions(
+            request=req,
+            duration_minutes=req.duration_minutes,
+            reservation_policy="RESERVE_ON_SUBMIT",
+            created_by=self.employer_user.id,
+            db_alias="default",
+            effective_date=today,
+        )
+
+        balance = TimeOffBalance.objects.get(employee=self.employee, leave_type_code="ANL")
+        self.assertEqual((balance.earned_minutes, balance.reserved_minutes, balance.taken_minutes), (900, 120, 0))
+        self.assertEqual(get_available_balance(self.employee, "ANL", "RESERVE_ON_SUBMIT"), 780)
+        self.assertEqual(
+            get_available_balance(self.employee, "ANL", "RESERVE_ON_SUBMIT", as_of=today - timedelta(days=1)),
+            900,
+        )
+        self.assertEqual(find_balance_drift("default", include_snapshots=True), [])
+
+    def test_bulk_accrual_run_is_idempotent_and_tracks_progress(self):
+        plan = TimeOffAccrualPlan.objects.create(
+            employer_id=self.employer_profile.id,
+            name="Monthly ANL",
+            amount_minutes=480,
+            accrual_gain_time="START",
+        )
+        sub = TimeOffAccrualSubscription.objects.create(
+            plan=plan,
+            employee=self.employee,
+            leave_type_code="ANL",
+            start_date=date(2024, 1, 15),
+            created_by=self.employer_user.id,
+        )
+        # A period accrued by an earlier run must not be duplicated.
+        write_ledger_entry(
+            employer_id=self.employer_profile.id,
+            tenant_id=self.employer_profile.id,
+            employee=self.employee,
+            leave_type_code="ANL",
+            entry_type="ACCRUAL",
+            amount_minutes=480,
+            created_by=self.employer_user.id,
+            effective_date=date(2024, 2, 1),
+        )
+        snapshot_balances("default", date(2024, 3, 15))
+
+        summary = run_accruals_for_subscriptions(
+            upto_date=date(2024, 4, 10),
+            created_by=self.employer_user.id,
+            db_alias="default",
+        )
+        # Periods: Feb, Mar, Apr (January starts before the subscription).
+        self.assertEqual(summary, {"total_subscriptions": 1, "processed_subscriptions": 1, "entries_created": 2})
+        sub.refresh_from_db()
+        self.assertEqual(sub.last_accrual_date, date(2024, 4, 1))
+        balance = TimeOffBalance.objects.get(employee=self.employee, leave_type_code="ANL")
+        self.assertEqual(balance.earned_minutes, 3 * 480)
+        self.assertEqual(find_balance_drift("default", include_snapshots=True), [])
+
+        run = start_accrual_run(
+            employer_id=self.employer_profile.id,
+            upto_date=date(2024, 4, 10),
+            created_by=self.employer_user.id,
+            db_alias="default",
+        )
+        with self.assertRaises(ValueError):
+            start_accrual_run(
+                employer_id=self.employer_profile.id,
+                upto_date=date(2024, 4, 10),
+                created_by=self.employer_user.id,
+                db_alias="default",
+            )
+        run = execute_accrual_run(run.id, "default")
+        self.assertEqual(run.status, "COMPLETED")
+        self.assertEqual((run.processed_subscriptions, run.entries_created), (1, 0))
+        self.assertEqual(
+            TimeOffLedgerEntry.objects.filter(employee=self.employee, entry_type="ACCRUAL").count(),
+            3,
+        )
+        self.assertFalse(TimeOffAccrualRun.objects.filter(status__in=TimeOffAccrualRun.ACTIVE_STATUSES).exists())
+
+    def test_abandoned_accrual_run_is_released(self):
+        stuck = start_accrual_run(
+            employer_id=self.employer_profile.id,
+            upto_date=date(2024, 4, 10),
+            created_by=self.employer_user.id,
+            db_alias="default",
+        )
+        TimeOffAccrualRun.objects.filter(id=stuck.id).update(
+            status="RUNNING",
+            heartbeat_at=datetime.now().astimezone() - timedelta(hours=1),
+        )
+
+        run = start_accrual_run(
+            employer_id=self.employer_profile.id,
+            upto_date=date(2024, 4, 10),
+            created_by=self.employer_user.id,
+            db_alias="default",
+        )
+        stuck.refresh_from_db()
+        self.assertEqual(stuck.status, "FAILED")
+        self.assertEqual(run.status, "QUEUED")
+        self.assertEqual(execute_accrual_run(run.id, "default").status, "COMPLETED")
+        # A run that is no longer queued is not executed again.
+        self.assertEqual(execute_accrual_run(stuck.id, "default").status, "FAILED")
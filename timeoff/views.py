@@ -15,6 +15,7 @@ from .models import (
     TimeOffAccrualSubscription,
     TimeOffAllocation,
     TimeOffAllocationLine,
+    TimeOffAccrualRun,
     TimeOffAllocationRequest,
     TimeOffConfiguration,
     TimeOffLedgerEntry,
@@ -23,6 +24,7 @@ from .models import (
     ensure_timeoff_configuration,
 )
 from .serializers import (
+    TimeOffAccrualRunSerializer,
     TimeOffAllocationCreateSerializer,
     TimeOffAllocationRequestSerializer,
     TimeOffAllocationSerializer,
@@ -38,9 +40,10 @@ from .services import (
     apply_approval_transitions,
     apply_rejection_or_cancellation_transitions,
     apply_submit_transitions,
-    compute_balances,
+    get_balance_totals,
     post_allocation_entries,
-    run_accruals_for_subscriptions,
+    dispatch_accrual_run,
+    start_accrual_run,
 )
 from .notifications import (
     notify_timeoff_request_submitted,
@@ -548,13 +551,9 @@ class TimeOffBalanceViewSet(viewsets.ViewSet):
             policy = lt.get("reservation_policy") or reservation_policy
             reservation_map[lt.get("code")] = policy
 
-        entries = TimeOffLedgerEntry.objects.using(tenant_db).filter(employee=employee)
-        if as_of_date:
-            entries = entries.filter(effective_date__lte=as_of_date)
-        data = TimeOffBalanceSerializer.from_entries(
-            entries,
+        data = TimeOffBalanceSerializer.from_totals(
+            get_balance_totals(employee, tenant_db, as_of=as_of_date),
             reservation_policy,
-            as_of=as_of_date,
             reservation_policy_by_code=reservation_map,
         )
         return Response(data)
@@ -864,14 +863,35 @@ class AccrualRunViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated, EmployerAccessPermission]
     required_permissions = ["timeoff.accrual.run", "timeoff.manage"]
 
+    def _runs(self, request):
+        employer = get_active_employer(request, require_context=True)
+        tenant_db = get_tenant_database_alias(employer)
+        return employer, tenant_db, TimeOffAccrualRun.objects.using(tenant_db).filter(employer_id=employer.id)
+
+    def list(self, request):
+        _, _, runs = self._runs(request)
+        return Response(TimeOffAccrualRunSerializer(runs[:20], many=True).data)
+
+    def retrieve(self, request, pk=None):
+        _, _, runs = self._runs(request)
+        run = runs.filter(id=pk).first()
+        if not run:
+            return Response({"detail": "Accrual run not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(TimeOffAccrualRunSerializer(run).data)
+
     def create(self, request):
         run_date_param = request.data.get("run_date")
         upto = date.fromisoformat(run_date_param) if run_date_param else date.today()
-        employer = get_active_employer(request, require_context=True)
-        tenant_db = get_tenant_database_alias(employer)
-        run_accruals_for_subscriptions(
-            upto_date=upto,
-            created_by=request.user.id,
-            db_alias=tenant_db,
-        )
-        return Response({"status": "ok", "run_date": str(upto)})
+        employer, tenant_db, _ = self._runs(request)
+        try:
+            run = start_accrual_run(
+                employer_id=employer.id,
+                upto_date=upto,
+                created_by=request.user.id,
+                db_alias=tenant_db,
+            )
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        dispatch_accrual_run(run, tenant_db)
+        run.refresh_from_db(using=tenant_db)
+        return Response(TimeOffAccrualRunSerializer(run).data, status=status.HTTP_202_ACCEPTED)